@@ -2,12 +2,18 @@
 """CLI for n8n Railway deployment management."""
 
 import argparse
-import asyncio
+import json
 import sys
+import time
+from collections.abc import Coroutine, Iterator
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 from src.config import Config
-from src.health_check import HealthChecker
+
+# Subcommand dependencies (httpx, asyncpg, redis, ...) are imported inside the
+# command functions so that `validate` and `info` start without loading them.
 
 
 def setup_parser() -> argparse.ArgumentParser:
@@ -16,74 +22,1983 @@ def setup_parser() -> argparse.ArgumentParser:
         description="n8n Railway Deployment CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Run the command and report import time per module",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    _add_health_parser(subparsers)
+    _add_exporter_parser(subparsers)
+    _add_bench_parser(subparsers)
+    _add_executions_parser(subparsers)
+    _add_workflows_parser(subparsers)
+    _add_logs_parser(subparsers)
+    _add_binary_data_parser(subparsers)
+    _add_stand_in_parser(subparsers)
+    _add_sidecar_parser(subparsers)
+    _add_metrics_parser(subparsers)
+    _add_db_parser(subparsers)
+    _add_prune_parser(subparsers)
+    _add_backup_parsers(subparsers)
+    _add_simulate_parser(subparsers)
+
+    # Config validation command
+    subparsers.add_parser("validate", help="Validate configuration")
+
+    # Environment info command
+    subparsers.add_parser("info", help="Display environment information")
+
+    # Test command
+    test_parser = subparsers.add_parser("test", help="Run tests")
+    test_parser.add_argument(
+        "--unit", action="store_true", help="Run only unit tests"
+    )
+    test_parser.add_argument(
+        "--integration", action="store_true", help="Run only integration tests"
+    )
+    test_parser.add_argument(
+        "--coverage", action="store_true", help="Generate coverage report"
+    )
+
+    # Lint command
+    lint_parser = subparsers.add_parser("lint", help="Run linter")
+    lint_parser.add_argument("--fix", action="store_true", help="Auto-fix issues")
+
+    # Format command
+    subparsers.add_parser("format", help="Format code")
+
+    return parser
+
+
+def _add_health_parser(subparsers: Any) -> None:
+    """Add the ``health`` command with its watch, fleet, sampling and history modes."""
+    health_parser = subparsers.add_parser("health", help="Check n8n health status")
+    health_parser.add_argument(
+        "--url", type=str, help="n8n base URL (default: from config)"
+    )
+    health_parser.add_argument(
+        "--timeout", type=int, default=10, help="Timeout in seconds (default: 10)"
+    )
+    health_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Probe continuously over a pooled connection (with --fleet: in rounds)",
+    )
+    health_parser.add_argument(
+        "--interval",
+        type=float,
+        default=30.0,
+        help="Seconds between probes in watch mode (default: 30)",
+    )
+    health_parser.add_argument(
+        "--count", type=int, default=0, help="Stop watch mode after N probes (default: never)"
+    )
+    health_parser.add_argument(
+        "--fleet",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Probe every URL listed in FILE (default: HEALTH_FLEET_TARGETS)",
+    )
+    health_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=50,
+        help="Max concurrent fleet probes or sampling requests (default: 50)",
+    )
+    health_parser.add_argument(
+        "--deadline",
+        type=float,
+        default=15.0,
+        help="Per-target deadline in seconds for fleet probes (default: 15)",
+    )
+    health_parser.add_argument(
+        "--samples", type=int, default=0, help="Fire N requests and report latency percentiles"
+    )
+    health_parser.add_argument(
+        "--path", type=str, default="/healthz", help="Path to sample (default: /healthz)"
+    )
+    health_parser.add_argument(
+        "--export", type=str, metavar="FILE", help="Write the sampled histogram to FILE as JSON"
+    )
+    health_parser.add_argument(
+        "--merge",
+        type=str,
+        nargs="+",
+        default=[],
+        metavar="FILE",
+        help="Merge previously exported histograms into the report",
+    )
+    health_parser.add_argument(
+        "--history-file",
+        type=str,
+        help="Probe history written in watch mode (default: HEALTH_HISTORY_FILE)",
+    )
+    health_parser.add_argument(
+        "--no-history", action="store_true", help="Do not record watch mode probes"
+    )
+    health_parser.add_argument(
+        "--cgroup-interval",
+        type=float,
+        default=0.1,
+        help="Sample cgroup resources every N seconds in watch mode, 0 to disable (default: 0.1)",
+    )
+    health_subparsers = health_parser.add_subparsers(dest="health_command")
+    history_parser = health_subparsers.add_parser(
+        "history", help="Show recorded probe history from the ring-buffer file"
+    )
+    history_parser.add_argument(
+        "--file", type=str, help="Probe history file (default: HEALTH_HISTORY_FILE)"
+    )
+    history_parser.add_argument(
+        "--since-hours", type=float, default=24.0, help="Show the last N hours (default: 24)"
+    )
+    history_parser.add_argument(
+        "--resolution",
+        choices=["auto", "raw", "1m", "1h"],
+        default="auto",
+        help="Record resolution; auto picks by range (default: auto)",
+    )
+    history_parser.add_argument(
+        "--limit", type=int, default=50, help="Most recent rows to print (default: 50)"
+    )
+    history_parser.add_argument("--json", action="store_true", help="Print the history as JSON")
+
+
+def _add_exporter_parser(subparsers: Any) -> None:
+    """Add the ``exporter`` command."""
+    exporter_parser = subparsers.add_parser(
+        "exporter", help="Serve cached health results as Prometheus metrics"
+    )
+    exporter_parser.add_argument(
+        "--url", type=str, help="n8n base URL (default: from config)"
+    )
+    exporter_parser.add_argument(
+        "--timeout", type=int, default=10, help="Probe timeout in seconds (default: 10)"
+    )
+    exporter_parser.add_argument(
+        "--host", type=str, default="0.0.0.0", help="Listen address (default: 0.0.0.0)"
+    )
+    exporter_parser.add_argument(
+        "--port", type=int, default=9464, help="Listen port (default: 9464)"
+    )
+    exporter_parser.add_argument(
+        "--ttl",
+        type=float,
+        default=15.0,
+        help="Seconds a probe result is served from cache (default: 15)",
+    )
+
+
+def _positive_float(value: str) -> float:
+    """Parse a strictly positive number for argparse."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+    return number
+
+
+def _add_bench_parser(subparsers: Any) -> None:
+    """Add the ``bench`` commands."""
+    bench_parser = subparsers.add_parser("bench", help="Run load benchmarks")
+    bench_subparsers = bench_parser.add_subparsers(dest="bench_command", help="Benchmarks")
+    webhook_parser = bench_subparsers.add_parser(
+        "webhook", help="Drive a webhook at fixed request rates (open loop)"
+    )
+    webhook_target = webhook_parser.add_mutually_exclusive_group(required=True)
+    webhook_target.add_argument("--url", type=str, help="Full webhook URL")
+    webhook_target.add_argument(
+        "--path", type=str, help="Webhook path appended to WEBHOOK_URL/webhook/"
+    )
+    webhook_parser.add_argument(
+        "--rates",
+        type=_positive_float,
+        nargs="+",
+        default=[10.0],
+        help="Target requests per second for each ramp step (default: 10)",
+    )
+    webhook_parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds per ramp step (default: 10)"
+    )
+    webhook_parser.add_argument(
+        "--payload",
+        type=str,
+        default="{}",
+        help="JSON request body, or @FILE to read it from a file (default: {})",
+    )
+    webhook_parser.add_argument(
+        "--method", type=str, default="POST", help="HTTP method (default: POST)"
+    )
+    webhook_parser.add_argument(
+        "--timeout", type=float, default=10.0, help="Request timeout in seconds (default: 10)"
+    )
+    webhook_parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=1000,
+        help="Cap on outstanding requests (default: 1000)",
+    )
+
+    regress_parser = bench_subparsers.add_parser(
+        "regress", help="Run the performance regression suite against the committed baseline"
+    )
+    regress_parser.add_argument(
+        "--only",
+        type=str,
+        nargs="+",
+        metavar="PREFIX",
+        help="Only run benchmarks whose names start with PREFIX (e.g. cli. fleet.)",
+    )
+    regress_parser.add_argument(
+        "--runs", type=int, default=10, help="Samples per benchmark (default: 10)"
+    )
+    regress_parser.add_argument(
+        "--baseline",
+        type=str,
+        default="benchmarks/baseline.json",
+        help="Baseline results file (default: benchmarks/baseline.json)",
+    )
+    regress_parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record this run as the new baseline instead of comparing",
+    )
+    regress_parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="Significance level of the one-sided Mann-Whitney U test (default: 0.01)",
+    )
+    regress_parser.add_argument(
+        "--min-effect",
+        type=float,
+        default=0.25,
+        help="Smallest median slowdown treated as a regression (default: 0.25)",
+    )
+
+
+def _add_executions_parser(subparsers: Any) -> None:
+    """Add the ``executions`` commands."""
+    executions_parser = subparsers.add_parser(
+        "executions", help="Sync and analyze execution history"
+    )
+    executions_parser.add_argument(
+        "--db", type=str, help="SQLite cache path (default: EXECUTIONS_CACHE_DB)"
+    )
+    executions_subparsers = executions_parser.add_subparsers(
+        dest="executions_command", help="Execution history commands"
+    )
+    sync_parser = executions_subparsers.add_parser(
+        "sync", help="Fetch new or changed executions into the local cache"
+    )
+    sync_parser.add_argument("--url", type=str, help="n8n base URL (default: from config)")
+    sync_parser.add_argument("--api-key", type=str, help="n8n API key (default: N8N_API_KEY)")
+    sync_parser.add_argument(
+        "--page-size", type=int, default=250, help="Executions per API page (default: 250)"
+    )
+    sync_parser.add_argument(
+        "--timeout", type=int, default=30, help="Request timeout in seconds (default: 30)"
+    )
+    stats_parser = executions_subparsers.add_parser(
+        "stats", help="Per-workflow duration percentiles and failure rates"
+    )
+    stats_parser.add_argument(
+        "--since-hours", type=float, help="Only include executions from the last N hours"
+    )
+    throughput_parser = executions_subparsers.add_parser(
+        "throughput", help="Executions per time bucket"
+    )
+    throughput_parser.add_argument(
+        "--bucket", type=int, default=3600, help="Bucket size in seconds (default: 3600)"
+    )
+    throughput_parser.add_argument(
+        "--since-hours", type=float, help="Only include executions from the last N hours"
+    )
+
+
+def _add_workflows_parser(subparsers: Any) -> None:
+    """Add the ``workflows`` commands."""
+    workflows_parser = subparsers.add_parser("workflows", help="Work with exported workflows")
+    workflows_subparsers = workflows_parser.add_subparsers(
+        dest="workflows_command", help="Workflow commands"
+    )
+    analyze_parser = workflows_subparsers.add_parser(
+        "analyze", help="Find structural performance problems in exported workflows"
+    )
+    analyze_parser.add_argument(
+        "paths", nargs="+", help="Workflow JSON files or directories to scan"
+    )
+    analyze_parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count, 1 = in-process)"
+    )
+    analyze_parser.add_argument(
+        "--top", type=int, default=20, help="Workflows to include in the report (default: 20)"
+    )
+    analyze_parser.add_argument(
+        "--json", action="store_true", help="Stream one JSON result per line instead"
+    )
+
+    export_parser = workflows_subparsers.add_parser(
+        "export", help="Export workflows to one JSON file each, writing only changed ones"
+    )
+    export_parser.add_argument("directory", help="Directory holding the exported workflows")
+    export_parser.add_argument("--url", type=str, help="n8n base URL (default: from config)")
+    export_parser.add_argument("--api-key", type=str, help="n8n API key (default: N8N_API_KEY)")
+    export_parser.add_argument(
+        "--page-size", type=int, default=250, help="Workflows per API page (default: 250)"
+    )
+    export_parser.add_argument(
+        "--timeout", type=int, default=30, help="Request timeout in seconds (default: 30)"
+    )
+    export_parser.add_argument(
+        "--prune", action="store_true", help="Delete files of workflows removed upstream"
+    )
+    import_parser = workflows_subparsers.add_parser(
+        "import", help="Push exported workflows to n8n, sending only those that differ"
+    )
+    import_parser.add_argument("directory", help="Directory holding the exported workflows")
+    import_parser.add_argument("--url", type=str, help="n8n base URL (default: from config)")
+    import_parser.add_argument("--api-key", type=str, help="n8n API key (default: N8N_API_KEY)")
+    import_parser.add_argument(
+        "--concurrency", type=int, default=8, help="Concurrent create/update requests (default: 8)"
+    )
+    import_parser.add_argument(
+        "--timeout", type=int, default=30, help="Request timeout in seconds (default: 30)"
+    )
+    import_parser.add_argument(
+        "--dry-run", action="store_true", help="Report what would be created and updated"
+    )
+
+
+def _add_logs_parser(subparsers: Any) -> None:
+    """Add the ``logs`` commands."""
+    logs_parser = subparsers.add_parser("logs", help="Analyze n8n log files")
+    logs_subparsers = logs_parser.add_subparsers(dest="logs_command", help="Log commands")
+    logs_analyze_parser = logs_subparsers.add_parser(
+        "analyze", help="Per-workflow executions, durations, errors and warnings from logs"
+    )
+    logs_analyze_parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Log files, oldest first (default: N8N_LOG_FILE_LOCATION)",
+    )
+    logs_analyze_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for large files (default: CPU count, 1 = in-process)",
+    )
+    logs_analyze_parser.add_argument(
+        "--top", type=int, default=20, help="Workflows to include in the report (default: 20)"
+    )
+    logs_analyze_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    logs_analyze_parser.add_argument(
+        "--follow", action="store_true", help="Keep reading lines appended to the last file"
+    )
+    logs_analyze_parser.add_argument(
+        "--interval",
+        type=float,
+        default=10.0,
+        help="Seconds between reports when following (default: 10)",
+    )
+    logs_analyze_parser.add_argument(
+        "--count", type=int, default=0, help="Stop following after N polls (default: never)"
+    )
+
+
+def _add_binary_data_parser(subparsers: Any) -> None:
+    """Add the ``binary-data`` commands."""
+    binary_parser = subparsers.add_parser(
+        "binary-data", help="Inspect filesystem binary data (N8N_BINARY_DATA_MODE=filesystem)"
+    )
+    binary_subparsers = binary_parser.add_subparsers(
+        dest="binary_data_command", help="Binary data commands"
+    )
+    binary_scan_parser = binary_subparsers.add_parser(
+        "scan", help="Report usage and duplicates, optionally deduplicate and remove orphans"
+    )
+    binary_scan_parser.add_argument(
+        "--path", type=str, help="Binary data directory (default: N8N_BINARY_DATA_STORAGE_PATH)"
+    )
+    binary_scan_parser.add_argument(
+        "--index",
+        type=str,
+        default=".cache/binary-data-index.sqlite3",
+        help="Digest cache for incremental rescans (default: .cache/binary-data-index.sqlite3)",
+    )
+    binary_scan_parser.add_argument(
+        "--no-index", action="store_true", help="Hash every candidate file without the cache"
+    )
+    binary_scan_parser.add_argument(
+        "--workers", type=int, help="Hashing threads (default: based on CPU count)"
+    )
+    binary_scan_parser.add_argument(
+        "--top", type=int, default=10, help="Rows per section of the report (default: 10)"
+    )
+    binary_scan_parser.add_argument(
+        "--hardlink", action="store_true", help="Replace duplicate files with hardlinks"
+    )
+    binary_scan_parser.add_argument(
+        "--orphans",
+        action="store_true",
+        help="Report files of executions missing from the database",
+    )
+    binary_scan_parser.add_argument(
+        "--remove-orphans", action="store_true", help="Delete files of missing executions"
+    )
+    binary_scan_parser.add_argument(
+        "--sqlite", type=str, metavar="FILE", help="Read execution IDs from an n8n SQLite database"
+    )
+    binary_scan_parser.add_argument(
+        "--dry-run", action="store_true", help="Report what --hardlink/--remove-orphans would do"
+    )
+    binary_scan_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+
+def _add_stand_in_parser(subparsers: Any) -> None:
+    """Add the ``stand-in`` command."""
+    stand_in_parser = subparsers.add_parser(
+        "stand-in", help="Run a local n8n stand-in server for benchmarking"
+    )
+    stand_in_parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Listen address (default: 127.0.0.1)"
+    )
+    stand_in_parser.add_argument(
+        "--port", type=int, default=5678, help="Listen port (default: 5678)"
+    )
+    stand_in_parser.add_argument(
+        "--latency",
+        type=str,
+        default="fixed:0",
+        help="Latency distribution in seconds: fixed:S, exponential:MEAN or lognormal:MU,SIGMA",
+    )
+    stand_in_parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500"
+    )
+    stand_in_parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="Fraction of connections dropped mid-request"
+    )
+    stand_in_parser.add_argument(
+        "--slow-start",
+        type=float,
+        default=0.0,
+        help="Seconds after start during which latency is inflated (default: 0)",
+    )
+    stand_in_parser.add_argument(
+        "--slow-start-factor",
+        type=float,
+        default=10.0,
+        help="Latency multiplier at start, decaying to 1 (default: 10)",
+    )
+    stand_in_parser.add_argument(
+        "--executions", type=int, default=1000, help="Executions served by the API (default: 1000)"
+    )
+    stand_in_parser.add_argument(
+        "--workflows", type=int, default=0, help="Workflows served by the API (default: 0)"
+    )
+    stand_in_parser.add_argument("--api-key", type=str, help="Require this X-N8N-API-KEY")
+    stand_in_parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+
+
+def _add_sidecar_parser(subparsers: Any) -> None:
+    """Add the ``sidecar`` command."""
+    sidecar_parser = subparsers.add_parser(
+        "sidecar", help="Refresh health in the background and serve it over a Unix socket"
+    )
+    sidecar_parser.add_argument(
+        "--socket", type=str, help="Socket path (default: HEALTH_SIDECAR_SOCKET)"
+    )
+    sidecar_parser.add_argument("--url", type=str, help="n8n base URL (default: from config)")
+    sidecar_parser.add_argument(
+        "--interval", type=float, default=5.0, help="Seconds between refreshes (default: 5)"
+    )
+    sidecar_parser.add_argument(
+        "--max-age",
+        type=float,
+        help="Report stale once the cached result is older than this (default: 3 intervals)",
+    )
+    sidecar_parser.add_argument(
+        "--timeout", type=int, default=10, help="Probe timeout in seconds (default: 10)"
+    )
+
+
+def _add_metrics_parser(subparsers: Any) -> None:
+    """Add the ``metrics`` command."""
+    metrics_parser = subparsers.add_parser(
+        "metrics", help="Scrape n8n's /metrics pages and report runtime health and rates"
+    )
+    metrics_parser.add_argument(
+        "urls", nargs="*", help="n8n base URLs (default: --fleet targets or from config)"
+    )
+    metrics_parser.add_argument(
+        "--fleet",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Scrape fleet targets from FILE (or HEALTH_FLEET_TARGETS if no file)",
+    )
+    metrics_parser.add_argument(
+        "--count", type=int, default=2, help="Scrape rounds; rates need 2 or more (default: 2)"
+    )
+    metrics_parser.add_argument(
+        "--interval", type=float, default=10.0, help="Seconds between rounds (default: 10)"
+    )
+    metrics_parser.add_argument(
+        "--concurrency", type=int, default=50, help="Maximum scrapes in flight (default: 50)"
+    )
+    metrics_parser.add_argument(
+        "--timeout", type=int, default=10, help="Scrape timeout in seconds (default: 10)"
+    )
+    metrics_parser.add_argument(
+        "--top", type=int, default=5, help="Counters listed per instance (default: 5)"
+    )
+    metrics_parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+
+
+async def health_command(args: argparse.Namespace) -> int:
+    """Execute health check command."""
+    if getattr(args, "fleet", None) is not None:
+        return await fleet_command(args)
+    if getattr(args, "samples", 0) or getattr(args, "merge", []):
+        return await sample_command(args)
+    if getattr(args, "watch", False):
+        return await watch_command(args)
+
+    from src.health_check import HealthChecker
+
+    print("🏥 Checking n8n health...")
+    print("=" * 60)
+
+    checker = HealthChecker(base_url=args.url, timeout=args.timeout)
+
+    try:
+        result = await checker.full_health_check()
+
+        print(f"\nOverall Status: {result['status'].upper()}")
+        print("\nChecks:")
+
+        for check_name, check_result in result["checks"].items():
+            status = check_result.get("status", "unknown")
+            emoji = "✅" if status == "healthy" else "❌" if status == "unhealthy" else "ℹ️"
+            print(f"  {emoji} {check_name}: {status}")
+            _print_check_details(check_result)
+
+        return 0 if result["status"] == "healthy" else 1
+
+    except Exception as e:
+        print(f"\n❌ Health check failed: {e}")
+        return 1
+
+
+def _add_db_parser(subparsers: Any) -> None:
+    """Add the ``db`` commands."""
+    db_parser = subparsers.add_parser("db", help="Inspect the n8n database")
+    db_subparsers = db_parser.add_subparsers(dest="db_command", help="Database commands")
+    report_parser = db_subparsers.add_parser(
+        "report", help="Table sizes, bloat, index usage and slowest statements"
+    )
+    report_parser.add_argument(
+        "--limit", type=int, default=10, help="Rows per ranked section (default: 10)"
+    )
+    report_parser.add_argument(
+        "--timeout", type=int, default=30, help="Query timeout in seconds (default: 30)"
+    )
+    report_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+
+def _add_prune_parser(subparsers: Any) -> None:
+    """Add the ``prune`` command."""
+    prune_parser = subparsers.add_parser(
+        "prune", help="Delete old executions in throttled batches"
+    )
+    prune_parser.add_argument(
+        "--older-than-hours",
+        type=float,
+        help="Prune executions stopped more than N hours ago (default: EXECUTIONS_DATA_MAX_AGE)",
+    )
+    prune_parser.add_argument(
+        "--dry-run", action="store_true", help="Only estimate the rows and bytes to delete"
+    )
+    prune_parser.add_argument(
+        "--sqlite",
+        type=str,
+        metavar="FILE",
+        help="Prune an n8n SQLite database instead of PostgreSQL",
+    )
+    prune_parser.add_argument(
+        "--batch-size", type=int, default=500, help="Initial rows per batch (default: 500)"
+    )
+    prune_parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="Batch latency the batch size adapts toward (default: 250)",
+    )
+    prune_parser.add_argument(
+        "--pause-ratio",
+        type=float,
+        default=1.0,
+        help="Pause after each batch as a multiple of its latency (default: 1.0)",
+    )
+    prune_parser.add_argument(
+        "--max-batches", type=int, help="Stop after N batches; rerun to resume"
+    )
+    prune_parser.add_argument(
+        "--state",
+        type=str,
+        default=".cache/prune-state.json",
+        help="Progress file for resuming (default: .cache/prune-state.json)",
+    )
+
+
+def _add_backup_parsers(subparsers: Any) -> None:
+    """Add the ``backup`` and ``restore`` commands."""
+    backup_parser = subparsers.add_parser(
+        "backup", help="Back up the database with parallel, compressed per-table COPY"
+    )
+    backup_parser.add_argument("directory", help="Directory to write the backup to")
+    backup_parser.add_argument(
+        "--tables", type=str, help="Comma-separated tables to back up (default: all)"
+    )
+    backup_parser.add_argument(
+        "--jobs", type=int, default=4, help="Tables copied in parallel (default: 4)"
+    )
+    backup_parser.add_argument(
+        "--level", type=int, default=6, help="Gzip compression level 1-9 (default: 6)"
+    )
+    backup_parser.add_argument(
+        "--timeout", type=int, default=30, help="Connect timeout in seconds (default: 30)"
+    )
+    restore_parser = subparsers.add_parser(
+        "restore", help="Restore tables from a backup in parallel, in foreign-key order"
+    )
+    restore_parser.add_argument("directory", help="Directory holding the backup")
+    restore_parser.add_argument(
+        "--tables", type=str, help="Comma-separated tables to restore (default: all)"
+    )
+    restore_parser.add_argument(
+        "--jobs", type=int, default=4, help="Tables restored in parallel (default: 4)"
+    )
+    restore_parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Truncate the restored tables, and the tables referencing them, first",
+    )
+    restore_parser.add_argument(
+        "--verify", action="store_true", help="Only check the backup files against the manifest"
+    )
+    restore_parser.add_argument(
+        "--timeout", type=int, default=30, help="Connect timeout in seconds (default: 30)"
+    )
+
+
+def _add_simulate_parser(subparsers: Any) -> None:
+    """Add the ``simulate`` command."""
+    simulate_parser = subparsers.add_parser(
+        "simulate", help="Compare regular and queue mode capacity by simulation"
+    )
+    simulate_parser.add_argument(
+        "--profile",
+        type=str,
+        default="3600:1",
+        help="Arrival profile as SECONDS:RATE_PER_SECOND,... (default: 3600:1)",
+    )
+    duration_source = simulate_parser.add_mutually_exclusive_group()
+    duration_source.add_argument(
+        "--duration",
+        type=str,
+        help="Duration distribution: fixed:S, exponential:MEAN or lognormal:MU,SIGMA",
+    )
+    duration_source.add_argument(
+        "--from-history",
+        action="store_true",
+        help="Fit a lognormal duration distribution from the execution cache",
+    )
+    simulate_parser.add_argument(
+        "--db", type=str, help="SQLite cache path for --from-history (default: EXECUTIONS_CACHE_DB)"
+    )
+    simulate_parser.add_argument("--workflow", type=str, help="Fit durations of one workflow only")
+    simulate_parser.add_argument(
+        "--workers",
+        type=str,
+        default="1,2,4,8",
+        help="Comma-separated queue mode worker counts to sweep (default: 1,2,4,8)",
+    )
+    simulate_parser.add_argument(
+        "--worker-concurrency",
+        type=int,
+        default=10,
+        help="Concurrent executions per worker (default: 10)",
+    )
+    simulate_parser.add_argument(
+        "--main-concurrency",
+        type=int,
+        default=10,
+        help="Concurrent executions in regular mode (default: 10)",
+    )
+    simulate_parser.add_argument(
+        "--queue-overhead-ms",
+        type=float,
+        default=5.0,
+        help="Redis dispatch latency per execution in queue mode (default: 5)",
+    )
+    simulate_parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    simulate_parser.add_argument(
+        "--processes", type=int, default=1, help="Processes to spread the sweep over (default: 1)"
+    )
+
+
+def _print_check_details(check: dict[str, Any]) -> None:
+    """Print the measurements reported by one check."""
+    if "error" in check:
+        print(f"     Error: {check['error']}")
+    if "response_time_ms" in check:
+        print(f"     Response time: {check['response_time_ms']:.2f}ms")
+    if "connect_time_ms" in check:
+        print(f"     Connection setup: {check['connect_time_ms']:.2f}ms")
+    if "phases_ms" in check:
+        print(f"     Phases: {_format_phases(check['phases_ms'])}")
+    if "query_time_ms" in check:
+        print(f"     Query time: {check['query_time_ms']:.2f}ms")
+    if "max_connections" in check:
+        print(
+            f"     Connections: {check['connections']}"
+            f"/{check['max_connections']}"
+            f", lock waits: {check['lock_waits']}"
+        )
+    if "waiting" in check:
+        print(
+            f"     Jobs: {check['waiting']} waiting"
+            f", {check['active']} active"
+            f", {check['delayed']} delayed"
+            f", {check['failed']} failed"
+        )
+        oldest = f"     Oldest waiting: {check['oldest_waiting_age_ms'] / 1000:.1f}s"
+        if check.get("processed_per_second") is not None:
+            oldest += f", processed: {check['processed_per_second']:.2f}/s"
+        print(oldest)
+    if check.get("event_loop_lag_ms") is not None:
+        print(f"     Event loop lag: {check['event_loop_lag_ms']:.2f}ms")
+    if check.get("heap_used_bytes") is not None:
+        heap = f"     Heap: {_mib(int(check['heap_used_bytes']))} used"
+        if check.get("heap_total_bytes") is not None:
+            heap += f", {_mib(int(check['heap_total_bytes']))} committed"
+        if check.get("heap_pressure") is not None:
+            heap += f" ({check['heap_pressure']:.0%} of {_mib(int(check['heap_limit_bytes']))})"
+        print(heap)
+
+
+async def watch_command(args: argparse.Namespace) -> int:
+    """Probe health repeatedly, reusing one pooled keep-alive connection."""
+    import asyncio
+
+    from src.health_check import HealthChecker
+
+    print(f"👀 Watching n8n health every {args.interval:g}s (Ctrl+C to stop)...")
+    print("=" * 60)
+
+    probes = 0
+    failures = 0
+    history = None
+    if not getattr(args, "no_history", True):
+        from src.history import ProbeHistory
+
+        history = ProbeHistory(args.history_file or Config.HEALTH_HISTORY_FILE)
+        print(f"  • Recording probes to {history.path}")
+    resources = _start_resource_watch(getattr(args, "cgroup_interval", 0))
+
+    try:
+        async with HealthChecker(base_url=args.url, timeout=args.timeout) as checker:
+            while True:
+                result = await checker.full_health_check()
+                n8n = result["checks"]["n8n"]
+                probes += 1
+                if history is not None:
+                    history.append(time.time(), result)
+                failures += result["status"] != "healthy"
+
+                line = _watch_line(result)
+                if resources is not None:
+                    line += f"  {_format_resources(resources.observe(n8n.get('latency_ms')))}"
+                print(line)
+
+                if args.count and probes >= args.count:
+                    break
+                await asyncio.sleep(args.interval)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n👋 Stopped watching")
+    finally:
+        if history is not None:
+            history.close()
+        print(f"\n{probes} probes, {failures} unhealthy")
+        if resources is not None:
+            await resources.stop()
+            correlations = resources.correlations()
+            if correlations:
+                print(f"Latency correlation: {_format_correlations(correlations)}")
+    return 0 if failures == 0 else 1
+
+
+def _watch_line(result: dict[str, Any]) -> str:
+    """Format one watch mode probe result."""
+    n8n = result["checks"]["n8n"]
+    timestamp = time.strftime("%H:%M:%S")
+    emoji = "✅" if result["status"] == "healthy" else "❌"
+    line = f"[{timestamp}] {emoji} {result['status']}"
+
+    if "error" in n8n:
+        line += f"  error={n8n['error']}"
+        if "retry_in_ms" in n8n:
+            line += f" (retry in {n8n['retry_in_ms'] / 1000:.1f}s)"
+    else:
+        line += f"  latency={n8n.get('latency_ms', 0.0):.2f}ms"
+        if "phases_ms" in n8n:
+            line += f"  ttfb={n8n['phases_ms']['ttfb']:.2f}ms"
+        line += f"  timeout={n8n.get('timeout_ms', 0.0) / 1000:.2f}s"
+        if n8n.get("connection_reused"):
+            line += "  (reused connection)"
+        else:
+            line += f"  connect={n8n.get('connect_time_ms', 0.0):.2f}ms"
+
+    queue = result["checks"].get("queue", {})
+    if "waiting" in queue:
+        line += (
+            f"  queue={queue['waiting']} waiting"
+            f" ({queue['oldest_waiting_age_ms'] / 1000:.1f}s lag)"
+        )
+    runtime = result["checks"].get("runtime", {})
+    if runtime.get("event_loop_lag_ms") is not None:
+        line += f"  loop_lag={runtime['event_loop_lag_ms']:.1f}ms"
+    if runtime.get("heap_pressure") is not None:
+        line += f"  heap={runtime['heap_pressure']:.0%}"
+    return line
+
+
+def _start_resource_watch(interval: float) -> Any:
+    """Start sampling n8n's cgroup every ``interval`` seconds, if it is known and readable."""
+    if interval <= 0:
+        return None
+
+    from src.cgroup import CgroupSampler, ResourceWatch, find_cgroup
+
+    if find_cgroup() is None:
+        print("  ⚠️  Not sampling resources: set HEALTH_CGROUP_PATH or HEALTH_CGROUP_PID to n8n's")
+        return None
+    sampler = CgroupSampler()
+    if not sampler.available:
+        sampler.close()
+        return None
+    resources = ResourceWatch(sampler, interval)
+    resources.start()
+    print(f"  • Sampling cgroup {sampler.path} every {interval:g}s")
+    return resources
+
+
+def _format_correlations(correlations: dict[str, float]) -> str:
+    return "  ".join(f"{name}={value:+.2f}" for name, value in correlations.items())
+
+
+def _format_resources(usage: dict[str, Any]) -> str:
+    """Format one cgroup window as ``key=value`` pairs, skipping values not reported."""
+    parts = []
+    if usage["cpu_cores"] is not None:
+        parts.append(f"cpu={usage['cpu_cores']:.2f}")
+    if usage["throttled_ratio"] is not None:
+        parts.append(f"throttled={usage['throttled_ratio']:.1%}")
+    if usage["memory_bytes"] is not None:
+        parts.append(f"mem={_mib(int(usage['memory_bytes']))}")
+    if usage["memory_headroom_bytes"] is not None:
+        parts.append(f"headroom={_mib(int(usage['memory_headroom_bytes']))}")
+    for name, ratio in usage["pressure"].items():
+        if name.endswith("_some") and ratio:
+            parts.append(f"psi.{name[:-5]}={ratio:.1%}")
+    if usage["oom_kills"]:
+        parts.append(f"oom_kills={usage['oom_kills']:g}")
+    return " ".join(parts)
+
+
+def _format_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}ms"
+
+
+def _format_phases(phases_ms: dict[str, float]) -> str:
+    return " ".join(f"{phase}={value:.2f}ms" for phase, value in phases_ms.items())
+
+
+def health_history_command(args: argparse.Namespace) -> int:
+    """Summarize recorded probes over a time range, reading only the records it covers."""
+    from src.history import ProbeHistory, pick_resolution, summarize
+
+    path = Path(args.file or Config.HEALTH_HISTORY_FILE)
+    if not path.exists():
+        print(f"❌ No probe history at {path} (record some with: health --watch)")
+        return 1
+
+    end_ms = int(time.time() * 1000) + 1
+    start_ms = _since_ms(args.since_hours)
+    resolution = args.resolution
+    if resolution == "auto":
+        resolution = pick_resolution(end_ms - start_ms)
+    with ProbeHistory(path) as history:
+        records = history.records(resolution, start_ms, end_ms)
+        outages = history.outages(start_ms, end_ms)
+    summary = summarize(records, resolution)
+
+    if args.json:
+        report = {"resolution": resolution, "summary": summary, "outages": outages}
+        print(json.dumps({**report, "records": records}))
+        return 0
+
+    print(f"📈 Probe history for the last {args.since_hours:g}h ({resolution} records)")
+    print("=" * 60)
+    if not summary["probes"]:
+        print("  No probes recorded in this range")
+        return 0
+    print(
+        f"  • {summary['probes']} probes, availability {summary['availability']:.2%}, "
+        f"latency mean {_format_ms(summary['latency_mean_ms'])}, "
+        f"max {_format_ms(summary['latency_max_ms'])}"
+    )
+    if summary["phases_ms"]:
+        print(f"  • Mean phases: {_format_phases(summary['phases_ms'])}")
+
+    def stamp(timestamp_ms: int) -> str:
+        return datetime.fromtimestamp(timestamp_ms / 1000, UTC).strftime("%Y-%m-%d %H:%M:%S")
+
+    if outages:
+        print(f"\n🚨 {len(outages)} outages:")
+        for outage in outages[-args.limit :]:
+            seconds = (outage["end_ms"] - outage["start_ms"]) / 1000
+            print(f"  {stamp(outage['start_ms'])}  {outage['probes']} probes over {seconds:.0f}s")
+
+    print()
+    for record in records[-args.limit :]:
+        if resolution == "raw":
+            emoji = "✅" if record["healthy"] else "❌"
+            print(
+                f"  {stamp(record['timestamp_ms'])} {emoji} "
+                f"latency={_format_ms(record['latency_ms'])} db={_format_ms(record['db_ms'])}"
+            )
+        else:
+            print(
+                f"  {stamp(record['timestamp_ms'])} {record['probes']:>5} probes "
+                f"{record['availability']:>8.2%} up  mean={_format_ms(record['latency_mean_ms'])}"
+                f"  max={_format_ms(record['latency_max_ms'])}"
+            )
+    return 0
+
+
+async def fleet_command(args: argparse.Namespace) -> int:
+    """Probe many n8n instances concurrently and summarize the results.
+
+    With ``--watch`` the fleet is probed in rounds; per-target adaptive
+    timeouts and circuit breakers carry over between rounds, and only
+    unhealthy targets are listed.
+    """
+    import asyncio
+
+    from src.fleet import load_targets, probe_fleet, summarize
+
+    targets = load_targets(args.fleet or None)
+    if not targets:
+        print("❌ No fleet targets found (pass a file or set HEALTH_FLEET_TARGETS)")
+        return 1
+
+    watch = getattr(args, "watch", False)
+    print(f"🛰️  Probing {len(targets)} n8n instances (concurrency {args.concurrency})...")
+    print("=" * 60)
+
+    timeouts: dict[str, Any] = {}
+    breakers: dict[str, Any] = {}
+    rounds = 0
+    unhealthy_rounds = 0
+
+    while True:
+        results = []
+        start = time.perf_counter()
+
+        async for result in probe_fleet(
+            targets,
+            concurrency=args.concurrency,
+            deadline=args.deadline,
+            timeout=args.timeout,
+            timeouts=timeouts,
+            breakers=breakers,
+        ):
+            results.append(result)
+            if watch and result["status"] == "healthy":
+                continue
+            emoji = "✅" if result["status"] == "healthy" else "❌"
+            line = f"  {emoji} {result['url']}  {result['duration_ms']:.2f}ms"
+            error = result.get("error") or result.get("checks", {}).get("n8n", {}).get("error")
+            if error:
+                line += f"  error={error}"
+            print(line)
+
+        summary = summarize(results, (time.perf_counter() - start) * 1000)
+        rounds += 1
+        unhealthy_rounds += summary["unhealthy"] > 0
+
+        if not watch:
+            break
+        print(
+            f"[{time.strftime('%H:%M:%S')}] {summary['healthy']}/{summary['total']} healthy"
+            f"  wall={summary['wall_time_ms']:.2f}ms"
+            f"  open circuits={summary['open_circuits']}"
+        )
+        if args.count and rounds >= args.count:
+            return 0 if unhealthy_rounds == 0 else 1
+        await asyncio.sleep(args.interval)
+
+    print("\nSummary:")
+    print(f"  • Healthy: {summary['healthy']}/{summary['total']}")
+    print(f"  • Wall time: {summary['wall_time_ms']:.2f}ms")
+    print(f"  • p50 probe: {summary['p50_ms']:.2f}ms")
+    if summary["phase_p50_ms"]:
+        print(f"  • p50 phases: {_format_phases(summary['phase_p50_ms'])}")
+    print(f"  • Slowest: {summary['slowest']} ({summary['max_ms']:.2f}ms)")
+    if summary["open_circuits"]:
+        print(f"  • Open circuits: {summary['open_circuits']}")
+
+    return 0 if summary["unhealthy"] == 0 else 1
+
+
+def _phase_path(path: str, phase: str) -> Path:
+    """Return the file holding the ``phase`` histogram exported alongside ``path``."""
+    return Path(path).with_suffix(f".{phase}.json")
+
+
+async def metrics_command(args: argparse.Namespace) -> int:
+    """Scrape n8n /metrics pages concurrently and report event loop lag, heap and rates.
+
+    Each round streams every page once; counter rates are computed between
+    the last two rounds.
+    """
+    import asyncio
+
+    import httpx
+
+    from src.fleet import load_targets
+    from src.n8n_metrics import MetricsScraper, assess
+
+    if args.urls:
+        targets = args.urls
+    elif args.fleet is not None:
+        targets = load_targets(args.fleet or None)
+    else:
+        targets = [f"http://localhost:{Config.N8N_PORT}"]
+    if not targets:
+        print("❌ No targets found (pass URLs, a fleet file or set HEALTH_FLEET_TARGETS)")
+        return 1
+
+    rounds = max(args.count, 1)
+    if not args.json:
+        print(f"📡 Scraping {len(targets)} instances, {rounds} rounds {args.interval:g}s apart")
+        print("=" * 60)
+
+    scraper = MetricsScraper(concurrency=args.concurrency)
+    urls = [f"{target.rstrip('/')}/metrics" for target in targets]
+    limits = httpx.Limits(max_connections=max(args.concurrency, 1))
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for round_number in range(rounds):
+            if round_number:
+                await asyncio.sleep(args.interval)
+            reports = await scraper.scrape_all(client, urls)
+
+    failing = 0
+    for report in reports:
+        report["reasons"] = [report["error"]] if "error" in report else assess(report)
+        failing += bool(report["reasons"])
+    if args.json:
+        print(json.dumps(reports))
+        return 0 if failing == 0 else 1
+
+    for report in reports:
+        emoji = "❌" if report["reasons"] else "✅"
+        print(f"\n{emoji} {report['url']}")
+        for reason in report["reasons"]:
+            print(f"     {reason}")
+        if "error" in report:
+            continue
+        _print_check_details(report)
+        top = sorted(report.get("rates", {}).items(), key=lambda item: -item[1])
+        for name, rate in top[: args.top]:
+            print(f"     {name}: {rate:.2f}/s")
+
+    print(f"\n{len(reports) - failing}/{len(reports)} instances healthy")
+    return 0 if failing == 0 else 1
+
+
+async def sample_command(args: argparse.Namespace) -> int:
+    """Sample request latency and report percentiles from a histogram.
+
+    Each request is also broken down by phase; per-phase histograms are
+    exported and merged through sibling ``<name>.<phase>.json`` files.
+    """
+    from src.health_check import PHASES, HealthChecker
+    from src.histogram import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    phases: dict[str, LatencyHistogram] = {}
+    errors = 0
+
+    if args.samples:
+        print(
+            f"📊 Sampling {args.samples} requests to {args.path} "
+            f"(concurrency {args.concurrency})..."
+        )
+        print("=" * 60)
+
+        checker = HealthChecker(
+            base_url=args.url, timeout=args.timeout, pool_size=args.concurrency
+        )
+        histogram, errors = await checker.sample_latency(
+            args.samples,
+            concurrency=args.concurrency,
+            path=args.path,
+            histogram=histogram,
+            phases=phases,
+        )
+
+    for path in args.merge:
+        histogram.merge(LatencyHistogram.load(path))
+        for phase in PHASES:
+            if _phase_path(path, phase).exists():
+                loaded = LatencyHistogram.load(_phase_path(path, phase))
+                phases.setdefault(phase, LatencyHistogram()).merge(loaded)
+
+    summary = histogram.summary()
+    print(f"\nRequests: {histogram.total}  Errors: {errors}")
+    print(
+        f"  p50={summary['p50']:.2f}ms  p90={summary['p90']:.2f}ms  "
+        f"p99={summary['p99']:.2f}ms  p99.9={summary['p99.9']:.2f}ms  "
+        f"max={summary['max']:.2f}ms"
+    )
+
+    print("\nPercentile distribution:")
+    for percentile, latency in histogram.distribution():
+        print(f"  {percentile:>7g}%  {latency:>10.2f}ms")
+
+    if phases:
+        print(f"\n{'Phase':<12} {'count':>7} {'p50':>10} {'p99':>10} {'max':>10}")
+        for phase in PHASES:
+            if phase in phases:
+                summary = phases[phase].summary()
+                print(
+                    f"{phase:<12} {phases[phase].total:>7} {summary['p50']:>8.2f}ms "
+                    f"{summary['p99']:>8.2f}ms {summary['max']:>8.2f}ms"
+                )
+
+    if args.export:
+        histogram.save(args.export)
+        for phase, phase_histogram in phases.items():
+            phase_histogram.save(_phase_path(args.export, phase))
+        print(f"\n💾 Histogram written to {args.export}")
+
+    return 0 if errors == 0 else 1
+
+
+async def exporter_command(args: argparse.Namespace) -> int:
+    """Run the Prometheus exporter until interrupted."""
+    from src.exporter import MetricsExporter
+    from src.health_check import HealthChecker
+
+    checker = HealthChecker(base_url=args.url, timeout=args.timeout)
+    exporter = MetricsExporter(checker, ttl=args.ttl)
+
+    server = await exporter.start(args.host, args.port)
+    print(f"📈 Serving metrics on http://{args.host}:{args.port}/metrics (TTL {args.ttl:g}s)")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await exporter.stop()
+
+    return 0
+
+
+async def bench_webhook_command(args: argparse.Namespace) -> int:
+    """Run an open-loop webhook load test over a ramp of request rates."""
+    from src.bench import load_payload, run_ramp, webhook_url
+
+    url = args.url or webhook_url(args.path)
+    payload = load_payload(args.payload)
+
+    print(f"🚀 Benchmarking {args.method} {url}")
+    print(f"   Ramp: {', '.join(f'{r:g}' for r in args.rates)} req/s, {args.duration:g}s per step")
+    print("=" * 60)
+
+    results = await run_ramp(
+        url,
+        args.rates,
+        args.duration,
+        payload=payload,
+        method=args.method,
+        timeout=args.timeout,
+        max_inflight=args.max_inflight,
+    )
 
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    print(
+        f"\n{'target':>8} {'achieved':>9} {'errors':>7} "
+        f"{'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"
+    )
+    for step in results:
+        latency = step["latency"]
+        print(
+            f"{step['target_rps']:>8g} {step['achieved_rps']:>9.1f} "
+            f"{step['error_rate']:>6.1%} "
+            f"{latency['p50']:>7.1f}ms {latency['p90']:>7.1f}ms "
+            f"{latency['p99']:>7.1f}ms {latency['max']:>7.1f}ms"
+        )
 
-    # Health check command
-    health_parser = subparsers.add_parser("health", help="Check n8n health status")
-    health_parser.add_argument(
-        "--url", type=str, help="n8n base URL (default: from config)"
+    print("\nLatency is measured from each request's scheduled start (coordinated-omission corrected).")
+    return 0
+
+
+async def bench_regress_command(args: argparse.Namespace) -> int:
+    """Run the regression suite and compare it to, or record it as, the baseline."""
+    from src.regression import compare, load_baseline, run_suite, save_baseline
+
+    baseline_path = Path(args.baseline)
+    print(f"📏 Running regression suite ({args.runs} samples per benchmark)...")
+    print("=" * 60)
+
+    results = await run_suite(args.only, runs=args.runs)
+    if args.update_baseline:
+        save_baseline(results, baseline_path)
+        print(f"\n✅ Recorded {len(results)} benchmarks in {baseline_path}")
+        return 0
+
+    rows = compare(
+        load_baseline(baseline_path), results, alpha=args.alpha, min_effect=args.min_effect
     )
-    health_parser.add_argument(
-        "--timeout", type=int, default=10, help="Timeout in seconds (default: 10)"
+    icons = {"ok": "✅", "improvement": "🚀", "regression": "❌", "new": "🆕"}
+    print(f"\n{'benchmark':<22} {'baseline':>10} {'current':>10} {'change':>8} {'p':>8}")
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{icons['new']} {row['name']:<20} {'-':>10} {row['current_ms']:>8.2f}ms")
+            continue
+        print(
+            f"{icons[row['status']]} {row['name']:<20} {row['baseline_ms']:>8.2f}ms "
+            f"{row['current_ms']:>8.2f}ms {row['change']:>+7.1%} {row['p_value']:>8.4f}"
+        )
+
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n❌ Significant regressions: {', '.join(regressions)}")
+        return 1
+
+    print("\n✅ No significant regressions")
+    return 0
+
+
+def _since_ms(hours: float | None) -> int:
+    """Convert a look-back in hours to an epoch-milliseconds lower bound."""
+    if hours is None:
+        return 0
+    return int((time.time() - hours * 3600) * 1000)
+
+
+async def executions_sync_command(args: argparse.Namespace) -> int:
+    """Sync execution history into the local SQLite cache."""
+    import httpx
+
+    from src.executions import ExecutionStore, sync_executions
+
+    base_url = args.url or f"http://localhost:{Config.N8N_PORT}"
+    store = ExecutionStore(args.db)
+
+    print(f"🔄 Syncing executions from {base_url}...")
+    print("=" * 60)
+
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout) as client:
+            result = await sync_executions(
+                store, client, base_url, api_key=args.api_key, page_size=args.page_size
+            )
+    except httpx.HTTPError as e:
+        print(f"\n❌ Sync failed: {e}")
+        return 1
+    finally:
+        store.close()
+
+    print(f"\n✅ Synced {result['synced']} executions over {result['pages']} pages")
+    print(f"  • High-water mark: {result['watermark'] or 'none'}")
+    return 0
+
+
+def executions_stats_command(args: argparse.Namespace) -> int:
+    """Print per-workflow execution statistics from the local cache."""
+    from src.executions import ExecutionStore
+
+    store = ExecutionStore(args.db)
+    try:
+        stats = store.workflow_stats(_since_ms(args.since_hours))
+    finally:
+        store.close()
+
+    print(
+        f"{'workflow':<20} {'runs':>7} {'failed':>7} "
+        f"{'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}"
     )
+    for row in stats:
+        durations = [row[k] for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms")]
+        print(
+            f"{row['workflow_id']:<20} {row['executions']:>7} {row['failure_rate']:>6.1%} "
+            + " ".join(f"{d:>8}ms" if d is not None else f"{'-':>10}" for d in durations)
+        )
+    return 0
 
-    # Config validation command
-    subparsers.add_parser("validate", help="Validate configuration")
 
-    # Environment info command
-    subparsers.add_parser("info", help="Display environment information")
+def executions_throughput_command(args: argparse.Namespace) -> int:
+    """Print execution throughput per time bucket from the local cache."""
+    from src.executions import ExecutionStore
 
-    # Test command
-    test_parser = subparsers.add_parser("test", help="Run tests")
-    test_parser.add_argument(
-        "--unit", action="store_true", help="Run only unit tests"
+    store = ExecutionStore(args.db)
+    try:
+        buckets = store.throughput(args.bucket, _since_ms(args.since_hours))
+    finally:
+        store.close()
+
+    print(f"{'bucket start (UTC)':<22} {'runs':>7} {'failed':>7} {'per sec':>9}")
+    for row in buckets:
+        start = datetime.fromtimestamp(row["bucket_start_ms"] / 1000, UTC)
+        print(
+            f"{start:%Y-%m-%d %H:%M:%S}    {row['executions']:>7} {row['failures']:>7} "
+            f"{row['executions'] / args.bucket:>9.3f}"
+        )
+    return 0
+
+
+def workflows_analyze_command(args: argparse.Namespace) -> int:
+    """Analyze exported workflows and print a ranked report."""
+    from src.workflow_analyzer import analyze_bulk, find_workflow_files, top_ranked
+
+    files = find_workflow_files(args.paths)
+    if not files:
+        print("❌ No workflow files found")
+        return 1
+
+    if not args.json:
+        print(f"🔬 Analyzing {len(files)} workflow files...")
+        print("=" * 60)
+
+    analyzed = 0
+    errors = 0
+
+    def stream() -> Iterator[dict[str, Any]]:
+        nonlocal analyzed, errors
+        for result in analyze_bulk(files, workers=args.workers):
+            analyzed += 1
+            errors += "error" in result
+            if args.json:
+                print(json.dumps(result))
+            elif "error" in result:
+                print(f"  ❌ {result['file']}: {result['error']}")
+            elif result["findings"]:
+                print(
+                    f"  ⚠️  {result['name']} ({result['file']}): "
+                    f"{len(result['findings'])} findings, score {result['score']}"
+                )
+            yield result
+
+    ranked = top_ranked(stream(), args.top)
+    if args.json:
+        return 0 if errors == 0 else 1
+
+    print(f"\n📋 Top {len(ranked)} of {analyzed} workflows by score:")
+    for result in ranked:
+        if "error" in result:
+            continue
+        print(f"\n  {result['name']} [{result['file']}] score {result['score']}")
+        print(
+            f"     nodes {result['nodes']}, critical path {len(result['critical_path'])} nodes "
+            f"(cost {result['critical_path_cost']}), fan-out {result['max_fan_out']}, "
+            f"fan-in {result['max_fan_in']}, parallel width {result['max_parallel_width']}"
+        )
+        for finding in result["findings"]:
+            print(f"     • [{finding['severity']}] {finding['pattern']}: {finding['detail']}")
+
+    return 0 if errors == 0 else 1
+
+
+async def workflows_export_command(args: argparse.Namespace) -> int:
+    """Export workflows, rewriting only files whose content changed."""
+    import httpx
+
+    from src.workflow_sync import export_workflows
+
+    base_url = args.url or f"http://localhost:{Config.N8N_PORT}"
+    print(f"📤 Exporting workflows from {base_url} to {args.directory}...")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout) as client:
+            result = await export_workflows(
+                client,
+                Path(args.directory),
+                base_url,
+                api_key=args.api_key,
+                page_size=args.page_size,
+                prune=args.prune,
+            )
+    except httpx.HTTPError as e:
+        print(f"\n❌ Export failed: {e}")
+        return 1
+
+    print(
+        f"\n✅ {result['written']} changed, {result['unchanged']} unchanged of {result['total']} "
+        f"workflows ({result['pages']} pages, {time.perf_counter() - start:.1f}s)"
     )
-    test_parser.add_argument(
-        "--integration", action="store_true", help="Run only integration tests"
+    if result["removed"]:
+        action = "Deleted" if args.prune else "Removed upstream (use --prune to delete)"
+        print(f"  • {action}: {', '.join(result['removed'])}")
+    return 0
+
+
+async def workflows_import_command(args: argparse.Namespace) -> int:
+    """Import exported workflows, pushing only those that differ from the target."""
+    import httpx
+
+    from src.workflow_sync import import_workflows
+
+    base_url = args.url or f"http://localhost:{Config.N8N_PORT}"
+    if not Path(args.directory).is_dir():
+        print(f"❌ Directory not found: {args.directory}")
+        return 1
+
+    print(f"📥 Importing workflows from {args.directory} to {base_url}...")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    try:
+        limits = httpx.Limits(max_connections=max(args.concurrency, 1))
+        async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+            result = await import_workflows(
+                client,
+                Path(args.directory),
+                base_url,
+                api_key=args.api_key,
+                concurrency=args.concurrency,
+                dry_run=args.dry_run,
+            )
+    except httpx.HTTPError as e:
+        print(f"\n❌ Import failed: {e}")
+        return 1
+
+    verb = "Would push" if args.dry_run else "Pushed"
+    failed = f", {len(result['failed'])} failed" if result["failed"] else ""
+    print(
+        f"\n{verb} {result['created']} new and {result['updated']} changed workflows, "
+        f"{result['unchanged']} unchanged{failed} ({time.perf_counter() - start:.1f}s)"
     )
-    test_parser.add_argument(
-        "--coverage", action="store_true", help="Generate coverage report"
+    for failure in result["failed"]:
+        print(f"  ❌ {failure['name']}: {failure['error']}")
+    return 1 if result["failed"] else 0
+
+
+def _print_log_report(report: dict[str, Any]) -> None:
+    """Print a log analysis report."""
+    levels = report["levels"]
+    print(
+        f"\n📜 {report['lines']} lines ({_mib(report['bytes'])}), "
+        f"{levels.get('error', 0)} errors, {levels.get('warn', 0)} warnings, "
+        f"{report['unparsed']} unparsed"
     )
+    if report["workflows"]:
+        print(
+            f"\n{'workflow':<20} {'runs':>6} {'failed':>7} {'errors':>7} {'warns':>6} "
+            f"{'total':>9} {'p50':>9} {'p99':>9} {'max':>9}"
+        )
+    for row in report["workflows"]:
+        print(
+            f"{row['workflow_id'][:20]:<20} {row['finished']:>6} {row['failure_rate']:>6.1%} "
+            f"{row['errors']:>7} {row['warnings']:>6} {row['total_s']:>8.1f}s "
+            f"{row['p50_ms']:>7.0f}ms {row['p99_ms']:>7.0f}ms {row['max_ms']:>7.0f}ms"
+        )
+    if report["slowest"]:
+        print("\n🐢 Slowest executions:")
+        for run in report["slowest"]:
+            print(
+                f"  • {run['execution_id']} (workflow {run['workflow_id']}): "
+                f"{run['duration_ms']:.0f}ms"
+            )
+    if report["in_flight"] or report["unmatched"]:
+        print(
+            f"\n  {report['in_flight']} executions still running, "
+            f"{report['unmatched']} start/finish lines unmatched"
+        )
 
-    # Lint command
-    lint_parser = subparsers.add_parser("lint", help="Run linter")
-    lint_parser.add_argument("--fix", action="store_true", help="Auto-fix issues")
 
-    # Format command
-    subparsers.add_parser("format", help="Format code")
+def logs_analyze_command(args: argparse.Namespace) -> int:
+    """Analyze n8n log files, optionally following the last one."""
+    from src.log_analyzer import LogAnalyzer, analyze_file, follow
 
-    return parser
+    paths = args.paths or ([Config.N8N_LOG_FILE_LOCATION] if Config.N8N_LOG_FILE_LOCATION else [])
+    missing = [path for path in paths if not Path(path).is_file()]
+    if not paths or missing:
+        print(f"❌ Log file not found: {', '.join(missing) or 'set N8N_LOG_FILE_LOCATION'}")
+        return 1
 
+    if not args.json:
+        print(f"📜 Analyzing {len(paths)} log file(s)...")
+        print("=" * 60)
 
-async def health_command(args: argparse.Namespace) -> int:
-    """Execute health check command."""
-    print("🏥 Checking n8n health...")
+    def show() -> None:
+        report = analyzer.report(args.top)
+        if args.json:
+            print(json.dumps(report), flush=True)
+        else:
+            _print_log_report(report)
+
+    analyzer = LogAnalyzer()
+    position = 0
+    for path in paths:
+        analyzed = analyze_file(path, args.workers, partial=not args.follow)
+        position = analyzed.bytes_read
+        analyzer.merge(analyzed)
+    show()
+    if not args.follow:
+        return 0
+
+    polls = args.count or None
+    try:
+        for lines in follow(paths[-1], analyzer, position, interval=args.interval, polls=polls):
+            if lines:
+                show()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped following")
+
+    return 0
+
+
+async def _execution_ids(sqlite_path: str | None) -> set[str]:
+    """Load every execution ID from n8n's database."""
+    if sqlite_path:
+        import sqlite3
+
+        from src.binary_data import sqlite_execution_ids
+
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            return sqlite_execution_ids(conn)
+        finally:
+            conn.close()
+
+    import asyncpg
+
+    from src.binary_data import postgres_execution_ids
+    from src.database import connection_kwargs
+
+    pool = await asyncpg.create_pool(**connection_kwargs(), min_size=1, max_size=1)
+    try:
+        return await postgres_execution_ids(pool)
+    finally:
+        await pool.close()
+
+
+def _print_binary_data_report(report: dict[str, Any], dry_run: bool) -> None:
+    """Print a binary data scan report."""
+    print(
+        f"\n📦 {report['files']} files, {_mib(report['bytes'])} "
+        f"({_mib(report['disk_bytes'])} on disk)"
+    )
+    print(f"  • Hashed {report['hashed']} files, {report['cached']} digests reused from the index")
+    print("\n🏷️  Largest workflows:")
+    for row in report["workflows"]:
+        print(f"  • {row['workflow_id']}: {_mib(row['bytes'])} in {row['files']} files")
+    print("\n🏷️  Largest executions:")
+    for row in report["executions"]:
+        print(
+            f"  • {row['execution_id']} (workflow {row['workflow_id']}): "
+            f"{_mib(row['bytes'])} in {row['files']} files"
+        )
+    print(
+        f"\n♻️  {report['duplicate_groups']} duplicate groups, "
+        f"{_mib(report['reclaimable_bytes'])} reclaimable"
+    )
+    for group in report["duplicates"]:
+        print(f"  • {group['copies']} x {_mib(group['size'])} {group['digest'][:12]}")
+        for path in group["paths"][:3]:
+            print(f"      {path}")
+
+    verb = "Would free" if dry_run else "Freed"
+    if "hardlinked" in report:
+        hardlinked = report["hardlinked"]
+        print(f"\n🔗 {verb} {_mib(hardlinked['bytes'])} by hardlinking {hardlinked['files']} files")
+    if "orphans" in report:
+        orphans = report["orphans"]
+        print(f"\n👻 {orphans['files']} orphaned files ({_mib(orphans['bytes'])})")
+        if "removed_bytes" in orphans:
+            print(f"  • {verb} {_mib(orphans['removed_bytes'])} by removing them")
+
+
+async def binary_data_scan_command(args: argparse.Namespace) -> int:
+    """Report binary data usage and duplicates, optionally deduplicating and cleaning up."""
+    from src.binary_data import (
+        HashIndex,
+        find_orphans,
+        hardlink_duplicates,
+        remove_orphans,
+        scan,
+        storage_path,
+    )
+
+    root = Path(args.path) if args.path else storage_path()
+    if not root.is_dir():
+        print(f"❌ Binary data directory not found: {root}")
+        return 1
+
+    if not args.json:
+        print(f"🗂️  Scanning {root}...")
+        print("=" * 60)
+
+    index = None if args.no_index else HashIndex(args.index)
+    try:
+        result = scan(root, index, workers=args.workers)
+        report = result.report(args.top)
+
+        if args.hardlink:
+            linked, freed = hardlink_duplicates(result.duplicate_groups(), dry_run=args.dry_run)
+            report["hardlinked"] = {"files": linked, "bytes": freed}
+            if index is not None and not args.dry_run:
+                index.replace(result.files)
+
+        if args.orphans or args.remove_orphans:
+            orphans = find_orphans(result.files, await _execution_ids(args.sqlite))
+            report["orphans"] = {"files": len(orphans), "bytes": sum(f.size for f in orphans)}
+            if args.remove_orphans:
+                report["orphans"]["removed_bytes"] = remove_orphans(
+                    root, orphans, dry_run=args.dry_run
+                )
+    finally:
+        if index is not None:
+            index.close()
+
+    if args.json:
+        print(json.dumps(report))
+        return 0
+
+    _print_binary_data_report(report, args.dry_run)
+    return 0
+
+
+async def stand_in_command(args: argparse.Namespace) -> int:
+    """Serve a scriptable n8n stand-in until interrupted."""
+    from src.stand_in import Behaviour, StandInServer
+
+    server = StandInServer(
+        default=Behaviour(args.latency, args.error_rate, args.drop_rate),
+        slow_start=args.slow_start,
+        slow_start_factor=args.slow_start_factor,
+        executions=args.executions,
+        workflows=args.workflows,
+        api_key=args.api_key,
+        seed=args.seed,
+    )
+    listener = await server.start(args.host, args.port)
+
+    print(f"🧪 n8n stand-in listening on {server.url}")
+    print(f"  • Latency: {args.latency}")
+    print(f"  • Error rate: {args.error_rate:.1%}, drop rate: {args.drop_rate:.1%}")
+    if args.slow_start:
+        print(f"  • Slow start: {args.slow_start:g}s at {args.slow_start_factor:g}x")
+
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+        print(
+            f"\n{sum(server.requests.values())} requests, {server.errors} errors,"
+            f" {server.drops} drops"
+        )
+
+    return 0
+
+
+async def sidecar_command(args: argparse.Namespace) -> int:
+    """Serve cached health results to healthcheck.py until interrupted."""
+    import asyncio
+
+    from src.health_check import HealthChecker
+    from src.sidecar import HealthSidecar
+
+    socket_path = args.socket or Config.HEALTH_SIDECAR_SOCKET
+    async with HealthChecker(base_url=args.url, timeout=args.timeout) as checker:
+        sidecar = HealthSidecar(checker, socket_path, args.interval, args.max_age)
+        await sidecar.start()
+        print(f"🩺 Health sidecar on {socket_path}, refreshing every {args.interval:g}s")
+        print(f"  • Query with: python3 -S healthcheck.py --socket {socket_path}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await sidecar.stop()
+            print(f"\n{sidecar.refreshes} refreshes, {sidecar.queries} queries")
+
+    return 0
+
+
+def _mib(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MiB"
+
+
+async def db_report_command(args: argparse.Namespace) -> int:
+    """Print the tables and indexes costing the most I/O."""
+    from src.db_report import database_report
+
+    report = await database_report(limit=args.limit, timeout=args.timeout)
+    if args.json:
+        print(json.dumps(report, default=str))
+        return 0 if report["status"] == "healthy" else 1
+
+    print(f"🗄️  Database report ({Config.DB_POSTGRESDB_DATABASE})")
     print("=" * 60)
 
-    checker = HealthChecker(base_url=args.url, timeout=args.timeout)
+    if report["status"] != "healthy":
+        print(f"\n❌ Report failed: {report['error']}")
+        return 1
+
+    print(f"  • Schema {report['schema']}: {_mib(report['total_bytes'])}")
+
+    print("\n📋 Tables by blocks touched:")
+    print(
+        f"  {'table':<28} {'total':>11} {'blocks':>12} {'hit':>6} {'dead':>6} {'seq':>6}"
+    )
+    for table in report["tables"]:
+        print(
+            f"  {table['name']:<28} {_mib(table['total_bytes']):>11} {table['io_blocks']:>12} "
+            f"{table['cache_hit_ratio']:>6.1%} {table['dead_ratio']:>6.1%} "
+            f"{table['seq_scan_ratio']:>6.1%}"
+        )
+        for finding in table["findings"]:
+            print(f"     ⚠️  {finding}")
+
+    print("\n📇 Indexes by blocks touched:")
+    for index in report["indexes"]:
+        print(
+            f"  {index['name']:<40} {_mib(index['bytes']):>11} {index['io_blocks']:>12} "
+            f"{index['scans']:>10} scans"
+        )
+
+    if report["unused_indexes"]:
+        print("\n🪦 Unused indexes (never scanned, not unique):")
+        for index in report["unused_indexes"]:
+            print(f"  • {index['name']} on {index['table_name']} ({_mib(index['bytes'])})")
+
+    print("\n🐢 Slowest statements by total time:")
+    if "statements_error" in report:
+        print(f"  pg_stat_statements unavailable: {report['statements_error']}")
+    for statement in report["statements"]:
+        query = " ".join(statement["query"].split())[:70]
+        print(
+            f"  {statement['total_ms']:>12.1f}ms {statement['calls']:>8} calls "
+            f"{statement['mean_ms']:>9.2f}ms avg  {query}"
+        )
+
+    return 0
+
+
+def _table_list(tables: str | None) -> list[str] | None:
+    """Split a comma-separated ``--tables`` value."""
+    return [t.strip() for t in tables.split(",") if t.strip()] if tables else None
+
+
+async def backup_command(args: argparse.Namespace) -> int:
+    """Back up the database to a directory of compressed per-table COPY files."""
+    from src.backup import backup_database
+
+    print(f"💾 Backing up {Config.DB_POSTGRESDB_DATABASE} to {args.directory}...")
+    print("=" * 60)
 
     try:
-        result = await checker.full_health_check()
+        result = await backup_database(
+            Path(args.directory),
+            tables=_table_list(args.tables),
+            jobs=args.jobs,
+            level=args.level,
+            timeout=args.timeout,
+        )
+    except Exception as e:
+        print(f"\n❌ Backup failed: {e}")
+        return 1
 
-        print(f"\nOverall Status: {result['status'].upper()}")
-        print("\nChecks:")
+    ratio = result["compressed_bytes"] / result["bytes"] if result["bytes"] else 0.0
+    print(
+        f"\n✅ Backed up {result['tables']} tables, {result['rows']} rows in "
+        f"{result['seconds']:.1f}s"
+    )
+    raw, compressed = _mib(result["bytes"]), _mib(result["compressed_bytes"])
+    print(f"  • {raw} raw, {compressed} compressed ({ratio:.0%})")
+    return 0
 
-        for check_name, check_result in result["checks"].items():
-            status = check_result.get("status", "unknown")
-            emoji = "✅" if status == "healthy" else "❌" if status == "unhealthy" else "ℹ️"
-            print(f"  {emoji} {check_name}: {status}")
 
-            if "error" in check_result:
-                print(f"     Error: {check_result['error']}")
-            if "response_time_ms" in check_result:
-                print(f"     Response time: {check_result['response_time_ms']:.2f}ms")
+async def restore_command(args: argparse.Namespace) -> int:
+    """Restore tables from a backup directory, or verify its checksums."""
+    from src.backup import MANIFEST, restore_database, verify_backup
 
-        return 0 if result["status"] == "healthy" else 1
+    directory = Path(args.directory)
+    if not (directory / MANIFEST).exists():
+        print(f"❌ No backup manifest in {directory}")
+        return 1
 
+    if args.verify:
+        results = verify_backup(directory)
+        bad = sorted(name for name, ok in results.items() if not ok)
+        for name in bad:
+            print(f"  ❌ {name}: checksum mismatch")
+        print(f"{'❌' if bad else '✅'} {len(results) - len(bad)} of {len(results)} tables intact")
+        return 1 if bad else 0
+
+    print(f"♻️  Restoring {args.directory} into {Config.DB_POSTGRESDB_DATABASE}...")
+    print("=" * 60)
+
+    try:
+        result = await restore_database(
+            directory,
+            tables=_table_list(args.tables),
+            jobs=args.jobs,
+            clean=args.clean,
+            timeout=args.timeout,
+        )
     except Exception as e:
-        print(f"\n❌ Health check failed: {e}")
+        print(f"\n❌ Restore failed: {e}")
+        return 1
+
+    print(
+        f"\n✅ Restored {result['tables']} tables, {result['rows']} rows in "
+        f"{result['waves']} waves ({result['seconds']:.1f}s)"
+    )
+    if result.get("cleared"):
+        print(f"⚠️  Also emptied by --clean (foreign keys): {', '.join(result['cleared'])}")
+    return 0
+
+
+async def prune_command(args: argparse.Namespace) -> int:
+    """Prune old executions, or estimate what would be pruned."""
+    from datetime import timedelta
+    import sqlite3
+
+    from src.prune import PostgresPruneBackend, SQLitePruneBackend, prune_executions
+
+    hours = args.older_than_hours
+    if hours is None:
+        hours = Config.EXECUTIONS_DATA_MAX_AGE
+    cutoff = datetime.now(UTC) - timedelta(hours=hours)
+    pool: Any = None
+
+    if args.sqlite:
+        backend: Any = SQLitePruneBackend(sqlite3.connect(args.sqlite))
+        database = f"sqlite:{Path(args.sqlite).resolve()}"
+    else:
+        import asyncpg
+
+        from src.database import connection_kwargs
+
+        kwargs = connection_kwargs()
+        pool = await asyncpg.create_pool(**kwargs, min_size=1, max_size=1)
+        backend = PostgresPruneBackend(pool)
+        database = f"postgresdb:{kwargs['host']}:{kwargs['port']}/{kwargs['database']}"
+
+    print(f"🧹 Pruning executions stopped before {cutoff:%Y-%m-%d %H:%M} UTC")
+    print("=" * 60)
+
+    try:
+        if args.dry_run:
+            rows, size = await backend.estimate(cutoff)
+            print(f"  • Would delete {rows} executions (~{_mib(size)})")
+            return 0
+
+        result = await prune_executions(
+            backend,
+            cutoff,
+            batch_size=args.batch_size,
+            target_ms=args.target_ms,
+            pause_ratio=args.pause_ratio,
+            state_path=args.state,
+            max_batches=args.max_batches,
+            identity={"database": database, "older_than_hours": hours},
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
         return 1
+    finally:
+        if pool is not None:
+            await pool.close()
+        else:
+            backend.conn.close()
+
+    if result["resumed"]:
+        print(f"  • Resumed interrupted run (cutoff {result['cutoff']})")
+    print(f"  • Deleted {result['deleted']} executions in {result['batches']} batches")
+    print(f"  • Slowest batch: {result['max_latency_ms']:.1f}ms")
+    print(f"  • Final batch size: {result['batch_size']}")
+    if not result["complete"]:
+        print(f"\n⏸️  Stopped early; rerun to resume from id {result['last_id']}")
+    else:
+        print("\n✅ Prune complete")
+    return 0
+
+
+def simulate_command(args: argparse.Namespace) -> int:
+    """Simulate regular and queue mode for a workload and print a comparison."""
+    from src.simulator import (
+        effective_timeout,
+        fit_lognormal,
+        generate_workload,
+        parse_distribution,
+        parse_profile,
+        sweep,
+    )
+
+    if args.from_history:
+        from src.executions import ExecutionStore
+
+        store = ExecutionStore(args.db)
+        try:
+            mu, sigma = fit_lognormal(store.durations(workflow_id=args.workflow))
+        finally:
+            store.close()
+        spec = f"lognormal:{mu:.4f},{sigma:.4f}"
+    else:
+        spec = args.duration or "exponential:1"
+
+    profile = parse_profile(args.profile)
+    arrivals, durations = generate_workload(profile, parse_distribution(spec), args.seed)
+    timeout = effective_timeout()
+
+    print("🧮 Capacity simulation")
+    print("=" * 60)
+    print(f"  • Executions: {len(arrivals)} over {sum(s for s, _ in profile):.0f}s")
+    print(f"  • Durations: {spec}")
+    print(f"  • Timeout: {timeout:.0f}s")
+
+    results = sweep(
+        arrivals,
+        durations,
+        [int(w) for w in args.workers.split(",")],
+        worker_concurrency=args.worker_concurrency,
+        main_concurrency=args.main_concurrency,
+        timeout=timeout,
+        queue_overhead=args.queue_overhead_ms / 1000,
+        processes=args.processes,
+    )
+
+    print(
+        f"\n{'mode':<8} {'workers':>7} {'slots':>6} {'mean wait':>10} "
+        f"{'p99 wait':>10} {'util':>7} {'timeouts':>9}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:<8} {row['workers']:>7} {row['slots']:>6} "
+            f"{row['mean_wait']:>9.2f}s {row['p99_wait']:>9.2f}s "
+            f"{row['utilization']:>6.1%} {row['timeout_rate']:>8.2%}"
+        )
+    return 0
 
 
 def validate_command() -> int:
@@ -136,6 +2051,32 @@ def info_command() -> int:
     print(f"  • JWT Secret: {'✅ Set' if Config.N8N_JWT_SECRET else '❌ Not set'}")
     print(f"  • Secure Cookie: {Config.N8N_SECURE_COOKIE}")
 
+    from src.cgroup import CgroupSampler, find_cgroup
+
+    if find_cgroup() is None:
+        print("\n📦 Container resources: set HEALTH_CGROUP_PATH or HEALTH_CGROUP_PID")
+        return 0
+
+    with CgroupSampler() as sampler:
+        if sampler.available:
+            sampler.sample()
+            totals = sampler.totals()
+            print(f"\n📦 Container resources ({sampler.path}):")
+            if totals["memory_current"] is not None:
+                memory = f"  • Memory: {_mib(int(totals['memory_current']))}"
+                if totals["memory_max"] is not None:
+                    headroom = totals["memory_max"] - totals["memory_current"]
+                    memory += f" of {_mib(int(totals['memory_max']))}"
+                    memory += f" ({_mib(int(headroom))} headroom)"
+                print(memory)
+            if totals["cpu_quota_cores"] is not None:
+                print(f"  • CPU limit: {totals['cpu_quota_cores']:g} cores")
+            if totals["cpu_periods"]:
+                ratio = totals["cpu_throttled_periods"] / totals["cpu_periods"]
+                print(f"  • CPU throttled in {ratio:.1%} of periods since start")
+            if totals["oom_kills"]:
+                print(f"  • OOM kills since start: {totals['oom_kills']:g}")
+
     return 0
 
 
@@ -211,31 +2152,137 @@ def run_format() -> int:
     return 0
 
 
-def main() -> int:
+def parse_importtime(output: str) -> tuple[list[dict[str, Any]], list[str]]:
+    """Split ``-X importtime`` stderr into per-module timings and other lines."""
+    modules = []
+    other = []
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        name = fields[2].rstrip()
+        modules.append(
+            {
+                "module": name.strip(),
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+                "top_level": len(name) - len(name.lstrip()) <= 1,
+            }
+        )
+
+    return modules, other
+
+
+def startup_profile_command(argv: list[str], top: int = 20) -> int:
+    """Re-run the CLI under ``-X importtime`` and report import time per module."""
+    import subprocess
+
+    cmd = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), *argv]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, stderr=subprocess.PIPE, text=True, check=False)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    modules, other = parse_importtime(result.stderr)
+    for line in other:
+        print(line, file=sys.stderr)
+
+    total_ms = sum(m["cumulative_us"] for m in modules if m["top_level"]) / 1000
+    print("\n⏱️  Startup profile")
+    print("=" * 60)
+    print(f"  • Wall time: {wall_ms:.1f}ms")
+    print(f"  • Import time: {total_ms:.1f}ms across {len(modules)} modules")
+    print(f"\n{'cumulative':>12} {'self':>10}  module")
+    for module in sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top]:
+        print(
+            f"{module['cumulative_us'] / 1000:>10.1f}ms {module['self_us'] / 1000:>8.1f}ms"
+            f"  {module['module']}"
+        )
+
+    return result.returncode
+
+
+def _run_async(coro: Coroutine[Any, Any, int]) -> int:
+    """Run an async command, importing asyncio only when one is dispatched."""
+    import asyncio
+
+    return asyncio.run(coro)
+
+
+def _commands() -> dict[str, Any]:
+    """Map each command to its handler, or a command group to its subcommands.
+
+    A group maps to the argument naming its subcommand and that
+    subcommand's handlers; ``None`` handles the group without a subcommand.
+    Handlers take the parsed arguments and return an exit code, or a
+    coroutine that is run to get one.
+    """
+    return {
+        "health": ("health_command", {None: health_command, "history": health_history_command}),
+        "exporter": exporter_command,
+        "bench": (
+            "bench_command",
+            {"webhook": bench_webhook_command, "regress": bench_regress_command},
+        ),
+        "executions": (
+            "executions_command",
+            {
+                "sync": executions_sync_command,
+                "stats": executions_stats_command,
+                "throughput": executions_throughput_command,
+            },
+        ),
+        "workflows": (
+            "workflows_command",
+            {
+                "analyze": workflows_analyze_command,
+                "export": workflows_export_command,
+                "import": workflows_import_command,
+            },
+        ),
+        "logs": ("logs_command", {"analyze": logs_analyze_command}),
+        "binary-data": ("binary_data_command", {"scan": binary_data_scan_command}),
+        "stand-in": stand_in_command,
+        "db": ("db_command", {"report": db_report_command}),
+        "sidecar": sidecar_command,
+        "metrics": metrics_command,
+        "prune": prune_command,
+        "backup": backup_command,
+        "restore": restore_command,
+        "simulate": simulate_command,
+        "validate": lambda _: validate_command(),
+        "info": lambda _: info_command(),
+        "test": run_tests,
+        "lint": run_lint,
+        "format": lambda _: run_format(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
     """Main CLI entry point."""
     parser = setup_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.startup_profile:
+        argv = sys.argv[1:] if argv is None else argv
+        return startup_profile_command([a for a in argv if a != "--startup-profile"])
 
-    if not args.command:
+    handler = _commands().get(args.command)
+    if isinstance(handler, tuple):
+        attribute, subcommands = handler
+        handler = subcommands.get(getattr(args, attribute))
+    if handler is None:
         parser.print_help()
         return 1
 
     try:
-        if args.command == "health":
-            return asyncio.run(health_command(args))
-        elif args.command == "validate":
-            return validate_command()
-        elif args.command == "info":
-            return info_command()
-        elif args.command == "test":
-            return run_tests(args)
-        elif args.command == "lint":
-            return run_lint(args)
-        elif args.command == "format":
-            return run_format()
-        else:
-            parser.print_help()
-            return 1
+        result = handler(args)
+        return _run_async(result) if isinstance(result, Coroutine) else int(result)
     except KeyboardInterrupt:
         print("\n\n⚠️  Operation cancelled by user")
         return 130
@@ -0,0 +1,11 @@
+#!/usr/bin/env -S python3 -S
+"""Container healthcheck answered by the health sidecar (`cli.py sidecar`).
+
+Exits 0 when the sidecar's cached result is healthy and fresh, 1 otherwise.
+"""
+
+import sys
+
+from src.probe_client import main
+
+sys.exit(main())
@@ -0,0 +1,132 @@
+"""Open-loop webhook load generator."""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+import httpx
+
+from src.config import config
+from src.health_check import http2_available
+from src.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+def webhook_url(path: str, base_url: str | None = None) -> str:
+    """Build the production webhook URL for ``path`` from WEBHOOK_URL."""
+    base = (base_url or config.WEBHOOK_URL or f"http://localhost:{config.N8N_PORT}").rstrip("/")
+    return f"{base}/webhook/{path.lstrip('/')}"
+
+
+def load_payload(payload: str) -> bytes:
+    """Return the request body for ``payload``, reading ``@file`` references."""
+    if payload.startswith("@"):
+        return Path(payload[1:]).read_bytes()
+
+    json.loads(payload)
+    return payload.encode()
+
+
+async def run_step(
+    client: httpx.AsyncClient,
+    url: str,
+    rate: float,
+    duration: float,
+    payload: bytes = b"{}",
+    method: str = "POST",
+    max_inflight: int = 1000,
+) -> dict[str, Any]:
+    """Drive ``url`` at a fixed ``rate`` for ``duration`` seconds.
+
+    Requests are scheduled open-loop on a fixed timetable, independent of
+    how quickly earlier requests complete. Latency is measured from each
+    request's intended start time rather than its actual send time, which
+    corrects for coordinated omission when the target falls behind;
+    ``service_time`` keeps the uncorrected measurement for comparison.
+    Raises ValueError unless ``rate`` is positive.
+    """
+    if not rate > 0:
+        raise ValueError(f"Rate must be positive, got {rate}")
+    latency = LatencyHistogram()
+    service_time = LatencyHistogram()
+    headers = {"Content-Type": "application/json"}
+    slots = asyncio.Semaphore(max(max_inflight, 1))
+    total = max(round(rate * duration), 1)
+    interval = 1 / rate
+    completed = 0
+    errors = 0
+
+    async def fire(intended: float) -> None:
+        nonlocal completed, errors
+        sent = time.perf_counter()
+        try:
+            response = await client.request(method, url, content=payload, headers=headers)
+            if response.status_code >= 400:
+                errors += 1
+        except httpx.HTTPError as e:
+            logger.debug(f"Webhook request failed: {e}")
+            errors += 1
+        finally:
+            slots.release()
+
+        done = time.perf_counter()
+        latency.record((done - intended) * 1000)
+        service_time.record((done - sent) * 1000)
+        completed += 1
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        intended = start + i * interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        tasks.append(asyncio.create_task(fire(intended)))
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "target_rps": rate,
+        "achieved_rps": completed / elapsed if elapsed > 0 else 0.0,
+        "requests": completed,
+        "errors": errors,
+        "error_rate": errors / completed if completed else 0.0,
+        "latency": latency.summary(),
+        "service_time": service_time.summary(),
+    }
+
+
+async def run_ramp(
+    url: str,
+    rates: list[float],
+    duration: float,
+    payload: bytes = b"{}",
+    method: str = "POST",
+    timeout: float = 10,
+    max_inflight: int = 1000,
+) -> list[dict[str, Any]]:
+    """Run one open-loop step per target rate over a shared connection pool."""
+    limits = httpx.Limits(max_connections=max_inflight, max_keepalive_connections=max_inflight)
+    results = []
+
+    async with httpx.AsyncClient(timeout=timeout, http2=http2_available(), limits=limits) as client:
+        for rate in rates:
+            results.append(
+                await run_step(
+                    client,
+                    url,
+                    rate,
+                    duration,
+                    payload=payload,
+                    method=method,
+                    max_inflight=max_inflight,
+                )
+            )
+
+    return results
@@ -0,0 +1,321 @@
+"""Usage report, content-hash deduplication and orphan cleanup for filesystem binary data."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
+import os
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 1024 * 1024
+METADATA_SUFFIX = ".metadata"
+UNKNOWN = "-"
+# Execution ID n8n uses for binary data written before the execution is saved.
+TEMP_EXECUTION = "temp"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    digest TEXT
+)
+"""
+
+PG_EXECUTION_IDS = "SELECT id::text AS id FROM execution_entity"
+SQLITE_EXECUTION_IDS = "SELECT CAST(id AS TEXT) FROM execution_entity"
+
+
+def storage_path() -> Path:
+    """Return the binary data directory from N8N_BINARY_DATA_STORAGE_PATH or n8n's default."""
+    return Path(config.N8N_BINARY_DATA_STORAGE_PATH or Path.home() / ".n8n" / "binaryData")
+
+
+def classify(relative: Path) -> tuple[str, str]:
+    """Return ``(workflow_id, execution_id)`` for a path relative to the storage root.
+
+    Understands the current ``workflows/<wf>/executions/<ex>/binary_data/<id>``
+    layout and the legacy flat ``<executionId>_<id>`` file names.
+    """
+    parts = relative.parts
+    if len(parts) >= 4 and parts[0] == "workflows" and parts[2] == "executions":
+        return parts[1], parts[3]
+    head = parts[0].split("_", 1)[0] if parts else ""
+    return UNKNOWN, head if head.isdigit() else UNKNOWN
+
+
+class BinaryFile:
+    """One file in the binary data directory."""
+
+    __slots__ = (
+        "device",
+        "digest",
+        "execution_id",
+        "inode",
+        "mtime_ns",
+        "path",
+        "size",
+        "workflow_id",
+    )
+
+    def __init__(
+        self, path: str, stat: os.stat_result, workflow_id: str, execution_id: str
+    ) -> None:
+        """Initialize from a ``stat`` result."""
+        self.path = path
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.inode = stat.st_ino
+        self.device = stat.st_dev
+        self.workflow_id = workflow_id
+        self.execution_id = execution_id
+        self.digest: str | None = None
+
+    @property
+    def is_metadata(self) -> bool:
+        """Whether this is a metadata sidecar rather than binary content."""
+        return self.path.endswith(METADATA_SUFFIX)
+
+
+def walk(root: Path) -> Iterator[BinaryFile]:
+    """Yield every regular file under ``root``, using the stat data ``scandir`` already has."""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        relative = Path(entry.path).relative_to(root)
+                        yield BinaryFile(entry.path, entry.stat(), *classify(relative))
+        except OSError as e:
+            logger.warning(f"Skipping {directory}: {e}")
+
+
+def hash_file(path: str, chunk_bytes: int = CHUNK_BYTES) -> str:
+    """Return the SHA-256 of a file, read in chunks into one reused buffer."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_bytes)
+    view = memoryview(buffer)
+    with Path(path).open("rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+class HashIndex:
+    """SQLite cache of file digests keyed by path, size, mtime and inode."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open or create the index."""
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(INDEX_SCHEMA)
+
+    def load(self) -> dict[str, tuple[int, int, int, str]]:
+        """Return every cached ``path -> (size, mtime_ns, inode, digest)``."""
+        rows = self.conn.execute("SELECT path, size, mtime_ns, inode, digest FROM files")
+        return {path: (size, mtime, inode, digest) for path, size, mtime, inode, digest in rows}
+
+    def replace(self, files: Iterable[BinaryFile]) -> None:
+        """Replace the index with the digests of ``files``."""
+        with self.conn:
+            self.conn.execute("DELETE FROM files")
+            self.conn.executemany(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                ((f.path, f.size, f.mtime_ns, f.inode, f.digest) for f in files if f.digest),
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+
+class BinaryDataScan:
+    """Files found under the storage root, with digests for possible duplicates."""
+
+    def __init__(self, root: Path, files: list[BinaryFile], hashed: int, cached: int) -> None:
+        """Initialize scan result."""
+        self.root = root
+        self.files = files
+        self.hashed = hashed
+        self.cached = cached
+
+    def duplicate_groups(self) -> list[list[BinaryFile]]:
+        """Return groups of two or more content files with the same digest, largest first."""
+        groups: dict[tuple[int, str], list[BinaryFile]] = defaultdict(list)
+        for f in self.files:
+            if f.digest is not None:
+                groups[(f.size, f.digest)].append(f)
+        duplicates = [sorted(g, key=lambda f: f.path) for g in groups.values() if len(g) > 1]
+        return sorted(duplicates, key=_reclaimable, reverse=True)
+
+    def report(self, top: int = 10) -> dict[str, Any]:
+        """Return totals, the heaviest workflows and executions, and duplicate groups."""
+        workflows: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+        executions: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0, 0])
+        inodes: set[tuple[int, int]] = set()
+        disk_bytes = 0
+        for f in self.files:
+            for usage in (workflows[f.workflow_id], executions[(f.workflow_id, f.execution_id)]):
+                usage[0] += 1
+                usage[1] += f.size
+            if (f.device, f.inode) not in inodes:
+                inodes.add((f.device, f.inode))
+                disk_bytes += f.size
+
+        groups = self.duplicate_groups()
+        return {
+            "root": str(self.root),
+            "files": len(self.files),
+            "bytes": sum(f.size for f in self.files),
+            "disk_bytes": disk_bytes,
+            "hashed": self.hashed,
+            "cached": self.cached,
+            "workflows": [
+                {"workflow_id": wf, "files": n, "bytes": size}
+                for wf, (n, size) in sorted(workflows.items(), key=lambda i: -i[1][1])[:top]
+            ],
+            "executions": [
+                {"workflow_id": wf, "execution_id": ex, "files": n, "bytes": size}
+                for (wf, ex), (n, size) in sorted(executions.items(), key=lambda i: -i[1][1])[:top]
+            ],
+            "duplicate_groups": len(groups),
+            "reclaimable_bytes": sum(_reclaimable(g) for g in groups),
+            "duplicates": [
+                {
+                    "digest": g[0].digest,
+                    "size": g[0].size,
+                    "copies": len(g),
+                    "reclaimable_bytes": _reclaimable(g),
+                    "paths": [f.path for f in g],
+                }
+                for g in groups[:top]
+            ],
+        }
+
+
+def _reclaimable(group: list[BinaryFile]) -> int:
+    """Bytes freed by hardlinking a group: one copy per distinct inode beyond the first."""
+    return (len({(f.device, f.inode) for f in group}) - 1) * group[0].size
+
+
+def scan(
+    root: Path,
+    index: HashIndex | None = None,
+    workers: int | None = None,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> BinaryDataScan:
+    """Walk ``root`` and hash every file that could have a duplicate.
+
+    Only content files whose size matches another file's are hashed, and
+    hardlinks to an already-hashed inode reuse its digest. Digests are
+    reused from ``index`` when a file's size, mtime and inode are unchanged,
+    and hashing runs on ``workers`` threads (hashlib releases the GIL).
+    """
+    files = list(walk(root))
+    by_size: dict[int, int] = defaultdict(int)
+    for f in files:
+        if f.size and not f.is_metadata:
+            by_size[f.size] += 1
+
+    cache = index.load() if index else {}
+    by_inode: dict[tuple[int, int], list[BinaryFile]] = defaultdict(list)
+    cached = 0
+    for f in files:
+        if f.is_metadata or by_size.get(f.size, 0) < 2:
+            continue
+        entry = cache.get(f.path)
+        if entry is not None and entry[:3] == (f.size, f.mtime_ns, f.inode):
+            f.digest = entry[3]
+            cached += 1
+        else:
+            by_inode[(f.device, f.inode)].append(f)
+
+    pending = list(by_inode.values())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = pool.map(lambda links: hash_file(links[0].path, chunk_bytes), pending)
+        for links, digest in zip(pending, digests, strict=True):
+            for f in links:
+                f.digest = digest
+
+    if index is not None:
+        index.replace(files)
+    return BinaryDataScan(root, files, hashed=len(pending), cached=cached)
+
+
+def hardlink_duplicates(groups: list[list[BinaryFile]], dry_run: bool = False) -> tuple[int, int]:
+    """Replace every duplicate with a hardlink to the first file in its group.
+
+    Each replacement links to a temporary name and renames it over the
+    duplicate, so the path always exists. n8n deletes binary data per file,
+    so removing one link never affects the others. Returns the number of
+    files relinked and the bytes freed.
+    """
+    linked = 0
+    freed = 0
+    for group in groups:
+        canonical = group[0]
+        seen = {(canonical.device, canonical.inode)}
+        for f in group[1:]:
+            if f.device != canonical.device or (f.device, f.inode) in seen:
+                continue
+            seen.add((f.device, f.inode))
+            linked += 1
+            freed += f.size
+            if dry_run:
+                continue
+            tmp = Path(f"{f.path}.dedup-tmp")
+            tmp.hardlink_to(canonical.path)
+            tmp.replace(f.path)
+            f.inode, f.mtime_ns = canonical.inode, canonical.mtime_ns
+    return linked, freed
+
+
+def find_orphans(files: Iterable[BinaryFile], execution_ids: set[str]) -> list[BinaryFile]:
+    """Return files belonging to executions that no longer exist in the database."""
+    return [
+        f
+        for f in files
+        if f.execution_id not in (UNKNOWN, TEMP_EXECUTION) and f.execution_id not in execution_ids
+    ]
+
+
+def remove_orphans(root: Path, orphans: list[BinaryFile], dry_run: bool = False) -> int:
+    """Delete orphaned files and any directories left empty; return bytes removed."""
+    removed = 0
+    for f in orphans:
+        removed += f.size
+        if dry_run:
+            continue
+        path = Path(f.path)
+        path.unlink(missing_ok=True)
+        for parent in path.parents:
+            if parent == root or root not in parent.parents:
+                break
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+    return removed
+
+
+async def postgres_execution_ids(pool: Any) -> set[str]:
+    """Return the IDs of every execution in n8n's PostgreSQL database."""
+    return {row["id"] for row in await pool.fetch(PG_EXECUTION_IDS)}
+
+
+def sqlite_execution_ids(conn: sqlite3.Connection) -> set[str]:
+    """Return the IDs of every execution in n8n's SQLite database."""
+    return {row[0] for row in conn.execute(SQLITE_EXECUTION_IDS)}
@@ -0,0 +1,396 @@
+"""Low-overhead cgroup v2 sampler for CPU throttling, memory headroom, I/O and pressure stalls.
+
+asyncio and statistics are imported where used so that ``cli.py info``
+can take a sample without loading them.
+"""
+
+from array import array
+from collections.abc import Callable
+import contextlib
+import logging
+import math
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# Large enough for io.stat with a few dozen devices; longer files are truncated.
+BUFFER_BYTES = 16384
+
+# Sample layout: one float per field, NaN when the file or key is missing.
+FIELDS = (
+    "time",
+    "cpu_usage_usec",
+    "cpu_periods",
+    "cpu_throttled_periods",
+    "cpu_throttled_usec",
+    "cpu_quota_cores",
+    "memory_current",
+    "memory_max",
+    "memory_high_events",
+    "memory_max_events",
+    "oom_kills",
+    "io_read_bytes",
+    "io_write_bytes",
+    "cpu_some_usec",
+    "memory_some_usec",
+    "memory_full_usec",
+    "io_some_usec",
+    "io_full_usec",
+)
+F = {name: index for index, name in enumerate(FIELDS)}
+
+# Keyed files: (key, field) pairs read from ``key value`` lines.
+KEYED = {
+    "cpu.stat": (
+        (b"usage_usec", F["cpu_usage_usec"]),
+        (b"nr_periods", F["cpu_periods"]),
+        (b"nr_throttled", F["cpu_throttled_periods"]),
+        (b"throttled_usec", F["cpu_throttled_usec"]),
+    ),
+    "memory.events": (
+        (b"high", F["memory_high_events"]),
+        (b"max", F["memory_max_events"]),
+        (b"oom_kill", F["oom_kills"]),
+    ),
+}
+# Pressure stall files: cumulative ``total=`` of the ``some`` and ``full`` lines.
+PRESSURE = {
+    "cpu.pressure": (F["cpu_some_usec"], None),
+    "memory.pressure": (F["memory_some_usec"], F["memory_full_usec"]),
+    "io.pressure": (F["io_some_usec"], F["io_full_usec"]),
+}
+PRESSURE_FIELDS = (
+    "cpu_some_usec",
+    "memory_some_usec",
+    "memory_full_usec",
+    "io_some_usec",
+    "io_full_usec",
+)
+FILES = ("cpu.max", "memory.current", "memory.max", "io.stat", *KEYED, *PRESSURE)
+
+
+def find_cgroup(root: Path = CGROUP_ROOT, proc: str | None = None) -> Path | None:
+    """Return n8n's cgroup v2 directory, or None when it is not known.
+
+    HEALTH_CGROUP_PATH names it directly; otherwise it is resolved from the
+    unified hierarchy entry of ``/proc/<HEALTH_CGROUP_PID>/cgroup`` (or
+    ``proc``). This process's own cgroup is never assumed, since outside a
+    container shared with n8n it holds only the health checker.
+    """
+    if config.HEALTH_CGROUP_PATH:
+        return Path(config.HEALTH_CGROUP_PATH)
+    if proc is None:
+        if config.HEALTH_CGROUP_PID is None:
+            return None
+        proc = f"/proc/{config.HEALTH_CGROUP_PID}/cgroup"
+    with contextlib.suppress(OSError):
+        for line in Path(proc).read_text().splitlines():
+            if line.startswith("0::"):
+                candidate = root / line[3:].strip().lstrip("/")
+                if (candidate / "cgroup.controllers").exists():
+                    return candidate
+    return None
+
+
+def _number(buffer: bytearray, start: int, end: int) -> float:
+    """Parse the number in ``buffer[start:end]``, treating ``max`` as unlimited (NaN)."""
+    token = buffer[start:end]
+    return math.nan if token == b"max" else float(token)
+
+
+def _token_end(buffer: bytearray, start: int, end: int) -> int:
+    """Return the index of the first space or newline at or after ``start``."""
+    stop = buffer.find(b"\n", start, end)
+    stop = end if stop == -1 else stop
+    space = buffer.find(b" ", start, stop)
+    return stop if space == -1 else space
+
+
+def _keyed(buffer: bytearray, end: int, key: bytes) -> float:
+    """Return the value of the ``key value`` line, or NaN if there is none."""
+    start = 0
+    while (start := buffer.find(key, start, end)) != -1:
+        value = start + len(key)
+        line_start = start == 0 or buffer[start - 1] == 0x0A
+        if line_start and value < end and buffer[value] == 0x20:
+            return _number(buffer, value + 1, _token_end(buffer, value + 1, end))
+        start = value
+    return math.nan
+
+
+def _sum_values(buffer: bytearray, end: int, key: bytes, start: int = 0) -> float:
+    """Sum every ``key=value`` pair, e.g. ``rbytes=`` over all io.stat devices."""
+    total = 0.0
+    while (start := buffer.find(key, start, end)) != -1:
+        start += len(key)
+        total += _number(buffer, start, _token_end(buffer, start, end))
+    return total
+
+
+def _value(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+def _ratio(part: float, whole: float) -> float | None:
+    """Return ``part / whole``; 0.0 for an empty window, None when not reported."""
+    if math.isnan(part) or math.isnan(whole):
+        return None
+    return part / whole if whole > 0 else 0.0
+
+
+class CgroupSampler:
+    """Sample a cgroup v2 directory's resource counters at high frequency.
+
+    Every file is opened once and re-read in place with ``preadv`` into one
+    preallocated buffer, and samples are parsed into two preallocated
+    arrays that are swapped rather than reallocated, so sampling every
+    100ms costs a handful of syscalls. Counters are cumulative, so
+    ``collect`` reports exact averages over the time since it was last
+    called, plus peaks seen by the individual samples in between.
+    """
+
+    def __init__(
+        self, path: str | Path | None = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Open the files of cgroup ``path``, found with ``find_cgroup`` by default."""
+        found = Path(path) if path else find_cgroup()
+        self.path = found
+        self.clock = clock
+        self._fds: dict[str, int] = {}
+        if found is not None:
+            for name in FILES:
+                with contextlib.suppress(OSError):
+                    self._fds[name] = os.open(found / name, os.O_RDONLY)
+        self._buffer = bytearray(BUFFER_BYTES)
+        self._views = [memoryview(self._buffer)]
+        self.current = array("d", [math.nan] * len(FIELDS))
+        self.previous = array("d", [math.nan] * len(FIELDS))
+        self._mark = array("d", [math.nan] * len(FIELDS))
+        self.samples = 0
+        self._reset_peaks()
+
+    @property
+    def available(self) -> bool:
+        """True when at least one cgroup file could be opened."""
+        return bool(self._fds)
+
+    def __enter__(self) -> "CgroupSampler":
+        """Return the open sampler."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the sampler."""
+        self.close()
+
+    def close(self) -> None:
+        """Close every open file descriptor."""
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def _read(self, name: str) -> int:
+        """Read file ``name`` into the buffer; return its length, or 0 if unavailable."""
+        fd = self._fds.get(name)
+        if fd is None:
+            return 0
+        try:
+            return os.preadv(fd, self._views, 0)
+        except OSError as e:
+            logger.debug(f"Reading {name} failed: {e}")
+            return 0
+
+    def sample(self) -> array:
+        """Read every file once into ``current``, keeping the last sample in ``previous``."""
+        self.previous, self.current = self.current, self.previous
+        sample, buffer = self.current, self._buffer
+        for index in range(len(FIELDS)):
+            sample[index] = math.nan
+        sample[F["time"]] = self.clock()
+
+        if n := self._read("cpu.max"):
+            quota_end = _token_end(buffer, 0, n)
+            quota = _number(buffer, 0, quota_end)
+            period = _number(buffer, quota_end + 1, _token_end(buffer, quota_end + 1, n))
+            sample[F["cpu_quota_cores"]] = quota / period
+        if n := self._read("memory.current"):
+            sample[F["memory_current"]] = _number(buffer, 0, _token_end(buffer, 0, n))
+        if n := self._read("memory.max"):
+            sample[F["memory_max"]] = _number(buffer, 0, _token_end(buffer, 0, n))
+        if n := self._read("io.stat"):
+            sample[F["io_read_bytes"]] = _sum_values(buffer, n, b"rbytes=")
+            sample[F["io_write_bytes"]] = _sum_values(buffer, n, b"wbytes=")
+        for name, keys in KEYED.items():
+            if n := self._read(name):
+                for key, index in keys:
+                    sample[index] = _keyed(buffer, n, key)
+        self._sample_pressure(sample)
+
+        self.samples += 1
+        if self.samples == 1:
+            self._mark[:] = sample
+        self._track_peaks()
+        return sample
+
+    def _sample_pressure(self, sample: array) -> None:
+        """Read the cumulative stall totals of each pressure file into ``sample``."""
+        buffer = self._buffer
+        for name, (some, full) in PRESSURE.items():
+            if n := self._read(name):
+                full_start = buffer.find(b"\nfull ", 0, n)
+                some_end = n if full_start == -1 else full_start
+                sample[some] = _sum_values(buffer, some_end, b"total=")
+                if full is not None and full_start != -1:
+                    sample[full] = _sum_values(buffer, n, b"total=", full_start)
+
+    def totals(self) -> dict[str, float | None]:
+        """Return the latest sample's raw counters, cumulative since the cgroup started."""
+        return {name: _value(value) for name, value in zip(FIELDS, self.current, strict=True)}
+
+    def _reset_peaks(self) -> None:
+        self._peak_memory = math.nan
+        self._peak_throttled = 0.0
+        self._peak_stall = 0.0
+
+    def _track_peaks(self) -> None:
+        """Fold the latest sample into the window's peaks; rates need two samples."""
+        current, previous = self.current, self.previous
+        elapsed_usec = (current[F["time"]] - previous[F["time"]]) * 1_000_000
+        memory = current[F["memory_current"]]
+        if not math.isnan(memory):
+            self._peak_memory = (
+                memory if math.isnan(self._peak_memory) else max(self._peak_memory, memory)
+            )
+        periods = current[F["cpu_periods"]] - previous[F["cpu_periods"]]
+        if periods > 0:
+            throttled = current[F["cpu_throttled_periods"]] - previous[F["cpu_throttled_periods"]]
+            self._peak_throttled = max(self._peak_throttled, throttled / periods)
+        if elapsed_usec > 0:
+            for name in PRESSURE_FIELDS:
+                stall = (current[F[name]] - previous[F[name]]) / elapsed_usec
+                if not math.isnan(stall):
+                    self._peak_stall = max(self._peak_stall, stall)
+
+    def collect(self) -> dict[str, Any]:
+        """Take a sample and report resource use since the previous ``collect``.
+
+        Ratios are fractions of the window; ``pressure`` holds the share of
+        wall time some (or all, for ``*_full``) tasks were stalled on each
+        resource. Values the cgroup does not expose are None.
+        """
+        self.sample()
+        start, end = self._mark, self.current
+        seconds = end[F["time"]] - start[F["time"]]
+
+        def delta(name: str) -> float:
+            return end[F[name]] - start[F[name]]
+
+        def per_second(name: str) -> float | None:
+            return _ratio(delta(name), seconds)
+
+        memory_max = end[F["memory_max"]]
+        peak = self._peak_memory if not math.isnan(self._peak_memory) else end[F["memory_current"]]
+        report = {
+            "window_seconds": seconds,
+            "cpu_cores": _ratio(delta("cpu_usage_usec") / 1e6, seconds),
+            "cpu_quota_cores": _value(end[F["cpu_quota_cores"]]),
+            "throttled_ratio": _ratio(delta("cpu_throttled_periods"), delta("cpu_periods")),
+            "throttled_peak_ratio": self._peak_throttled,
+            "throttled_seconds": _value(delta("cpu_throttled_usec") / 1e6),
+            "memory_bytes": _value(end[F["memory_current"]]),
+            "memory_peak_bytes": _value(peak),
+            "memory_max_bytes": _value(memory_max),
+            "memory_headroom_bytes": _value(memory_max - peak),
+            "memory_high_events": _value(delta("memory_high_events")),
+            "memory_max_events": _value(delta("memory_max_events")),
+            "oom_kills": _value(delta("oom_kills")),
+            "io_read_bytes_per_second": per_second("io_read_bytes"),
+            "io_write_bytes_per_second": per_second("io_write_bytes"),
+            "pressure": {
+                name.removesuffix("_usec"): _ratio(delta(name) / 1e6, seconds)
+                for name in PRESSURE_FIELDS
+                if not math.isnan(delta(name))
+            },
+            "stall_peak_ratio": self._peak_stall,
+        }
+        self._mark[:] = end
+        self._reset_peaks()
+        return report
+
+    async def run(self, interval: float = 0.1) -> None:
+        """Sample every ``interval`` seconds until cancelled."""
+        import asyncio
+
+        while True:
+            self.sample()
+            await asyncio.sleep(interval)
+
+
+def correlate(latencies: list[float], series: dict[str, list[float | None]]) -> dict[str, float]:
+    """Return the Pearson correlation of probe latency with each resource series.
+
+    Probes where a series has no value are skipped; series that are
+    constant or have fewer than three points are left out.
+    """
+    import statistics
+
+    correlations = {}
+    for name, values in series.items():
+        pairs = [(x, y) for x, y in zip(latencies, values, strict=True) if y is not None]
+        if len(pairs) < 3:
+            continue
+        xs, ys = zip(*pairs, strict=True)
+        with contextlib.suppress(statistics.StatisticsError):
+            correlations[name] = statistics.correlation(xs, ys)
+    return correlations
+
+
+class ResourceWatch:
+    """Sample a cgroup in the background and pair each probe with its resource window."""
+
+    # Report fields correlated with probe latency.
+    SERIES = ("cpu_cores", "throttled_ratio", "memory_headroom_bytes", "stall_peak_ratio")
+
+    def __init__(self, sampler: CgroupSampler, interval: float = 0.1) -> None:
+        """Initialize watch over an open sampler."""
+        self.sampler = sampler
+        self.interval = interval
+        self.latencies: list[float] = []
+        self.series: dict[str, list[float | None]] = {name: [] for name in self.SERIES}
+        self._task: Any = None
+
+    def start(self) -> None:
+        """Start background sampling."""
+        import asyncio
+
+        self.sampler.sample()
+        self._task = asyncio.create_task(self.sampler.run(self.interval))
+
+    async def stop(self) -> None:
+        """Stop sampling and close the sampler."""
+        import asyncio
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.sampler.close()
+
+    def observe(self, latency_ms: float | None) -> dict[str, Any]:
+        """Close the current resource window and record it against ``latency_ms``."""
+        report = self.sampler.collect()
+        if latency_ms is not None:
+            self.latencies.append(latency_ms)
+            for name, values in self.series.items():
+                values.append(report[name])
+        return report
+
+    def correlations(self) -> dict[str, float]:
+        """Return the correlation of probe latency with each resource series."""
+        return correlate(self.latencies, self.series)
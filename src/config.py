@@ -1,55 +1,153 @@
 """Configuration management for n8n deployment."""
 
+from collections.abc import Callable
+import functools
 import os
+from typing import Any, Generic, TypeVar
 
-from dotenv import load_dotenv
+T = TypeVar("T")
 
-load_dotenv()
+# Settings declared by each class, so ``reload`` only re-arms its own.
+_SETTINGS: dict[type, dict[str, "Setting[Any]"]] = {}
+
+
+@functools.cache
+def _load_dotenv() -> None:
+    """Load .env once, on the first setting access rather than at import time."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _optional_int(value: str | None) -> int | None:
+    return int(value) if value is not None else None
+
+
+def _optional_str(value: str | None) -> str | None:
+    return value
+
+
+class Setting(Generic[T]):
+    """Environment-backed setting, evaluated on first access and then memoized.
+
+    The first read replaces the descriptor on the owning class with the
+    parsed value, so later reads are plain attribute lookups.
+    """
+
+    def __init__(self, env: str, default: str | None, cast: Callable[[Any], T]) -> None:
+        """Initialize setting."""
+        self.env = env
+        self.default = default
+        self.cast = cast
+        self.name = env
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """Register the setting with its owner so it can be re-armed by ``Config.reload``."""
+        self.name = name
+        _SETTINGS.setdefault(owner, {})[name] = self
+
+    def __get__(self, instance: object | None, owner: type) -> T:
+        """Read, parse and memoize the environment variable."""
+        _load_dotenv()
+        value = self.cast(os.getenv(self.env, self.default))
+        setattr(owner, self.name, value)
+        return value
+
+
+def setting(env: str, default: str | None, cast: Callable[[Any], T]) -> Any:
+    """Declare a ``Setting`` on a class attribute annotated with its parsed type."""
+    return Setting(env, default, cast)
 
 
 class Config:
     """Application configuration."""
 
     # N8N Settings
-    N8N_PORT: int = int(os.getenv("N8N_PORT", "5678"))
-    N8N_PROTOCOL: str = os.getenv("N8N_PROTOCOL", "https")
-    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    N8N_PORT: int = setting("N8N_PORT", "5678", int)
+    N8N_PROTOCOL: str = setting("N8N_PROTOCOL", "https", str)
+    WEBHOOK_URL: str = setting("WEBHOOK_URL", "", str)
 
     # Authentication
-    N8N_BASIC_AUTH_ACTIVE: bool = os.getenv("N8N_BASIC_AUTH_ACTIVE", "true").lower() == "true"
-    N8N_BASIC_AUTH_USER: str = os.getenv("N8N_BASIC_AUTH_USER", "admin")
-    N8N_BASIC_AUTH_PASSWORD: str = os.getenv("N8N_BASIC_AUTH_PASSWORD", "")
+    N8N_BASIC_AUTH_ACTIVE: bool = setting("N8N_BASIC_AUTH_ACTIVE", "true", _bool)
+    N8N_BASIC_AUTH_USER: str = setting("N8N_BASIC_AUTH_USER", "admin", str)
+    N8N_BASIC_AUTH_PASSWORD: str = setting("N8N_BASIC_AUTH_PASSWORD", "", str)
 
     # Database
-    DB_TYPE: str = os.getenv("DB_TYPE", "postgresdb")
-    DB_POSTGRESDB_HOST: str = os.getenv("DB_POSTGRESDB_HOST", "")
-    DB_POSTGRESDB_PORT: int = int(os.getenv("DB_POSTGRESDB_PORT", "5432"))
-    DB_POSTGRESDB_DATABASE: str = os.getenv("DB_POSTGRESDB_DATABASE", "n8n")
-    DB_POSTGRESDB_USER: str = os.getenv("DB_POSTGRESDB_USER", "")
-    DB_POSTGRESDB_PASSWORD: str = os.getenv("DB_POSTGRESDB_PASSWORD", "")
+    DB_TYPE: str = setting("DB_TYPE", "postgresdb", str)
+    DB_POSTGRESDB_HOST: str = setting("DB_POSTGRESDB_HOST", "", str)
+    DB_POSTGRESDB_PORT: int = setting("DB_POSTGRESDB_PORT", "5432", int)
+    DB_POSTGRESDB_DATABASE: str = setting("DB_POSTGRESDB_DATABASE", "n8n", str)
+    DB_POSTGRESDB_USER: str = setting("DB_POSTGRESDB_USER", "", str)
+    DB_POSTGRESDB_PASSWORD: str = setting("DB_POSTGRESDB_PASSWORD", "", str)
+    DB_POSTGRESDB_SCHEMA: str = setting("DB_POSTGRESDB_SCHEMA", "public", str)
 
     # Security
-    N8N_ENCRYPTION_KEY: str = os.getenv("N8N_ENCRYPTION_KEY", "")
-    N8N_JWT_SECRET: str = os.getenv("N8N_JWT_SECRET", "")
-    N8N_SECURE_COOKIE: bool = os.getenv("N8N_SECURE_COOKIE", "true").lower() == "true"
+    N8N_ENCRYPTION_KEY: str = setting("N8N_ENCRYPTION_KEY", "", str)
+    N8N_JWT_SECRET: str = setting("N8N_JWT_SECRET", "", str)
+    N8N_SECURE_COOKIE: bool = setting("N8N_SECURE_COOKIE", "true", _bool)
 
     # Execution
-    EXECUTIONS_MODE: str = os.getenv("EXECUTIONS_MODE", "regular")
-    EXECUTIONS_TIMEOUT: int = int(os.getenv("EXECUTIONS_TIMEOUT", "3600"))
-    EXECUTIONS_TIMEOUT_MAX: int = int(os.getenv("EXECUTIONS_TIMEOUT_MAX", "7200"))
+    EXECUTIONS_MODE: str = setting("EXECUTIONS_MODE", "regular", str)
+    EXECUTIONS_TIMEOUT: int = setting("EXECUTIONS_TIMEOUT", "3600", int)
+    EXECUTIONS_TIMEOUT_MAX: int = setting("EXECUTIONS_TIMEOUT_MAX", "7200", int)
+    EXECUTIONS_DATA_MAX_AGE: int = setting("EXECUTIONS_DATA_MAX_AGE", "336", int)
 
     # Redis Queue
-    QUEUE_BULL_REDIS_HOST: str | None = os.getenv("QUEUE_BULL_REDIS_HOST")
-    _redis_port = os.getenv("QUEUE_BULL_REDIS_PORT")
-    QUEUE_BULL_REDIS_PORT: int | None = int(_redis_port) if _redis_port is not None else None
-    QUEUE_BULL_REDIS_PASSWORD: str | None = os.getenv("QUEUE_BULL_REDIS_PASSWORD")
+    QUEUE_BULL_REDIS_HOST: str | None = setting("QUEUE_BULL_REDIS_HOST", None, _optional_str)
+    QUEUE_BULL_REDIS_PORT: int | None = setting("QUEUE_BULL_REDIS_PORT", None, _optional_int)
+    QUEUE_BULL_REDIS_PASSWORD: str | None = setting(
+        "QUEUE_BULL_REDIS_PASSWORD", None, _optional_str
+    )
+    QUEUE_BULL_REDIS_DB: int = setting("QUEUE_BULL_REDIS_DB", "0", int)
+    QUEUE_BULL_PREFIX: str = setting("QUEUE_BULL_PREFIX", "bull", str)
 
     # Logging
-    N8N_LOG_LEVEL: str = os.getenv("N8N_LOG_LEVEL", "info")
-    N8N_LOG_OUTPUT: str = os.getenv("N8N_LOG_OUTPUT", "console")
+    N8N_LOG_LEVEL: str = setting("N8N_LOG_LEVEL", "info", str)
+    N8N_LOG_OUTPUT: str = setting("N8N_LOG_OUTPUT", "console", str)
+    N8N_LOG_FILE_LOCATION: str = setting("N8N_LOG_FILE_LOCATION", "", str)
+
+    # Binary data (filesystem mode)
+    N8N_BINARY_DATA_STORAGE_PATH: str = setting("N8N_BINARY_DATA_STORAGE_PATH", "", str)
 
     # Timezone
-    GENERIC_TIMEZONE: str = os.getenv("GENERIC_TIMEZONE", "UTC")
+    GENERIC_TIMEZONE: str = setting("GENERIC_TIMEZONE", "UTC", str)
+
+    # n8n public API
+    N8N_API_KEY: str = setting("N8N_API_KEY", "", str)
+    EXECUTIONS_CACHE_DB: str = setting("EXECUTIONS_CACHE_DB", ".cache/executions.sqlite3", str)
+
+    # Fleet monitoring (comma-separated n8n base URLs)
+    HEALTH_FLEET_TARGETS: str = setting("HEALTH_FLEET_TARGETS", "", str)
+
+    # Health sidecar (`cli.py sidecar`, queried by healthcheck.py)
+    HEALTH_SIDECAR_SOCKET: str = setting("HEALTH_SIDECAR_SOCKET", "/tmp/n8n-health.sock", str)
+
+    # Probe history written by `cli.py health --watch`, read by `cli.py health history`
+    HEALTH_HISTORY_FILE: str = setting("HEALTH_HISTORY_FILE", ".cache/health-history.bin", str)
+
+    # n8n's own Prometheus /metrics, scraped into the runtime health check
+    N8N_METRICS: bool = setting("N8N_METRICS", "false", _bool)
+    HEALTH_EVENT_LOOP_LAG_MAX_MS: float = setting("HEALTH_EVENT_LOOP_LAG_MAX_MS", "500", float)
+    HEALTH_HEAP_PRESSURE_MAX: float = setting("HEALTH_HEAP_PRESSURE_MAX", "0.95", float)
+    HEALTH_HEAP_LIMIT_MB: int | None = setting("HEALTH_HEAP_LIMIT_MB", None, _optional_int)
+
+    # cgroup v2 directory sampled by `cli.py info` and watch mode (default: this process's)
+    HEALTH_CGROUP_PATH: str = setting("HEALTH_CGROUP_PATH", "", str)
+    HEALTH_CGROUP_PID: int | None = setting("HEALTH_CGROUP_PID", None, _optional_int)
+
+    @classmethod
+    def reload(cls, *names: str) -> None:
+        """Discard memoized values so the next access re-reads the environment.
+
+        Only ``names`` are re-armed when given; otherwise every setting is.
+        """
+        settings = _SETTINGS.get(cls, {})
+        for name in names or settings:
+            setattr(cls, name, settings[name])
 
     @classmethod
     def validate(cls) -> list[str]:
@@ -0,0 +1,110 @@
+"""Asynchronous PostgreSQL probe for n8n's database."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any
+
+import asyncpg
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+STATS_QUERY = """
+SELECT
+    (SELECT count(*) FROM pg_stat_activity) AS connections,
+    current_setting('max_connections')::int AS max_connections,
+    (SELECT count(*) FROM pg_locks WHERE NOT granted) AS lock_waits
+"""
+
+PoolFactory = Callable[..., Awaitable[Any]]
+
+
+def connection_kwargs() -> dict[str, Any]:
+    """Build asyncpg connection arguments from the DB_POSTGRESDB_* settings."""
+    return {
+        "host": config.DB_POSTGRESDB_HOST or "localhost",
+        "port": config.DB_POSTGRESDB_PORT,
+        "database": config.DB_POSTGRESDB_DATABASE,
+        "user": config.DB_POSTGRESDB_USER or None,
+        "password": config.DB_POSTGRESDB_PASSWORD or None,
+    }
+
+
+class DatabaseProbe:
+    """Probe PostgreSQL latency and load through a small reusable pool."""
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        min_size: int = 1,
+        max_size: int = 2,
+        pool_factory: PoolFactory | None = None,
+    ) -> None:
+        """Initialize database probe.
+
+        ``pool_factory`` defaults to ``asyncpg.create_pool`` and may be replaced
+        to point the probe at a stand-in server in tests.
+        """
+        self.timeout = timeout
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool_factory = pool_factory or asyncpg.create_pool
+        self._pool: Any = None
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        """Create the connection pool if it is not already open.
+
+        Concurrent callers, such as the probes of a fleet round sharing one
+        probe, wait for a single pool rather than each creating their own.
+        """
+        async with self._lock:
+            if self._pool is None:
+                self._pool = await self._pool_factory(
+                    **connection_kwargs(),
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    timeout=self.timeout,
+                    command_timeout=self.timeout,
+                )
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def check(self) -> dict[str, Any]:
+        """Measure connect time, query round trip, connection usage and lock waits."""
+        try:
+            start = time.perf_counter()
+            await self.open()
+
+            async with self._pool.acquire() as conn:
+                connect_time_ms = (time.perf_counter() - start) * 1000
+
+                query_start = time.perf_counter()
+                await conn.fetchval("SELECT 1")
+                query_time_ms = (time.perf_counter() - query_start) * 1000
+
+                stats = await conn.fetchrow(STATS_QUERY)
+
+            connections = stats["connections"]
+            max_connections = stats["max_connections"]
+
+            return {
+                "status": "healthy",
+                "type": config.DB_TYPE,
+                "connect_time_ms": connect_time_ms,
+                "query_time_ms": query_time_ms,
+                "connections": connections,
+                "max_connections": max_connections,
+                "connection_usage": connections / max_connections if max_connections else 0.0,
+                "lock_waits": stats["lock_waits"],
+            }
+        except Exception as e:
+            logger.error(f"Database check failed: {e}")
+            return {"status": "unhealthy", "error": str(e) or type(e).__name__}
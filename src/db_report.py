@@ -0,0 +1,170 @@
+"""Table size, bloat and index usage report for n8n's PostgreSQL schema."""
+
+import asyncio
+import logging
+from typing import Any
+
+import asyncpg
+
+from src.config import config
+from src.database import PoolFactory, connection_kwargs
+
+logger = logging.getLogger(__name__)
+
+TABLES_QUERY = """
+SELECT
+    s.relname AS name,
+    s.n_live_tup AS live_tuples,
+    s.n_dead_tup AS dead_tuples,
+    coalesce(s.seq_scan, 0) AS seq_scans,
+    coalesce(s.seq_tup_read, 0) AS seq_tuples_read,
+    coalesce(s.idx_scan, 0) AS index_scans,
+    pg_relation_size(s.relid) AS table_bytes,
+    pg_indexes_size(s.relid) AS index_bytes,
+    pg_total_relation_size(s.relid) AS total_bytes,
+    coalesce(io.heap_blks_read, 0) + coalesce(io.idx_blks_read, 0)
+        + coalesce(io.toast_blks_read, 0) + coalesce(io.tidx_blks_read, 0) AS blocks_read,
+    coalesce(io.heap_blks_hit, 0) + coalesce(io.idx_blks_hit, 0)
+        + coalesce(io.toast_blks_hit, 0) + coalesce(io.tidx_blks_hit, 0) AS blocks_hit,
+    greatest(s.last_vacuum, s.last_autovacuum) AS last_vacuum
+FROM pg_stat_user_tables s
+JOIN pg_statio_user_tables io ON io.relid = s.relid
+WHERE s.schemaname = $1
+"""
+
+INDEXES_QUERY = """
+SELECT
+    s.relname AS table_name,
+    s.indexrelname AS name,
+    s.idx_scan AS scans,
+    s.idx_tup_read AS tuples_read,
+    pg_relation_size(s.indexrelid) AS bytes,
+    coalesce(io.idx_blks_read, 0) AS blocks_read,
+    coalesce(io.idx_blks_hit, 0) AS blocks_hit,
+    i.indisunique AS is_unique
+FROM pg_stat_user_indexes s
+JOIN pg_statio_user_indexes io ON io.indexrelid = s.indexrelid
+JOIN pg_index i ON i.indexrelid = s.indexrelid
+WHERE s.schemaname = $1
+"""
+
+STATEMENTS_QUERY = """
+SELECT
+    query,
+    calls,
+    total_exec_time AS total_ms,
+    mean_exec_time AS mean_ms,
+    rows,
+    shared_blks_read AS blocks_read
+FROM pg_stat_statements
+WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+ORDER BY total_exec_time DESC
+LIMIT $1
+"""
+
+DEAD_TUPLE_THRESHOLD = 0.2
+SEQ_SCAN_MIN_ROWS = 10_000
+
+
+def _ratio(part: float, whole: float) -> float:
+    return part / whole if whole else 0.0
+
+
+def rank_tables(rows: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """Derive bloat and scan ratios and rank tables by blocks touched."""
+    tables = []
+    for row in rows:
+        table = dict(row)
+        table["io_blocks"] = table["blocks_read"] + table["blocks_hit"]
+        table["cache_hit_ratio"] = _ratio(table["blocks_hit"], table["io_blocks"])
+        table["dead_ratio"] = _ratio(
+            table["dead_tuples"], table["live_tuples"] + table["dead_tuples"]
+        )
+        table["seq_scan_ratio"] = _ratio(
+            table["seq_scans"], table["seq_scans"] + table["index_scans"]
+        )
+
+        findings = []
+        if table["dead_ratio"] >= DEAD_TUPLE_THRESHOLD:
+            findings.append(f"{table['dead_ratio']:.0%} dead tuples, needs VACUUM")
+        if table["seq_scan_ratio"] > 0.5 and table["live_tuples"] >= SEQ_SCAN_MIN_ROWS:
+            findings.append(f"{table['seq_scan_ratio']:.0%} of scans are sequential")
+        table["findings"] = findings
+        tables.append(table)
+
+    tables.sort(key=lambda t: (t["io_blocks"], t["total_bytes"]), reverse=True)
+    return tables[:limit]
+
+
+def rank_indexes(rows: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """Rank indexes by blocks touched, flagging ones that are never scanned."""
+    indexes = []
+    for row in rows:
+        index = dict(row)
+        index["io_blocks"] = index["blocks_read"] + index["blocks_hit"]
+        index["unused"] = index["scans"] == 0 and not index["is_unique"]
+        indexes.append(index)
+
+    indexes.sort(key=lambda i: (i["io_blocks"], i["bytes"]), reverse=True)
+    return indexes[:limit]
+
+
+async def collect_report(pool: Any, schema: str | None = None, limit: int = 10) -> dict[str, Any]:
+    """Run the catalog queries concurrently over ``pool`` and rank the results.
+
+    ``pg_stat_statements`` is optional; when the extension is missing the
+    report still covers tables and indexes.
+    """
+    schema = schema or config.DB_POSTGRESDB_SCHEMA
+    tables, indexes, statements = await asyncio.gather(
+        pool.fetch(TABLES_QUERY, schema),
+        pool.fetch(INDEXES_QUERY, schema),
+        pool.fetch(STATEMENTS_QUERY, limit),
+        return_exceptions=True,
+    )
+
+    for result in (tables, indexes):
+        if isinstance(result, BaseException):
+            raise result
+
+    report: dict[str, Any] = {
+        "schema": schema,
+        "tables": rank_tables(tables, limit),
+        "indexes": rank_indexes(indexes, limit),
+        "unused_indexes": [
+            index for index in rank_indexes(indexes, len(indexes)) if index["unused"]
+        ],
+        "total_bytes": sum(t["total_bytes"] for t in tables),
+    }
+
+    if isinstance(statements, BaseException):
+        logger.warning(f"pg_stat_statements unavailable: {statements}")
+        report["statements"] = []
+        report["statements_error"] = str(statements)
+    else:
+        report["statements"] = [dict(row) for row in statements]
+
+    return report
+
+
+async def database_report(
+    limit: int = 10, timeout: float = 30, pool_factory: PoolFactory | None = None
+) -> dict[str, Any]:
+    """Open one small pool, collect the report and close the pool."""
+    pool_factory = pool_factory or asyncpg.create_pool
+    try:
+        pool = await pool_factory(
+            **connection_kwargs(),
+            min_size=3,
+            max_size=3,
+            timeout=timeout,
+            command_timeout=timeout,
+        )
+        try:
+            report = await collect_report(pool, limit=limit)
+        finally:
+            await pool.close()
+        return {"status": "healthy", **report}
+    except Exception as e:
+        logger.error(f"Database report failed: {e}")
+        return {"status": "unhealthy", "error": str(e) or type(e).__name__}
@@ -0,0 +1,258 @@
+"""Incremental sync of n8n execution history into a local SQLite cache."""
+
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime
+import logging
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+import httpx
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id TEXT PRIMARY KEY,
+    workflow_id TEXT,
+    mode TEXT,
+    status TEXT,
+    finished INTEGER,
+    started_at_ms INTEGER,
+    stopped_at_ms INTEGER,
+    duration_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_executions_started ON executions (started_at_ms);
+CREATE INDEX IF NOT EXISTS idx_executions_workflow_duration
+    ON executions (workflow_id, duration_ms);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT = """
+INSERT INTO executions (
+    id, workflow_id, mode, status, finished, started_at_ms, stopped_at_ms, duration_ms
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    workflow_id = excluded.workflow_id,
+    mode = excluded.mode,
+    status = excluded.status,
+    finished = excluded.finished,
+    started_at_ms = excluded.started_at_ms,
+    stopped_at_ms = excluded.stopped_at_ms,
+    duration_ms = excluded.duration_ms
+"""
+
+FAILED = """
+    status IN ('error', 'crashed')
+    OR (status IS NULL AND finished = 0 AND stopped_at_ms IS NOT NULL)
+"""
+
+WORKFLOW_STATS = f"""
+WITH ranked AS (
+    SELECT
+        workflow_id,
+        duration_ms,
+        ROW_NUMBER() OVER (PARTITION BY workflow_id ORDER BY duration_ms) AS rn,
+        COUNT(*) OVER (PARTITION BY workflow_id) AS n
+    FROM executions
+    WHERE duration_ms IS NOT NULL AND started_at_ms >= :since
+),
+durations AS (
+    SELECT
+        workflow_id,
+        MIN(CASE WHEN rn >= 0.50 * n THEN duration_ms END) AS p50_ms,
+        MIN(CASE WHEN rn >= 0.90 * n THEN duration_ms END) AS p90_ms,
+        MIN(CASE WHEN rn >= 0.99 * n THEN duration_ms END) AS p99_ms,
+        MAX(duration_ms) AS max_ms
+    FROM ranked
+    GROUP BY workflow_id
+)
+SELECT
+    e.workflow_id,
+    COUNT(*) AS executions,
+    SUM(CASE WHEN {FAILED} THEN 1 ELSE 0 END) AS failures,
+    d.p50_ms,
+    d.p90_ms,
+    d.p99_ms,
+    d.max_ms
+FROM executions e
+LEFT JOIN durations d ON d.workflow_id = e.workflow_id
+WHERE e.started_at_ms >= :since
+GROUP BY e.workflow_id
+ORDER BY executions DESC
+"""
+
+THROUGHPUT = f"""
+SELECT
+    (started_at_ms / :bucket_ms) * :bucket_ms AS bucket_start_ms,
+    COUNT(*) AS executions,
+    SUM(CASE WHEN {FAILED} THEN 1 ELSE 0 END) AS failures
+FROM executions
+WHERE started_at_ms >= :since
+GROUP BY bucket_start_ms
+ORDER BY bucket_start_ms
+"""
+
+
+def id_key(execution_id: str) -> tuple[int, str]:
+    """Sort key ordering numeric execution ids numerically."""
+    return (len(execution_id), execution_id)
+
+
+def parse_timestamp_ms(value: str | None) -> int | None:
+    """Convert an n8n ISO-8601 timestamp to epoch milliseconds."""
+    if not value:
+        return None
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+def execution_row(execution: dict[str, Any]) -> tuple[Any, ...]:
+    """Flatten an executions API record into a table row."""
+    started = parse_timestamp_ms(execution.get("startedAt"))
+    stopped = parse_timestamp_ms(execution.get("stoppedAt"))
+    return (
+        str(execution["id"]),
+        str(execution.get("workflowId", "")),
+        execution.get("mode"),
+        execution.get("status"),
+        int(bool(execution.get("finished"))),
+        started,
+        stopped,
+        stopped - started if started is not None and stopped is not None else None,
+    )
+
+
+class ExecutionStore:
+    """Indexed SQLite store of execution summaries with a sync high-water mark."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Open (and create if needed) the store at ``path``."""
+        path = str(path or config.EXECUTIONS_CACHE_DB)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def upsert(self, executions: Iterable[dict[str, Any]]) -> int:
+        """Insert or update executions in one transaction; return the row count."""
+        rows = [execution_row(e) for e in executions]
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    @property
+    def watermark(self) -> str | None:
+        """Highest execution id below which every execution has finished."""
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def update_watermark(self) -> str | None:
+        """Advance the watermark to just below the oldest still-running execution."""
+        running = self.conn.execute(
+            "SELECT id FROM executions WHERE stopped_at_ms IS NULL "
+            "ORDER BY length(id), id LIMIT 1"
+        ).fetchone()
+
+        if running:
+            row = self.conn.execute(
+                "SELECT id FROM executions "
+                "WHERE length(id) < :n OR (length(id) = :n AND id < :id) "
+                "ORDER BY length(id) DESC, id DESC LIMIT 1",
+                {"n": len(running[0]), "id": running[0]},
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT id FROM executions ORDER BY length(id) DESC, id DESC LIMIT 1"
+            ).fetchone()
+
+        if row:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO sync_state (key, value) VALUES ('watermark', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    (row[0],),
+                )
+        return self.watermark
+
+    def workflow_stats(self, since_ms: int = 0) -> list[dict[str, Any]]:
+        """Per-workflow execution count, failure rate and duration percentiles."""
+        cursor = self.conn.execute(WORKFLOW_STATS, {"since": since_ms})
+        columns = [c[0] for c in cursor.description]
+        stats = [dict(zip(columns, row, strict=True)) for row in cursor]
+        for row in stats:
+            row["failure_rate"] = row["failures"] / row["executions"]
+        return stats
+
+    def durations(self, since_ms: int = 0, workflow_id: str | None = None) -> list[int]:
+        """Recorded durations in milliseconds of finished executions."""
+        query = "SELECT duration_ms FROM executions WHERE duration_ms IS NOT NULL"
+        query += " AND started_at_ms >= :since"
+        if workflow_id is not None:
+            query += " AND workflow_id = :workflow"
+        cursor = self.conn.execute(query, {"since": since_ms, "workflow": workflow_id})
+        return [row[0] for row in cursor]
+
+    def throughput(self, bucket_seconds: int = 3600, since_ms: int = 0) -> list[dict[str, Any]]:
+        """Executions and failures per time bucket."""
+        cursor = self.conn.execute(
+            THROUGHPUT, {"bucket_ms": bucket_seconds * 1000, "since": since_ms}
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row, strict=True)) for row in cursor]
+
+
+async def sync_executions(
+    store: ExecutionStore,
+    client: httpx.AsyncClient,
+    base_url: str,
+    api_key: str | None = None,
+    page_size: int = 250,
+) -> dict[str, Any]:
+    """Stream new or changed executions from the n8n API into ``store``.
+
+    Pages arrive newest first; paging stops at the stored watermark, so
+    repeat runs only fetch executions that are new or were still running
+    last time. The next page is requested while the current one is written.
+    """
+    watermark = store.watermark
+    url = f"{base_url.rstrip('/')}/api/v1/executions"
+    headers = {"X-N8N-API-KEY": api_key or config.N8N_API_KEY}
+
+    async def fetch(cursor: str | None) -> dict[str, Any]:
+        params = {"limit": str(page_size), "includeData": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    pages = 0
+    synced = 0
+    pending = asyncio.create_task(fetch(None))
+
+    while pending is not None:
+        body = await pending
+        page = body.get("data", [])
+        pages += 1
+
+        fresh = [e for e in page if watermark is None or id_key(str(e["id"])) > id_key(watermark)]
+        caught_up = len(fresh) < len(page)
+        cursor = body.get("nextCursor")
+
+        pending = asyncio.create_task(fetch(cursor)) if cursor and not caught_up else None
+        synced += store.upsert(fresh)
+
+    logger.info(f"Synced {synced} executions over {pages} pages")
+    return {"pages": pages, "synced": synced, "watermark": store.update_watermark()}
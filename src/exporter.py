@@ -0,0 +1,197 @@
+"""Prometheus exporter serving cached n8n health results."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+import logging
+import time
+from typing import Any
+
+from src.health_check import HealthChecker
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class TTLCache:
+    """Cache one async result for ``ttl`` seconds, coalescing concurrent refreshes.
+
+    While a refresh is in flight every caller awaits the same task, so any
+    number of simultaneous readers trigger a single upstream fetch.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize cache."""
+        self._fetch = fetch
+        self.ttl = ttl
+        self._clock = clock
+        self._value: Any = None
+        self._fetched_at: float | None = None
+        self._inflight: asyncio.Task[Any] | None = None
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the cached value was fetched, or None if empty."""
+        if self._fetched_at is None:
+            return None
+        return self._clock() - self._fetched_at
+
+    async def get(self) -> Any:
+        """Return the cached value, refreshing it if missing or expired."""
+        age = self.age
+        if age is not None and age < self.ttl:
+            return self._value
+        return await self.refresh()
+
+    async def refresh(self) -> Any:
+        """Fetch a new value, joining any refresh already in flight."""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run())
+        return await asyncio.shield(self._inflight)
+
+    async def _run(self) -> Any:
+        try:
+            self._value = await self._fetch()
+            self._fetched_at = self._clock()
+            return self._value
+        finally:
+            self._inflight = None
+
+
+def _metric_value(value: Any) -> float | None:
+    """Convert a check field to a sample value, or None if not numeric."""
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, int | float):
+        return float(value)
+    return None
+
+
+def render_metrics(result: dict[str, Any], cache_age: float | None = None) -> str:
+    """Render a full_health_check result in the Prometheus text format.
+
+    Every numeric field of every check becomes an ``n8n_check_<field>`` gauge
+    labelled by check name; ``*_ms`` fields are converted to seconds. A
+    check's ``phases_ms`` breakdown becomes ``n8n_check_phase_seconds``
+    labelled by check and phase, and counter ``rates`` become
+    ``n8n_check_rate_per_second`` labelled by check and counter name.
+    """
+    samples: dict[str, list[str]] = {}
+
+    def add(name: str, value: float, labels: str = "") -> None:
+        samples.setdefault(name, []).append(f"{name}{labels} {value:g}")
+
+    add("n8n_health_healthy", 1.0 if result["status"] == "healthy" else 0.0)
+
+    for check_name, check in sorted(result.get("checks", {}).items()):
+        labels = f'{{check="{check_name}"}}'
+        status = check.get("status")
+        if status != "not_applicable":
+            add("n8n_check_healthy", 1.0 if status == "healthy" else 0.0, labels)
+
+        for phase, raw in check.get("phases_ms", {}).items():
+            phase_labels = f'{{check="{check_name}",phase="{phase}"}}'
+            add("n8n_check_phase_seconds", raw / 1000, phase_labels)
+        for counter, rate in sorted(check.get("rates", {}).items()):
+            add("n8n_check_rate_per_second", rate, f'{{check="{check_name}",counter="{counter}"}}')
+
+        for field, raw in sorted(check.items()):
+            value = _metric_value(raw)
+            if value is None:
+                continue
+            name = f"n8n_check_{field}"
+            if field.endswith("_ms"):
+                name = f"n8n_check_{field[:-3]}_seconds"
+                value /= 1000
+            add(name, value, labels)
+
+    if cache_age is not None:
+        add("n8n_exporter_cache_age_seconds", cache_age)
+
+    lines = []
+    for name, metric_lines in samples.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(metric_lines)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Serve ``/metrics`` from a background-refreshed TTL cache."""
+
+    def __init__(self, checker: HealthChecker, ttl: float = 15.0) -> None:
+        """Initialize exporter."""
+        self.checker = checker
+        self.cache = TTLCache(checker.full_health_check, ttl)
+        self._refresher: asyncio.Task[None] | None = None
+
+    async def _refresh_loop(self) -> None:
+        """Keep the cache warm so scrapes rarely wait on a probe."""
+        while True:
+            try:
+                await self.cache.refresh()
+            except Exception as e:
+                logger.error(f"Background refresh failed: {e}")
+            await asyncio.sleep(self.cache.ttl)
+
+    async def metrics(self) -> str:
+        """Return the current metrics page."""
+        result = await self.cache.get()
+        return render_metrics(result, self.cache.age)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one HTTP request.
+
+        When no health result can be had, ``/metrics`` answers 503 with the
+        error instead of dropping the connection.
+        """
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else ""
+
+            if path.split("?", 1)[0] == "/metrics":
+                try:
+                    status, body = "200 OK", await self.metrics()
+                except Exception as e:
+                    logger.error(f"Scrape failed: {e}")
+                    status, body = "503 Service Unavailable", f"{str(e) or type(e).__name__}\n"
+            else:
+                status, body = "404 Not Found", "Not Found\n"
+
+            payload = body.encode()
+            head = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode() + payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.debug(f"Scrape connection dropped: {e}")
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "0.0.0.0", port: int = 9464) -> asyncio.Server:
+        """Start the background refresh loop and the HTTP server."""
+        await self.checker.open()
+        self._refresher = asyncio.create_task(self._refresh_loop())
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and close probe connections."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+        await self.checker.aclose()
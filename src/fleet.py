@@ -0,0 +1,127 @@
+"""Concurrent health probing across a fleet of n8n instances."""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+import httpx
+
+from src.config import config
+from src.health_check import HealthChecker, http2_available
+from src.resilience import AdaptiveTimeout, CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+def parse_targets(lines: Iterable[str]) -> list[str]:
+    """Parse target URLs, skipping blanks, comments and duplicates."""
+    targets: list[str] = []
+    seen: set[str] = set()
+
+    for raw in lines:
+        for item in raw.split(","):
+            url = item.split("#", 1)[0].strip().rstrip("/")
+            if url and url not in seen:
+                seen.add(url)
+                targets.append(url)
+
+    return targets
+
+
+def load_targets(path: str | None = None) -> list[str]:
+    """Load fleet targets from a file, or from HEALTH_FLEET_TARGETS when no path is given."""
+    if path:
+        with Path(path).open() as f:
+            return parse_targets(f)
+
+    return parse_targets([config.HEALTH_FLEET_TARGETS])
+
+
+async def probe_fleet(
+    targets: list[str],
+    concurrency: int = 50,
+    deadline: float = 15.0,
+    timeout: int = 10,
+    timeouts: dict[str, AdaptiveTimeout] | None = None,
+    breakers: dict[str, CircuitBreaker] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Probe every target concurrently, yielding results as they complete.
+
+    At most ``concurrency`` probes are in flight at once and each is cancelled
+    after ``deadline`` seconds, so total wall time tracks the slowest target
+    rather than the sum of all of them. All probes share one HTTP connection
+    pool. The database and queue configured locally say nothing about each
+    target, so they are not checked. Passing the same ``timeouts`` and
+    ``breakers`` mappings to repeated rounds keeps per-target latency history,
+    so dead targets fail fast instead of holding a concurrency slot for
+    ``timeout``.
+    """
+    timeouts = {} if timeouts is None else timeouts
+    breakers = {} if breakers is None else breakers
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    limits = httpx.Limits(max_connections=max(concurrency, 1), keepalive_expiry=60)
+
+    async with httpx.AsyncClient(timeout=timeout, http2=http2_available(), limits=limits) as client:
+
+        async def probe(url: str) -> dict[str, Any]:
+            async with semaphore:
+                checker = HealthChecker(
+                    base_url=url,
+                    timeout=timeout,
+                    client=client,
+                    adaptive_timeout=timeouts.setdefault(url, AdaptiveTimeout(ceiling=timeout)),
+                    breaker=breakers.setdefault(url, CircuitBreaker()),
+                    backends=False,
+                )
+                start = time.perf_counter()
+                try:
+                    async with asyncio.timeout(deadline):
+                        result = await checker.full_health_check()
+                except TimeoutError:
+                    logger.error(f"Fleet probe for {url} exceeded {deadline}s deadline")
+                    result = {"status": "unhealthy", "error": "deadline exceeded", "checks": {}}
+
+                result["url"] = url
+                result["duration_ms"] = (time.perf_counter() - start) * 1000
+                result["circuit"] = checker.breaker.state
+                return result
+
+        tasks = [asyncio.create_task(probe(url)) for url in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def summarize(results: list[dict[str, Any]], wall_time_ms: float) -> dict[str, Any]:
+    """Build an aggregate summary of fleet probe results.
+
+    ``phase_p50_ms`` holds the median of each request phase over the
+    targets whose n8n probe reported one.
+    """
+    durations = sorted(r["duration_ms"] for r in results)
+    phases: dict[str, list[float]] = {}
+    for r in results:
+        for phase, value in r.get("checks", {}).get("n8n", {}).get("phases_ms", {}).items():
+            phases.setdefault(phase, []).append(value)
+    healthy = sum(1 for r in results if r["status"] == "healthy")
+    slowest = max(results, key=lambda r: r["duration_ms"], default=None)
+
+    return {
+        "total": len(results),
+        "healthy": healthy,
+        "unhealthy": len(results) - healthy,
+        "wall_time_ms": wall_time_ms,
+        "p50_ms": durations[len(durations) // 2] if durations else 0.0,
+        "max_ms": durations[-1] if durations else 0.0,
+        "slowest": slowest["url"] if slowest else None,
+        "open_circuits": sum(1 for r in results if r.get("circuit", "closed") != "closed"),
+        "phase_p50_ms": {
+            phase: sorted(values)[len(values) // 2] for phase, values in phases.items()
+        },
+    }
@@ -1,62 +1,383 @@
 """Health check utilities for n8n deployment."""
 
+import asyncio
+import contextlib
+import importlib.util
+import ipaddress
 import logging
+import socket
+import time
 from typing import Any
 
 import httpx
 
 from src.config import config
+from src.database import DatabaseProbe
+from src.histogram import LatencyHistogram
+from src.n8n_metrics import MetricsScraper, assess
+from src.queue_probe import QueueProbe
+from src.resilience import AdaptiveTimeout, CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+PHASES = ("dns", "tcp_connect", "tls", "ttfb", "body")
+# httpcore trace steps, without their connection/http11/http2 prefix, whose
+# ``started`` and ``complete`` events open and close each phase.
+PHASE_STARTS = {
+    "connect_tcp": "tcp_connect",
+    "connect_unix_socket": "tcp_connect",
+    "start_tls": "tls",
+    "send_request_headers": "ttfb",
+    "receive_response_body": "body",
+}
+PHASE_ENDS = {
+    "connect_tcp": "tcp_connect",
+    "connect_unix_socket": "tcp_connect",
+    "start_tls": "tls",
+    "receive_response_headers": "ttfb",
+    "receive_response_body": "body",
+}
+
+
+def http2_available() -> bool:
+    """Return True when the optional ``h2`` package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ConnectionTimer:
+    """httpx trace hook that splits a request into DNS, connect, TLS, TTFB and body phases.
+
+    httpcore reports name resolution as part of ``connect_tcp``, so when a
+    new connection is opened to a host name the hook resolves it itself and
+    times that as ``dns``. httpcore passes the ``connect_tcp.started`` info
+    dict on to the network backend as its arguments, so the hook replaces
+    the host there with the resolved address and the connection does not
+    look the name up a second time. TLS server names and Host headers come
+    from the request URL, so they are unaffected.
+    """
+
+    def __init__(self, resolve: bool = True) -> None:
+        """Initialize connection timer; ``resolve=False`` skips DNS timing."""
+        self.resolve = resolve
+        self.connect_seconds = 0.0
+        self.connected = False
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._started: dict[str, float] = {}
+
+    async def _resolve(self, info: dict[str, Any]) -> None:
+        host = info.get("host")
+        if not self.resolve or not host:
+            return
+        try:
+            ipaddress.ip_address(host)
+            return
+        except ValueError:
+            pass
+        start = time.perf_counter()
+        with contextlib.suppress(OSError):
+            loop = asyncio.get_running_loop()
+            addresses = await loop.getaddrinfo(host, info.get("port"), type=socket.SOCK_STREAM)
+            if addresses:
+                info["host"] = addresses[0][4][0]
+        self.phases["dns"] += time.perf_counter() - start
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        """Record phase start/complete events."""
+        prefix, _, rest = event_name.partition(".")
+        step, _, stage = rest.rpartition(".")
+        if stage == "started" and step in PHASE_STARTS:
+            phase = PHASE_STARTS[step]
+            if step == "connect_tcp":
+                dns = self.phases["dns"]
+                await self._resolve(info)
+                self.connect_seconds += self.phases["dns"] - dns
+            self._started[phase] = time.perf_counter()
+        elif stage == "complete" and PHASE_ENDS.get(step) in self._started:
+            phase = PHASE_ENDS[step]
+            elapsed = time.perf_counter() - self._started.pop(phase)
+            self.phases[phase] += elapsed
+            if prefix == "connection":
+                self.connect_seconds += elapsed
+                self.connected = True
+
+    @property
+    def connect_ms(self) -> float:
+        """Connection setup time in milliseconds."""
+        return self.connect_seconds * 1000
+
+    @property
+    def phases_ms(self) -> dict[str, float]:
+        """Time per phase in milliseconds."""
+        return {phase: seconds * 1000 for phase, seconds in self.phases.items()}
+
 
 class HealthChecker:
     """Health check for n8n instance."""
 
-    def __init__(self, base_url: str | None = None, timeout: int = 10) -> None:
-        """Initialize health checker."""
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: int = 10,
+        http2: bool | None = None,
+        client: httpx.AsyncClient | None = None,
+        database: DatabaseProbe | None = None,
+        pool_size: int = 4,
+        adaptive_timeout: AdaptiveTimeout | None = None,
+        breaker: CircuitBreaker | None = None,
+        backends: bool = True,
+    ) -> None:
+        """Initialize health checker.
+
+        A caller-owned ``client`` or ``database`` probe may be passed to share
+        one connection pool between many checkers; neither is closed by the
+        checker. ``adaptive_timeout`` and ``breaker`` carry per-target probe
+        history and may be passed in to keep it across checkers. With
+        ``backends`` false the database and queue configured locally are not
+        checked, for targets that are not backed by them.
+        """
         self.base_url = base_url or f"http://localhost:{config.N8N_PORT}"
         self.timeout = timeout
+        self.http2 = http2_available() if http2 is None else http2
+        self.pool_size = pool_size
+        self._client: httpx.AsyncClient | None = client
+        self._owns_client = client is None
+        self._database: DatabaseProbe | None = database
+        self._owns_database = database is None
+        self._queue: QueueProbe | None = None
+        self.adaptive_timeout = adaptive_timeout or AdaptiveTimeout(ceiling=timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.backends = backends
+        self.metrics = MetricsScraper()
+
+    async def __aenter__(self) -> "HealthChecker":
+        """Open a pooled client for the lifetime of the context."""
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the pooled client."""
+        await self.aclose()
+
+    async def open(self) -> None:
+        """Open a long-lived keep-alive client reused by every probe."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=max(self.pool_size, 1),
+                    max_keepalive_connections=max(self.pool_size, 1),
+                    keepalive_expiry=300,
+                ),
+            )
+        if not self.backends:
+            return
+        if self._database is None and config.DB_TYPE == "postgresdb":
+            self._database = DatabaseProbe(timeout=self.timeout)
+        if self._queue is None and config.EXECUTIONS_MODE == "queue":
+            self._queue = QueueProbe(timeout=self.timeout)
+
+    async def aclose(self) -> None:
+        """Close the pooled client, database pool and Redis pool, if open."""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+        if self._database is not None and self._owns_database:
+            await self._database.aclose()
+            self._database = None
+        if self._queue is not None:
+            await self._queue.aclose()
+            self._queue = None
+
+    async def _probe(self, client: httpx.AsyncClient, timeout: float) -> dict[str, Any]:
+        """Probe /healthz, separating connection setup from request latency.
+
+        ``phases_ms`` breaks the request down by phase; the setup phases are
+        zero when a pooled connection was reused.
+        """
+        timer = ConnectionTimer()
+        response = await client.get(
+            f"{self.base_url}/healthz", timeout=timeout, extensions={"trace": timer}
+        )
+
+        response_time_ms = response.elapsed.total_seconds() * 1000
+        return {
+            "status": "healthy" if response.status_code == 200 else "unhealthy",
+            "status_code": response.status_code,
+            "response_time_ms": response_time_ms,
+            "connect_time_ms": timer.connect_ms,
+            "latency_ms": max(response_time_ms - timer.connect_ms, 0.0),
+            "connection_reused": not timer.connected,
+            "timeout_ms": timeout * 1000,
+            "phases_ms": timer.phases_ms,
+        }
 
     async def check_health(self) -> dict[str, Any]:
-        """Check n8n health status."""
+        """Check n8n health status.
+
+        Probes are refused without a request while the circuit breaker is
+        open. Only transport failures count against the breaker: a target
+        that answers with an error status is unhealthy but reachable, and a
+        probe cancelled by its caller is neither.
+        """
+        if not self.breaker.allow():
+            return {
+                "status": "unhealthy",
+                "error": "circuit open",
+                "retry_in_ms": self.breaker.retry_in * 1000,
+            }
+
+        timeout = self.adaptive_timeout.current
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/healthz")
-
-                return {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "status_code": response.status_code,
-                    "response_time_ms": response.elapsed.total_seconds() * 1000,
-                }
+            if self._client is not None:
+                result = await self._probe(self._client, timeout)
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    result = await self._probe(client, timeout)
         except httpx.TimeoutException:
-            logger.error("Health check timed out")
-            return {"status": "unhealthy", "error": "timeout"}
+            logger.error(f"Health check timed out after {timeout:.2f}s")
+            self.adaptive_timeout.observe_timeout()
+            self.breaker.record_failure()
+            return {"status": "unhealthy", "error": "timeout", "timeout_ms": timeout * 1000}
         except httpx.RequestError as e:
             logger.error(f"Health check failed: {e}")
+            self.breaker.record_failure()
             return {"status": "unhealthy", "error": str(e)}
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        self.adaptive_timeout.observe(result["response_time_ms"] / 1000)
+        self.breaker.record_success()
+        return result
+
+    async def sample_latency(
+        self,
+        samples: int,
+        concurrency: int = 10,
+        path: str = "/healthz",
+        histogram: LatencyHistogram | None = None,
+        phases: dict[str, LatencyHistogram] | None = None,
+    ) -> tuple[LatencyHistogram, int]:
+        """Fire ``samples`` requests at ``path`` and record their latencies.
+
+        Requests are issued by ``concurrency`` workers sharing the pooled
+        client. Returns the histogram and the number of failed requests.
+        When ``phases`` is given, each request is traced and its phase times
+        are recorded into per-phase histograms, created as needed; setup
+        phases are only recorded for requests that opened a connection.
+        """
+        histogram = histogram or LatencyHistogram()
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        remaining = samples
+        errors = 0
 
-    def check_database(self) -> dict[str, Any]:
+        async def worker(client: httpx.AsyncClient) -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                timer = ConnectionTimer()
+                extensions = {"trace": timer} if phases is not None else None
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url, extensions=extensions)
+                except httpx.RequestError as e:
+                    logger.debug(f"Sample request failed: {e}")
+                    errors += 1
+                    continue
+                histogram.record((time.perf_counter() - start) * 1000)
+                if phases is not None:
+                    for phase, value in timer.phases_ms.items():
+                        if timer.connected or phase in ("ttfb", "body"):
+                            phases.setdefault(phase, LatencyHistogram()).record(value)
+                if response.status_code != 200:
+                    errors += 1
+
+        opened = self._client is None
+        if opened:
+            await self.open()
+        try:
+            client = self._client
+            assert client is not None
+            await asyncio.gather(*(worker(client) for _ in range(max(concurrency, 1))))
+        finally:
+            if opened:
+                await self.aclose()
+
+        return histogram, errors
+
+    async def check_database(self) -> dict[str, Any]:
         """Check database connectivity."""
+        if not self.backends:
+            return {"status": "not_applicable", "message": "Backends not checked for this target"}
         if config.DB_TYPE != "postgresdb":
             return {"status": "not_applicable", "message": "Not using PostgreSQL"}
 
+        if self._database is not None:
+            return await self._database.check()
+
+        probe = DatabaseProbe(timeout=self.timeout, max_size=1)
         try:
-            # This would require psycopg2 or asyncpg for real implementation
-            # Simplified for demonstration
-            return {"status": "healthy", "type": config.DB_TYPE}
-        except Exception as e:
-            logger.error(f"Database check failed: {e}")
-            return {"status": "unhealthy", "error": str(e)}
+            return await probe.check()
+        finally:
+            await probe.aclose()
+
+    async def check_queue(self) -> dict[str, Any]:
+        """Check Bull queue depth and worker lag."""
+        if not self.backends:
+            return {"status": "not_applicable", "message": "Backends not checked for this target"}
+        if config.EXECUTIONS_MODE != "queue":
+            return {"status": "not_applicable", "message": "Not running in queue mode"}
+
+        if self._queue is not None:
+            return await self._queue.check()
+
+        probe = QueueProbe(timeout=self.timeout)
+        try:
+            return await probe.check()
+        finally:
+            await probe.aclose()
+
+    async def check_runtime(self) -> dict[str, Any]:
+        """Check event loop lag and heap pressure from n8n's own /metrics page.
+
+        Counter rates are reported from the second check onwards, since the
+        scraper keeps the previous scrape.
+        """
+        if not config.N8N_METRICS:
+            return {"status": "not_applicable", "message": "N8N_METRICS is disabled"}
+
+        url = f"{self.base_url}/metrics"
+        try:
+            if self._client is not None:
+                report = await self.metrics.scrape(self._client, url)
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    report = await self.metrics.scrape(client, url)
+        except httpx.HTTPError as e:
+            logger.error(f"Metrics scrape failed: {e}")
+            return {"status": "unhealthy", "error": str(e) or type(e).__name__}
+
+        reasons = assess(report)
+        if reasons:
+            return {"status": "unhealthy", "error": "; ".join(reasons), **report}
+        return {"status": "healthy", **report}
 
     async def full_health_check(self) -> dict[str, Any]:
         """Perform full health check."""
-        health = await self.check_health()
-        database = self.check_database()
+        health, database, queue, runtime = await asyncio.gather(
+            self.check_health(), self.check_database(), self.check_queue(), self.check_runtime()
+        )
 
         overall_status = (
             "healthy"
-            if health["status"] == "healthy" and database["status"] in ["healthy", "not_applicable"]
+            if health["status"] == "healthy"
+            and database["status"] in ["healthy", "not_applicable"]
+            and queue["status"] in ["healthy", "not_applicable"]
+            and runtime["status"] in ["healthy", "not_applicable"]
             else "unhealthy"
         )
 
@@ -65,5 +386,7 @@ class HealthChecker:
             "checks": {
                 "n8n": health,
                 "database": database,
+                "queue": queue,
+                "runtime": runtime,
             },
         }
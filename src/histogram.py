@@ -0,0 +1,162 @@
+"""Fixed-memory log-bucketed latency histogram."""
+
+from array import array
+from collections.abc import Iterable
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+# Each power-of-two range is split into 2**SUB_BUCKET_BITS linear buckets,
+# bounding the relative error of any recorded value to 1 / 2**SUB_BUCKET_BITS.
+SUB_BUCKET_BITS = 6
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# Values are stored in microseconds; 2**40us is roughly 12.7 days.
+MAX_EXPONENT = 40
+BUCKET_COUNT = SUB_BUCKET_COUNT + (MAX_EXPONENT - SUB_BUCKET_BITS + 1) * SUB_BUCKET_COUNT
+MAX_VALUE_US = (1 << (MAX_EXPONENT + 1)) - 1
+
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+DISTRIBUTION_PERCENTILES = (0.0, 50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 99.99, 100.0)
+
+
+def bucket_index(value_us: int) -> int:
+    """Return the bucket index for a value in microseconds."""
+    value_us = min(max(value_us, 0), MAX_VALUE_US)
+    if value_us < SUB_BUCKET_COUNT:
+        return value_us
+
+    exponent = value_us.bit_length() - 1
+    shift = exponent - SUB_BUCKET_BITS
+    sub_bucket = (value_us >> shift) - SUB_BUCKET_COUNT
+    return SUB_BUCKET_COUNT + shift * SUB_BUCKET_COUNT + sub_bucket
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Return the highest value in microseconds that maps to ``index``."""
+    if index < SUB_BUCKET_COUNT:
+        return index
+
+    shift, sub_bucket = divmod(index - SUB_BUCKET_COUNT, SUB_BUCKET_COUNT)
+    lowest = (SUB_BUCKET_COUNT + sub_bucket) << shift
+    return lowest + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR-style histogram recording latencies in a fixed number of buckets.
+
+    Memory use is constant regardless of how many samples are recorded, and
+    histograms from separate runs or hosts can be merged exactly because
+    they share the same bucket layout.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        """Record a latency in milliseconds."""
+        value_us = min(max(round(value_ms * 1000), 0), MAX_VALUE_US)
+        self.counts[bucket_index(value_us)] += count
+
+        if self.total == 0 or value_us < self.min_us:
+            self.min_us = value_us
+        self.max_us = max(self.max_us, value_us)
+        self.total += count
+        self.sum_us += value_us * count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add every sample recorded in ``other`` to this histogram."""
+        if other.total == 0:
+            return
+
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+
+        self.min_us = other.min_us if self.total == 0 else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        self.total += other.total
+        self.sum_us += other.sum_us
+
+    def percentile(self, percentile: float) -> float:
+        """Return the latency in milliseconds at ``percentile`` (0-100)."""
+        if self.total == 0:
+            return 0.0
+        if percentile >= 100.0:
+            return self.max_us / 1000
+        if percentile <= 0.0:
+            return self.min_us / 1000
+
+        target = max(math.ceil(percentile / 100 * self.total), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_upper_bound(index), self.max_us) / 1000
+
+        return self.max_us / 1000
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in milliseconds."""
+        return self.sum_us / self.total / 1000 if self.total else 0.0
+
+    def summary(self) -> dict[str, float]:
+        """Return count, mean, p50/p90/p99/p99.9 and max in milliseconds."""
+        result = {"count": float(self.total), "mean": self.mean}
+        for percentile in REPORT_PERCENTILES:
+            result[f"p{percentile:g}"] = self.percentile(percentile)
+        result["max"] = self.max_us / 1000
+        return result
+
+    def distribution(
+        self, percentiles: Iterable[float] = DISTRIBUTION_PERCENTILES
+    ) -> list[tuple[float, float]]:
+        """Return ``(percentile, latency_ms)`` rows for a distribution table."""
+        return [(p, self.percentile(p)) for p in percentiles]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export the histogram as a sparse, JSON-serializable mapping."""
+        return {
+            "sub_bucket_bits": SUB_BUCKET_BITS,
+            "max_exponent": MAX_EXPONENT,
+            "total": self.total,
+            "sum_us": self.sum_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "counts": {str(i): c for i, c in enumerate(self.counts) if c},
+            "distribution": [{"percentile": p, "latency_ms": v} for p, v in self.distribution()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram exported with :meth:`to_dict`."""
+        if (
+            data.get("sub_bucket_bits") != SUB_BUCKET_BITS
+            or data.get("max_exponent") != MAX_EXPONENT
+        ):
+            raise ValueError("Histogram bucket layout does not match")
+
+        histogram = cls()
+        for index, count in data["counts"].items():
+            histogram.counts[int(index)] = count
+        histogram.total = data["total"]
+        histogram.sum_us = data["sum_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
+
+    def save(self, path: str | Path) -> None:
+        """Write the histogram to a JSON file."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LatencyHistogram":
+        """Read a histogram from a JSON file."""
+        return cls.from_dict(json.loads(Path(path).read_text()))
@@ -0,0 +1,368 @@
+"""Memory-mapped, fixed-size ring buffers of health probe results with 1m and 1h rollups."""
+
+from collections.abc import Iterator
+import logging
+import math
+import mmap
+from pathlib import Path
+import struct
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"N8NHIST\x01"
+VERSION = 3
+HEADER = struct.Struct("<8sI4x")
+# Per ring: record size, capacity (records), records ever written.
+SECTION = struct.Struct("<IIQ")
+# Request phases of the n8n probe, as reported in its ``phases_ms``.
+PHASES = ("dns", "tcp_connect", "tls", "ttfb", "body")
+# Probe timestamp (ms), healthy flag, n8n latency, database query time, queue lag and
+# one time per phase (ms, NaN when the check did not report one).
+RAW = struct.Struct(f"<qB3xfff{len(PHASES)}f")
+# Bucket start (ms), probes, failures, latency samples, latency mean, min, max, the mean
+# of each phase (ms) and the number of samples that reported each phase.
+ROLLUP = struct.Struct(f"<qIIIfff{len(PHASES)}f{len(PHASES)}I")
+TIMESTAMP = struct.Struct("<q")
+
+RESOLUTIONS = {"raw": 0, "1m": 60_000, "1h": 3_600_000}
+# About 35 days of raw probes at a 30s interval, 30 days of minutes and a year of hours.
+DEFAULT_CAPACITY = {"raw": 100_000, "1m": 43_200, "1h": 8_760}
+HEADER_BYTES = HEADER.size + SECTION.size * len(RESOLUTIONS)
+
+
+def _value(value: float) -> float | None:
+    return None if math.isnan(value) else round(value, 3)
+
+
+def _fold(mean: float, value: float, samples: int) -> float:
+    """Add ``value`` to a running mean of ``samples`` values, skipping NaN.
+
+    ``samples`` counts the values already in ``mean``, so each phase keeps
+    its own count: a phase not reported by every probe is averaged only
+    over the probes that reported it.
+    """
+    if math.isnan(value):
+        return mean
+    if samples == 0 or math.isnan(mean):
+        return value
+    return mean + (value - mean) / (samples + 1)
+
+
+def _phases(values: list[float]) -> dict[str, float]:
+    return {
+        phase: round(v, 3) for phase, v in zip(PHASES, values, strict=True) if not math.isnan(v)
+    }
+
+
+class Ring:
+    """A fixed-capacity ring of fixed-size records in a section of the mapped file.
+
+    Records are kept in append order, so a time range is found by binary
+    search on the leading timestamp and only the pages it covers are read.
+    """
+
+    def __init__(
+        self, mm: mmap.mmap, index: int, offset: int, record: struct.Struct, capacity: int
+    ) -> None:
+        """Wrap section ``index`` of the header, whose records start at ``offset``."""
+        self.mm = mm
+        self.header_offset = HEADER.size + index * SECTION.size
+        self.offset = offset
+        self.record = record
+        self.capacity = capacity
+
+    @property
+    def written(self) -> int:
+        """Records ever appended, including those since overwritten."""
+        return SECTION.unpack_from(self.mm, self.header_offset)[2]
+
+    def __len__(self) -> int:
+        """Number of records currently held."""
+        return min(self.written, self.capacity)
+
+    def _position(self, index: int) -> int:
+        slot = (self.written - len(self) + index) % self.capacity
+        return self.offset + slot * self.record.size
+
+    def get(self, index: int) -> tuple[Any, ...]:
+        """Return the record at logical ``index``, oldest first."""
+        return self.record.unpack_from(self.mm, self._position(index))
+
+    def last(self) -> tuple[Any, ...] | None:
+        """Return the newest record."""
+        return self.get(len(self) - 1) if len(self) else None
+
+    def append(self, values: tuple[Any, ...]) -> None:
+        """Write a record over the oldest slot, then publish it by bumping the count."""
+        written = self.written
+        slot = written % self.capacity
+        self.record.pack_into(self.mm, self.offset + slot * self.record.size, *values)
+        SECTION.pack_into(self.mm, self.header_offset, self.record.size, self.capacity, written + 1)
+
+    def replace_last(self, values: tuple[Any, ...]) -> None:
+        """Overwrite the newest record in place."""
+        self.record.pack_into(self.mm, self._position(len(self) - 1), *values)
+
+    def bisect(self, timestamp_ms: int) -> int:
+        """Return the logical index of the first record at or after ``timestamp_ms``."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if TIMESTAMP.unpack_from(self.mm, self._position(middle))[0] < timestamp_ms:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def scan(self, start_ms: int, end_ms: int) -> Iterator[tuple[Any, ...]]:
+        """Yield records with ``start_ms <= timestamp < end_ms``."""
+        for index in range(self.bisect(start_ms), len(self)):
+            record = self.get(index)
+            if record[0] >= end_ms:
+                break
+            yield record
+
+
+class ProbeHistory:
+    """Append-only probe history file holding raw, per-minute and per-hour rings.
+
+    The file is created at its full size and memory-mapped, so it never
+    grows: once a ring is full each append overwrites its oldest record.
+    Rollups are updated in place as probes arrive, so long ranges are
+    answered from the coarse rings without touching raw records. One
+    process writes; readers may map the same file at any time.
+    """
+
+    def __init__(self, path: str | Path, capacity: dict[str, int] | None = None) -> None:
+        """Open ``path``, creating it with ``capacity`` records per ring if missing.
+
+        A history file written in another format version is recreated, losing
+        its records, since the history is only a bounded cache of probes.
+        Raises ValueError for a file that is not a probe history at all.
+        """
+        self.path = Path(path)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self._create(capacity or DEFAULT_CAPACITY)
+        self._map()
+        magic, version = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a probe history file")
+        if version != VERSION:
+            logger.warning(
+                f"Recreating {self.path}: probe history version {version} "
+                f"is not the supported version {VERSION}"
+            )
+            self.close()
+            self._create(capacity or DEFAULT_CAPACITY)
+            self._map()
+
+        self.rings: dict[str, Ring] = {}
+        offset = HEADER_BYTES
+        for index, name in enumerate(RESOLUTIONS):
+            size, slots, _ = SECTION.unpack_from(self.mm, HEADER.size + index * SECTION.size)
+            record = RAW if name == "raw" else ROLLUP
+            self.rings[name] = Ring(self.mm, index, offset, record, slots)
+            offset += size * slots
+
+    def _map(self) -> None:
+        self.file = self.path.open("r+b")
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+
+    def _create(self, capacity: dict[str, int]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = bytearray(HEADER_BYTES)
+        HEADER.pack_into(header, 0, MAGIC, VERSION)
+        size = HEADER_BYTES
+        for index, name in enumerate(RESOLUTIONS):
+            record = RAW if name == "raw" else ROLLUP
+            slots = max(capacity.get(name, DEFAULT_CAPACITY[name]), 1)
+            SECTION.pack_into(header, HEADER.size + index * SECTION.size, record.size, slots, 0)
+            size += record.size * slots
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            f.write(header)
+            f.truncate(size)
+        tmp.replace(self.path)
+
+    def __enter__(self) -> "ProbeHistory":
+        """Return the open history."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the history."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self.mm.close()
+        self.file.close()
+
+    def append(self, timestamp: float, result: dict[str, Any]) -> None:
+        """Record one ``full_health_check`` result and fold it into the rollups.
+
+        Timestamps are clamped to the newest record so the rings stay
+        sorted if the wall clock steps backwards.
+        """
+        checks = result.get("checks", {})
+        healthy = result.get("status") == "healthy"
+        n8n = checks.get("n8n", {})
+        latency = n8n.get("latency_ms", math.nan)
+        reported = n8n.get("phases_ms", {})
+        phases = tuple(reported.get(phase, math.nan) for phase in PHASES)
+        raw = self.rings["raw"]
+        last = raw.last()
+        timestamp_ms = max(int(timestamp * 1000), last[0] if last else 0)
+        raw.append(
+            (
+                timestamp_ms,
+                healthy,
+                latency,
+                checks.get("database", {}).get("query_time_ms", math.nan),
+                checks.get("queue", {}).get("oldest_waiting_age_ms", math.nan),
+                *phases,
+            )
+        )
+        for name in ("1m", "1h"):
+            ring = self.rings[name]
+            self._roll(ring, RESOLUTIONS[name], timestamp_ms, healthy, latency, phases)
+
+    @staticmethod
+    def _roll(
+        ring: Ring,
+        width_ms: int,
+        timestamp_ms: int,
+        healthy: bool,
+        latency: float,
+        phases: tuple[float, ...],
+    ) -> None:
+        start = timestamp_ms - timestamp_ms % width_ms
+        failure = 0 if healthy else 1
+        last = ring.last()
+        if last is None or last[0] != start:
+            if math.isnan(latency):
+                unmeasured = (math.nan,) * len(PHASES)
+                zeros = (0,) * len(PHASES)
+                ring.append(
+                    (start, 1, failure, 0, math.nan, math.nan, math.nan, *unmeasured, *zeros)
+                )
+            else:
+                counts = tuple(int(not math.isnan(value)) for value in phases)
+                ring.append((start, 1, failure, 1, latency, latency, latency, *phases, *counts))
+            return
+
+        _, probes, failures, samples, mean, low, high, *rest = last
+        means, counts = rest[: len(PHASES)], rest[len(PHASES) :]
+        if not math.isnan(latency):
+            mean = latency if samples == 0 else mean + (latency - mean) / (samples + 1)
+            low = latency if samples == 0 else min(low, latency)
+            high = latency if samples == 0 else max(high, latency)
+            means = [
+                _fold(average, value, count)
+                for average, value, count in zip(means, phases, counts, strict=True)
+            ]
+            counts = [
+                count + (not math.isnan(value)) for count, value in zip(counts, phases, strict=True)
+            ]
+            samples += 1
+        ring.replace_last(
+            (start, probes + 1, failures + failure, samples, mean, low, high, *means, *counts)
+        )
+
+    def records(self, resolution: str, start_ms: int, end_ms: int) -> list[dict[str, Any]]:
+        """Return the records of one ring within ``[start_ms, end_ms)``."""
+        scanned = self.rings[resolution].scan(start_ms, end_ms)
+        if resolution == "raw":
+            return [
+                {
+                    "timestamp_ms": ts,
+                    "healthy": bool(healthy),
+                    "latency_ms": _value(latency),
+                    "db_ms": _value(db),
+                    "queue_lag_ms": _value(queue),
+                    "phases_ms": _phases(phases),
+                }
+                for ts, healthy, latency, db, queue, *phases in scanned
+            ]
+        return [
+            {
+                "timestamp_ms": ts,
+                "probes": probes,
+                "failures": failures,
+                "availability": 1 - failures / probes if probes else 0.0,
+                "samples": samples,
+                "latency_mean_ms": _value(mean),
+                "latency_min_ms": _value(low),
+                "latency_max_ms": _value(high),
+                "phases_ms": _phases(rest[: len(PHASES)]),
+                "phase_samples": {
+                    phase: count
+                    for phase, count in zip(PHASES, rest[len(PHASES) :], strict=True)
+                    if count
+                },
+            }
+            for ts, probes, failures, samples, mean, low, high, *rest in scanned
+        ]
+
+    def outages(self, start_ms: int, end_ms: int) -> list[dict[str, Any]]:
+        """Return runs of consecutive unhealthy raw probes within the range."""
+        outages: list[dict[str, Any]] = []
+        current: dict[str, Any] | None = None
+        for ts, healthy, *_ in self.rings["raw"].scan(start_ms, end_ms):
+            if healthy:
+                current = None
+            elif current is None:
+                current = {"start_ms": ts, "end_ms": ts, "probes": 1}
+                outages.append(current)
+            else:
+                current["end_ms"] = ts
+                current["probes"] += 1
+        return outages
+
+
+def pick_resolution(span_ms: int) -> str:
+    """Choose the finest ring that keeps a range of ``span_ms`` to a readable size."""
+    if span_ms <= 2 * 3_600_000:
+        return "raw"
+    if span_ms <= 3 * 86_400_000:
+        return "1m"
+    return "1h"
+
+
+def summarize(records: list[dict[str, Any]], resolution: str) -> dict[str, Any]:
+    """Return probe count, availability, latency and mean phase times over records."""
+    if resolution == "raw":
+        probes = len(records)
+        failures = sum(not r["healthy"] for r in records)
+        measured = [r for r in records if r["latency_ms"] is not None]
+        latencies = [r["latency_ms"] for r in measured]
+        weighted = sum(latencies)
+        samples = len(latencies)
+        peak = max(latencies, default=None)
+    else:
+        probes = sum(r["probes"] for r in records)
+        failures = sum(r["failures"] for r in records)
+        measured = [r for r in records if r["samples"]]
+        samples = sum(r["samples"] for r in measured)
+        weighted = sum(r["latency_mean_ms"] * r["samples"] for r in measured)
+        peak = max((r["latency_max_ms"] for r in measured), default=None)
+
+    phases: dict[str, float] = {}
+    for phase in PHASES:
+        pairs = [
+            (r["phases_ms"][phase], 1 if resolution == "raw" else r["phase_samples"][phase])
+            for r in measured
+            if phase in r["phases_ms"]
+        ]
+        total = sum(w for _, w in pairs)
+        if total:
+            phases[phase] = sum(v * w for v, w in pairs) / total
+    return {
+        "probes": probes,
+        "failures": failures,
+        "availability": 1 - failures / probes if probes else None,
+        "latency_mean_ms": weighted / samples if samples else None,
+        "latency_max_ms": peak,
+        "phases_ms": phases,
+    }
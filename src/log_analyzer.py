@@ -0,0 +1,406 @@
+"""Streaming, memory-mapped analyzer for n8n log files."""
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import heapq
+import itertools
+import json
+import logging
+import math
+import mmap
+import os
+from pathlib import Path
+import re
+import time
+from typing import Any
+
+from src.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are split at line boundaries across worker processes.
+CHUNK_BYTES = 32 * 1024 * 1024
+MAX_PENDING = 100_000
+SLOWEST_KEPT = 10
+NO_WORKFLOW = "-"
+
+# Console/text format: "2026-01-01T00:00:00.000Z | info | message {metadata}"
+TEXT_LINE = re.compile(
+    rb"^(?P<ts>\d{4}-\d\d-\d\d[T ][\d:.]+(?:Z|[+-]\d\d:?\d\d)?)\s*\|\s*(?P<level>\w+)\s*\|\s*"
+    rb"(?P<message>.*?)\s*(?P<meta>\{.*\})?\s*$"
+)
+JSON_LEVEL = re.compile(rb'"level"\s*:\s*"(\w+)"')
+LEVELS = {"warning": "warn", "err": "error"}
+
+
+class LogEvent:
+    """One parsed log line."""
+
+    __slots__ = ("execution_id", "level", "message", "timestamp", "workflow_id")
+
+    def __init__(
+        self,
+        level: str,
+        message: str = "",
+        timestamp: float | None = None,
+        workflow_id: str | None = None,
+        execution_id: str | None = None,
+    ) -> None:
+        """Initialize log event."""
+        self.level = level
+        self.message = message
+        self.timestamp = timestamp
+        self.workflow_id = workflow_id
+        self.execution_id = execution_id
+
+
+def _timestamp(value: Any) -> float | None:
+    """Parse an ISO-8601 timestamp into epoch seconds."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _level(value: bytes | str) -> str:
+    level = (value.decode("ascii", "replace") if isinstance(value, bytes) else value).lower()
+    return LEVELS.get(level, level)
+
+
+def parse_line(line: bytes) -> LogEvent | None:
+    """Parse a JSON or text-format n8n log line, or return None if it is neither.
+
+    Only lines mentioning a workflow are fully decoded; for everything else
+    the level is picked out with a regex, which keeps the common case cheap.
+    """
+    line = line.strip()
+    if line.startswith(b"{"):
+        return _parse_json(line)
+
+    match = TEXT_LINE.match(line)
+    if match is None:
+        return None
+    event = LogEvent(_level(match.group("level")))
+    if match.group("meta") is None or b"workflowId" not in match.group("meta"):
+        return event
+    try:
+        meta = json.loads(match.group("meta"))
+    except ValueError:
+        return event
+    event.message = match.group("message").decode("utf-8", "replace")
+    event.timestamp = _timestamp(match.group("ts").decode("ascii"))
+    event.workflow_id = _optional_id(meta.get("workflowId"))
+    event.execution_id = _optional_id(meta.get("executionId"))
+    return event
+
+
+def _parse_json(line: bytes) -> LogEvent | None:
+    """Parse a JSON-format line, with workflow metadata at the top level or in ``metadata``."""
+    if b"workflowId" not in line:
+        match = JSON_LEVEL.search(line)
+        return LogEvent(_level(match.group(1))) if match else None
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    meta = data.get("metadata") or data
+    return LogEvent(
+        _level(str(data.get("level", ""))),
+        str(data.get("message", "")),
+        _timestamp(data.get("timestamp") or meta.get("timestamp")),
+        _optional_id(meta.get("workflowId")),
+        _optional_id(meta.get("executionId")),
+    )
+
+
+def _optional_id(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+class WorkflowLogStats:
+    """Constant-size per-workflow aggregates."""
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self.started = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.errors = 0
+        self.warnings = 0
+        self.durations = LatencyHistogram()
+
+    def merge(self, other: "WorkflowLogStats") -> None:
+        """Add ``other`` into these stats."""
+        self.started += other.started
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.errors += other.errors
+        self.warnings += other.warnings
+        self.durations.merge(other.durations)
+
+
+class LogAnalyzer:
+    """Aggregates n8n log lines per workflow in bounded memory.
+
+    Execution durations come from pairing each "execution started" line with
+    its "finished" line by execution ID. At most ``max_pending`` unfinished
+    executions are tracked; the oldest are dropped beyond that. Finish lines
+    whose start was not seen are kept (also bounded) so that analyzers for
+    consecutive chunks of a file can be merged in order and still pair
+    executions that straddle a chunk boundary.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING) -> None:
+        """Initialize analyzer."""
+        self.max_pending = max_pending
+        self.workflows: dict[str, WorkflowLogStats] = {}
+        self.levels: Counter[str] = Counter()
+        self.lines = 0
+        self.unparsed = 0
+        self.dropped = 0
+        self.bytes_read = 0
+        self.pending: dict[str, tuple[str, float | None]] = {}
+        self.orphans: list[tuple[str, str, float]] = []
+        self.slowest: list[tuple[float, str, str]] = []
+
+    def stats(self, workflow_id: str) -> WorkflowLogStats:
+        """Return the stats for ``workflow_id``, creating them on first use."""
+        stats = self.workflows.get(workflow_id)
+        if stats is None:
+            stats = self.workflows[workflow_id] = WorkflowLogStats()
+        return stats
+
+    def feed(self, line: bytes) -> None:
+        """Aggregate one log line."""
+        self.lines += 1
+        event = parse_line(line)
+        if event is None:
+            self.unparsed += 1
+            return
+
+        self.levels[event.level] += 1
+        if event.workflow_id is None and event.level not in ("error", "warn"):
+            return
+
+        stats = self.stats(event.workflow_id or NO_WORKFLOW)
+        if event.level == "error":
+            stats.errors += 1
+        elif event.level == "warn":
+            stats.warnings += 1
+
+        if event.workflow_id is None or event.execution_id is None:
+            return
+        message = event.message.lower()
+        if "execution started" in message:
+            stats.started += 1
+            self._start(event.execution_id, event.workflow_id, event.timestamp)
+        elif "finished" in message and "execution" in message:
+            if "error" in message or "fail" in message:
+                stats.failed += 1
+            else:
+                stats.succeeded += 1
+            self._finish(event.execution_id, event.workflow_id, event.timestamp)
+
+    def _start(self, execution_id: str, workflow_id: str, timestamp: float | None) -> None:
+        if len(self.pending) >= self.max_pending:
+            del self.pending[next(iter(self.pending))]
+            self.dropped += 1
+        self.pending[execution_id] = (workflow_id, timestamp)
+
+    def _finish(self, execution_id: str, workflow_id: str, timestamp: float | None) -> None:
+        started = self.pending.pop(execution_id, None)
+        if started is None:
+            if timestamp is not None and len(self.orphans) < self.max_pending:
+                self.orphans.append((execution_id, workflow_id, timestamp))
+            return
+        if started[1] is not None and timestamp is not None:
+            self._record(execution_id, workflow_id, (timestamp - started[1]) * 1000)
+
+    def _record(self, execution_id: str, workflow_id: str, duration_ms: float) -> None:
+        self.stats(workflow_id).durations.record(duration_ms)
+        entry = (duration_ms, execution_id, workflow_id)
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def feed_mapped(self, mm: mmap.mmap, start: int, end: int, partial: bool = True) -> int:
+        """Aggregate the lines in ``mm[start:end]``, returning the offset reached.
+
+        With ``partial=False`` a trailing line without a newline is left
+        unread, as it may still be being written.
+        """
+        mm.seek(start)
+        position = start
+        while position < end:
+            line = mm.readline()
+            if not line.endswith(b"\n") and not partial:
+                break
+            position += len(line)
+            self.feed(line)
+        self.bytes_read += position - start
+        return position
+
+    def merge(self, other: "LogAnalyzer") -> None:
+        """Merge the analyzer of the chunk that follows this one in the log."""
+        for execution_id, workflow_id, timestamp in other.orphans:
+            started = self.pending.pop(execution_id, None)
+            if started is None:
+                if len(self.orphans) < self.max_pending:
+                    self.orphans.append((execution_id, workflow_id, timestamp))
+            elif started[1] is not None:
+                self._record(execution_id, workflow_id, (timestamp - started[1]) * 1000)
+
+        for execution_id, started in other.pending.items():
+            if len(self.pending) >= self.max_pending:
+                del self.pending[next(iter(self.pending))]
+                self.dropped += 1
+            self.pending[execution_id] = started
+
+        for workflow_id, stats in other.workflows.items():
+            self.stats(workflow_id).merge(stats)
+        for entry in other.slowest:
+            if len(self.slowest) < SLOWEST_KEPT:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+        self.levels.update(other.levels)
+        self.lines += other.lines
+        self.unparsed += other.unparsed
+        self.dropped += other.dropped
+        self.bytes_read += other.bytes_read
+
+    def report(self, top: int = 20) -> dict[str, Any]:
+        """Return totals, the ``top`` workflows by total execution time and the slowest runs."""
+        rows = []
+        for workflow_id, stats in self.workflows.items():
+            durations = stats.durations
+            finished = stats.succeeded + stats.failed
+            rows.append(
+                {
+                    "workflow_id": workflow_id,
+                    "started": stats.started,
+                    "finished": finished,
+                    "failed": stats.failed,
+                    "failure_rate": stats.failed / finished if finished else 0.0,
+                    "errors": stats.errors,
+                    "warnings": stats.warnings,
+                    "total_s": durations.sum_us / 1e6,
+                    "mean_ms": durations.mean,
+                    "p50_ms": durations.percentile(50),
+                    "p99_ms": durations.percentile(99),
+                    "max_ms": durations.max_us / 1000,
+                }
+            )
+        rows.sort(key=lambda r: (r["total_s"], r["errors"], r["finished"]), reverse=True)
+
+        return {
+            "lines": self.lines,
+            "unparsed": self.unparsed,
+            "bytes": self.bytes_read,
+            "levels": dict(self.levels),
+            "in_flight": len(self.pending),
+            "unmatched": len(self.orphans) + self.dropped,
+            "workflows": rows[:top],
+            "slowest": [
+                {"execution_id": e, "workflow_id": w, "duration_ms": d}
+                for d, e, w in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+def split_ranges(mm: mmap.mmap, parts: int) -> list[tuple[int, int]]:
+    """Split ``mm`` into up to ``parts`` byte ranges that start and end on line boundaries."""
+    size = len(mm)
+    bounds = [0]
+    for i in range(1, parts):
+        newline = mm.find(b"\n", size * i // parts)
+        bound = size if newline == -1 else newline + 1
+        if bound > bounds[-1]:
+            bounds.append(bound)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(itertools.pairwise(bounds))
+
+
+def _analyze_range(path: str, start: int, end: int, max_pending: int, partial: bool) -> LogAnalyzer:
+    """Worker entry point: analyze one byte range of a log file."""
+    analyzer = LogAnalyzer(max_pending)
+    with Path(path).open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        analyzer.feed_mapped(mm, start, end, partial)
+    return analyzer
+
+
+def analyze_file(
+    path: str,
+    workers: int | None = None,
+    chunk_bytes: int = CHUNK_BYTES,
+    max_pending: int = MAX_PENDING,
+    partial: bool = True,
+) -> LogAnalyzer:
+    """Analyze one log file through a memory map.
+
+    Files larger than ``chunk_bytes`` are split at line boundaries and the
+    chunks analyzed by up to ``workers`` processes (CPU count by default);
+    the per-chunk results are merged in file order.
+    """
+    size = Path(path).stat().st_size
+    if size == 0:
+        return LogAnalyzer(max_pending)
+
+    parts = min(workers or os.cpu_count() or 1, math.ceil(size / max(chunk_bytes, 1)))
+    with Path(path).open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        ranges = split_ranges(mm, max(parts, 1))
+        if len(ranges) == 1:
+            analyzer = LogAnalyzer(max_pending)
+            analyzer.feed_mapped(mm, 0, size, partial)
+            return analyzer
+
+    last = len(ranges) - 1
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [
+            pool.submit(_analyze_range, path, start, end, max_pending, partial or i < last)
+            for i, (start, end) in enumerate(ranges)
+        ]
+        analyzer = futures[0].result()
+        for future in futures[1:]:
+            analyzer.merge(future.result())
+    return analyzer
+
+
+def follow(
+    path: str,
+    analyzer: LogAnalyzer,
+    position: int = 0,
+    interval: float = 1.0,
+    polls: int | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[int]:
+    """Keep feeding lines appended to ``path``, yielding the number read per poll.
+
+    Only complete lines are consumed. If the file shrinks (truncated or
+    rotated in place) reading restarts from the beginning.
+    """
+    poll = 0
+    while polls is None or poll < polls:
+        if poll:
+            sleep(interval)
+        poll += 1
+
+        size = Path(path).stat().st_size if Path(path).exists() else 0
+        if size < position:
+            logger.info(f"{path} shrank from {position} to {size} bytes; reading from the start")
+            position = 0
+        if size == position:
+            yield 0
+            continue
+
+        lines = analyzer.lines
+        with Path(path).open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = analyzer.feed_mapped(mm, position, len(mm), partial=False)
+        yield analyzer.lines - lines
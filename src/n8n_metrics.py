@@ -0,0 +1,251 @@
+"""Streaming scraper for n8n's Prometheus /metrics endpoint, with rates between scrapes."""
+
+import asyncio
+from collections.abc import AsyncIterable, Callable
+import logging
+import re
+import time
+from typing import Any
+
+import httpx
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+# n8n prefixes every metric with N8N_METRICS_PREFIX ("n8n_" by default), so
+# series are matched by suffix.
+EVENT_LOOP_LAG = ("nodejs_eventloop_lag_p99_seconds", "nodejs_eventloop_lag_seconds")
+HEAP_USED = "nodejs_heap_size_used_bytes"
+HEAP_TOTAL = "nodejs_heap_size_total_bytes"
+HEAP_AVAILABLE = "nodejs_heap_space_size_available_bytes"
+RESIDENT_MEMORY = "process_resident_memory_bytes"
+GAUGES = (*EVENT_LOOP_LAG, HEAP_USED, HEAP_TOTAL, HEAP_AVAILABLE, RESIDENT_MEMORY)
+WORKFLOW_LABEL = "workflow_id"
+MIB = 1024 * 1024
+
+LABEL = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+ESCAPES = {"\\\\": "\\", '\\"': '"', "\\n": "\n"}
+
+Labels = tuple[tuple[str, str], ...]
+SeriesKey = tuple[str, Labels]
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return re.sub(r"\\[\\\"n]", lambda m: ESCAPES[m.group()], value)
+
+
+def parse_sample(line: str) -> tuple[str, Labels, float]:
+    """Parse one exposition-format sample line into name, labels and value.
+
+    A trailing timestamp is ignored. Raises ValueError for a malformed line.
+    """
+    brace = line.find("{")
+    if brace == -1:
+        name, _, rest = line.partition(" ")
+        labels: Labels = ()
+    else:
+        name = line[:brace]
+        position = brace + 1
+        pairs = []
+        while (match := LABEL.match(line, position)) is not None:
+            pairs.append((match.group(1), _unescape(match.group(2))))
+            position = match.end()
+        if line[position : position + 1] != "}":
+            raise ValueError(f"Malformed labels in metric line: {line!r}")
+        labels = tuple(sorted(pairs))
+        rest = line[position + 1 :]
+    value = rest.split()
+    if not name or not value:
+        raise ValueError(f"Malformed metric line: {line!r}")
+    return name.strip(), labels, float(value[0])
+
+
+class Scrape:
+    """Counters and runtime gauges from one scrape of a /metrics page."""
+
+    def __init__(self, timestamp: float) -> None:
+        """Initialize an empty scrape taken at ``timestamp`` (monotonic seconds)."""
+        self.timestamp = timestamp
+        self.samples: dict[SeriesKey, float] = {}
+        self.counters: set[str] = set()
+
+    def gauge(self, *suffixes: str) -> float | None:
+        """Return the first unlabelled series whose name ends with one of ``suffixes``."""
+        for suffix in suffixes:
+            for (name, labels), value in self.samples.items():
+                if not labels and name.endswith(suffix):
+                    return value
+        return None
+
+    def total(self, suffix: str) -> float | None:
+        """Return the sum over labels of the series whose name ends with ``suffix``."""
+        values = [value for (name, _), value in self.samples.items() if name.endswith(suffix)]
+        return sum(values) if values else None
+
+
+def heap_limit(scrape: Scrape) -> float | None:
+    """Return the V8 heap limit in bytes, or None when it cannot be told.
+
+    HEALTH_HEAP_LIMIT_MB overrides it; otherwise it is the heap in use plus
+    what V8 reports still available across its heap spaces.
+    """
+    if config.HEALTH_HEAP_LIMIT_MB:
+        return float(config.HEALTH_HEAP_LIMIT_MB * MIB)
+    used = scrape.gauge(HEAP_USED)
+    available = scrape.total(HEAP_AVAILABLE)
+    if used is None or available is None:
+        return None
+    return used + available
+
+
+async def read_metrics(lines: AsyncIterable[str], timestamp: float) -> Scrape:
+    """Parse exposition-format lines as they arrive, keeping only what rates and checks use.
+
+    Counters and the runtime gauges are kept; histograms, summaries and other
+    gauges are skipped line by line, so neither the body nor the series
+    that are not needed are held in memory. Malformed lines are skipped.
+    """
+    scrape = Scrape(timestamp)
+    types: dict[str, str] = {}
+    async for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            parts = line.split(None, 3)
+            if len(parts) == 4 and parts[1] == "TYPE":
+                types[parts[2]] = parts[3].strip()
+            continue
+        try:
+            name, labels, value = parse_sample(line)
+        except ValueError as e:
+            logger.debug(f"Skipping metric line: {e}")
+            continue
+        counter = "counter" in (types.get(name), types.get(name.removesuffix("_total")))
+        if counter:
+            scrape.counters.add(name)
+        if counter or name.endswith(GAUGES):
+            scrape.samples[(name, labels)] = value
+    return scrape
+
+
+def counter_rates(previous: Scrape, current: Scrape) -> dict[SeriesKey, float]:
+    """Return per-second rates of the current scrape's counters.
+
+    A series missing from the previous scrape (say, a workflow's first
+    execution) counts from zero. A counter that went down was reset by a
+    restart, so its whole current value is counted as the increase.
+    """
+    elapsed = current.timestamp - previous.timestamp
+    if elapsed <= 0:
+        return {}
+    rates = {}
+    for key, value in current.samples.items():
+        if key[0] in current.counters:
+            increase = value - previous.samples.get(key, 0.0)
+            rates[key] = (value if increase < 0 else increase) / elapsed
+    return rates
+
+
+def summarize(scrape: Scrape, rates: dict[SeriesKey, float] | None) -> dict[str, Any]:
+    """Build a runtime report from one scrape and the rates since the previous one.
+
+    ``rates`` sums each counter over its labels; ``workflow_rates`` breaks
+    counters labelled by workflow down per workflow ID.
+
+    ``heap_total_bytes`` is the heap V8 has committed so far, which a healthy
+    process keeps close to what it uses, so it says nothing about headroom;
+    ``heap_pressure`` is measured against ``heap_limit`` instead.
+    """
+    lag = scrape.gauge(*EVENT_LOOP_LAG)
+    used = scrape.gauge(HEAP_USED)
+    limit = heap_limit(scrape)
+    report: dict[str, Any] = {
+        "event_loop_lag_ms": lag * 1000 if lag is not None else None,
+        "heap_used_bytes": used,
+        "heap_total_bytes": scrape.gauge(HEAP_TOTAL),
+        "heap_limit_bytes": limit,
+        "heap_pressure": used / limit if used is not None and limit else None,
+        "resident_memory_bytes": scrape.gauge(RESIDENT_MEMORY),
+    }
+    if rates is not None:
+        totals: dict[str, float] = {}
+        workflows: dict[str, float] = {}
+        for (name, labels), rate in rates.items():
+            totals[name] = totals.get(name, 0.0) + rate
+            workflow = dict(labels).get(WORKFLOW_LABEL)
+            if workflow is not None:
+                key = f"{name}:{workflow}"
+                workflows[key] = workflows.get(key, 0.0) + rate
+        report["rates"] = totals
+        report["workflow_rates"] = workflows
+    return report
+
+
+def assess(
+    report: dict[str, Any], max_lag_ms: float | None = None, max_heap: float | None = None
+) -> list[str]:
+    """Return the reasons a runtime report is unhealthy; empty when healthy.
+
+    Limits default to HEALTH_EVENT_LOOP_LAG_MAX_MS and HEALTH_HEAP_PRESSURE_MAX.
+    """
+    max_lag_ms = config.HEALTH_EVENT_LOOP_LAG_MAX_MS if max_lag_ms is None else max_lag_ms
+    max_heap = config.HEALTH_HEAP_PRESSURE_MAX if max_heap is None else max_heap
+    reasons = []
+    lag = report.get("event_loop_lag_ms")
+    if lag is not None and lag > max_lag_ms:
+        reasons.append(f"event loop lag {lag:.0f}ms > {max_lag_ms:g}ms")
+    heap = report.get("heap_pressure")
+    if heap is not None and heap > max_heap:
+        reasons.append(f"heap {heap:.0%} used > {max_heap:.0%}")
+    return reasons
+
+
+class MetricsScraper:
+    """Scrape n8n /metrics pages, keeping each target's previous scrape for rates.
+
+    One scraper may be shared by repeated rounds over many targets; rates
+    appear from a target's second scrape onwards.
+    """
+
+    def __init__(self, concurrency: int = 50, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize scraper."""
+        self.concurrency = max(concurrency, 1)
+        self.clock = clock
+        self.previous: dict[str, Scrape] = {}
+
+    async def scrape(self, client: httpx.AsyncClient, url: str) -> dict[str, Any]:
+        """Stream one /metrics page and return its runtime report.
+
+        Raises ``httpx.HTTPStatusError`` for a non-2xx answer, such as the
+        404 n8n returns when N8N_METRICS is off.
+        """
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            scrape = await read_metrics(response.aiter_lines(), self.clock())
+
+        previous = self.previous.get(url)
+        self.previous[url] = scrape
+        rates = counter_rates(previous, scrape) if previous is not None else None
+        report = summarize(scrape, rates)
+        if previous is not None:
+            report["interval_seconds"] = scrape.timestamp - previous.timestamp
+        return report
+
+    async def scrape_all(self, client: httpx.AsyncClient, urls: list[str]) -> list[dict[str, Any]]:
+        """Scrape every URL concurrently; failed scrapes report an ``error``."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(url: str) -> dict[str, Any]:
+            async with semaphore:
+                try:
+                    report = await self.scrape(client, url)
+                except httpx.HTTPError as e:
+                    logger.error(f"Scraping {url} failed: {e}")
+                    return {"url": url, "error": str(e) or type(e).__name__}
+            return {"url": url, **report}
+
+        return await asyncio.gather(*(one(url) for url in urls))
@@ -0,0 +1,63 @@
+"""Minimal health sidecar client: read one cached reply and exit 0 only if healthy.
+
+Only ``os``, ``socket`` and ``sys`` are imported so that
+``python3 -S healthcheck.py`` starts, queries and exits in a few
+milliseconds; argparse, the config module and HTTP clients stay unloaded.
+"""
+
+import os
+import socket
+import sys
+
+# Same default as Config.HEALTH_SIDECAR_SOCKET, repeated to avoid importing config.
+DEFAULT_SOCKET = "/tmp/n8n-health.sock"
+USAGE = "usage: healthcheck.py [--socket PATH] [--timeout SECONDS] [-v] [--json]"
+
+
+def query(path: str, timeout: float = 1.0) -> bytes:
+    """Connect to the sidecar socket and return its whole reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        chunks = []
+        while chunk := sock.recv(65536):
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Query the sidecar; 0 when healthy, 1 when unhealthy, stale, starting or unreachable."""
+    args = sys.argv[1:] if argv is None else list(argv)
+    path = os.environ.get("HEALTH_SIDECAR_SOCKET") or DEFAULT_SOCKET
+    timeout = 1.0
+    verbose = show_json = False
+    while args:
+        arg = args.pop(0)
+        if arg == "--socket" and args:
+            path = args.pop(0)
+        elif arg == "--timeout" and args:
+            timeout = float(args.pop(0))
+        elif arg in ("-v", "--verbose"):
+            verbose = True
+        elif arg == "--json":
+            show_json = True
+        else:
+            print(USAGE, file=sys.stderr)
+            return 2
+
+    try:
+        reply = query(path, timeout)
+    except OSError as e:
+        print(f"sidecar unreachable at {path}: {e}", file=sys.stderr)
+        return 1
+
+    status_line, _, body = reply.partition(b"\n")
+    if verbose:
+        print(status_line.decode(errors="replace"))
+    if show_json:
+        print(body.decode(errors="replace").strip())
+    return 0 if status_line.split(b" ", 1)[0] == b"healthy" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
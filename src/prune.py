@@ -0,0 +1,237 @@
+"""Batched, throttled pruning of old n8n executions."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import time
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+PG_ESTIMATE = """
+SELECT
+    count(*) AS rows,
+    coalesce(sum(pg_column_size(e.*) + coalesce(pg_column_size(d.*), 0)), 0) AS bytes
+FROM execution_entity e
+LEFT JOIN execution_data d ON d."executionId" = e.id
+WHERE e."stoppedAt" < $1
+"""
+
+PG_NEXT_BATCH = """
+SELECT id FROM execution_entity
+WHERE id > $1 AND "stoppedAt" < $2
+ORDER BY id
+LIMIT $3
+"""
+
+SQLITE_ESTIMATE = """
+SELECT
+    count(*) AS rows,
+    coalesce(sum(coalesce(length(d.data), 0) + coalesce(length(d."workflowData"), 0)), 0)
+FROM execution_entity e
+LEFT JOIN execution_data d ON d."executionId" = e.id
+WHERE e."stoppedAt" < ?
+"""
+
+SQLITE_NEXT_BATCH = """
+SELECT id FROM execution_entity
+WHERE id > ? AND "stoppedAt" < ?
+ORDER BY id
+LIMIT ?
+"""
+
+
+class PruneBackend(Protocol):
+    """Database operations the prune engine needs."""
+
+    async def estimate(self, cutoff: datetime) -> tuple[int, int]:
+        """Return rows and bytes that pruning up to ``cutoff`` would remove."""
+
+    async def next_batch(self, after_id: int, cutoff: datetime, limit: int) -> list[int]:
+        """Return up to ``limit`` prunable execution ids greater than ``after_id``."""
+
+    async def delete(self, ids: list[int]) -> int:
+        """Delete executions and their data; return the number of executions removed."""
+
+
+class PostgresPruneBackend:
+    """Prune backend for n8n's PostgreSQL schema over an asyncpg pool."""
+
+    def __init__(self, pool: Any) -> None:
+        """Initialize backend."""
+        self.pool = pool
+
+    async def estimate(self, cutoff: datetime) -> tuple[int, int]:
+        """Return rows and on-disk bytes older than ``cutoff``."""
+        row = await self.pool.fetchrow(PG_ESTIMATE, cutoff)
+        return row["rows"], row["bytes"]
+
+    async def next_batch(self, after_id: int, cutoff: datetime, limit: int) -> list[int]:
+        """Return the next keyset page of prunable ids."""
+        rows = await self.pool.fetch(PG_NEXT_BATCH, after_id, cutoff, limit)
+        return [row["id"] for row in rows]
+
+    async def delete(self, ids: list[int]) -> int:
+        """Delete a batch of executions and their data in one transaction."""
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                'DELETE FROM execution_data WHERE "executionId" = ANY($1::int[])', ids
+            )
+            status = await conn.execute(
+                "DELETE FROM execution_entity WHERE id = ANY($1::int[])", ids
+            )
+        return int(status.split()[-1])
+
+
+class SQLitePruneBackend:
+    """Prune backend for n8n's SQLite schema (``DB_TYPE=sqlite``)."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        """Initialize backend."""
+        self.conn = conn
+
+    @staticmethod
+    def _timestamp(cutoff: datetime) -> str:
+        """Format ``cutoff`` the way n8n stores datetimes in SQLite."""
+        return cutoff.astimezone(UTC).replace(tzinfo=None).isoformat(" ", "milliseconds")
+
+    async def estimate(self, cutoff: datetime) -> tuple[int, int]:
+        """Return rows and data bytes older than ``cutoff``."""
+        rows, size = self.conn.execute(SQLITE_ESTIMATE, (self._timestamp(cutoff),)).fetchone()
+        return rows, size
+
+    async def next_batch(self, after_id: int, cutoff: datetime, limit: int) -> list[int]:
+        """Return the next keyset page of prunable ids."""
+        cursor = self.conn.execute(SQLITE_NEXT_BATCH, (after_id, self._timestamp(cutoff), limit))
+        return [row[0] for row in cursor]
+
+    async def delete(self, ids: list[int]) -> int:
+        """Delete a batch of executions and their data in one transaction."""
+        placeholders = ",".join("?" * len(ids))
+        with self.conn:
+            self.conn.execute(
+                f'DELETE FROM execution_data WHERE "executionId" IN ({placeholders})', ids
+            )
+            cursor = self.conn.execute(
+                f"DELETE FROM execution_entity WHERE id IN ({placeholders})", ids
+            )
+        return cursor.rowcount
+
+
+def next_batch_size(
+    size: int, latency_ms: float, target_ms: float, min_size: int, max_size: int
+) -> int:
+    """Scale the batch size toward ``target_ms`` per batch, at most 2x per step."""
+    factor = 2.0 if latency_ms <= 0 else min(2.0, max(0.5, target_ms / latency_ms))
+    return max(min_size, min(max_size, round(size * factor)))
+
+
+def load_state(path: str | Path | None) -> dict[str, Any] | None:
+    """Load an interrupted run's progress, if any."""
+    if path is None or not Path(path).exists():
+        return None
+    return json.loads(Path(path).read_text())
+
+
+def save_state(path: str | Path | None, state: dict[str, Any]) -> None:
+    """Atomically persist progress so an interrupted run can resume."""
+    if path is None:
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path)
+
+
+async def prune_executions(
+    backend: PruneBackend,
+    cutoff: datetime,
+    batch_size: int = 500,
+    min_batch: int = 50,
+    max_batch: int = 5000,
+    target_ms: float = 250.0,
+    pause_ratio: float = 1.0,
+    state_path: str | Path | None = None,
+    max_batches: int | None = None,
+    identity: dict[str, Any] | None = None,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    clock: Callable[[], float] = time.perf_counter,
+) -> dict[str, Any]:
+    """Delete executions stopped before ``cutoff`` in keyset-paginated batches.
+
+    Each batch is timed and the next batch is resized toward ``target_ms``.
+    After each batch the engine pauses for ``pause_ratio`` times the batch
+    latency, so pruning takes at most ``1 / (1 + pause_ratio)`` of the
+    database's time. Progress is saved to ``state_path`` after every batch;
+    a run that finds saved state resumes from its cursor and cutoff.
+
+    ``identity`` (say, the target database and age threshold) is saved with
+    the progress. Saved state with a different identity raises ValueError
+    rather than resuming, since its cursor would skip rows of another run.
+    """
+    state = load_state(state_path)
+    resumed = state is not None
+    if state is None:
+        state = {
+            "cutoff": cutoff.isoformat(),
+            "identity": identity,
+            "last_id": 0,
+            "deleted": 0,
+            "batches": 0,
+        }
+    elif state.get("identity") != identity:
+        raise ValueError(
+            f"Saved prune state in {state_path} is for {state.get('identity')}, "
+            f"not {identity}; delete it to start over"
+        )
+    else:
+        cutoff = datetime.fromisoformat(state["cutoff"])
+        logger.info(f"Resuming prune after id {state['last_id']} (cutoff {state['cutoff']})")
+
+    size = batch_size
+    max_latency_ms = 0.0
+    batches = 0
+    complete = False
+    start = clock()
+
+    while max_batches is None or batches < max_batches:
+        batch_start = clock()
+        ids = await backend.next_batch(state["last_id"], cutoff, size)
+        if not ids:
+            complete = True
+            break
+        deleted = await backend.delete(ids)
+        latency_ms = (clock() - batch_start) * 1000
+
+        batches += 1
+        state["last_id"] = ids[-1]
+        state["deleted"] += deleted
+        state["batches"] += 1
+        save_state(state_path, state)
+
+        max_latency_ms = max(max_latency_ms, latency_ms)
+        logger.debug(f"Pruned {deleted} executions in {latency_ms:.1f}ms (batch {size})")
+        size = next_batch_size(size, latency_ms, target_ms, min_batch, max_batch)
+        await sleep(latency_ms / 1000 * pause_ratio)
+
+    if not complete:
+        logger.info(f"Prune stopped after {batches} batches; rerun to resume")
+    elif state_path is not None:
+        Path(state_path).unlink(missing_ok=True)
+
+    return {
+        "complete": complete,
+        "resumed": resumed,
+        "cutoff": state["cutoff"],
+        "deleted": state["deleted"],
+        "batches": state["batches"],
+        "last_id": state["last_id"],
+        "batch_size": size,
+        "max_latency_ms": max_latency_ms,
+        "elapsed_s": clock() - start,
+    }
@@ -0,0 +1,119 @@
+"""Redis/Bull queue probe for n8n queue mode."""
+
+from collections.abc import Callable
+import logging
+import time
+from typing import Any
+
+import redis.asyncio as redis
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+# n8n enqueues every execution on a single Bull queue named "jobs".
+QUEUE_NAME = "jobs"
+
+# Bull LPUSHes new jobs, so the oldest waiting job sits at the tail of the
+# wait list. Resolving it server-side keeps the probe to one round trip.
+OLDEST_WAITING_SCRIPT = """
+local id = redis.call('LINDEX', KEYS[1], -1)
+if not id then
+    return false
+end
+return redis.call('HGET', ARGV[1] .. id, 'timestamp')
+"""
+
+ClientFactory = Callable[..., Any]
+
+
+class QueueProbe:
+    """Probe Bull queue depth, worker lag and throughput over one pipelined round trip."""
+
+    def __init__(self, timeout: float = 10, client_factory: ClientFactory | None = None) -> None:
+        """Initialize queue probe.
+
+        ``client_factory`` defaults to ``redis.asyncio.Redis``.
+        """
+        self.timeout = timeout
+        self.key_prefix = f"{config.QUEUE_BULL_PREFIX}:{QUEUE_NAME}:"
+        self._client_factory = client_factory or redis.Redis
+        self._client: Any = None
+        # (Redis time in seconds, jobs ever enqueued, jobs not yet finished) at the last check.
+        self._previous: tuple[float, int, int] | None = None
+
+    def _connect(self) -> Any:
+        """Return the pooled Redis client, creating it on first use."""
+        if self._client is None:
+            self._client = self._client_factory(
+                host=config.QUEUE_BULL_REDIS_HOST or "localhost",
+                port=config.QUEUE_BULL_REDIS_PORT or 6379,
+                password=config.QUEUE_BULL_REDIS_PASSWORD or None,
+                db=config.QUEUE_BULL_REDIS_DB,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _processed_per_second(self, now: float, enqueued: int, backlog: int) -> float | None:
+        """Return jobs finished per second since the previous check.
+
+        n8n enqueues with removeOnComplete/removeOnFail, so the completed set
+        stays empty. Instead, finished jobs are those enqueued (Bull's ``id``
+        counter) minus the growth of the backlog. Times come from Redis so
+        local clock skew does not matter. None on the first check, or when
+        the counter went backwards because the queue was reset.
+        """
+        previous, self._previous = self._previous, (now, enqueued, backlog)
+        if previous is None:
+            return None
+        elapsed = now - previous[0]
+        if elapsed <= 0 or enqueued < previous[1]:
+            return None
+        processed = (enqueued - previous[1]) - (backlog - previous[2])
+        return max(processed, 0) / elapsed
+
+    async def check(self) -> dict[str, Any]:
+        """Report job counts, oldest waiting job age and throughput since the last check."""
+        prefix = self.key_prefix
+
+        try:
+            client = self._connect()
+            start = time.perf_counter()
+
+            pipe = client.pipeline(transaction=False)
+            pipe.llen(f"{prefix}wait")
+            pipe.llen(f"{prefix}active")
+            pipe.zcard(f"{prefix}delayed")
+            pipe.zcard(f"{prefix}failed")
+            pipe.get(f"{prefix}id")
+            pipe.eval(OLDEST_WAITING_SCRIPT, 1, f"{prefix}wait", prefix)
+            pipe.time()
+            waiting, active, delayed, failed, enqueued, oldest, server_time = await pipe.execute()
+
+            round_trip_ms = (time.perf_counter() - start) * 1000
+            server_now_ms = server_time[0] * 1000 + server_time[1] / 1000
+            oldest_age_ms = max(server_now_ms - float(oldest), 0.0) if oldest else 0.0
+            processed = self._processed_per_second(
+                server_now_ms / 1000, int(enqueued or 0), waiting + active + delayed
+            )
+
+            return {
+                "status": "healthy",
+                "round_trip_ms": round_trip_ms,
+                "waiting": waiting,
+                "active": active,
+                "delayed": delayed,
+                "failed": failed,
+                "oldest_waiting_age_ms": oldest_age_ms,
+                "processed_per_second": processed,
+            }
+        except Exception as e:
+            logger.error(f"Queue check failed: {e}")
+            return {"status": "unhealthy", "error": str(e) or type(e).__name__}
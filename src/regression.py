@@ -0,0 +1,292 @@
+"""Performance regression suite for CLI startup and the probing paths."""
+
+import asyncio
+from collections.abc import Iterator
+import contextlib
+from datetime import UTC, datetime
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from src.config import Config
+from src.fleet import probe_fleet
+from src.health_check import HealthChecker
+from src.stand_in import StandInServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLI = Path(__file__).resolve().parent.parent / "cli.py"
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+
+# Commands that run to completion without a live n8n; "{tmp}" is a scratch directory.
+CLI_COMMANDS: dict[str, list[str]] = {
+    "help": ["--help"],
+    "info": ["info"],
+    "validate": ["validate"],
+    "health": ["health", "--url", "http://127.0.0.1:9", "--timeout", "1"],
+    "executions": ["executions", "--db", "{tmp}/executions.sqlite3", "stats"],
+    "workflows": ["workflows", "analyze", "{tmp}", "--workers", "1"],
+    "simulate": ["simulate", "--profile", "1:1", "--duration", "fixed:0.1", "--workers", "1"],
+}
+FLEET_SIZES = (1, 16, 64)
+
+# A fixed set, so that config.load does not grow as settings are added.
+CONFIG_LOAD_SETTINGS = (
+    "N8N_PORT",
+    "N8N_PROTOCOL",
+    "N8N_BASIC_AUTH_ACTIVE",
+    "DB_TYPE",
+    "DB_POSTGRESDB_HOST",
+    "DB_POSTGRESDB_PORT",
+    "EXECUTIONS_MODE",
+    "EXECUTIONS_TIMEOUT",
+    "QUEUE_BULL_REDIS_HOST",
+    "QUEUE_BULL_REDIS_PORT",
+    "QUEUE_BULL_REDIS_PASSWORD",
+    "N8N_LOG_LEVEL",
+)
+
+# Skip the database and queue checks so only the HTTP path is measured.
+PROBE_ONLY_ENV = {"DB_TYPE": "sqlite", "EXECUTIONS_MODE": "regular"}
+
+
+@contextlib.contextmanager
+def probe_only_env() -> Iterator[None]:
+    """Temporarily configure health checks to probe n8n over HTTP only."""
+    saved = {name: os.environ.get(name) for name in PROBE_ONLY_ENV}
+    os.environ.update(PROBE_ONLY_ENV)
+    Config.reload()
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        Config.reload()
+
+
+def time_cli(
+    commands: dict[str, list[str]], runs: int, cli: Path = DEFAULT_CLI
+) -> dict[str, list[float]]:
+    """Time ``runs`` cold starts of ``cli.py`` per command in fresh interpreters, in ms.
+
+    Commands are run round-robin so that drift in machine load is spread
+    over all of them rather than landing on whichever ran last.
+    """
+    samples: dict[str, list[float]] = {label: [] for label in commands}
+    env = {**os.environ, **PROBE_ONLY_ENV}
+    with tempfile.TemporaryDirectory() as tmp:
+        argvs = {
+            label: [sys.executable, str(cli), *(arg.format(tmp=tmp) for arg in argv)]
+            for label, argv in commands.items()
+        }
+        for _ in range(runs):
+            for label, command in argvs.items():
+                start = time.perf_counter()
+                subprocess.run(command, capture_output=True, env=env, cwd=cli.parent, check=False)
+                samples[label].append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def time_config_load(runs: int, loops: int = 200) -> list[float]:
+    """Time re-reading ``CONFIG_LOAD_SETTINGS`` from the environment, in ms per load."""
+    samples = []
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            for _ in range(loops):
+                Config.reload(*CONFIG_LOAD_SETTINGS)
+                for name in CONFIG_LOAD_SETTINGS:
+                    getattr(Config, name)
+            samples.append((time.perf_counter() - start) * 1000 / loops)
+    finally:
+        Config.reload()
+    return samples
+
+
+async def health_throughput(runs: int, probes: int = 50) -> list[float]:
+    """Time ``full_health_check`` on one pooled checker against a stand-in, in ms per check."""
+    samples = []
+    with probe_only_env():
+        async with StandInServer(seed=0) as server, HealthChecker(base_url=server.url) as checker:
+            for _ in range(probes):
+                await checker.full_health_check()
+            for _ in range(runs):
+                start = time.perf_counter()
+                for _ in range(probes):
+                    await checker.full_health_check()
+                samples.append((time.perf_counter() - start) * 1000 / probes)
+    return samples
+
+
+async def fleet_fanout(runs: int, sizes: tuple[int, ...] = FLEET_SIZES) -> dict[int, list[float]]:
+    """Time one fleet round against ``size`` stand-ins for each size, in ms per round."""
+    samples: dict[int, list[float]] = {size: [] for size in sizes}
+    servers = [StandInServer(seed=i) for i in range(max(sizes, default=0))]
+    with probe_only_env():
+        try:
+            for server in servers:
+                await server.start()
+            for size in sizes:
+                targets = [server.url for server in servers[:size]]
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    async for _result in probe_fleet(targets, concurrency=size):
+                        pass
+                    samples[size].append((time.perf_counter() - start) * 1000)
+        finally:
+            await asyncio.gather(*(server.stop() for server in servers))
+    return samples
+
+
+def benchmark_names() -> list[str]:
+    """Return the name of every benchmark in the suite."""
+    return [
+        *(f"cli.{label}" for label in CLI_COMMANDS),
+        "config.load",
+        "health.full_check",
+        *(f"fleet.fanout.{size}" for size in FLEET_SIZES),
+    ]
+
+
+async def run_suite(
+    select: list[str] | None = None, runs: int = 10, cli: Path = DEFAULT_CLI
+) -> dict[str, list[float]]:
+    """Run the benchmarks whose names start with any prefix in ``select`` (all by default)."""
+
+    def wanted(name: str) -> bool:
+        return not select or any(name.startswith(prefix) for prefix in select)
+
+    results: dict[str, list[float]] = {}
+    commands = {label: argv for label, argv in CLI_COMMANDS.items() if wanted(f"cli.{label}")}
+    if commands:
+        logger.info(f"Timing cold start of {len(commands)} CLI commands")
+        for label, samples in time_cli(commands, runs, cli).items():
+            results[f"cli.{label}"] = samples
+    if wanted("config.load"):
+        results["config.load"] = time_config_load(runs)
+    if wanted("health.full_check"):
+        results["health.full_check"] = await health_throughput(runs)
+
+    sizes = tuple(size for size in FLEET_SIZES if wanted(f"fleet.fanout.{size}"))
+    if sizes:
+        for size, samples in (await fleet_fanout(runs, sizes)).items():
+            results[f"fleet.fanout.{size}"] = samples
+    return results
+
+
+def mann_whitney_p(baseline: list[float], current: list[float]) -> float:
+    """One-sided Mann-Whitney U p-value that ``current`` tends to be larger than ``baseline``.
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is adequate from about eight samples per side.
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        return 1.0
+
+    combined = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+    ranks = [0.0] * len(combined)
+    ties = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        size = j - i + 1
+        ties += size**3 - size
+        i = j + 1
+
+    u = (
+        sum(rank for rank, (_, side) in zip(ranks, combined, strict=True) if side)
+        - n2 * (n2 + 1) / 2
+    )
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / variance**0.5
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def compare(
+    baseline: dict[str, list[float]],
+    current: dict[str, list[float]],
+    alpha: float = 0.01,
+    min_effect: float = 0.25,
+) -> list[dict[str, Any]]:
+    """Compare current samples to the baseline.
+
+    A benchmark regresses when it is slower with one-sided significance
+    ``alpha`` and its median moved by more than ``min_effect``, so neither
+    noise nor tiny-but-consistent shifts fail the suite.
+    """
+    rows = []
+    for name, samples in current.items():
+        median = statistics.median(samples)
+        row: dict[str, Any] = {"name": name, "current_ms": median, "samples": len(samples)}
+        reference = baseline.get(name)
+        if not reference:
+            rows.append({**row, "status": "new"})
+            continue
+
+        reference_median = statistics.median(reference)
+        change = median / reference_median - 1 if reference_median else 0.0
+        slower = mann_whitney_p(reference, samples)
+        faster = mann_whitney_p(samples, reference)
+        if slower < alpha and change > min_effect:
+            status, p_value = "regression", slower
+        elif faster < alpha and change < -min_effect:
+            status, p_value = "improvement", faster
+        else:
+            status, p_value = "ok", min(slower, faster)
+        rows.append(
+            {
+                **row,
+                "baseline_ms": reference_median,
+                "change": change,
+                "p_value": p_value,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> dict[str, list[float]]:
+    """Load baseline samples by benchmark name; a missing file is an empty baseline."""
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text())
+    return {name: entry["samples"] for name, entry in data.get("benchmarks", {}).items()}
+
+
+def save_baseline(results: dict[str, list[float]], path: Path = DEFAULT_BASELINE) -> None:
+    """Record ``results`` in the baseline file, keeping entries for benchmarks not rerun."""
+    data = json.loads(path.read_text()) if path.exists() else {}
+    benchmarks = data.get("benchmarks", {})
+    for name, samples in results.items():
+        benchmarks[name] = {
+            "median_ms": round(statistics.median(samples), 3),
+            "samples": [round(sample, 3) for sample in samples],
+        }
+
+    data = {
+        "recorded_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
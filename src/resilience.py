@@ -0,0 +1,152 @@
+"""Adaptive probe timeouts and a circuit breaker for health checks."""
+
+from collections import deque
+from collections.abc import Callable
+import time
+
+
+class AdaptiveTimeout:
+    """Probe timeout derived from recent latencies, capped at a fixed ceiling.
+
+    The timeout is the larger of an RFC 6298 style estimate (smoothed
+    latency plus four times its mean deviation) and ``headroom`` times the
+    recent ``percentile`` latency. Until ``min_samples`` probes have
+    succeeded the ceiling is used; each timeout doubles the value until the
+    next success.
+    """
+
+    def __init__(
+        self,
+        ceiling: float,
+        floor: float = 0.5,
+        window: int = 64,
+        min_samples: int = 5,
+        percentile: float = 0.99,
+        headroom: float = 2.0,
+    ) -> None:
+        """Initialize adaptive timeout."""
+        self.ceiling = ceiling
+        self.floor = min(floor, ceiling)
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.headroom = headroom
+        self.samples: deque[float] = deque(maxlen=window)
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.backoff = 1.0
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a successful probe."""
+        if self.srtt is None:
+            self.srtt = seconds
+            self.rttvar = seconds / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - seconds)
+            self.srtt = 0.875 * self.srtt + 0.125 * seconds
+        self.samples.append(seconds)
+        self.backoff = 1.0
+
+    def observe_timeout(self) -> None:
+        """Back off after a probe timed out."""
+        self.backoff = min(self.backoff * 2, self.ceiling / self.floor)
+
+    @property
+    def current(self) -> float:
+        """Timeout in seconds for the next probe."""
+        if self.srtt is None or len(self.samples) < self.min_samples:
+            return self.ceiling
+
+        ordered = sorted(self.samples)
+        recent = ordered[int(self.percentile * (len(ordered) - 1))] * self.headroom
+        estimate = max(self.srtt + 4 * self.rttvar, recent, self.floor)
+        return min(estimate * self.backoff, self.ceiling)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker that stops probing unreachable targets.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused without touching the network. Once ``reset_timeout``
+    has elapsed, up to ``half_open_trials`` concurrent trial calls are let
+    through: a success closes the circuit, a failure reopens it with the
+    reset timeout doubled (up to ``max_reset_timeout``).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 300.0,
+        half_open_trials: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.half_open_trials = half_open_trials
+        self.clock = clock
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the reset timeout passes."""
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed."""
+        if self.state != self.OPEN:
+            return 0.0
+        return self.reset_timeout - (self.clock() - self._opened_at)
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed, reserving a trial slot when half-open."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._trials < self.half_open_trials:
+            self._trials += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.failures = 0
+        self._state = self.CLOSED
+        self._trials = 0
+        self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit when the threshold is reached."""
+        self.failures += 1
+        if self._state == self.HALF_OPEN:
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif self._state == self.CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Give back the trial slot of a call that was cancelled before it finished.
+
+        A cancelled call says nothing about the target, so it is neither a
+        success nor a failure.
+        """
+        if self._state == self.HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+        self._trials = 0
@@ -0,0 +1,114 @@
+"""Resident health probe daemon answering container healthchecks from cache over a Unix socket."""
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+from src.health_check import HealthChecker
+
+logger = logging.getLogger(__name__)
+
+
+class HealthSidecar:
+    """Refresh ``full_health_check`` in the background and serve the cached result.
+
+    Each connection to the socket gets one reply and is closed: a status
+    line ``<status> <age_ms>`` followed by the cached result as JSON. The
+    status is the cached overall status, ``starting`` before the first
+    check completes, or ``stale`` once the result is older than
+    ``max_age`` seconds because refreshes are hanging or failing.
+    """
+
+    def __init__(
+        self,
+        checker: HealthChecker,
+        socket_path: str | Path,
+        interval: float = 5.0,
+        max_age: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize sidecar; ``max_age`` defaults to three refresh intervals."""
+        self.checker = checker
+        self.socket_path = Path(socket_path)
+        self.interval = interval
+        self.max_age = max_age or interval * 3
+        self.clock = clock
+        self.result: dict[str, Any] | None = None
+        self.checked_at = 0.0
+        self.refreshes = 0
+        self.queries = 0
+        self._body = b"{}"
+        self._server: asyncio.Server | None = None
+        self._refresher: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "HealthSidecar":
+        """Start serving and refreshing."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop serving and refreshing."""
+        await self.stop()
+
+    async def refresh(self) -> dict[str, Any]:
+        """Run one full health check and cache its result and encoded reply body."""
+        result = await self.checker.full_health_check()
+        self._body = json.dumps(result, default=str).encode()
+        self.result = result
+        self.checked_at = self.clock()
+        self.refreshes += 1
+        return result
+
+    def reply(self) -> bytes:
+        """Build the reply for one query from the cached result."""
+        if self.result is None:
+            return b"starting 0\n{}\n"
+        age = self.clock() - self.checked_at
+        status = "stale" if age > self.max_age else self.result["status"]
+        return f"{status} {age * 1000:.0f}\n".encode() + self._body + b"\n"
+
+    async def handle(self, _reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one query without reading a request."""
+        self.queries += 1
+        try:
+            writer.write(self.reply())
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> asyncio.Server:
+        """Listen on the socket, replacing a stale one, and start refreshing."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self.handle, str(self.socket_path))
+        self.socket_path.chmod(0o660)
+        self._refresher = asyncio.create_task(self._refresh_forever())
+        return self._server
+
+    async def stop(self) -> None:
+        """Stop refreshing, close the server and remove the socket."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            self.socket_path.unlink(missing_ok=True)
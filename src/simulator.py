@@ -0,0 +1,195 @@
+"""Discrete-event capacity simulator for n8n regular and queue execution modes."""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import math
+import random
+import statistics
+from typing import Any
+
+from src.config import config
+
+Sampler = Callable[[random.Random], float]
+
+
+def parse_profile(profile: str) -> list[tuple[float, float]]:
+    """Parse ``"SECONDS:RATE,SECONDS:RATE"`` into piecewise-constant arrival steps."""
+    steps = []
+    for part in profile.split(","):
+        seconds, _, rate = part.partition(":")
+        steps.append((float(seconds), float(rate)))
+    if not steps or any(seconds <= 0 or rate < 0 for seconds, rate in steps):
+        raise ValueError(f"Invalid arrival profile: {profile!r}")
+    return steps
+
+
+def parse_distribution(spec: str) -> Sampler:
+    """Parse an execution-duration distribution in seconds.
+
+    Supported forms are ``fixed:SECONDS``, ``exponential:MEAN`` and
+    ``lognormal:MU,SIGMA`` (parameters of the underlying normal, in log-seconds).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda _rng: values[0]
+    if kind == "exponential" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0])
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+
+    raise ValueError(f"Invalid duration distribution: {spec!r}")
+
+
+def fit_lognormal(durations_ms: Iterable[float]) -> tuple[float, float]:
+    """Fit lognormal ``(mu, sigma)`` in log-seconds to recorded durations."""
+    logs = [math.log(d / 1000) for d in durations_ms if d and d > 0]
+    if len(logs) < 2:
+        raise ValueError("At least two recorded durations are needed to fit a distribution")
+    return statistics.fmean(logs), statistics.stdev(logs)
+
+
+def generate_workload(
+    profile: list[tuple[float, float]], sampler: Sampler, seed: int = 0
+) -> tuple[list[float], list[float]]:
+    """Draw Poisson arrival times and execution durations for ``profile``.
+
+    The same workload is replayed against every configuration in a sweep
+    (common random numbers), so differences between configurations are not
+    masked by sampling noise.
+    """
+    rng = random.Random(seed)
+    arrivals: list[float] = []
+    durations: list[float] = []
+    step_start = 0.0
+
+    for seconds, rate in profile:
+        t = step_start
+        step_end = step_start + seconds
+        while rate > 0:
+            t += rng.expovariate(rate)
+            if t >= step_end:
+                break
+            arrivals.append(t)
+            durations.append(sampler(rng))
+        step_start = step_end
+
+    return arrivals, durations
+
+
+def effective_timeout(timeout: float | None = None, timeout_max: float | None = None) -> float:
+    """Return the execution timeout in seconds, or ``inf`` when disabled."""
+    timeout = config.EXECUTIONS_TIMEOUT if timeout is None else timeout
+    timeout_max = config.EXECUTIONS_TIMEOUT_MAX if timeout_max is None else timeout_max
+    if timeout <= 0:
+        return math.inf
+    return min(timeout, timeout_max) if timeout_max > 0 else timeout
+
+
+def simulate(
+    arrivals: list[float],
+    durations: list[float],
+    slots: int,
+    timeout: float = math.inf,
+    dispatch_overhead: float = 0.0,
+) -> dict[str, Any]:
+    """Simulate a FIFO pool of ``slots`` concurrent execution slots.
+
+    Uses an event heap of slot-free times: each job, in arrival order, takes
+    the earliest free slot, so the run costs O(n log slots). Executions are
+    cut off at ``timeout`` seconds. ``dispatch_overhead`` models the extra
+    hop through Redis in queue mode.
+    """
+    free_at = [0.0] * max(slots, 1)
+    waits: list[float] = []
+    busy = 0.0
+    timeouts = 0
+    last_finish = 0.0
+
+    for arrival, duration in zip(arrivals, durations, strict=True):
+        ready = arrival + dispatch_overhead
+        start = max(ready, heapq.heappop(free_at))
+        run = duration
+        if run > timeout:
+            run = timeout
+            timeouts += 1
+        finish = start + run
+        heapq.heappush(free_at, finish)
+
+        waits.append(start - arrival)
+        busy += run
+        last_finish = max(last_finish, finish)
+
+    jobs = len(arrivals)
+    horizon = max(last_finish, arrivals[-1] if arrivals else 0.0)
+    waits.sort()
+
+    return {
+        "slots": slots,
+        "jobs": jobs,
+        "mean_wait": statistics.fmean(waits) if waits else 0.0,
+        "p50_wait": waits[int(0.50 * (jobs - 1))] if waits else 0.0,
+        "p99_wait": waits[int(0.99 * (jobs - 1))] if waits else 0.0,
+        "max_wait": waits[-1] if waits else 0.0,
+        "utilization": busy / (slots * horizon) if horizon > 0 else 0.0,
+        "timeout_rate": timeouts / jobs if jobs else 0.0,
+    }
+
+
+def _run_config(args: tuple[list[float], list[float], dict[str, Any]]) -> dict[str, Any]:
+    """Worker entry point for one sweep configuration."""
+    arrivals, durations, scenario = args
+    result = simulate(
+        arrivals,
+        durations,
+        scenario["slots"],
+        timeout=scenario["timeout"],
+        dispatch_overhead=scenario["dispatch_overhead"],
+    )
+    return {**scenario, **result}
+
+
+def sweep(
+    arrivals: list[float],
+    durations: list[float],
+    worker_counts: list[int],
+    worker_concurrency: int = 10,
+    main_concurrency: int = 10,
+    timeout: float = math.inf,
+    queue_overhead: float = 0.005,
+    processes: int | None = 1,
+) -> list[dict[str, Any]]:
+    """Simulate regular mode and queue mode with each worker count.
+
+    Regular mode runs every execution in the main process with
+    ``main_concurrency`` slots; queue mode spreads them over ``workers``
+    processes of ``worker_concurrency`` slots each, after a Redis hop.
+    """
+    scenarios = [
+        {
+            "mode": "regular",
+            "workers": 0,
+            "slots": main_concurrency,
+            "timeout": timeout,
+            "dispatch_overhead": 0.0,
+        }
+    ]
+    scenarios += [
+        {
+            "mode": "queue",
+            "workers": workers,
+            "slots": workers * worker_concurrency,
+            "timeout": timeout,
+            "dispatch_overhead": queue_overhead,
+        }
+        for workers in worker_counts
+    ]
+
+    jobs = [(arrivals, durations, scenario) for scenario in scenarios]
+    if processes == 1:
+        return [_run_config(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_run_config, jobs))
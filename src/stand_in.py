@@ -0,0 +1,300 @@
+"""In-process asyncio stand-in for n8n with scriptable latency and failures."""
+
+import asyncio
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+import json
+import logging
+import random
+import time
+from typing import Any
+from urllib.parse import parse_qs
+
+from src.simulator import parse_distribution
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+class Behaviour:
+    """How the stand-in answers requests on a route.
+
+    ``latency`` is a duration distribution in seconds, in the form accepted
+    by ``simulator.parse_distribution``. ``error_rate`` of requests get a
+    500 and ``drop_rate`` have their connection aborted without a response.
+    """
+
+    def __init__(
+        self, latency: str = "fixed:0", error_rate: float = 0.0, drop_rate: float = 0.0
+    ) -> None:
+        """Initialize behaviour."""
+        self.latency = latency
+        self.sample_latency = parse_distribution(latency)
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+
+
+def make_executions(count: int, rng: random.Random) -> list[dict[str, Any]]:
+    """Build ``count`` finished executions, newest first, in the public API format."""
+    executions = []
+    for i in range(count, 0, -1):
+        started = EPOCH + timedelta(minutes=i)
+        failed = i % 20 == 0
+        executions.append(
+            {
+                "id": str(i),
+                "finished": not failed,
+                "mode": "webhook",
+                "status": "error" if failed else "success",
+                "startedAt": started.isoformat().replace("+00:00", "Z"),
+                "stoppedAt": (started + timedelta(seconds=rng.expovariate(0.5)))
+                .isoformat()
+                .replace("+00:00", "Z"),
+                "workflowId": str(i % 7 + 1),
+            }
+        )
+    return executions
+
+
+def make_workflows(count: int) -> dict[str, dict[str, Any]]:
+    """Build ``count`` small workflows keyed by ID, in the public API format."""
+    workflows = {}
+    for i in range(1, count + 1):
+        updated = (EPOCH + timedelta(hours=i)).isoformat().replace("+00:00", "Z")
+        workflows[str(i)] = {
+            "id": str(i),
+            "name": f"Workflow {i}",
+            "active": i % 3 == 0,
+            "nodes": [
+                {
+                    "name": "Webhook",
+                    "type": "n8n-nodes-base.webhook",
+                    "parameters": {"path": str(i)},
+                },
+                {"name": "Set", "type": "n8n-nodes-base.set", "parameters": {}},
+            ],
+            "connections": {"Webhook": {"main": [[{"node": "Set", "type": "main", "index": 0}]]}},
+            "settings": {"executionOrder": "v1"},
+            "staticData": None,
+            "createdAt": updated,
+            "updatedAt": updated,
+        }
+    return workflows
+
+
+class StandInServer:
+    """Keep-alive HTTP/1.1 server mimicking n8n's health, webhook and public REST API.
+
+    Behaviour is chosen per request by the longest matching prefix in
+    ``routes``, falling back to ``default``; both may be changed while the
+    server runs. For ``slow_start`` seconds after start, latencies are
+    multiplied by a factor that decays linearly from ``slow_start_factor``
+    to 1, like a cold instance warming up.
+    """
+
+    def __init__(
+        self,
+        default: Behaviour | None = None,
+        routes: dict[str, Behaviour] | None = None,
+        slow_start: float = 0.0,
+        slow_start_factor: float = 10.0,
+        executions: int = 1000,
+        workflows: int = 0,
+        api_key: str | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize stand-in server."""
+        self.default = default or Behaviour()
+        self.routes = routes or {}
+        self.slow_start = slow_start
+        self.slow_start_factor = slow_start_factor
+        self.api_key = api_key
+        self.rng = random.Random(seed)
+        self.executions = make_executions(executions, self.rng)
+        self.workflows = make_workflows(workflows)
+        self.requests: Counter[str] = Counter()
+        self.errors = 0
+        self.drops = 0
+        self.connections = 0
+        self.started_at = time.monotonic()
+        # Runtime gauges reported on /metrics; may be changed while the server runs.
+        self.event_loop_lag = 0.002
+        self.heap_used = 60 * 1024 * 1024
+        self.heap_total = 100 * 1024 * 1024
+        self.heap_limit = 2048 * 1024 * 1024
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> "StandInServer":
+        """Start on an ephemeral local port."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        await self.stop()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Start listening; ``port=0`` picks a free port."""
+        self.started_at = time.monotonic()
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server
+
+    async def stop(self) -> None:
+        """Stop listening and close the server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        assert self._server is not None, "server not started"
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def behaviour_for(self, path: str) -> Behaviour:
+        """Return the behaviour of the longest route prefix matching ``path``."""
+        matches = [prefix for prefix in self.routes if path.startswith(prefix)]
+        return self.routes[max(matches, key=len)] if matches else self.default
+
+    def latency(self, behaviour: Behaviour) -> float:
+        """Sample a latency in seconds, scaled up while slow-starting."""
+        seconds = behaviour.sample_latency(self.rng)
+        elapsed = time.monotonic() - self.started_at
+        if elapsed < self.slow_start:
+            seconds *= 1 + (self.slow_start_factor - 1) * (1 - elapsed / self.slow_start)
+        return seconds
+
+    def route(
+        self, method: str, path: str, query: str, headers: dict[str, str], body: bytes = b""
+    ) -> tuple[int, Any]:
+        """Return the status and JSON body for a request."""
+        if path == "/healthz":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics()
+        if path.startswith(("/webhook/", "/webhook-test/")):
+            return 200, {"message": "Workflow was started"}
+        if not path.startswith("/api/v1/"):
+            return 404, {"message": "not found"}
+        if self.api_key and headers.get("x-n8n-api-key") != self.api_key:
+            return 401, {"message": "unauthorized"}
+        return self.api_route(method, path.removeprefix("/api/v1"), parse_qs(query), body)
+
+    def api_route(
+        self, method: str, path: str, params: dict[str, list[str]], body: bytes
+    ) -> tuple[int, Any]:
+        """Return the status and JSON body for an authorized public API request."""
+        if path == "/executions" and method == "GET":
+            return 200, self.page(self.executions, params)
+        if path == "/workflows" and method == "GET":
+            return 200, self.page(list(self.workflows.values()), params)
+        if path.startswith("/workflows") and method in ("POST", "PUT"):
+            return self.save_workflow(path.removeprefix("/workflows").strip("/"), body)
+        return 404, {"message": "not found"}
+
+    def metrics(self) -> str:
+        """Render n8n-style Prometheus metrics; each webhook path counts as a workflow."""
+        lines = [
+            "# HELP n8n_nodejs_eventloop_lag_seconds Lag of event loop in seconds.",
+            "# TYPE n8n_nodejs_eventloop_lag_seconds gauge",
+            f"n8n_nodejs_eventloop_lag_seconds {self.event_loop_lag}",
+            "# TYPE n8n_nodejs_heap_size_total_bytes gauge",
+            f"n8n_nodejs_heap_size_total_bytes {self.heap_total}",
+            "# TYPE n8n_nodejs_heap_size_used_bytes gauge",
+            f"n8n_nodejs_heap_size_used_bytes {self.heap_used}",
+            "# TYPE n8n_nodejs_heap_space_size_available_bytes gauge",
+            'n8n_nodejs_heap_space_size_available_bytes{space="new"} 0',
+            'n8n_nodejs_heap_space_size_available_bytes{space="old"} '
+            + str(max(self.heap_limit - self.heap_used, 0)),
+            "# TYPE n8n_http_request_duration_seconds histogram",
+            'n8n_http_request_duration_seconds_bucket{le="+Inf"} ' + str(self.requests.total()),
+            "# HELP n8n_workflow_started_total Total number of workflows started.",
+            "# TYPE n8n_workflow_started_total counter",
+        ]
+        for path, count in sorted(self.requests.items()):
+            if path.startswith("/webhook/"):
+                workflow = path.removeprefix("/webhook/")
+                lines.append(f'n8n_workflow_started_total{{workflow_id="{workflow}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def page(self, items: list[dict[str, Any]], params: dict[str, list[str]]) -> dict[str, Any]:
+        """Return one cursor-paginated page of ``items``."""
+        limit = min(int(params.get("limit", ["100"])[0]), 250)
+        offset = int(params.get("cursor", ["0"])[0])
+        more = offset + limit < len(items)
+        return {
+            "data": items[offset : offset + limit],
+            "nextCursor": str(offset + limit) if more else None,
+        }
+
+    def save_workflow(self, workflow_id: str, body: bytes) -> tuple[int, Any]:
+        """Create (no ID) or replace a workflow from a JSON request body."""
+        if workflow_id and workflow_id not in self.workflows:
+            return 404, {"message": "workflow not found"}
+        try:
+            changes = json.loads(body)
+        except ValueError:
+            return 400, {"message": "request body must be JSON"}
+        workflow_id = workflow_id or str(max(map(int, self.workflows), default=0) + 1)
+        now = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        workflow = self.workflows.get(workflow_id, {"createdAt": now, "active": False})
+        workflow.update(changes, id=workflow_id, updatedAt=now)
+        self.workflows[workflow_id] = workflow
+        return 200, workflow
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection."""
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()).strip():
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                path, _, query = target.partition("?")
+                behaviour = self.behaviour_for(path)
+                self.requests[path] += 1
+                await asyncio.sleep(self.latency(behaviour))
+
+                if self.rng.random() < behaviour.drop_rate:
+                    self.drops += 1
+                    writer.transport.abort()
+                    return
+                if self.rng.random() < behaviour.error_rate:
+                    self.errors += 1
+                    status, response = 500, {"message": "stand-in error"}
+                else:
+                    status, response = self.route(method, path, query, headers, body)
+
+                close = headers.get("connection", "").lower() == "close"
+                if isinstance(response, str):
+                    payload, content_type = response.encode(), "text/plain; version=0.0.4"
+                else:
+                    payload, content_type = json.dumps(response).encode(), "application/json"
+                head = (
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                )
+                writer.write(head.encode() + payload)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.debug(f"Stand-in connection ended: {e}")
+        finally:
+            writer.close()
@@ -0,0 +1,355 @@
+"""Structural performance analysis of exported n8n workflows."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import heapq
+import json
+from pathlib import Path
+from typing import Any
+
+HTTP_NODE_TYPES = {"n8n-nodes-base.httpRequest", "n8n-nodes-base.httpRequestTool"}
+CODE_NODE_TYPES = {
+    "n8n-nodes-base.code",
+    "n8n-nodes-base.function",
+    "n8n-nodes-base.functionItem",
+}
+BATCH_NODE_TYPES = {"n8n-nodes-base.splitInBatches"}
+
+# Rough relative cost of a node on the critical path; network and code
+# nodes dominate execution time in typical workflows.
+NODE_COSTS = {
+    **dict.fromkeys(HTTP_NODE_TYPES, 5),
+    **dict.fromkeys(CODE_NODE_TYPES, 2),
+    "n8n-nodes-base.wait": 10,
+}
+
+FAN_OUT_THRESHOLD = 5
+SERIAL_HTTP_THRESHOLD = 3
+
+SEVERITY = {"high": 10, "medium": 5, "low": 1}
+
+
+def _node_type(node: dict[str, Any]) -> str:
+    return str(node.get("type", ""))
+
+
+def build_graph(workflow: dict[str, Any]) -> tuple[dict[str, dict[str, Any]], dict[str, list[str]]]:
+    """Return nodes by name and successor lists from a workflow's connections."""
+    nodes = {node["name"]: node for node in workflow.get("nodes", []) if "name" in node}
+    successors: dict[str, list[str]] = {name: [] for name in nodes}
+
+    for source, outputs in (workflow.get("connections") or {}).items():
+        if source not in nodes:
+            continue
+        for branches in outputs.values():
+            for branch in branches or []:
+                for target in branch or []:
+                    name = target.get("node")
+                    if name in nodes and name not in successors[source]:
+                        successors[source].append(name)
+
+    return nodes, successors
+
+
+def find_back_edges(successors: dict[str, list[str]]) -> set[tuple[str, str]]:
+    """Return the edges that close cycles, found by iterative depth-first search."""
+    white, grey, black = 0, 1, 2
+    color = dict.fromkeys(successors, white)
+    back_edges: set[tuple[str, str]] = set()
+
+    for root in successors:
+        if color[root] != white:
+            continue
+        color[root] = grey
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if color[child] == grey:
+                    back_edges.add((node, child))
+                elif color[child] == white:
+                    color[child] = grey
+                    stack.append((child, iter(successors[child])))
+                    break
+            else:
+                color[node] = black
+                stack.pop()
+
+    return back_edges
+
+
+def _cycle_nodes(successors: dict[str, list[str]], edge: tuple[str, str]) -> set[str]:
+    """Return the nodes on the cycle closed by back edge ``edge``."""
+    source, target = edge
+    parents: dict[str, str | None] = {target: None}
+    frontier = [target]
+    while frontier and source not in parents:
+        next_frontier = []
+        for node in frontier:
+            for child in successors[node]:
+                if child not in parents:
+                    parents[child] = node
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    cycle: set[str] = set()
+    node: str | None = source if source in parents else None
+    while node is not None:
+        cycle.add(node)
+        node = parents[node]
+    return cycle
+
+
+def analyze_workflow(workflow: dict[str, Any]) -> dict[str, Any]:
+    """Compute critical path, fan-out/fan-in, parallelism and slow-pattern findings."""
+    nodes, successors = build_graph(workflow)
+    back_edges = find_back_edges(successors)
+
+    dag: dict[str, list[str]] = {
+        name: [c for c in children if (name, c) not in back_edges]
+        for name, children in successors.items()
+    }
+    predecessors: dict[str, list[str]] = defaultdict(list)
+    for name, children in dag.items():
+        for child in children:
+            predecessors[child].append(name)
+
+    # Kahn's algorithm gives a topological order for longest-path DP.
+    in_degree = {name: len(predecessors[name]) for name in nodes}
+    order = [name for name, degree in in_degree.items() if degree == 0]
+    for name in order:
+        for child in dag[name]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                order.append(child)
+
+    cost: dict[str, int] = {}
+    best_parent: dict[str, str | None] = {}
+    level: dict[str, int] = {}
+    for name in order:
+        own = NODE_COSTS.get(_node_type(nodes[name]), 1)
+        parents = predecessors[name]
+        parent = max(parents, key=lambda p: cost[p]) if parents else None
+        cost[name] = own + (cost[parent] if parent else 0)
+        best_parent[name] = parent
+        level[name] = max((level[p] + 1 for p in parents), default=0)
+
+    critical_path: list[str] = []
+    if cost:
+        node: str | None = max(cost, key=lambda n: cost[n])
+        while node is not None:
+            critical_path.append(node)
+            node = best_parent[node]
+        critical_path.reverse()
+
+    width: dict[int, int] = defaultdict(int)
+    for depth in level.values():
+        width[depth] += 1
+
+    fan_out = {name: len(children) for name, children in successors.items()}
+    fan_in = {name: len(predecessors[name]) for name in nodes}
+
+    findings = _find_slow_patterns(nodes, successors, dag, predecessors, back_edges)
+    score = sum(SEVERITY[f["severity"]] for f in findings) + sum(cost.values()) // 100
+
+    return {
+        "id": workflow.get("id"),
+        "name": workflow.get("name"),
+        "nodes": len(nodes),
+        "edges": sum(len(children) for children in successors.values()),
+        "critical_path": critical_path,
+        "critical_path_cost": cost[critical_path[-1]] if critical_path else 0,
+        "max_fan_out": max(fan_out.values(), default=0),
+        "max_fan_in": max(fan_in.values(), default=0),
+        "parallel_branches": sum(n - 1 for n in fan_out.values() if n > 1),
+        "max_parallel_width": max(width.values(), default=0),
+        "loops": len(back_edges),
+        "findings": findings,
+        "score": score,
+    }
+
+
+def _find_slow_patterns(
+    nodes: dict[str, dict[str, Any]],
+    successors: dict[str, list[str]],
+    dag: dict[str, list[str]],
+    predecessors: dict[str, list[str]],
+    back_edges: set[tuple[str, str]],
+) -> list[dict[str, Any]]:
+    """Flag known slow node patterns."""
+    findings = [
+        _finding("large_fan_out", "medium", name, f"{len(children)} downstream branches")
+        for name, children in successors.items()
+        if len(children) >= FAN_OUT_THRESHOLD
+    ]
+    findings.extend(_serial_http_chains(nodes, dag, predecessors))
+
+    for edge in sorted(back_edges):
+        cycle = _cycle_nodes(successors, edge)
+        if not any(_node_type(nodes[n]) in BATCH_NODE_TYPES for n in cycle):
+            findings.append(
+                _finding(
+                    "unbatched_loop",
+                    "high",
+                    edge[1],
+                    f"loop over {len(cycle)} nodes without Split In Batches",
+                )
+            )
+
+    findings.extend(_node_findings(nodes, dag, predecessors))
+    return findings
+
+
+def _finding(pattern: str, severity: str, node: str, detail: str) -> dict[str, Any]:
+    return {"pattern": pattern, "severity": severity, "node": node, "detail": detail}
+
+
+def _serial_http_chains(
+    nodes: dict[str, dict[str, Any]],
+    dag: dict[str, list[str]],
+    predecessors: dict[str, list[str]],
+) -> list[dict[str, Any]]:
+    """Flag runs of HTTP nodes linked one-to-one, reporting each run once."""
+
+    def is_http(name: str) -> bool:
+        return _node_type(nodes[name]) in HTTP_NODE_TYPES
+
+    def next_in_chain(name: str) -> str | None:
+        children = dag[name]
+        if len(children) == 1 and is_http(children[0]) and len(predecessors[children[0]]) == 1:
+            return children[0]
+        return None
+
+    chained = {child for name in nodes if is_http(name) and (child := next_in_chain(name))}
+    findings = []
+    for name in nodes:
+        if not is_http(name) or name in chained:
+            continue
+        chain = [name]
+        while (child := next_in_chain(chain[-1])) is not None:
+            chain.append(child)
+        if len(chain) >= SERIAL_HTTP_THRESHOLD:
+            findings.append(
+                _finding(
+                    "serial_http_chain",
+                    "high",
+                    name,
+                    f"{len(chain)} HTTP requests in series: {' -> '.join(chain)}",
+                )
+            )
+    return findings
+
+
+def _node_findings(
+    nodes: dict[str, dict[str, Any]],
+    dag: dict[str, list[str]],
+    predecessors: dict[str, list[str]],
+) -> list[dict[str, Any]]:
+    """Flag slow settings on individual Split In Batches and Code nodes."""
+    findings = []
+
+    for name, node in nodes.items():
+        params = node.get("parameters") or {}
+        node_type = _node_type(node)
+
+        if node_type in BATCH_NODE_TYPES and params.get("batchSize") == 1:
+            findings.append(
+                _finding(
+                    "batch_size_one",
+                    "medium",
+                    name,
+                    "Split In Batches processes one item per iteration",
+                )
+            )
+        if node_type not in CODE_NODE_TYPES:
+            continue
+
+        if params.get("mode") == "runOnceForEachItem" or node_type.endswith("functionItem"):
+            findings.append(
+                _finding(
+                    "per_item_code",
+                    "low",
+                    name,
+                    "Code runs once per item instead of once for all items",
+                )
+            )
+        findings.extend(
+            _finding(
+                "redundant_code", "low", child, f"Code node directly follows Code node '{name}'"
+            )
+            for child in dag[name]
+            if _node_type(nodes[child]) in CODE_NODE_TYPES and len(predecessors[child]) == 1
+        )
+
+    return findings
+
+
+def load_workflows(path: str | Path) -> list[dict[str, Any]]:
+    """Load one workflow or a list of workflows from an exported JSON file."""
+    data = json.loads(Path(path).read_text())
+    return data if isinstance(data, list) else [data]
+
+
+def analyze_file(path: str) -> list[dict[str, Any]]:
+    """Analyze every workflow in ``path``, tagging results with the file name.
+
+    A file that cannot be loaded, or a workflow that is not shaped like an
+    n8n export, yields an error record instead of aborting a bulk run.
+    """
+    try:
+        workflows = load_workflows(path)
+    except (OSError, ValueError) as e:
+        return [{"file": path, "error": str(e), "score": 0, "findings": []}]
+
+    results = []
+    for workflow in workflows:
+        try:
+            result = analyze_workflow(workflow)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            result = {"error": f"Malformed workflow: {e}", "score": 0, "findings": []}
+        result["file"] = path
+        results.append(result)
+    return results
+
+
+def _analyze_batch(paths: list[str]) -> list[dict[str, Any]]:
+    """Worker entry point: analyze a batch of files."""
+    return [result for path in paths for result in analyze_file(path)]
+
+
+def find_workflow_files(paths: Iterable[str | Path]) -> list[str]:
+    """Expand files and directories into a sorted list of JSON files."""
+    files: list[str] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(str(p) for p in sorted(path.rglob("*.json")))
+        else:
+            files.append(str(path))
+    return files
+
+
+def analyze_bulk(
+    files: list[str], workers: int | None = None, batch_size: int = 64
+) -> Iterator[dict[str, Any]]:
+    """Analyze many files over a process pool, yielding results as batches finish.
+
+    Files are handed to workers in batches to amortize inter-process
+    overhead. With ``workers=1`` everything runs in-process.
+    """
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+
+    if workers == 1:
+        for batch in batches:
+            yield from _analyze_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_analyze_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def top_ranked(results: Iterable[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """Return the ``limit`` highest-scoring results, keeping only that many in memory."""
+    return heapq.nlargest(limit, results, key=lambda r: r["score"])
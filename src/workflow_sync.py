@@ -0,0 +1,220 @@
+"""Delta sync of workflows between n8n and a directory of per-workflow JSON files."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+# Fields the public API accepts on create/update; the content hash covers only these,
+# so IDs, timestamps and version IDs that differ between environments are ignored.
+SYNC_FIELDS = ("name", "nodes", "connections", "settings", "staticData")
+
+
+def content_hash(workflow: dict[str, Any]) -> str:
+    """Return a SHA-256 over the workflow's synced fields in canonical JSON form."""
+    content = {field: workflow.get(field) for field in SYNC_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def load_manifest(directory: Path) -> dict[str, Any]:
+    """Load the export manifest, or an empty one."""
+    path = directory / MANIFEST
+    if not path.exists():
+        return {"workflows": {}}
+    return json.loads(path.read_text())
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write JSON atomically so an interrupted export never leaves a torn file."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+    tmp.replace(path)
+
+
+def _write_workflows(directory: Path, workflows: list[dict[str, Any]]) -> None:
+    for workflow in workflows:
+        _write_json(directory / f"{workflow['id']}.json", workflow)
+
+
+async def workflow_pages(
+    client: httpx.AsyncClient, base_url: str, api_key: str | None = None, page_size: int = 250
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield pages of workflows, requesting the next page while the current one is handled."""
+    url = f"{base_url.rstrip('/')}/api/v1/workflows"
+    headers = {"X-N8N-API-KEY": api_key or config.N8N_API_KEY}
+
+    async def fetch(cursor: str | None) -> dict[str, Any]:
+        params = {"limit": str(page_size), "excludePinnedData": "true"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    pending: asyncio.Task[dict[str, Any]] | None = asyncio.create_task(fetch(None))
+    try:
+        while pending is not None:
+            body = await pending
+            cursor = body.get("nextCursor")
+            pending = asyncio.create_task(fetch(cursor)) if cursor else None
+            yield body.get("data", [])
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def export_workflows(
+    client: httpx.AsyncClient,
+    directory: Path,
+    base_url: str,
+    api_key: str | None = None,
+    page_size: int = 250,
+    prune: bool = False,
+) -> dict[str, Any]:
+    """Export workflows to ``directory`` as ``<id>.json``, writing only changed ones.
+
+    A manifest maps each workflow ID to the hash of its synced fields, so
+    files are rewritten only when the workflow's content changed. Files
+    are written on a worker thread while the next page downloads.
+    Workflows that no longer exist upstream are reported, and deleted
+    along with their files when ``prune`` is set.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(directory)
+    entries: dict[str, dict[str, Any]] = manifest["workflows"]
+    seen: set[str] = set()
+    pages = 0
+    written = 0
+
+    async for page in workflow_pages(client, base_url, api_key, page_size):
+        pages += 1
+        changed = []
+        for workflow in page:
+            workflow_id = str(workflow["id"])
+            seen.add(workflow_id)
+            digest = content_hash(workflow)
+            entry = entries.get(workflow_id)
+            if entry and entry["hash"] == digest and (directory / f"{workflow_id}.json").exists():
+                continue
+            changed.append(workflow)
+            entries[workflow_id] = {"hash": digest, "name": workflow.get("name")}
+        if changed:
+            await asyncio.to_thread(_write_workflows, directory, changed)
+            written += len(changed)
+
+    removed = sorted(set(entries) - seen)
+    if prune:
+        for workflow_id in removed:
+            (directory / f"{workflow_id}.json").unlink(missing_ok=True)
+            del entries[workflow_id]
+
+    manifest.update(source=base_url, exported_at=datetime.now(UTC).isoformat(timespec="seconds"))
+    _write_json(directory / MANIFEST, manifest)
+    logger.info(f"Exported {written} of {len(seen)} workflows over {pages} pages")
+    return {
+        "pages": pages,
+        "total": len(seen),
+        "written": written,
+        "unchanged": len(seen) - written,
+        "removed": removed,
+    }
+
+
+def read_local(directory: Path) -> list[dict[str, Any]]:
+    """Read every exported workflow file in ``directory``."""
+    return [
+        json.loads(path.read_text())
+        for path in sorted(directory.glob("*.json"))
+        if path.name != MANIFEST
+    ]
+
+
+async def import_workflows(
+    client: httpx.AsyncClient,
+    directory: Path,
+    base_url: str,
+    api_key: str | None = None,
+    concurrency: int = 8,
+    page_size: int = 250,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Push workflows in ``directory`` to n8n, sending only those that differ.
+
+    The target's workflows are listed once and hashed like the local files.
+    A local workflow is matched by ID, or by name when promoting between
+    environments whose IDs differ; unchanged matches are skipped, changed
+    ones updated, and unmatched ones created, ``concurrency`` at a time.
+    ``created`` and ``updated`` count the pushes the target accepted with a
+    2xx response (or would push, with ``dry_run``); the rest are ``failed``.
+    """
+    local = await asyncio.to_thread(read_local, directory)
+    remote_hash: dict[str, str] = {}
+    remote_by_name: dict[str, str] = {}
+    async for page in workflow_pages(client, base_url, api_key, page_size):
+        for workflow in page:
+            remote_hash[str(workflow["id"])] = content_hash(workflow)
+            remote_by_name.setdefault(workflow.get("name", ""), str(workflow["id"]))
+
+    creates: list[dict[str, Any]] = []
+    updates: list[tuple[str, dict[str, Any]]] = []
+    for workflow in local:
+        target = str(workflow.get("id", ""))
+        if target not in remote_hash:
+            target = remote_by_name.get(workflow.get("name", ""), "")
+        if not target:
+            creates.append(workflow)
+        elif remote_hash[target] != content_hash(workflow):
+            updates.append((target, workflow))
+
+    result: dict[str, Any] = {
+        "total": len(local),
+        "created": len(creates),
+        "updated": len(updates),
+        "unchanged": len(local) - len(creates) - len(updates),
+        "failed": [],
+    }
+    if dry_run:
+        return result
+
+    result["created"] = result["updated"] = 0
+    url = f"{base_url.rstrip('/')}/api/v1/workflows"
+    headers = {"X-N8N-API-KEY": api_key or config.N8N_API_KEY}
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def push(method: str, target: str, workflow: dict[str, Any]) -> None:
+        payload = {field: workflow[field] for field in SYNC_FIELDS if field in workflow}
+        payload.setdefault("settings", {})
+        async with semaphore:
+            try:
+                response = await client.request(
+                    method, f"{url}/{target}" if target else url, json=payload, headers=headers
+                )
+                if not response.is_success:
+                    raise httpx.HTTPStatusError(
+                        f"{response.status_code} {response.reason_phrase}",
+                        request=response.request,
+                        response=response,
+                    )
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to push workflow {workflow.get('name')!r}: {e}")
+                result["failed"].append({"name": workflow.get("name"), "error": str(e)})
+                return
+            result["updated" if target else "created"] += 1
+
+    await asyncio.gather(
+        *(push("POST", "", workflow) for workflow in creates),
+        *(push("PUT", target, workflow) for target, workflow in updates),
+    )
+    return result
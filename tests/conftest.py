@@ -1,12 +1,14 @@
 """Pytest configuration and fixtures."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 import os
 from typing import Any
 
 from dotenv import load_dotenv
 import pytest
 
+from src.stand_in import StandInServer
+
 # Load test environment
 load_dotenv(".env.test")
 
@@ -41,6 +43,13 @@ def setup_test_env(test_env: dict[str, str]) -> Generator[None, None, None]:
     os.environ.update(old_environ)
 
 
+@pytest.fixture
+async def n8n_stand_in() -> AsyncGenerator[StandInServer, None]:
+    """Provide a running local n8n stand-in server."""
+    async with StandInServer(seed=0) as server:
+        yield server
+
+
 @pytest.fixture
 def mock_n8n_url() -> str:
     """Provide mock n8n URL."""
@@ -0,0 +1,266 @@
+"""Unit tests for parallel database backup and restore."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+import gzip
+import hashlib
+from pathlib import Path
+import re
+from typing import Any
+import zlib
+
+import pytest
+
+from src.backup import (
+    GZIP_WBITS,
+    OUTPUT_BYTES,
+    backup_database,
+    dependent_tables,
+    load_manifest,
+    read_compressed,
+    restore_database,
+    restore_order,
+    verify_backup,
+)
+
+REFERENCES = [
+    {"table_name": "execution_entity", "referenced": "workflow_entity"},
+    {"table_name": "execution_data", "referenced": "execution_entity"},
+]
+REFERENCE_PAIRS = [(r["table_name"], r["referenced"]) for r in REFERENCES]
+
+
+def sample_tables() -> dict[str, bytes]:
+    """Build COPY text data for three related n8n tables."""
+    return {
+        "workflow_entity": b"".join(b"%d\tWorkflow %d\n" % (i, i) for i in range(1, 4)),
+        "execution_entity": b"".join(b"%d\t%d\tsuccess\n" % (i, i % 3 + 1) for i in range(50)),
+        "execution_data": b"".join(b'%d\t{"data": "%s"}\n' % (i, b"x" * 500) for i in range(50)),
+    }
+
+
+class FakeTransaction:
+    """Async context manager returned by FakeConnection.transaction()."""
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class FakeConnection:
+    """asyncpg connection stand-in serving COPY from an in-memory database."""
+
+    def __init__(self, db: "FakePool") -> None:
+        self.db = db
+
+    def transaction(self, **options: Any) -> FakeTransaction:
+        self.db.transactions.append(options)
+        return FakeTransaction()
+
+    async def fetchval(self, query: str) -> str:
+        return "00000003-00000002-1" if "snapshot" in query else "16.2"
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        return await self.db.fetch(query, *args)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        return await self.db.execute(query, *args)
+
+    async def copy_from_table(
+        self, table: str, output: Callable[[bytes], Awaitable[None]], **options: Any
+    ) -> str:
+        self.db.copying += 1
+        self.db.max_copying = max(self.db.max_copying, self.db.copying)
+        data = self.db.tables[table]
+        for offset in range(0, len(data), 1000):
+            await output(data[offset : offset + 1000])
+            await asyncio.sleep(0)
+        self.db.copying -= 1
+        return f"COPY {len(data.splitlines())}"
+
+    async def copy_to_table(self, table: str, source: AsyncIterator[bytes], **options: Any) -> str:
+        self.db.order.append(table)
+        data = b"".join([chunk async for chunk in source])
+        self.db.tables[table] = data
+        return f"COPY {len(data.splitlines())}"
+
+
+class FakeAcquire:
+    """Async context manager returned by FakePool.acquire()."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    async def __aenter__(self) -> FakeConnection:
+        return self.conn
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class FakePool:
+    """asyncpg pool stand-in over a dict of table name to COPY text data."""
+
+    def __init__(self, tables: dict[str, bytes] | None = None) -> None:
+        self.tables = tables or {}
+        self.statements: list[str] = []
+        self.transactions: list[dict[str, Any]] = []
+        self.order: list[str] = []
+        self.copying = 0
+        self.max_copying = 0
+        self.closed = False
+
+    def acquire(self) -> FakeAcquire:
+        return FakeAcquire(FakeConnection(self))
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        if "pg_constraint" in query:
+            return REFERENCES
+        if "pg_get_serial_sequence" in query:
+            return [{"column_name": "id", "sequence": f"public.{args[1]}_id_seq"}]
+        return [
+            {"name": name, "bytes": len(data), "columns": ["id", "data"]}
+            for name, data in sorted(self.tables.items(), key=lambda t: -len(t[1]))
+        ]
+
+    async def execute(self, query: str, *args: Any) -> str:
+        self.statements.append(query)
+        if query.startswith("TRUNCATE"):
+            names = set(re.findall(r'"public"\."(\w+)"', query))
+            referencing = {r["table_name"] for r in REFERENCES if r["referenced"] in names}
+            if "CASCADE" not in query and referencing - names:
+                raise ValueError("cannot truncate a table referenced in a foreign key constraint")
+            for name in [*names, *dependent_tables(sorted(names), REFERENCE_PAIRS)]:
+                self.tables.pop(name, None)
+        return "OK"
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def factory(pool: FakePool) -> Callable[..., Awaitable[FakePool]]:
+    """Return a pool factory handing out ``pool``."""
+
+    async def create_pool(**kwargs: Any) -> FakePool:
+        return pool
+
+    return create_pool
+
+
+class TestBackup:
+    """Test backing up tables."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_backup_writes_compressed_tables_and_manifest(self, tmp_path: Path) -> None:
+        """Test each table is streamed to a gzip file in parallel within one snapshot."""
+        source = FakePool(sample_tables())
+        result = await backup_database(tmp_path, jobs=2, pool_factory=factory(source))
+        manifest = load_manifest(tmp_path)
+        entry = manifest["tables"]["execution_data"]
+
+        assert result["tables"] == 3
+        assert result["rows"] == 103
+        assert result["compressed_bytes"] < result["bytes"]
+        assert (
+            gzip.decompress((tmp_path / entry["file"]).read_bytes())
+            == sample_tables()["execution_data"]
+        )
+        assert entry["rows"] == 50
+        assert manifest["server_version"] == "16.2"
+        assert source.max_copying == 2
+        assert source.statements == ["SET TRANSACTION SNAPSHOT '00000003-00000002-1'"]
+        assert source.transactions[0] == {"isolation": "repeatable_read", "readonly": True}
+        assert source.closed
+        assert all(verify_backup(tmp_path).values())
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_backup_rejects_unknown_tables(self, tmp_path: Path) -> None:
+        """Test asking for a table that does not exist fails before copying."""
+        source = FakePool(sample_tables())
+        with pytest.raises(ValueError, match="Unknown tables: nope"):
+            await backup_database(tmp_path, tables=["nope"], pool_factory=factory(source))
+        assert source.closed
+        assert not (tmp_path / "manifest.json").exists()
+
+
+class TestRestore:
+    """Test restoring tables."""
+
+    @pytest.mark.unit
+    def test_restore_order_waves(self) -> None:
+        """Test referenced tables come first and cycles end up in the last wave."""
+        refs = REFERENCE_PAIRS
+        tables = ["execution_data", "execution_entity", "workflow_entity", "settings"]
+        assert restore_order(tables, refs) == [
+            ["settings", "workflow_entity"],
+            ["execution_entity"],
+            ["execution_data"],
+        ]
+        assert restore_order(["execution_data"], refs) == [["execution_data"]]
+        assert restore_order(["a", "b"], [("a", "b"), ("b", "a"), ("a", "a")]) == [["a", "b"]]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path: Path) -> None:
+        """Test a restore reproduces every table and resets sequences."""
+        await backup_database(tmp_path, pool_factory=factory(FakePool(sample_tables())))
+        target = FakePool()
+        result = await restore_database(tmp_path, clean=True, pool_factory=factory(target))
+
+        assert target.tables == sample_tables()
+        assert (result["tables"], result["rows"], result["waves"]) == (3, 103, 3)
+        assert target.order == ["workflow_entity", "execution_entity", "execution_data"]
+        assert target.statements[0].startswith('TRUNCATE "public"."execution_data"')
+        assert sum("setval" in s for s in target.statements) == 3
+        assert result["cleared"] == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_clean_subset_cascades_to_referencing_tables(self, tmp_path: Path) -> None:
+        """Test cleaning a referenced table also empties, and reports, the tables referencing it."""
+        await backup_database(tmp_path, pool_factory=factory(FakePool(sample_tables())))
+        target = FakePool(sample_tables())
+        result = await restore_database(
+            tmp_path, tables=["workflow_entity"], clean=True, pool_factory=factory(target)
+        )
+
+        assert target.statements[0] == 'TRUNCATE "public"."workflow_entity" CASCADE'
+        assert result["cleared"] == ["execution_data", "execution_entity"]
+        assert list(target.tables) == ["workflow_entity"]
+        assert dependent_tables(["execution_data"], REFERENCE_PAIRS) == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_restore_subset_and_checksum(self, tmp_path: Path) -> None:
+        """Test a chosen subset is restored and a corrupted file is rejected."""
+        await backup_database(tmp_path, pool_factory=factory(FakePool(sample_tables())))
+        target = FakePool()
+        await restore_database(tmp_path, tables=["workflow_entity"], pool_factory=factory(target))
+        assert list(target.tables) == ["workflow_entity"]
+
+        path = tmp_path / "execution_entity.copy.gz"
+        path.write_bytes(gzip.compress(b"1\t1\tcrashed\n"))
+        assert verify_backup(tmp_path)["execution_entity"] is False
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            await restore_database(
+                tmp_path, tables=["execution_entity"], pool_factory=factory(FakePool())
+            )
+        with pytest.raises(ValueError, match="not in backup: nope"):
+            await restore_database(tmp_path, tables=["nope"], pool_factory=factory(FakePool()))
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_read_compressed_bounds_chunks(self, tmp_path: Path) -> None:
+        """Test highly compressible data is inflated in bounded chunks."""
+        data = b"\0" * (3 * OUTPUT_BYTES + 1)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, GZIP_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+        path = tmp_path / "zeros.copy.gz"
+        path.write_bytes(compressed)
+        chunks = [c async for c in read_compressed(path, hashlib.sha256(compressed).hexdigest())]
+        assert max(len(c) for c in chunks) <= OUTPUT_BYTES
+        assert sum(len(c) for c in chunks) == len(data)
@@ -0,0 +1,74 @@
+"""Unit tests for the webhook load generator."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.bench import load_payload, run_ramp, run_step, webhook_url
+from src.stand_in import Behaviour, StandInServer
+
+
+@pytest.fixture
+def stand_in_url(n8n_stand_in: StandInServer) -> str:
+    """Configure the n8n stand-in with failing and slow webhooks."""
+    n8n_stand_in.routes["/webhook/fail"] = Behaviour(error_rate=1.0)
+    n8n_stand_in.routes["/webhook/slow"] = Behaviour(latency="fixed:0.05")
+    return n8n_stand_in.url
+
+
+class TestBench:
+    """Test webhook benchmark."""
+
+    @pytest.mark.unit
+    def test_webhook_url(self) -> None:
+        """Test webhook URLs are built from WEBHOOK_URL."""
+        assert webhook_url("/orders", "https://n8n.example.com/") == (
+            "https://n8n.example.com/webhook/orders"
+        )
+
+    @pytest.mark.unit
+    def test_load_payload(self, tmp_path: Path) -> None:
+        """Test inline JSON and @file payloads."""
+        body = tmp_path / "body.json"
+        body.write_text('{"a": 1}')
+
+        assert load_payload('{"b": 2}') == b'{"b": 2}'
+        assert load_payload(f"@{body}") == b'{"a": 1}'
+        with pytest.raises(ValueError):
+            load_payload("not json")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_step_holds_target_rate(self, stand_in_url: str) -> None:
+        """Test the achieved rate tracks the target for a fast server."""
+        async with httpx.AsyncClient() as client:
+            result = await run_step(client, f"{stand_in_url}/webhook/ok", rate=100, duration=0.5)
+
+        assert result["requests"] == 50
+        assert result["errors"] == 0
+        assert 60 < result["achieved_rps"] <= 110
+        assert result["latency"]["p50"] > 0
+
+        with pytest.raises(ValueError, match="positive"):
+            await run_step(client, f"{stand_in_url}/webhook/ok", rate=0, duration=0.5)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_step_corrects_coordinated_omission(self, stand_in_url: str) -> None:
+        """Test queueing delay shows up in latency but not in service time."""
+        async with httpx.AsyncClient() as client:
+            result = await run_step(
+                client, f"{stand_in_url}/webhook/slow", rate=100, duration=0.3, max_inflight=1
+            )
+
+        assert result["latency"]["max"] > 5 * result["service_time"]["p50"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_ramp_counts_errors(self, stand_in_url: str) -> None:
+        """Test each ramp step reports its own error rate."""
+        results = await run_ramp(f"{stand_in_url}/webhook/fail", [20, 40], duration=0.25)
+
+        assert [r["target_rps"] for r in results] == [20, 40]
+        assert all(r["error_rate"] == 1.0 for r in results)
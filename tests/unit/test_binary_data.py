@@ -0,0 +1,139 @@
+"""Unit tests for filesystem binary data scanning."""
+
+import hashlib
+from pathlib import Path
+import sqlite3
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.binary_data import (
+    UNKNOWN,
+    HashIndex,
+    classify,
+    find_orphans,
+    hardlink_duplicates,
+    hash_file,
+    postgres_execution_ids,
+    remove_orphans,
+    scan,
+    sqlite_execution_ids,
+    storage_path,
+)
+
+
+def write(root: Path, relative: str, content: bytes) -> Path:
+    """Write ``content`` to ``root/relative``, creating parent directories."""
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+@pytest.fixture
+def binary_data(tmp_path: Path) -> Path:
+    """Provide a binary data directory with one file stored three times."""
+    root = tmp_path / "binaryData"
+    for wf, ex in (("1", "10"), ("1", "11"), ("2", "20")):
+        base = f"workflows/{wf}/executions/{ex}/binary_data"
+        write(root, f"{base}/report", b"%PDF" * 1000)
+        write(root, f"{base}/report.metadata", b'{"fileName": "report.pdf"}')
+    write(root, "workflows/2/executions/20/binary_data/photo", b"\x89PNG" * 1000)
+    write(root, "workflows/2/executions/temp/binary_data/upload", b"partial")
+    return root
+
+
+class TestBinaryData:
+    """Test binary data scanning and cleanup."""
+
+    @pytest.mark.unit
+    def test_classify_layouts(self) -> None:
+        """Test current and legacy layouts map to workflow and execution IDs."""
+        assert classify(Path("workflows/7/executions/42/binary_data/abc")) == ("7", "42")
+        assert classify(Path("42_abc")) == (UNKNOWN, "42")
+        assert classify(Path("meta/abc")) == (UNKNOWN, UNKNOWN)
+
+    @pytest.mark.unit
+    def test_storage_path(self) -> None:
+        """Test the storage path setting with n8n's default as fallback."""
+        with patch("src.config.config.N8N_BINARY_DATA_STORAGE_PATH", "/data/binary"):
+            assert storage_path() == Path("/data/binary")
+        with patch("src.config.config.N8N_BINARY_DATA_STORAGE_PATH", ""):
+            assert storage_path() == Path.home() / ".n8n" / "binaryData"
+
+    @pytest.mark.unit
+    def test_hash_file_in_chunks(self, tmp_path: Path) -> None:
+        """Test chunked hashing matches hashing the whole file."""
+        path = write(tmp_path, "blob", bytes(range(256)) * 100)
+        assert (
+            hash_file(str(path), chunk_bytes=1000) == hashlib.sha256(path.read_bytes()).hexdigest()
+        )
+
+    @pytest.mark.unit
+    def test_scan_report(self, binary_data: Path) -> None:
+        """Test usage per workflow and execution and duplicate groups."""
+        result = scan(binary_data, workers=2)
+        report = result.report()
+
+        assert report["files"] == 8
+        assert report["hashed"] == 4
+        assert report["workflows"][0] == {"workflow_id": "1", "files": 4, "bytes": 8052}
+        assert report["executions"][0]["execution_id"] == "20"
+        assert report["duplicate_groups"] == 1
+        assert report["duplicates"][0]["copies"] == 3
+        assert report["reclaimable_bytes"] == 8000
+
+    @pytest.mark.unit
+    def test_index_skips_unchanged_files(self, binary_data: Path, tmp_path: Path) -> None:
+        """Test rescans only hash files whose size, mtime or inode changed."""
+        index = HashIndex(tmp_path / "cache" / "index.sqlite3")
+        first = scan(binary_data, index)
+        write(binary_data, "workflows/1/executions/11/binary_data/report", b"%PDF" * 999 + b"EDIT")
+        second = scan(binary_data, index)
+        index.close()
+
+        assert (first.hashed, first.cached) == (4, 0)
+        assert (second.hashed, second.cached) == (1, 3)
+        assert second.report()["duplicates"][0]["copies"] == 2
+
+    @pytest.mark.unit
+    def test_hardlink_duplicates(self, binary_data: Path) -> None:
+        """Test duplicates become hardlinks, which later scans hash once and count once."""
+        result = scan(binary_data)
+        assert hardlink_duplicates(result.duplicate_groups(), dry_run=True) == (2, 8000)
+        assert hardlink_duplicates(result.duplicate_groups()) == (2, 8000)
+
+        rescan = scan(binary_data)
+        report = rescan.report()
+        assert rescan.hashed == 2
+        assert report["reclaimable_bytes"] == 0
+        assert report["disk_bytes"] == report["bytes"] - 8000
+        assert hardlink_duplicates(rescan.duplicate_groups()) == (0, 0)
+
+    @pytest.mark.unit
+    def test_remove_orphans(self, binary_data: Path) -> None:
+        """Test files of deleted executions are removed with their empty directories."""
+        result = scan(binary_data)
+        orphans = find_orphans(result.files, {"10", "20"})
+
+        assert {Path(f.path).parent.parent.name for f in orphans} == {"11"}
+        assert remove_orphans(binary_data, orphans, dry_run=True) == 4026
+        assert (binary_data / "workflows/1/executions/11").exists()
+
+        assert remove_orphans(binary_data, orphans) == 4026
+        assert not (binary_data / "workflows/1/executions/11").exists()
+        assert (binary_data / "workflows/1/executions/10/binary_data/report").exists()
+        assert (binary_data / "workflows/2/executions/temp/binary_data/upload").exists()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_execution_ids(self) -> None:
+        """Test execution IDs are read from PostgreSQL and SQLite."""
+        pool = MagicMock()
+        pool.fetch = AsyncMock(return_value=[{"id": "1"}, {"id": "2"}])
+        assert await postgres_execution_ids(pool) == {"1", "2"}
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE execution_entity (id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO execution_entity VALUES (?)", [(3,), (4,)])
+        assert sqlite_execution_ids(conn) == {"3", "4"}
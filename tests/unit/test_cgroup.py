@@ -0,0 +1,183 @@
+"""Unit tests for the cgroup v2 resource sampler."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.cgroup import CgroupSampler, ResourceWatch, correlate, find_cgroup
+
+MIB = 1024 * 1024
+
+
+def write_cgroup(
+    path: Path,
+    usage: int = 0,
+    periods: int = 0,
+    throttled: int = 0,
+    memory: int = 100 * MIB,
+    read: int = 0,
+    stall: int = 0,
+    oom_kills: int = 0,
+) -> None:
+    """Write cgroup v2 interface files with the given cumulative counters."""
+    files = {
+        "cgroup.controllers": "cpu io memory pids\n",
+        "cpu.max": "150000 100000\n",
+        "cpu.stat": (
+            f"usage_usec {usage}\nuser_usec {usage}\nsystem_usec 0\n"
+            f"nr_periods {periods}\nnr_throttled {throttled}\nthrottled_usec {throttled * 1000}\n"
+        ),
+        "memory.current": f"{memory}\n",
+        "memory.max": f"{512 * MIB}\n",
+        "memory.events": f"low 0\nhigh 2\nmax 0\noom 0\noom_kill {oom_kills}\n",
+        "io.stat": (
+            f"8:0 rbytes={read} wbytes=4096 rios=1 wios=1 dbytes=0 dios=0\n"
+            f"8:16 rbytes={read} wbytes=0 rios=1 wios=0 dbytes=0 dios=0\n"
+        ),
+        "cpu.pressure": f"some avg10=0.00 avg60=0.00 avg300=0.00 total={stall}\n",
+        "memory.pressure": (
+            f"some avg10=0.00 avg60=0.00 avg300=0.00 total={stall}\n"
+            f"full avg10=0.00 avg60=0.00 avg300=0.00 total={stall // 2}\n"
+        ),
+    }
+    path.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (path / name).write_text(content)
+
+
+class TestCgroupSampler:
+    """Test sampling and windowed reports."""
+
+    @pytest.mark.unit
+    def test_collect_reports_window(self, tmp_path: Path) -> None:
+        """Test rates, throttling, headroom, OOM kills and pressure over one window."""
+        now = 10.0
+        write_cgroup(tmp_path)
+        with CgroupSampler(tmp_path, clock=lambda: now) as sampler:
+            sampler.sample()
+            now = 11.0
+            write_cgroup(tmp_path, 500_000, 10, 1, 300 * MIB, 1000, 50_000)
+            sampler.sample()
+            now = 12.0
+            write_cgroup(tmp_path, 1_500_000, 20, 5, 200 * MIB, 3000, 100_000, oom_kills=1)
+            report = sampler.collect()
+
+        assert report["window_seconds"] == 2.0
+        assert report["cpu_cores"] == pytest.approx(0.75)
+        assert report["cpu_quota_cores"] == 1.5
+        assert report["throttled_ratio"] == pytest.approx(0.25)
+        assert report["throttled_peak_ratio"] == pytest.approx(0.4)
+        assert report["memory_bytes"] == 200 * MIB
+        assert report["memory_peak_bytes"] == 300 * MIB
+        assert report["memory_headroom_bytes"] == 212 * MIB
+        assert report["oom_kills"] == 1
+        assert report["io_read_bytes_per_second"] == 3000.0
+        assert report["pressure"]["memory_some"] == pytest.approx(0.05)
+        assert report["pressure"]["memory_full"] == pytest.approx(0.025)
+        assert "io_some" not in report["pressure"]
+        assert report["stall_peak_ratio"] == pytest.approx(0.05)
+
+    @pytest.mark.unit
+    def test_windows_restart_after_collect(self, tmp_path: Path) -> None:
+        """Test each collect covers only the samples since the previous one."""
+        now = 0.0
+        write_cgroup(tmp_path)
+        with CgroupSampler(tmp_path, clock=lambda: now) as sampler:
+            sampler.sample()
+            now = 1.0
+            write_cgroup(tmp_path, 1_000_000, memory=400 * MIB)
+            sampler.sample()
+            sampler.collect()
+            now = 2.0
+            write_cgroup(tmp_path, 1_250_000)
+            sampler.sample()
+            report = sampler.collect()
+
+        assert report["cpu_cores"] == pytest.approx(0.25)
+        assert report["memory_peak_bytes"] == 100 * MIB
+
+    @pytest.mark.unit
+    def test_unlimited_and_missing_files(self, tmp_path: Path) -> None:
+        """Test ``max`` limits and absent controllers are reported as None."""
+        write_cgroup(tmp_path)
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        (tmp_path / "memory.max").write_text("max\n")
+        for name in ("cpu.stat", "memory.pressure"):
+            (tmp_path / name).unlink()
+        with CgroupSampler(tmp_path) as sampler:
+            report = sampler.collect()
+            totals = sampler.totals()
+
+        assert report["cpu_quota_cores"] is None
+        assert report["memory_headroom_bytes"] is None
+        assert report["throttled_ratio"] is None
+        assert set(report["pressure"]) == {"cpu_some"}
+        assert totals["memory_current"] == 100 * MIB
+        assert totals["cpu_periods"] is None
+
+    @pytest.mark.unit
+    def test_unavailable(self, tmp_path: Path) -> None:
+        """Test a directory without cgroup files is unavailable."""
+        with CgroupSampler(tmp_path / "missing") as sampler:
+            assert sampler.available is False
+
+    @pytest.mark.unit
+    def test_find_cgroup(self, tmp_path: Path) -> None:
+        """Test the unified hierarchy entry of a /proc/<pid>/cgroup file is resolved."""
+        write_cgroup(tmp_path / "system.slice" / "n8n.scope")
+        proc = tmp_path / "cgroup"
+        proc.write_text("0::/system.slice/n8n.scope\n")
+
+        assert find_cgroup(tmp_path, str(proc)) == tmp_path / "system.slice" / "n8n.scope"
+        proc.write_text("4:memory:/docker/abc\n")
+        assert find_cgroup(tmp_path / "v1", str(proc)) is None
+        with patch("src.config.config.HEALTH_CGROUP_PATH", "/custom"):
+            assert find_cgroup(tmp_path, str(proc)) == Path("/custom")
+
+    @pytest.mark.unit
+    def test_find_cgroup_needs_path_or_pid(self, tmp_path: Path) -> None:
+        """Test the checker's own cgroup is not assumed to be n8n's."""
+        write_cgroup(tmp_path)
+        assert find_cgroup(tmp_path) is None
+
+        pid = os.getpid()
+        lines = Path(f"/proc/{pid}/cgroup").read_text().splitlines()
+        entry = next(line[3:].strip().lstrip("/") for line in lines if line.startswith("0::"))
+        write_cgroup(tmp_path / entry)
+        with patch("src.config.config.HEALTH_CGROUP_PID", pid):
+            assert find_cgroup(tmp_path) == tmp_path / entry
+        with patch("src.config.config.HEALTH_CGROUP_PID", 0):
+            assert find_cgroup(tmp_path) is None
+
+
+class TestCorrelation:
+    """Test latency correlation."""
+
+    @pytest.mark.unit
+    def test_correlate(self) -> None:
+        """Test missing values are skipped and constant series left out."""
+        latencies = [10.0, 20.0, 30.0, 40.0]
+        series = {"throttled": [0.0, 0.1, None, 0.3], "flat": [1.0] * 4, "short": [None] * 4}
+
+        assert correlate(latencies, series) == {"throttled": pytest.approx(1.0)}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_resource_watch(self, tmp_path: Path) -> None:
+        """Test probes are paired with the resource window that preceded them."""
+        write_cgroup(tmp_path)
+        watch = ResourceWatch(CgroupSampler(tmp_path), interval=0.01)
+        watch.start()
+        for i in range(1, 5):
+            write_cgroup(tmp_path, periods=10 * i, throttled=i * i)
+            watch.sampler.sample()
+            watch.observe(float(i))
+        watch.observe(None)
+        await watch.stop()
+
+        assert watch.latencies == [1.0, 2.0, 3.0, 4.0]
+        assert len(watch.series["throttled_ratio"]) == 4
+        assert watch.correlations()["throttled_ratio"] > 0.9
+        assert watch.sampler.available is False
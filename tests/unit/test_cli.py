@@ -1,19 +1,36 @@
 """Unit tests for CLI."""
 
 import argparse
+import asyncio
+import contextlib
+import json
+from pathlib import Path
+import sqlite3
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from cli import (
+    fleet_command,
     health_command,
     info_command,
+    main,
+    metrics_command,
+    parse_importtime,
     run_format,
     run_lint,
     run_tests,
+    sample_command,
     setup_parser,
+    sidecar_command,
+    stand_in_command,
     validate_command,
+    watch_command,
+    workflows_export_command,
+    workflows_import_command,
 )
+from src.stand_in import StandInServer
 
 
 class TestCLIParser:
@@ -35,6 +52,84 @@ class TestCLIParser:
         assert args.url == "http://localhost:5678"
         assert args.timeout == 5
 
+    @pytest.mark.unit
+    def test_health_watch_args(self) -> None:
+        """Test health watch mode arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(["health", "--watch", "--interval", "5", "--count", "3"])
+        assert args.watch is True
+        assert args.interval == 5.0
+        assert args.count == 3
+
+    @pytest.mark.unit
+    def test_health_fleet_args(self) -> None:
+        """Test health fleet mode arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(["health", "--fleet", "targets.txt", "--concurrency", "8"])
+        assert args.fleet == "targets.txt"
+        assert args.concurrency == 8
+        assert parser.parse_args(["health", "--fleet"]).fleet == ""
+
+    @pytest.mark.unit
+    def test_exporter_command_args(self) -> None:
+        """Test exporter command arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(["exporter", "--port", "9100", "--ttl", "30"])
+        assert args.command == "exporter"
+        assert args.port == 9100
+        assert args.ttl == 30.0
+        assert args.host == "0.0.0.0"
+
+    @pytest.mark.unit
+    def test_bench_webhook_args(self) -> None:
+        """Test bench webhook arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(
+            ["bench", "webhook", "--path", "orders", "--rates", "10", "50", "--duration", "2"]
+        )
+        assert args.command == "bench"
+        assert args.bench_command == "webhook"
+        assert args.path == "orders"
+        assert args.rates == [10.0, 50.0]
+        assert args.duration == 2.0
+
+        for rate in ("0", "-5", "nan"):
+            with pytest.raises(SystemExit):
+                parser.parse_args(["bench", "webhook", "--rates", "10", rate])
+
+    @pytest.mark.unit
+    def test_executions_command_args(self) -> None:
+        """Test execution history command arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(["executions", "--db", "x.db", "sync", "--page-size", "50"])
+        assert args.executions_command == "sync"
+        assert args.db == "x.db"
+        assert args.page_size == 50
+
+        args = parser.parse_args(["executions", "throughput", "--bucket", "60"])
+        assert args.executions_command == "throughput"
+        assert args.bucket == 60
+
+    @pytest.mark.unit
+    def test_workflows_analyze_args(self) -> None:
+        """Test workflow analyze arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(["workflows", "analyze", "a.json", "exports/", "--workers", "4"])
+        assert args.workflows_command == "analyze"
+        assert args.paths == ["a.json", "exports/"]
+        assert args.workers == 4
+        assert args.top == 20
+
+    @pytest.mark.unit
+    def test_simulate_args(self) -> None:
+        """Test simulate arguments."""
+        parser = setup_parser()
+        args = parser.parse_args(["simulate", "--profile", "60:5", "--duration", "fixed:1"])
+        assert args.command == "simulate"
+        assert args.profile == "60:5"
+        assert args.workers == "1,2,4,8"
+        assert args.from_history is False
+
     @pytest.mark.unit
     def test_test_command_args(self) -> None:
         """Test test command arguments."""
@@ -70,7 +165,7 @@ class TestCLICommands:
             },
         }
 
-        with patch("cli.HealthChecker") as mock_checker:
+        with patch("src.health_check.HealthChecker") as mock_checker:
             mock_instance = MagicMock()
             mock_instance.full_health_check = AsyncMock(return_value=mock_result)
             mock_checker.return_value = mock_instance
@@ -78,6 +173,42 @@ class TestCLICommands:
             result = await health_command(args)
             assert result == 0
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_command_database_details(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a healthy database check, which has connect time but no phases, renders."""
+        args = argparse.Namespace(url=None, timeout=10)
+
+        mock_result = {
+            "status": "healthy",
+            "checks": {
+                "database": {
+                    "status": "healthy",
+                    "type": "postgresdb",
+                    "connect_time_ms": 3.0,
+                    "query_time_ms": 1.0,
+                    "connections": 5,
+                    "max_connections": 100,
+                    "connection_usage": 0.05,
+                    "lock_waits": 0,
+                },
+            },
+        }
+
+        with patch("src.health_check.HealthChecker") as mock_checker:
+            mock_instance = MagicMock()
+            mock_instance.full_health_check = AsyncMock(return_value=mock_result)
+            mock_checker.return_value = mock_instance
+
+            assert await health_command(args) == 0
+
+        out = capsys.readouterr().out
+        assert "Connection setup: 3.00ms" in out
+        assert "Connections: 5/100" in out
+        assert "Phases:" not in out
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_health_command_unhealthy(self) -> None:
@@ -91,7 +222,7 @@ class TestCLICommands:
             },
         }
 
-        with patch("cli.HealthChecker") as mock_checker:
+        with patch("src.health_check.HealthChecker") as mock_checker:
             mock_instance = MagicMock()
             mock_instance.full_health_check = AsyncMock(return_value=mock_result)
             mock_checker.return_value = mock_instance
@@ -99,6 +230,586 @@ class TestCLICommands:
             result = await health_command(args)
             assert result == 1
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_watch_command_reuses_checker(self) -> None:
+        """Test watch mode probes repeatedly through one pooled checker."""
+        args = argparse.Namespace(url=None, timeout=10, watch=True, interval=0, count=3)
+
+        mock_result = {
+            "status": "healthy",
+            "checks": {
+                "n8n": {"status": "healthy", "latency_ms": 4.0, "connection_reused": True},
+                "database": {"status": "healthy"},
+            },
+        }
+
+        with patch("src.health_check.HealthChecker") as mock_checker:
+            mock_instance = MagicMock()
+            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+            mock_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_instance.full_health_check = AsyncMock(return_value=mock_result)
+            mock_checker.return_value = mock_instance
+
+            result = await watch_command(args)
+            assert result == 0
+            assert mock_checker.call_count == 1
+            assert mock_instance.full_health_check.call_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_watch_records_history(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test watch mode records probes that health history then reports."""
+        history_file = str(tmp_path / "history.bin")
+        args = setup_parser().parse_args(
+            ["health", "--watch", "--interval", "0", "--count", "3", "--history-file", history_file]
+        )
+        results = [
+            {"status": status, "checks": {"n8n": {"status": status, "latency_ms": 4.0}}}
+            for status in ("healthy", "unhealthy", "healthy")
+        ]
+
+        with patch("src.health_check.HealthChecker") as mock_checker:
+            mock_instance = MagicMock()
+            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+            mock_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_instance.full_health_check = AsyncMock(side_effect=results)
+            mock_checker.return_value = mock_instance
+            assert await watch_command(args) == 1
+        capsys.readouterr()
+
+        assert main(["health", "history", "--file", history_file, "--since-hours", "1"]) == 0
+        output = capsys.readouterr().out
+        assert "3 probes, availability 66.67%, latency mean 4.00ms" in output
+        assert "1 outages" in output
+        assert output.count("latency=4.00ms") == 3
+
+        assert main(["health", "history", "--file", history_file, "--resolution", "1h"]) == 0
+        output = capsys.readouterr().out
+        assert "(1h records)" in output
+        assert "3 probes, availability 66.67%" in output
+        assert main(["health", "history", "--file", history_file, "--json"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert (report["resolution"], report["summary"]["failures"]) == ("1m", 1)
+        assert main(["health", "history", "--file", str(tmp_path / "missing.bin")]) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_watch_samples_cgroup(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test watch mode prints each probe's resource window."""
+        (tmp_path / "memory.current").write_text(f"{32 * 1024 * 1024}\n")
+        (tmp_path / "memory.max").write_text("max\n")
+        args = setup_parser().parse_args(
+            ["health", "--watch", "--interval", "0", "--count", "3", "--no-history"]
+        )
+        result = {"status": "healthy", "checks": {"n8n": {"status": "healthy", "latency_ms": 4.0}}}
+
+        with patch("src.health_check.HealthChecker") as mock_checker, patch(
+            "src.config.config.HEALTH_CGROUP_PATH", str(tmp_path)
+        ):
+            mock_instance = MagicMock()
+            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+            mock_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_instance.full_health_check = AsyncMock(return_value=result)
+            mock_checker.return_value = mock_instance
+            assert await watch_command(args) == 0
+            output = capsys.readouterr().out
+
+            with patch("src.config.config.HEALTH_CGROUP_PATH", ""):
+                assert await watch_command(args) == 0
+            unconfigured = capsys.readouterr().out
+
+        assert f"Sampling cgroup {tmp_path} every 0.1s" in output
+        assert output.count("mem=32.0 MiB") == 3
+        assert "headroom" not in output
+        assert "Not sampling resources: set HEALTH_CGROUP_PATH" in unconfigured
+        assert "mem=" not in unconfigured
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_watch_interrupt_prints_summary(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test an unbounded watch stopped by Ctrl+C still summarizes and cleans up."""
+        (tmp_path / "cpu.stat").write_text("usage_usec 0\nnr_periods 0\nnr_throttled 0\n")
+        args = setup_parser().parse_args(
+            ["health", "--watch", "--interval", "0", "--history-file", str(tmp_path / "h.bin")]
+        )
+        result = {"status": "healthy", "checks": {"n8n": {"status": "healthy", "latency_ms": 4.0}}}
+
+        with patch("src.health_check.HealthChecker") as mock_checker, patch(
+            "src.config.config.HEALTH_CGROUP_PATH", str(tmp_path)
+        ), patch("src.history.ProbeHistory") as mock_history, patch(
+            "src.cgroup.ResourceWatch.correlations", return_value={"cpu_cores": 0.5}
+        ):
+            mock_instance = MagicMock()
+            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+            mock_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_instance.full_health_check = AsyncMock(
+                side_effect=[result, result, asyncio.CancelledError()]
+            )
+            mock_checker.return_value = mock_instance
+            assert await watch_command(args) == 0
+        output = capsys.readouterr().out
+
+        mock_history.return_value.close.assert_called_once()
+        assert "Stopped watching" in output
+        assert "2 probes, 0 unhealthy" in output
+        assert "Latency correlation: cpu_cores=+0.50" in output
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fleet_command(self) -> None:
+        """Test fleet command streams results and reports unhealthy targets."""
+        args = argparse.Namespace(fleet="", concurrency=4, deadline=1.0, timeout=1)
+
+        async def fake_probe_fleet(targets, **kwargs):
+            for url in targets:
+                yield {"url": url, "status": "healthy", "duration_ms": 1.0, "checks": {}}
+
+        with patch("src.fleet.load_targets", return_value=["http://a", "http://b"]), patch(
+            "src.fleet.probe_fleet", fake_probe_fleet
+        ):
+            assert await fleet_command(args) == 0
+
+        with patch("src.fleet.load_targets", return_value=[]):
+            assert await fleet_command(args) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fleet_watch_keeps_breakers(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test fleet watch rounds share breaker state and list only unhealthy targets."""
+        args = argparse.Namespace(
+            fleet="", concurrency=4, deadline=1.0, timeout=1, watch=True, count=2, interval=0
+        )
+        seen: list[int] = []
+
+        async def fake_probe_fleet(targets, breakers, **kwargs):
+            seen.append(id(breakers))
+            breakers.setdefault("http://b", "open")
+            yield {"url": "http://a", "status": "healthy", "duration_ms": 1.0}
+            yield {
+                "url": "http://b",
+                "status": "unhealthy",
+                "duration_ms": 0.1,
+                "circuit": "open",
+                "checks": {"n8n": {"error": "circuit open"}},
+            }
+
+        with patch("src.fleet.load_targets", return_value=["http://a", "http://b"]), patch(
+            "src.fleet.probe_fleet", fake_probe_fleet
+        ):
+            assert await fleet_command(args) == 1
+
+        out = capsys.readouterr().out
+        assert len(seen) == 2
+        assert len(set(seen)) == 1
+        assert "http://a" not in out
+        assert out.count("error=circuit open") == 2
+        assert "1/2 healthy" in out
+        assert "open circuits=1" in out
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sample_command_exports_and_merges(self, tmp_path) -> None:
+        """Test sampling mode exports a histogram that can be merged later."""
+        from src.histogram import LatencyHistogram
+
+        export = tmp_path / "run.json"
+        args = argparse.Namespace(
+            url=None,
+            timeout=10,
+            samples=3,
+            concurrency=2,
+            path="/healthz",
+            export=str(export),
+            merge=[],
+        )
+
+        histogram = LatencyHistogram()
+        for value in (1.0, 2.0, 3.0):
+            histogram.record(value)
+
+        with patch("src.health_check.HealthChecker") as mock_checker:
+            mock_checker.return_value.sample_latency = AsyncMock(return_value=(histogram, 0))
+            assert await sample_command(args) == 0
+
+        merge_args = argparse.Namespace(
+            url=None,
+            timeout=10,
+            samples=0,
+            concurrency=2,
+            path="/healthz",
+            export=None,
+            merge=[str(export), str(export)],
+        )
+        assert await sample_command(merge_args) == 0
+        assert LatencyHistogram.load(export).total == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_metrics_command(
+        self, n8n_stand_in: StandInServer, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test scraping reports runtime gauges, counter rates and failing instances."""
+        async with httpx.AsyncClient() as client:
+            await client.get(f"{n8n_stand_in.url}/webhook/1")
+        url = n8n_stand_in.url
+        args = setup_parser().parse_args(["metrics", url, "--interval", "0.05"])
+        assert await metrics_command(args) == 0
+        output = capsys.readouterr().out
+        assert "Event loop lag: 2.00ms" in output
+        assert "Heap: 60.0 MiB used, 100.0 MiB committed (3% of 2048.0 MiB)" in output
+        assert "n8n_workflow_started_total: 0.00/s" in output
+        assert "1/1 instances healthy" in output
+
+        n8n_stand_in.heap_used = n8n_stand_in.heap_limit
+        args = setup_parser().parse_args(["metrics", url, f"{url}/nope", "--count", "1", "--json"])
+        assert await metrics_command(args) == 1
+        reports = json.loads(capsys.readouterr().out)
+        assert reports[0]["reasons"] == ["heap 100% used > 95%"]
+        assert "404" in reports[1]["reasons"][0]
+
+        with patch("src.fleet.load_targets", return_value=[]):
+            assert await metrics_command(setup_parser().parse_args(["metrics", "--fleet"])) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_phase_breakdown_output(
+        self, n8n_stand_in: StandInServer, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test health and sample modes report request phases and export them for merging."""
+        url = n8n_stand_in.url
+        with patch("src.config.config.DB_TYPE", "sqlite"):
+            assert await health_command(argparse.Namespace(url=url, timeout=5)) == 0
+        assert "Phases: dns=" in capsys.readouterr().out
+
+        export = tmp_path / "run.json"
+        args = setup_parser().parse_args(
+            [
+                "health",
+                "--url",
+                url,
+                "--samples",
+                "20",
+                "--concurrency",
+                "2",
+                "--export",
+                str(export),
+            ]
+        )
+        assert await sample_command(args) == 0
+        assert "ttfb" in capsys.readouterr().out
+        assert (tmp_path / "run.ttfb.json").exists()
+
+        merge = setup_parser().parse_args(["health", "--merge", str(export), str(export)])
+        assert await sample_command(merge) == 0
+        ttfb = next(
+            line for line in capsys.readouterr().out.splitlines() if line.startswith("ttfb")
+        )
+        assert ttfb.split()[1] == "40"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stand_in_command(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test the stand-in subcommand serves scripted failures until cancelled."""
+        args = setup_parser().parse_args(["stand-in", "--port", "0", "--error-rate", "1"])
+        task = asyncio.create_task(stand_in_command(args))
+        await asyncio.sleep(0.05)
+
+        url = capsys.readouterr().out.split("listening on ")[1].split()[0]
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{url}/healthz")
+
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+        assert response.status_code == 500
+        assert "1 requests, 1 errors, 0 drops" in capsys.readouterr().out
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_workflows_export_import_commands(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test workflows export then import round-trips without pushing anything."""
+        parser = setup_parser()
+        async with StandInServer(workflows=3, api_key="secret") as server:
+            common = ["--url", server.url, "--api-key", "secret"]
+            export_args = parser.parse_args(["workflows", "export", str(tmp_path), *common])
+            import_args = parser.parse_args(["workflows", "import", str(tmp_path), *common])
+            assert await workflows_export_command(export_args) == 0
+            del server.workflows["3"]
+            assert await workflows_export_command(export_args) == 0
+            assert await workflows_import_command(import_args) == 0
+            denied = parser.parse_args(["workflows", "import", str(tmp_path), "--url", server.url])
+            assert await workflows_import_command(denied) == 1
+
+        output = capsys.readouterr().out
+        assert "3 changed, 0 unchanged of 3 workflows" in output
+        assert "Removed upstream (use --prune to delete): 3" in output
+        assert "Pushed 1 new and 0 changed workflows, 2 unchanged" in output
+        assert "Import failed" in output
+        missing = parser.parse_args(["workflows", "import", str(tmp_path / "missing")])
+        assert await workflows_import_command(missing) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sidecar_command(
+        self, n8n_stand_in: StandInServer, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test the sidecar serves the stand-in's health over its socket until cancelled."""
+        from src.probe_client import main as probe
+
+        socket_path = str(tmp_path / "health.sock")
+        args = setup_parser().parse_args(
+            ["sidecar", "--socket", socket_path, "--url", n8n_stand_in.url, "--interval", "60"]
+        )
+        with patch("src.config.config.DB_TYPE", "sqlite"):
+            task = asyncio.create_task(sidecar_command(args))
+            while n8n_stand_in.requests["/healthz"] == 0:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+            code = await asyncio.to_thread(probe, ["--socket", socket_path])
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        assert code == 0
+        assert "1 refreshes, 1 queries" in capsys.readouterr().out
+
+    @pytest.mark.unit
+    def test_db_report_command(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test db report prints ranked tables, unused indexes and statements."""
+        report = {
+            "status": "healthy",
+            "schema": "public",
+            "total_bytes": 1 << 20,
+            "tables": [
+                {
+                    "name": "execution_entity",
+                    "total_bytes": 1 << 20,
+                    "io_blocks": 100,
+                    "cache_hit_ratio": 0.9,
+                    "dead_ratio": 0.3,
+                    "seq_scan_ratio": 0.1,
+                    "findings": ["30% dead tuples, needs VACUUM"],
+                }
+            ],
+            "indexes": [{"name": "idx_a", "bytes": 8192, "io_blocks": 10, "scans": 3}],
+            "unused_indexes": [{"name": "idx_b", "table_name": "t", "bytes": 8192}],
+            "statements": [{"query": "SELECT\n 1", "calls": 2, "total_ms": 10.0, "mean_ms": 5.0}],
+        }
+
+        with patch("src.db_report.database_report", AsyncMock(return_value=report)):
+            result = main(["db", "report"])
+
+        out = capsys.readouterr().out
+        assert result == 0
+        assert "needs VACUUM" in out
+        assert "idx_b on t" in out
+        assert "SELECT 1" in out
+
+        with patch(
+            "src.db_report.database_report",
+            AsyncMock(return_value={"status": "unhealthy", "error": "refused"}),
+        ):
+            assert main(["db", "report"]) == 1
+            assert main(["db", "report", "--json"]) == 1
+
+    @pytest.mark.unit
+    def test_prune_command_sqlite(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test prune estimates, then deletes, old executions in a SQLite database."""
+        db = tmp_path / "database.sqlite"
+        conn = sqlite3.connect(db)
+        conn.executescript(
+            'CREATE TABLE execution_entity (id INTEGER PRIMARY KEY, "stoppedAt" DATETIME);'
+            'CREATE TABLE execution_data ("executionId" INTEGER, data TEXT, "workflowData" TEXT);'
+            "INSERT INTO execution_entity VALUES (1, '2020-01-01 00:00:00.000');"
+            "INSERT INTO execution_data VALUES (1, 'data', 'wf');"
+        )
+        conn.commit()
+        conn.close()
+        state = str(tmp_path / "state.json")
+
+        assert main(["prune", "--sqlite", str(db), "--dry-run", "--state", state]) == 0
+        assert "Would delete 1 executions" in capsys.readouterr().out
+        assert main(["prune", "--sqlite", str(db), "--state", state]) == 0
+        assert "Deleted 1 executions in 1 batches" in capsys.readouterr().out
+
+        # An explicit 0 hours prunes everything stopped before now.
+        conn = sqlite3.connect(db)
+        conn.execute("INSERT INTO execution_entity VALUES (2, '2099-01-01 00:00:00.000')")
+        conn.execute("INSERT INTO execution_entity VALUES (3, '2021-01-01 00:00:00.000')")
+        conn.commit()
+        conn.close()
+        prune = ["prune", "--sqlite", str(db), "--state", state, "--older-than-hours", "0"]
+        assert main([*prune, "--dry-run"]) == 0
+        assert "Would delete 1 executions" in capsys.readouterr().out
+
+        # A run interrupted with one threshold is not resumed with another.
+        assert main([*prune, "--max-batches", "1"]) == 0
+        capsys.readouterr()
+        assert main([*prune[:-1], "24"]) == 1
+        assert "delete it to start over" in capsys.readouterr().out
+
+    @pytest.mark.unit
+    def test_simulate_command(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test simulate prints one row per configuration."""
+        result = main(
+            ["simulate", "--profile", "60:2", "--duration", "fixed:1", "--workers", "1,2"]
+        )
+
+        lines = capsys.readouterr().out.splitlines()
+        assert result == 0
+        assert sum(line.startswith(("regular", "queue")) for line in lines) == 3
+
+    @pytest.mark.unit
+    def test_logs_analyze_command(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test logs analyze reports per-workflow stats and follows the last file."""
+        log = tmp_path / "n8n.log"
+        log.write_text(
+            '{"level":"debug","message":"Workflow execution started",'
+            '"metadata":{"workflowId":"42","executionId":"1"},'
+            '"timestamp":"2026-01-01T00:00:00.000Z"}\n'
+            '{"level":"debug","message":"Workflow execution finished successfully",'
+            '"metadata":{"workflowId":"42","executionId":"1"},'
+            '"timestamp":"2026-01-01T00:00:01.500Z"}\n'
+        )
+
+        assert main(["logs", "analyze", str(log)]) == 0
+        output = capsys.readouterr().out
+        assert "2 lines" in output
+        assert "1 (workflow 42): 1500ms" in output
+
+        assert (
+            main(
+                [
+                    "logs",
+                    "analyze",
+                    str(log),
+                    "--json",
+                    "--follow",
+                    "--count",
+                    "2",
+                    "--interval",
+                    "0",
+                ]
+            )
+            == 0
+        )
+        reports = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert len(reports) == 1
+        assert reports[0]["workflows"][0]["finished"] == 1
+
+        assert main(["logs", "analyze", str(tmp_path / "missing.log")]) == 1
+
+    @pytest.mark.unit
+    def test_workflows_analyze_command(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test analysis failures fail the command with and without --json."""
+        nodes = [{"name": "A", "type": "n8n-nodes-base.set", "parameters": {}}]
+        (tmp_path / "ok.json").write_text(json.dumps({"name": "ok", "nodes": nodes}))
+        assert main(["workflows", "analyze", str(tmp_path), "--workers", "1", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out)["name"] == "ok"
+
+        (tmp_path / "broken.json").write_text("{not json")
+        assert main(["workflows", "analyze", str(tmp_path), "--workers", "1"]) == 1
+        assert "broken.json" in capsys.readouterr().out
+        assert main(["workflows", "analyze", str(tmp_path), "--workers", "1", "--json"]) == 1
+        results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert sum("error" in r for r in results) == 1
+
+    @pytest.mark.unit
+    def test_binary_data_scan_command(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test binary-data scan hardlinks duplicates and removes orphaned executions."""
+        root = tmp_path / "binaryData"
+        for execution in ("1", "2", "3"):
+            data = root / "workflows" / "7" / "executions" / execution / "binary_data"
+            data.mkdir(parents=True)
+            (data / "invoice").write_bytes(b"same content")
+        database = tmp_path / "n8n.sqlite"
+        conn = sqlite3.connect(database)
+        conn.execute("CREATE TABLE execution_entity (id INTEGER PRIMARY KEY)")
+        conn.executemany("INSERT INTO execution_entity VALUES (?)", [(1,), (2,)])
+        conn.commit()
+        conn.close()
+
+        base = ["binary-data", "scan", "--path", str(root), "--index", str(tmp_path / "idx")]
+        result = main([*base, "--hardlink", "--remove-orphans", "--sqlite", str(database)])
+        output = capsys.readouterr().out
+
+        assert result == 0
+        assert "1 duplicate groups" in output
+        assert "by hardlinking 2 files" in output
+        assert "1 orphaned files" in output
+        assert not (root / "workflows" / "7" / "executions" / "3").exists()
+
+        assert main([*base, "--json"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert (report["files"], report["cached"], report["reclaimable_bytes"]) == (2, 2, 0)
+        assert main(["binary-data", "scan", "--path", str(tmp_path / "missing")]) == 1
+
+    @pytest.mark.unit
+    def test_backup_restore_commands(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test backup and restore report results, failures and checksum verification."""
+        backup = {"tables": 2, "rows": 10, "bytes": 4096, "compressed_bytes": 1024, "seconds": 1}
+        restored = {"tables": 1, "rows": 4, "waves": 1, "cleared": ["v"], "seconds": 0.5}
+        restore = AsyncMock(return_value=restored)
+        with patch("src.backup.backup_database", AsyncMock(return_value=backup)):
+            assert main(["backup", str(tmp_path), "--jobs", "2"]) == 0
+        with patch("src.backup.backup_database", AsyncMock(side_effect=OSError("refused"))):
+            assert main(["backup", str(tmp_path)]) == 1
+        assert main(["restore", str(tmp_path)]) == 1
+
+        (tmp_path / "t.copy.gz").write_bytes(b"data")
+        entry = {"file": "t.copy.gz", "sha256": "0" * 64}
+        (tmp_path / "manifest.json").write_text(json.dumps({"tables": {"t": entry}}))
+        assert main(["restore", str(tmp_path), "--verify"]) == 1
+        with patch("src.backup.restore_database", restore):
+            assert main(["restore", str(tmp_path), "--tables", "t, u", "--clean"]) == 0
+
+        output = capsys.readouterr().out
+        assert "Backed up 2 tables, 10 rows" in output
+        assert "(25%)" in output
+        assert "Backup failed: refused" in output
+        assert "No backup manifest" in output
+        assert "t: checksum mismatch" in output
+        assert "Restored 1 tables, 4 rows in 1 waves" in output
+        assert "Also emptied by --clean (foreign keys): v" in output
+        assert restore.call_args.kwargs["tables"] == ["t", "u"]
+        assert restore.call_args.kwargs["clean"] is True
+
+    @pytest.mark.unit
+    def test_bench_regress_command(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test bench regress records a baseline and fails on a significant slowdown."""
+        baseline = str(tmp_path / "baseline.json")
+        fast = {"cli.info": [100.0 + i for i in range(10)]}
+        slow = {"cli.info": [200.0 + i for i in range(10)], "config.load": [0.1]}
+
+        with patch("src.regression.run_suite", AsyncMock(return_value=fast)):
+            recorded = main(["bench", "regress", "--baseline", baseline, "--update-baseline"])
+            unchanged = main(["bench", "regress", "--baseline", baseline])
+        with patch("src.regression.run_suite", AsyncMock(return_value=slow)):
+            regressed = main(["bench", "regress", "--baseline", baseline])
+
+        output = capsys.readouterr().out
+        assert (recorded, unchanged, regressed) == (0, 0, 1)
+        assert "Significant regressions: cli.info" in output
+        assert "config.load" in output
+
     @pytest.mark.unit
     def test_validate_command_success(self) -> None:
         """Test validate command with valid config."""
@@ -119,6 +830,31 @@ class TestCLICommands:
         result = info_command()
         assert result == 0
 
+    @pytest.mark.unit
+    def test_info_reports_cgroup(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test info shows container limits and cumulative counters without waiting."""
+        (tmp_path / "cpu.max").write_text("200000 100000\n")
+        (tmp_path / "cpu.stat").write_text("usage_usec 9\nnr_periods 8\nnr_throttled 2\n")
+        (tmp_path / "memory.current").write_text(f"{64 * 1024 * 1024}\n")
+        (tmp_path / "memory.max").write_text(f"{256 * 1024 * 1024}\n")
+        (tmp_path / "memory.events").write_text("oom_kill 1\n")
+
+        with patch("src.config.config.HEALTH_CGROUP_PATH", str(tmp_path)), patch(
+            "time.sleep"
+        ) as sleep:
+            assert info_command() == 0
+        output = capsys.readouterr().out
+
+        sleep.assert_not_called()
+        assert "Memory: 64.0 MiB of 256.0 MiB (192.0 MiB headroom)" in output
+        assert "CPU throttled in 25.0% of periods" in output
+        assert "CPU limit: 2 cores" in output
+        assert "OOM kills since start: 1" in output
+
+        with patch("src.config.config.HEALTH_CGROUP_PATH", ""):
+            assert info_command() == 0
+        assert "set HEALTH_CGROUP_PATH or HEALTH_CGROUP_PID" in capsys.readouterr().out
+
     @pytest.mark.unit
     def test_run_tests_command(self) -> None:
         """Test test command execution."""
@@ -149,3 +885,50 @@ class TestCLICommands:
             result = run_format()
             assert result == 0
             assert mock_run.call_count == 2
+
+
+class TestStartup:
+    """Test CLI startup behaviour."""
+
+    @pytest.mark.unit
+    def test_parse_importtime(self) -> None:
+        """Test -X importtime output is split into module timings."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:       300 |        420 | src.config\n"
+            "Traceback: something else\n"
+        )
+        modules, other = parse_importtime(output)
+
+        assert [m["module"] for m in modules] == ["_io", "src.config"]
+        assert modules[0]["top_level"] is False
+        assert modules[1]["top_level"] is True
+        assert modules[1]["cumulative_us"] == 420
+        assert other == ["Traceback: something else"]
+
+    @pytest.mark.unit
+    def test_startup_profile(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test --startup-profile runs the command and reports import times."""
+        assert main(["--startup-profile", "info"]) == 0
+
+        output = capsys.readouterr().out
+        assert "Startup profile" in output
+        assert "Import time" in output
+        assert "cumulative" in output
+
+    @pytest.mark.unit
+    def test_info_does_not_import_network_stack(self) -> None:
+        """Test validate/info start without importing httpx or probe modules."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, cli; cli.main(['info']); "
+            "print(sorted(m for m in ('asyncio', 'httpx', 'asyncpg', 'redis', 'src.health_check') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip().endswith("[]")
@@ -4,7 +4,7 @@ import os
 
 import pytest
 
-from src.config import Config
+from src.config import Config, Setting
 
 
 class TestConfig:
@@ -63,3 +63,65 @@ class TestConfig:
         port = int(os.getenv("N8N_PORT", "5678"))
         assert port == 9999
         assert isinstance(port, int)
+
+    @pytest.mark.unit
+    def test_settings_are_lazy_and_memoized(self) -> None:
+        """Test a setting is read on first access and cached afterwards."""
+
+        class Lazy:
+            VALUE = Setting("LAZY_TEST_VALUE", "1", int)
+
+        os.environ["LAZY_TEST_VALUE"] = "42"
+        assert Lazy.VALUE == 42
+
+        os.environ["LAZY_TEST_VALUE"] = "7"
+        assert Lazy.VALUE == 42
+        assert Lazy.__dict__["VALUE"] == 42
+
+    @pytest.mark.unit
+    def test_reload(self) -> None:
+        """Test reload re-reads the environment."""
+        os.environ["GENERIC_TIMEZONE"] = "Europe/Berlin"
+        Config.reload()
+        assert Config.GENERIC_TIMEZONE == "Europe/Berlin"
+
+        os.environ["GENERIC_TIMEZONE"] = "UTC"
+        Config.reload()
+        assert Config.GENERIC_TIMEZONE == "UTC"
+
+    @pytest.mark.unit
+    def test_reload_named_settings(self) -> None:
+        """Test reload re-reads only the named settings when given."""
+        os.environ["GENERIC_TIMEZONE"] = "UTC"
+        os.environ["N8N_LOG_LEVEL"] = "info"
+        Config.reload()
+        assert (Config.GENERIC_TIMEZONE, Config.N8N_LOG_LEVEL) == ("UTC", "info")
+
+        os.environ["GENERIC_TIMEZONE"] = "Europe/Berlin"
+        os.environ["N8N_LOG_LEVEL"] = "debug"
+        Config.reload("N8N_LOG_LEVEL")
+        assert (Config.GENERIC_TIMEZONE, Config.N8N_LOG_LEVEL) == ("UTC", "debug")
+
+    @pytest.mark.unit
+    def test_reload_ignores_other_classes_settings(self) -> None:
+        """Test a same-named setting on another class does not replace Config's."""
+
+        class Other:
+            N8N_PORT = Setting("OTHER_TEST_PORT", "1", int)
+
+        os.environ["N8N_PORT"] = "5678"
+        os.environ["OTHER_TEST_PORT"] = "2"
+        Config.reload()
+        assert Config.N8N_PORT == 5678
+        assert Other.N8N_PORT == 2
+
+    @pytest.mark.unit
+    def test_optional_settings(self) -> None:
+        """Test optional settings stay None when unset."""
+        os.environ.pop("QUEUE_BULL_REDIS_PORT", None)
+        Config.reload()
+        assert Config.QUEUE_BULL_REDIS_PORT is None
+
+        os.environ["QUEUE_BULL_REDIS_PORT"] = "6380"
+        Config.reload()
+        assert Config.QUEUE_BULL_REDIS_PORT == 6380
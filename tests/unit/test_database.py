@@ -0,0 +1,138 @@
+"""Unit tests for the PostgreSQL probe."""
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.database import DatabaseProbe, connection_kwargs
+
+
+class FakeConnection:
+    """Minimal asyncpg connection stand-in."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.queries: list[str] = []
+
+    async def fetchval(self, query: str) -> int:
+        self.queries.append(query)
+        if self.fail:
+            raise ConnectionResetError("server closed the connection")
+        return 1
+
+    async def fetchrow(self, query: str) -> dict[str, int]:
+        self.queries.append(query)
+        return {"connections": 25, "max_connections": 100, "lock_waits": 2}
+
+
+class FakeAcquire:
+    """Async context manager returned by FakePool.acquire()."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    async def __aenter__(self) -> FakeConnection:
+        return self.conn
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class FakePool:
+    """Minimal asyncpg pool stand-in."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+        self.closed = False
+
+    def acquire(self) -> FakeAcquire:
+        return FakeAcquire(self.conn)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TestDatabaseProbe:
+    """Test PostgreSQL probe."""
+
+    @pytest.mark.unit
+    def test_connection_kwargs_from_config(self) -> None:
+        """Test connection arguments come from DB_POSTGRESDB_* settings."""
+        with patch("src.config.config.DB_POSTGRESDB_HOST", "db.internal"), patch(
+            "src.config.config.DB_POSTGRESDB_PORT", 6543
+        ):
+            kwargs = connection_kwargs()
+
+        assert kwargs["host"] == "db.internal"
+        assert kwargs["port"] == 6543
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_reports_latency_and_load(self) -> None:
+        """Test a healthy probe reports timings, connection usage and lock waits."""
+        created: list[dict[str, Any]] = []
+        pool = FakePool(FakeConnection())
+
+        async def factory(**kwargs: Any) -> FakePool:
+            created.append(kwargs)
+            return pool
+
+        probe = DatabaseProbe(pool_factory=factory)
+        first = await probe.check()
+        await probe.check()
+        await probe.aclose()
+
+        assert len(created) == 1
+        assert created[0]["max_size"] == 2
+        assert pool.closed is True
+        assert first["status"] == "healthy"
+        assert first["connections"] == 25
+        assert first["connection_usage"] == 0.25
+        assert first["lock_waits"] == 2
+        assert first["query_time_ms"] >= 0.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_share_one_pool(self) -> None:
+        """Test concurrent checks on a fresh probe create a single pool."""
+        created: list[FakePool] = []
+
+        async def factory(**kwargs: Any) -> FakePool:
+            await asyncio.sleep(0.01)
+            created.append(FakePool(FakeConnection()))
+            return created[-1]
+
+        probe = DatabaseProbe(pool_factory=factory)
+        results = await asyncio.gather(*(probe.check() for _ in range(20)))
+        await probe.aclose()
+
+        assert len(created) == 1
+        assert created[0].closed is True
+        assert all(r["status"] == "healthy" for r in results)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_connection_failure(self) -> None:
+        """Test connection errors are reported as unhealthy."""
+
+        async def factory(**kwargs: Any) -> FakePool:
+            raise OSError("connection refused")
+
+        result = await DatabaseProbe(pool_factory=factory).check()
+
+        assert result["status"] == "unhealthy"
+        assert "connection refused" in result["error"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_query_failure(self) -> None:
+        """Test query errors are reported as unhealthy."""
+
+        async def factory(**kwargs: Any) -> FakePool:
+            return FakePool(FakeConnection(fail=True))
+
+        result = await DatabaseProbe(pool_factory=factory).check()
+
+        assert result["status"] == "unhealthy"
@@ -0,0 +1,179 @@
+"""Unit tests for the database report."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.db_report import collect_report, database_report, rank_indexes, rank_tables
+
+
+def table(name: str, **overrides: Any) -> dict[str, Any]:
+    """Build a TABLES_QUERY row."""
+    row = {
+        "name": name,
+        "live_tuples": 1000,
+        "dead_tuples": 0,
+        "seq_scans": 0,
+        "seq_tuples_read": 0,
+        "index_scans": 100,
+        "table_bytes": 8192,
+        "index_bytes": 8192,
+        "total_bytes": 16384,
+        "blocks_read": 0,
+        "blocks_hit": 0,
+        "last_vacuum": None,
+    }
+    return {**row, **overrides}
+
+
+def index(name: str, **overrides: Any) -> dict[str, Any]:
+    """Build an INDEXES_QUERY row."""
+    row = {
+        "table_name": "execution_entity",
+        "name": name,
+        "scans": 10,
+        "tuples_read": 100,
+        "bytes": 8192,
+        "blocks_read": 0,
+        "blocks_hit": 0,
+        "is_unique": False,
+    }
+    return {**row, **overrides}
+
+
+class FakePool:
+    """asyncpg pool stand-in answering catalog queries concurrently."""
+
+    def __init__(self, statements_error: Exception | None = None) -> None:
+        self.statements_error = statements_error
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if "pg_stat_user_tables" in query:
+            return [
+                table("workflow_entity", blocks_hit=50),
+                table(
+                    "execution_entity",
+                    live_tuples=50_000,
+                    dead_tuples=25_000,
+                    seq_scans=90,
+                    index_scans=10,
+                    blocks_read=400,
+                    blocks_hit=600,
+                    total_bytes=10 * 1024 * 1024,
+                ),
+            ]
+        if "pg_stat_user_indexes" in query:
+            return [
+                index("pk_execution", is_unique=True, scans=0, blocks_hit=10),
+                index("idx_execution_stopped", blocks_read=30, blocks_hit=70),
+                index("idx_unused", scans=0, bytes=1 << 20),
+            ]
+        if self.statements_error:
+            raise self.statements_error
+        return [
+            {
+                "query": "SELECT * FROM execution_entity",
+                "calls": 5,
+                "total_ms": 900.0,
+                "mean_ms": 180.0,
+                "rows": 10,
+                "blocks_read": 4,
+            }
+        ]
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TestDatabaseReport:
+    """Test database report."""
+
+    @pytest.mark.unit
+    def test_rank_tables(self) -> None:
+        """Test tables are ranked by blocks touched with bloat and scan findings."""
+        ranked = rank_tables(
+            [
+                table("small", blocks_hit=5),
+                table(
+                    "big",
+                    live_tuples=20_000,
+                    dead_tuples=20_000,
+                    seq_scans=3,
+                    index_scans=1,
+                    blocks_read=10,
+                    blocks_hit=30,
+                ),
+            ],
+            limit=5,
+        )
+
+        assert [t["name"] for t in ranked] == ["big", "small"]
+        assert ranked[0]["dead_ratio"] == 0.5
+        assert ranked[0]["seq_scan_ratio"] == 0.75
+        assert ranked[0]["cache_hit_ratio"] == 0.75
+        assert len(ranked[0]["findings"]) == 2
+        assert ranked[1]["findings"] == []
+
+    @pytest.mark.unit
+    def test_rank_indexes_flags_unused(self) -> None:
+        """Test unscanned non-unique indexes are flagged."""
+        ranked = rank_indexes(
+            [index("pk", is_unique=True, scans=0), index("unused", scans=0)], limit=1
+        )
+        assert len(ranked) == 1
+        assert [i["unused"] for i in rank_indexes([index("a", scans=0)], 5)] == [True]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_collect_report_runs_queries_concurrently(self) -> None:
+        """Test catalog queries run concurrently and are ranked."""
+        pool = FakePool()
+        report = await collect_report(pool, schema="public", limit=2)
+
+        assert pool.max_in_flight == 3
+        assert [t["name"] for t in report["tables"]] == ["execution_entity", "workflow_entity"]
+        assert [i["name"] for i in report["indexes"]] == ["idx_execution_stopped", "pk_execution"]
+        assert [i["name"] for i in report["unused_indexes"]] == ["idx_unused"]
+        assert report["statements"][0]["mean_ms"] == 180.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_report_without_pg_stat_statements(self) -> None:
+        """Test a missing pg_stat_statements extension does not fail the report."""
+        pool = FakePool(statements_error=RuntimeError('relation "pg_stat_statements" missing'))
+        created: list[dict[str, Any]] = []
+
+        async def factory(**kwargs: Any) -> FakePool:
+            created.append(kwargs)
+            return pool
+
+        report = await database_report(pool_factory=factory)
+
+        assert report["status"] == "healthy"
+        assert report["schema"] == "public"
+        assert report["statements"] == []
+        assert "pg_stat_statements" in report["statements_error"]
+        assert created[0]["max_size"] == 3
+        assert pool.closed is True
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_report_connection_failure(self) -> None:
+        """Test connection errors are reported as unhealthy."""
+
+        async def factory(**kwargs: Any) -> FakePool:
+            raise OSError("connection refused")
+
+        report = await database_report(pool_factory=factory)
+
+        assert report["status"] == "unhealthy"
+        assert "connection refused" in report["error"]
@@ -0,0 +1,128 @@
+"""Unit tests for execution history sync."""
+
+from typing import Any
+
+import httpx
+import pytest
+
+from src.executions import ExecutionStore, execution_row, id_key, sync_executions
+
+
+def make_execution(
+    index: int, workflow: str = "1", seconds: int = 5, status: str = "success"
+) -> dict[str, Any]:
+    """Build an executions API record like the sample_execution fixture."""
+    running = status == "running"
+    return {
+        "id": str(index),
+        "finished": status == "success",
+        "mode": "webhook",
+        "status": status,
+        "startedAt": f"2025-12-29T10:{index % 60:02d}:00.000Z",
+        "stoppedAt": None if running else f"2025-12-29T10:{index % 60:02d}:{seconds:02d}.000Z",
+        "workflowId": workflow,
+    }
+
+
+class FakeExecutionsAPI:
+    """Cursor-paginated executions endpoint returning newest first."""
+
+    def __init__(self, executions: list[dict[str, Any]]) -> None:
+        self.executions = executions
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        assert request.headers["X-N8N-API-KEY"] == "secret"
+
+        ordered = sorted(self.executions, key=lambda e: id_key(e["id"]), reverse=True)
+        offset = int(request.url.params.get("cursor", "0"))
+        limit = int(request.url.params["limit"])
+        page = ordered[offset : offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(ordered) else None
+        return httpx.Response(200, json={"data": page, "nextCursor": next_cursor})
+
+
+class TestExecutionStore:
+    """Test execution store."""
+
+    @pytest.mark.unit
+    def test_execution_row(self, sample_execution: dict[str, Any]) -> None:
+        """Test API records are flattened with a millisecond duration."""
+        row = execution_row(sample_execution)
+        assert row[0] == "exec_1"
+        assert row[1] == "1"
+        assert row[-1] == 5000
+
+    @pytest.mark.unit
+    def test_workflow_stats(self) -> None:
+        """Test per-workflow percentiles and failure rates."""
+        store = ExecutionStore(":memory:")
+        executions = [make_execution(i, "a", seconds=i % 10 + 1) for i in range(1, 101)]
+        executions += [make_execution(200, "b", status="error")]
+        store.upsert(executions)
+
+        stats = {row["workflow_id"]: row for row in store.workflow_stats()}
+
+        assert stats["a"]["executions"] == 100
+        assert stats["a"]["failure_rate"] == 0.0
+        assert stats["a"]["p50_ms"] == 5000
+        assert stats["a"]["p90_ms"] == 9000
+        assert stats["a"]["max_ms"] == 10000
+        assert stats["b"]["failure_rate"] == 1.0
+
+    @pytest.mark.unit
+    def test_throughput(self) -> None:
+        """Test executions are bucketed by start time."""
+        store = ExecutionStore(":memory:")
+        store.upsert(make_execution(i) for i in range(1, 31))
+
+        buckets = store.throughput(bucket_seconds=600)
+
+        assert [b["executions"] for b in buckets] == [9, 10, 10, 1]
+
+
+class TestSyncExecutions:
+    """Test incremental sync."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_incremental_sync(self) -> None:
+        """Test later syncs fetch only new and still-running executions."""
+        executions = [make_execution(i) for i in range(1, 48)]
+        executions.append(make_execution(48, status="running"))
+        executions += [make_execution(i) for i in range(49, 51)]
+        api = FakeExecutionsAPI(executions)
+        store = ExecutionStore(":memory:")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(api.handler)) as client:
+            first = await sync_executions(store, client, "http://n8n", "secret", page_size=10)
+
+            assert first["synced"] == 50
+            assert first["pages"] == 5
+            assert first["watermark"] == "47"
+
+            executions[47] = make_execution(48, status="error")
+            executions += [make_execution(i) for i in range(51, 54)]
+            api.requests.clear()
+
+            second = await sync_executions(store, client, "http://n8n", "secret", page_size=10)
+
+        assert len(api.requests) == 1
+        assert second["synced"] == 6
+        assert second["watermark"] == "53"
+
+        stats = store.workflow_stats()
+        assert stats[0]["executions"] == 53
+        assert stats[0]["failures"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sync_http_error(self) -> None:
+        """Test API errors propagate to the caller."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(401))
+        store = ExecutionStore(":memory:")
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await sync_executions(store, client, "http://n8n", "secret")
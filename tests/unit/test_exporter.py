@@ -0,0 +1,169 @@
+"""Unit tests for the Prometheus exporter."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.exporter import MetricsExporter, TTLCache, render_metrics
+
+HEALTHY_RESULT = {
+    "status": "healthy",
+    "checks": {
+        "n8n": {"status": "healthy", "status_code": 200, "latency_ms": 12.5},
+        "database": {"status": "healthy", "type": "postgresdb", "connections": 7},
+        "queue": {"status": "not_applicable", "message": "Not running in queue mode"},
+    },
+}
+
+
+class TestTTLCache:
+    """Test TTL cache."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_coalesce(self) -> None:
+        """Test ten simultaneous readers trigger one fetch."""
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        cache = TTLCache(fetch, ttl=60)
+        results = await asyncio.gather(*(cache.get() for _ in range(10)))
+
+        assert calls == 1
+        assert results == [1] * 10
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_expiry(self) -> None:
+        """Test values are refetched once the TTL passes."""
+        now = 0.0
+        fetch = AsyncMock(side_effect=[1, 2])
+        cache = TTLCache(fetch, ttl=10, clock=lambda: now)
+
+        assert await cache.get() == 1
+        now = 5.0
+        assert await cache.get() == 1
+        assert cache.age == 5.0
+        now = 11.0
+        assert await cache.get() == 2
+        assert fetch.await_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_refresh_can_retry(self) -> None:
+        """Test a failing fetch does not wedge the cache."""
+        fetch = AsyncMock(side_effect=[RuntimeError("boom"), 3])
+        cache = TTLCache(fetch, ttl=10)
+
+        with pytest.raises(RuntimeError):
+            await cache.get()
+        assert await cache.get() == 3
+
+
+class TestRenderMetrics:
+    """Test Prometheus rendering."""
+
+    @pytest.mark.unit
+    def test_render_metrics(self) -> None:
+        """Test checks become labelled gauges in base units."""
+        text = render_metrics(HEALTHY_RESULT, cache_age=1.5)
+
+        assert "n8n_health_healthy 1" in text
+        assert 'n8n_check_healthy{check="n8n"} 1' in text
+        assert 'n8n_check_latency_seconds{check="n8n"} 0.0125' in text
+        assert 'n8n_check_connections{check="database"} 7' in text
+        assert 'n8n_check_healthy{check="queue"}' not in text
+        assert "n8n_exporter_cache_age_seconds 1.5" in text
+        assert text.count("# TYPE n8n_check_healthy gauge") == 1
+
+    @pytest.mark.unit
+    def test_render_phases(self) -> None:
+        """Test request phases become one gauge labelled by phase."""
+        n8n = {"status": "healthy", "latency_ms": 3.0, "phases_ms": {"dns": 0.5, "ttfb": 2.0}}
+        text = render_metrics({"status": "healthy", "checks": {"n8n": n8n}})
+
+        assert 'n8n_check_phase_seconds{check="n8n",phase="dns"} 0.0005' in text
+        assert 'n8n_check_phase_seconds{check="n8n",phase="ttfb"} 0.002' in text
+        assert text.count("# TYPE n8n_check_phase_seconds gauge") == 1
+        assert "n8n_check_phases" not in text
+
+    @pytest.mark.unit
+    def test_render_rates(self) -> None:
+        """Test runtime counter rates become one gauge labelled by counter."""
+        runtime = {"status": "healthy", "event_loop_lag_ms": 4.0, "rates": {"started_total": 1.5}}
+        text = render_metrics({"status": "healthy", "checks": {"runtime": runtime}})
+
+        assert 'n8n_check_rate_per_second{check="runtime",counter="started_total"} 1.5' in text
+        assert 'n8n_check_event_loop_lag_seconds{check="runtime"} 0.004' in text
+
+
+class TestMetricsExporter:
+    """Test exporter server."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_scrapes_probe_once(self) -> None:
+        """Test simultaneous scrapes are answered by one upstream probe."""
+        probes = 0
+
+        async def full_health_check() -> dict[str, Any]:
+            nonlocal probes
+            probes += 1
+            await asyncio.sleep(0.05)
+            return HEALTHY_RESULT
+
+        checker = MagicMock()
+        checker.open = AsyncMock()
+        checker.aclose = AsyncMock()
+        checker.full_health_check = full_health_check
+
+        exporter = MetricsExporter(checker, ttl=60)
+        server = await exporter.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                responses = await asyncio.gather(*(client.get("/metrics") for _ in range(10)))
+                missing = await client.get("/other")
+        finally:
+            server.close()
+            await server.wait_closed()
+            await exporter.stop()
+
+        assert probes == 1
+        assert all(r.status_code == 200 for r in responses)
+        assert "n8n_health_healthy 1" in responses[0].text
+        assert missing.status_code == 404
+        checker.aclose.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_probe_answers_503(self) -> None:
+        """Test a scrape that cannot get a health result gets a 503 with the error."""
+        checker = MagicMock()
+        checker.open = AsyncMock()
+        checker.aclose = AsyncMock()
+        checker.full_health_check = AsyncMock(side_effect=RuntimeError("pool closed"))
+
+        exporter = MetricsExporter(checker, ttl=60)
+        server = await exporter.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                response = await client.get("/metrics")
+        finally:
+            server.close()
+            await server.wait_closed()
+            await exporter.stop()
+
+        assert response.status_code == 503
+        assert response.text == "pool closed\n"
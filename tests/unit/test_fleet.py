@@ -0,0 +1,170 @@
+"""Unit tests for fleet health probing."""
+
+import asyncio
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.fleet import load_targets, parse_targets, probe_fleet, summarize
+from src.resilience import AdaptiveTimeout, CircuitBreaker
+from src.stand_in import StandInServer
+
+
+class FakeChecker:
+    """HealthChecker stand-in whose latency is encoded in the URL; negative ones fail."""
+
+    def __init__(self, base_url: str, **kwargs: Any) -> None:
+        self.base_url = base_url
+        self.breaker = kwargs["breaker"]
+
+    async def full_health_check(self) -> dict[str, Any]:
+        delay = float(self.base_url.rsplit("/", 1)[-1])
+        if delay < 0:
+            raise ConnectionRefusedError("connection refused")
+        await asyncio.sleep(delay)
+        return {"status": "healthy", "checks": {"n8n": {"status": "healthy"}}}
+
+
+class GuardedChecker(FakeChecker):
+    """FakeChecker that reports probe outcomes to its circuit breaker."""
+
+    async def full_health_check(self) -> dict[str, Any]:
+        if not self.breaker.allow():
+            return {"status": "unhealthy", "checks": {"n8n": {"error": "circuit open"}}}
+        try:
+            result = await super().full_health_check()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except OSError as e:
+            self.breaker.record_failure()
+            return {"status": "unhealthy", "checks": {"n8n": {"error": str(e)}}}
+        self.breaker.record_success()
+        return result
+
+
+class TestFleet:
+    """Test fleet probing."""
+
+    @pytest.mark.unit
+    def test_parse_targets(self) -> None:
+        """Test comments, blanks, commas and duplicates are handled."""
+        lines = ["http://a:5678/  # primary", "", "http://b:5678,http://a:5678", "# only comment"]
+        assert parse_targets(lines) == ["http://a:5678", "http://b:5678"]
+
+    @pytest.mark.unit
+    def test_load_targets_from_file(self, tmp_path: Any) -> None:
+        """Test targets are read from a file."""
+        targets_file = tmp_path / "fleet.txt"
+        targets_file.write_text("http://a:5678\nhttp://b:5678\n")
+        assert load_targets(str(targets_file)) == ["http://a:5678", "http://b:5678"]
+
+    @pytest.mark.unit
+    def test_load_targets_from_config(self) -> None:
+        """Test targets fall back to HEALTH_FLEET_TARGETS."""
+        with patch("src.config.config.HEALTH_FLEET_TARGETS", "http://x:1, http://y:2"):
+            assert load_targets() == ["http://x:1", "http://y:2"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_fleet_runs_concurrently(self) -> None:
+        """Test wall time tracks the slowest target, not the sum."""
+        targets = [f"http://n{i}/0.05" for i in range(40)]
+
+        with patch("src.fleet.HealthChecker", FakeChecker):
+            start = time.perf_counter()
+            results = [r async for r in probe_fleet(targets, concurrency=40)]
+            elapsed = time.perf_counter() - start
+
+        assert len(results) == 40
+        assert elapsed < 0.05 * 40 / 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_fleet_streams_and_enforces_deadline(self) -> None:
+        """Test results stream in completion order and slow targets time out."""
+        targets = ["http://slow/5", "http://fast/0.01"]
+
+        with patch("src.fleet.HealthChecker", FakeChecker):
+            results = [r async for r in probe_fleet(targets, deadline=0.2)]
+
+        assert results[0]["url"] == "http://fast/0.01"
+        assert results[0]["status"] == "healthy"
+        assert results[1]["error"] == "deadline exceeded"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_fleet_keeps_breakers_across_rounds(self) -> None:
+        """Test per-target breakers persist between rounds and deadlines are not failures."""
+        breakers: dict[str, CircuitBreaker] = {}
+        timeouts: dict[str, AdaptiveTimeout] = {}
+        targets = ["http://down/-1", "http://slow/5", "http://fast/0"]
+
+        with patch("src.fleet.HealthChecker", GuardedChecker):
+            for _ in range(3):
+                results = [
+                    r
+                    async for r in probe_fleet(
+                        targets, deadline=0.05, timeouts=timeouts, breakers=breakers
+                    )
+                ]
+
+        assert set(breakers) == set(targets)
+        assert breakers["http://slow/5"].failures == 0
+        assert breakers["http://down/-1"].state == CircuitBreaker.OPEN
+        circuits = {r["url"]: r["circuit"] for r in results}
+        assert circuits == {
+            "http://down/-1": "open",
+            "http://slow/5": "closed",
+            "http://fast/0": "closed",
+        }
+        assert summarize(results, 1.0)["open_circuits"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_fleet_skips_local_backends(self, n8n_stand_in: StandInServer) -> None:
+        """Test targets are not charged with checks of the locally configured database and queue."""
+        with (
+            patch("src.config.config.DB_TYPE", "postgresdb"),
+            patch("src.config.config.EXECUTIONS_MODE", "queue"),
+            patch("src.health_check.DatabaseProbe") as database,
+            patch("src.health_check.QueueProbe") as queue,
+        ):
+            results = [r async for r in probe_fleet([n8n_stand_in.url])]
+
+        assert [r["status"] for r in results] == ["healthy"]
+        checks = results[0]["checks"]
+        assert checks["database"]["status"] == checks["queue"]["status"] == "not_applicable"
+        database.assert_not_called()
+        queue.assert_not_called()
+
+    @pytest.mark.unit
+    def test_summarize(self) -> None:
+        """Test aggregate summary."""
+        results = [
+            {"url": "a", "status": "healthy", "duration_ms": 10.0},
+            {"url": "b", "status": "unhealthy", "duration_ms": 30.0},
+            {"url": "c", "status": "healthy", "duration_ms": 20.0},
+        ]
+        summary = summarize(results, wall_time_ms=31.0)
+        assert summary["healthy"] == 2
+        assert summary["unhealthy"] == 1
+        assert summary["p50_ms"] == 20.0
+        assert summary["slowest"] == "b"
+        assert summary["phase_p50_ms"] == {}
+
+    @pytest.mark.unit
+    def test_summarize_phases(self) -> None:
+        """Test per-phase medians only count targets that reported phases."""
+        results = [
+            {"url": u, "status": "healthy", "duration_ms": 1.0, "checks": {"n8n": n8n}}
+            for u, n8n in (
+                ("a", {"phases_ms": {"dns": 1.0, "ttfb": 5.0}}),
+                ("b", {"phases_ms": {"dns": 3.0, "ttfb": 9.0}}),
+                ("c", {"phases_ms": {"dns": 2.0, "ttfb": 7.0}}),
+                ("d", {"error": "timeout"}),
+            )
+        ]
+        assert summarize(results, 1.0)["phase_p50_ms"] == {"dns": 2.0, "ttfb": 7.0}
@@ -1,11 +1,17 @@
 """Unit tests for health check."""
 
+import asyncio
+import time
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
-from src.health_check import HealthChecker
+from src.health_check import ConnectionTimer, HealthChecker
+from src.histogram import LatencyHistogram
+from src.resilience import CircuitBreaker
+from src.stand_in import StandInServer
 
 
 class TestHealthChecker:
@@ -90,13 +96,52 @@ class TestHealthChecker:
             assert "error" in result
 
     @pytest.mark.unit
-    def test_database_check_not_postgres(self, health_checker: HealthChecker) -> None:
+    @pytest.mark.asyncio
+    async def test_database_check_not_postgres(self, health_checker: HealthChecker) -> None:
         """Test database check when not using PostgreSQL."""
         with patch("src.config.config.DB_TYPE", "sqlite"):
-            result = health_checker.check_database()
+            result = await health_checker.check_database()
 
             assert result["status"] == "not_applicable"
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_database_check_uses_transient_probe(self, health_checker: HealthChecker) -> None:
+        """Test one-shot database checks open and close their own probe."""
+        with patch("src.config.config.DB_TYPE", "postgresdb"), patch(
+            "src.health_check.DatabaseProbe"
+        ) as mock_probe:
+            mock_instance = MagicMock()
+            mock_instance.check = AsyncMock(return_value={"status": "healthy"})
+            mock_instance.aclose = AsyncMock()
+            mock_probe.return_value = mock_instance
+
+            result = await health_checker.check_database()
+
+            assert result["status"] == "healthy"
+            mock_instance.aclose.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_full_health_check_runs_probes_concurrently(
+        self, health_checker: HealthChecker
+    ) -> None:
+        """Test the HTTP and database probes overlap."""
+
+        async def slow() -> dict[str, str]:
+            await asyncio.sleep(0.1)
+            return {"status": "healthy"}
+
+        with patch.object(health_checker, "check_health", side_effect=slow), patch.object(
+            health_checker, "check_database", side_effect=slow
+        ):
+            start = time.perf_counter()
+            result = await health_checker.full_health_check()
+            elapsed = time.perf_counter() - start
+
+        assert result["status"] == "healthy"
+        assert elapsed < 0.18
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_full_health_check(self, health_checker: HealthChecker) -> None:
@@ -110,3 +155,216 @@ class TestHealthChecker:
             assert "checks" in result
             assert "n8n" in result["checks"]
             assert "database" in result["checks"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_pooled_client_reused_across_probes(self, health_checker: HealthChecker) -> None:
+        """Test the pooled client is created once and reused by every probe."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.elapsed.total_seconds.return_value = 0.02
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value = mock_instance
+
+            async with health_checker:
+                first = await health_checker.check_health()
+                second = await health_checker.check_health()
+
+            assert mock_client.call_count == 1
+            assert mock_instance.get.call_count == 2
+            mock_instance.aclose.assert_awaited_once()
+            assert first["connection_reused"] is True
+            assert second["latency_ms"] == pytest.approx(20.0)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_connection_timer_separates_setup(self) -> None:
+        """Test connection setup events are timed and request events ignored."""
+        timer = ConnectionTimer()
+        await timer("connection.connect_tcp.started", {})
+        await timer("connection.connect_tcp.complete", {})
+        await timer("http11.send_request_headers.started", {})
+
+        assert timer.connected is True
+        assert timer.connect_ms >= 0.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_connection_timer_phases(self) -> None:
+        """Test trace events are split into phases and only setup counts as connecting."""
+        timer = ConnectionTimer()
+        for event in (
+            "connection.connect_tcp",
+            "connection.start_tls",
+            "http11.send_request_headers.started",
+            "http11.receive_response_headers.complete",
+            "http11.receive_response_body",
+        ):
+            if event.endswith(("started", "complete")):
+                await timer(event, {})
+            else:
+                await timer(f"{event}.started", {"host": "localhost", "port": 80})
+                await timer(f"{event}.complete", {})
+
+        phases = timer.phases_ms
+        assert list(phases) == ["dns", "tcp_connect", "tls", "ttfb", "body"]
+        assert phases["dns"] > 0.0
+        assert timer.connect_ms == pytest.approx(
+            phases["dns"] + phases["tcp_connect"] + phases["tls"]
+        )
+
+        literal = ConnectionTimer()
+        await literal("connection.connect_tcp.started", {"host": "127.0.0.1", "port": 80})
+        assert literal.phases["dns"] == 0.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_resolves_host_once(self, n8n_stand_in: StandInServer) -> None:
+        """Test the hook's lookup is handed to the connection instead of repeated."""
+        loop = asyncio.get_running_loop()
+        lookups: list[str] = []
+        getaddrinfo = loop.getaddrinfo
+
+        async def counting(host: str, *args: Any, **kwargs: Any) -> Any:
+            lookups.append(host)
+            return await getaddrinfo(host, *args, **kwargs)
+
+        url = n8n_stand_in.url.replace("127.0.0.1", "localhost")
+        with patch.object(loop, "getaddrinfo", counting):
+            async with HealthChecker(base_url=url) as checker:
+                result = await checker.check_health()
+
+        assert result["status"] == "healthy"
+        assert result["phases_ms"]["dns"] > 0.0
+        assert lookups == ["localhost"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_probe_phases(self, n8n_stand_in: StandInServer) -> None:
+        """Test a probe reports its phases and reused connections skip setup."""
+        url = n8n_stand_in.url.replace("127.0.0.1", "localhost")
+        async with HealthChecker(base_url=url) as checker:
+            first = await checker.check_health()
+            second = await checker.check_health()
+            phases = {"ttfb": LatencyHistogram()}
+            _, errors = await checker.sample_latency(10, concurrency=1, phases=phases)
+
+        assert first["phases_ms"]["tcp_connect"] > 0.0
+        assert first["phases_ms"]["ttfb"] > 0.0
+        assert second["connection_reused"] is True
+        assert second["phases_ms"]["tcp_connect"] == 0.0
+        assert second["phases_ms"]["ttfb"] > 0.0
+        assert errors == 0
+        assert phases["ttfb"].total == phases["body"].total == 10
+        assert "tcp_connect" not in phases
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_runtime(self, n8n_stand_in: StandInServer) -> None:
+        """Test event loop lag from /metrics feeds the overall status."""
+        with patch("src.config.config.N8N_METRICS", True), patch(
+            "src.config.config.DB_TYPE", "sqlite"
+        ):
+            async with HealthChecker(base_url=n8n_stand_in.url) as checker:
+                healthy = await checker.full_health_check()
+                n8n_stand_in.event_loop_lag = 1.5
+                lagging = await checker.full_health_check()
+
+            missing = await HealthChecker(base_url=f"{n8n_stand_in.url}/nope").check_runtime()
+
+        assert healthy["status"] == "healthy"
+        assert healthy["checks"]["runtime"]["event_loop_lag_ms"] == 2.0
+        assert "rates" not in healthy["checks"]["runtime"]
+        assert lagging["status"] == "unhealthy"
+        assert lagging["checks"]["runtime"]["error"] == "event loop lag 1500ms > 500ms"
+        assert lagging["checks"]["runtime"]["rates"] == {}
+        assert missing["status"] == "unhealthy"
+        assert "404" in missing["error"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_runtime_disabled(self, health_checker: HealthChecker) -> None:
+        """Test the runtime check is skipped unless N8N_METRICS is on."""
+        with patch("src.config.config.N8N_METRICS", False):
+            result = await health_checker.check_runtime()
+        assert result["status"] == "not_applicable"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sample_latency(self, mock_n8n_url: str) -> None:
+        """Test sampling records every request and counts failures."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            assert request.url.path == "/rest/ping"
+            return httpx.Response(503 if calls % 10 == 0 else 200)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            checker = HealthChecker(base_url=mock_n8n_url, client=client)
+            histogram, errors = await checker.sample_latency(50, concurrency=5, path="rest/ping")
+
+        assert calls == 50
+        assert histogram.total == 50
+        assert errors == 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_fails_fast(self, mock_n8n_url: str) -> None:
+        """Test probes stop reaching a dead target once the circuit opens."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("connection refused", request=request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            checker = HealthChecker(base_url=mock_n8n_url, client=client)
+            results = [await checker.check_health() for _ in range(5)]
+
+        assert calls == 3
+        assert results[2]["error"] == "connection refused"
+        assert results[3]["error"] == "circuit open"
+        assert results[4]["retry_in_ms"] > 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_probes_do_not_trip_the_breaker(self, mock_n8n_url: str) -> None:
+        """Test probes cancelled by a caller's deadline are not counted as failures."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(10)
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            checker = HealthChecker(base_url=mock_n8n_url, client=client)
+            for _ in range(5):
+                with pytest.raises(TimeoutError):
+                    await asyncio.wait_for(checker.check_health(), 0.01)
+
+        assert checker.breaker.failures == 0
+        assert checker.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout_applied_to_probes(self, mock_n8n_url: str) -> None:
+        """Test the per-request timeout shrinks once fast probes are observed."""
+        timeouts: list[float] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"]["read"])
+            return httpx.Response(200, stream=httpx.ByteStream(b"ok"))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            checker = HealthChecker(base_url=mock_n8n_url, timeout=10, client=client)
+            for _ in range(6):
+                result = await checker.check_health()
+
+        assert timeouts[0] == 10
+        assert timeouts[-1] < 10
+        assert result["timeout_ms"] == pytest.approx(timeouts[-1] * 1000)
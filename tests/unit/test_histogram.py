@@ -0,0 +1,98 @@
+"""Unit tests for the latency histogram."""
+
+from pathlib import Path
+import random
+
+import pytest
+
+from src.histogram import (
+    BUCKET_COUNT,
+    LatencyHistogram,
+    bucket_index,
+    bucket_upper_bound,
+)
+
+
+class TestLatencyHistogram:
+    """Test latency histogram."""
+
+    @pytest.mark.unit
+    def test_bucket_roundtrip_within_precision(self) -> None:
+        """Test every value maps to a bucket whose bound is within 1/64."""
+        for value in [0, 1, 63, 64, 65, 1000, 123_456, 10**9]:
+            index = bucket_index(value)
+            assert 0 <= index < BUCKET_COUNT
+            upper = bucket_upper_bound(index)
+            assert value <= upper <= value + value / 64 + 1
+
+    @pytest.mark.unit
+    def test_percentiles(self) -> None:
+        """Test percentiles of a uniform distribution."""
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        assert histogram.total == 1000
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.02)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.02)
+        assert histogram.percentile(100) == 1000.0
+        assert histogram.percentile(0) == 1.0
+        assert histogram.mean == pytest.approx(500.5)
+
+    @pytest.mark.unit
+    def test_empty_histogram(self) -> None:
+        """Test an empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.summary()["max"] == 0.0
+
+    @pytest.mark.unit
+    def test_memory_is_fixed(self) -> None:
+        """Test recording more samples does not grow the histogram."""
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for _ in range(10_000):
+            histogram.record(random.expovariate(1 / 20))
+        assert len(histogram.counts) == size
+
+    @pytest.mark.unit
+    def test_merge_matches_single_histogram(self) -> None:
+        """Test merging two runs equals recording everything in one."""
+        values = [random.lognormvariate(3, 1) for _ in range(2000)]
+        combined = LatencyHistogram()
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        for value in values:
+            combined.record(value)
+        for value in values[:700]:
+            first.record(value)
+        for value in values[700:]:
+            second.record(value)
+
+        first.merge(second)
+
+        assert first.counts == combined.counts
+        assert first.summary() == combined.summary()
+
+    @pytest.mark.unit
+    def test_export_and_load(self, tmp_path: Path) -> None:
+        """Test a saved histogram reloads identically."""
+        histogram = LatencyHistogram()
+        for value in (1.5, 2.5, 250.0):
+            histogram.record(value)
+
+        path = tmp_path / "hist.json"
+        histogram.save(path)
+        loaded = LatencyHistogram.load(path)
+
+        assert loaded.counts == histogram.counts
+        assert loaded.summary() == histogram.summary()
+        assert histogram.to_dict()["distribution"][-1]["latency_ms"] == 250.0
+
+    @pytest.mark.unit
+    def test_from_dict_rejects_other_layout(self) -> None:
+        """Test histograms with a different bucket layout cannot be merged."""
+        data = LatencyHistogram().to_dict()
+        data["sub_bucket_bits"] = 5
+        with pytest.raises(ValueError):
+            LatencyHistogram.from_dict(data)
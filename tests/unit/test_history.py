@@ -0,0 +1,169 @@
+"""Unit tests for the probe history ring buffers."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.history import HEADER, MAGIC, VERSION, ProbeHistory, pick_resolution, summarize
+
+T0 = 1_767_225_600.0  # 2026-01-01T00:00:00Z
+
+
+def result(
+    healthy: bool = True, latency: float | None = 10.0, ttfb: float | None = None
+) -> dict[str, Any]:
+    """Build a full_health_check result."""
+    n8n: dict[str, Any] = {"status": "healthy" if healthy else "unhealthy"}
+    if latency is not None:
+        n8n["latency_ms"] = latency
+    if ttfb is not None:
+        n8n["phases_ms"] = {"dns": 0.0, "tcp_connect": 0.0, "tls": 0.0, "ttfb": ttfb, "body": 0.5}
+    return {
+        "status": n8n["status"],
+        "checks": {"n8n": n8n, "database": {"status": "healthy", "query_time_ms": 1.5}},
+    }
+
+
+class TestProbeHistory:
+    """Test the probe history file."""
+
+    @pytest.mark.unit
+    def test_ring_wraps_at_fixed_size(self, tmp_path: Path) -> None:
+        """Test the file never grows and the oldest raw records are overwritten."""
+        path = tmp_path / "history.bin"
+        with ProbeHistory(path, {"raw": 5, "1m": 3, "1h": 2}) as history:
+            size = path.stat().st_size
+            for i in range(8):
+                history.append(T0 + i * 30, result(latency=float(i)))
+
+            raw = history.records("raw", 0, 2**62)
+            assert [r["latency_ms"] for r in raw] == [3.0, 4.0, 5.0, 6.0, 7.0]
+            assert raw[0]["db_ms"] == 1.5
+            assert raw[0]["queue_lag_ms"] is None
+        assert path.stat().st_size == size
+
+    @pytest.mark.unit
+    def test_rollups(self, tmp_path: Path) -> None:
+        """Test per-minute and per-hour rollups count probes, failures and latency."""
+        with ProbeHistory(tmp_path / "history.bin") as history:
+            for i in range(120):
+                healthy = i % 10 != 0
+                history.append(T0 + i * 30, result(healthy, 10.0 + i % 2 if healthy else None))
+
+            minutes = history.records("1m", 0, 2**62)
+            hours = history.records("1h", 0, 2**62)
+
+        assert len(minutes) == 60
+        assert minutes[0]["probes"] == 2
+        assert minutes[0]["failures"] == 1
+        assert minutes[0]["latency_mean_ms"] == pytest.approx(11.0)
+        assert len(hours) == 1
+        assert hours[0]["probes"] == 120
+        assert hours[0]["availability"] == pytest.approx(0.9)
+        assert hours[0]["latency_mean_ms"] == pytest.approx((48 * 10 + 60 * 11) / 108, rel=1e-3)
+        assert (hours[0]["latency_min_ms"], hours[0]["latency_max_ms"]) == (10.0, 11.0)
+
+    @pytest.mark.unit
+    def test_range_scan_and_outages(self, tmp_path: Path) -> None:
+        """Test ranges are found by binary search and failure runs become outages."""
+        path = tmp_path / "history.bin"
+        with ProbeHistory(path, {"raw": 100, "1m": 10, "1h": 10}) as history:
+            for i in range(150):
+                history.append(T0 + i, result(healthy=not 120 <= i < 125))
+            history.append(T0 + 10, result())
+
+        with ProbeHistory(path) as history:
+            start_ms = int((T0 + 100) * 1000)
+            records = history.records("raw", start_ms, start_ms + 10_000)
+            outages = history.outages(0, 2**62)
+
+        assert len(records) == 10
+        assert records[0]["timestamp_ms"] == start_ms
+        assert outages == [
+            {"start_ms": int((T0 + 120) * 1000), "end_ms": int((T0 + 124) * 1000), "probes": 5}
+        ]
+
+    @pytest.mark.unit
+    def test_rejects_other_files(self, tmp_path: Path) -> None:
+        """Test a file that is not a probe history is refused."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a history file")
+        with pytest.raises(ValueError, match="not a probe history file"):
+            ProbeHistory(path)
+
+    @pytest.mark.unit
+    def test_recreates_older_versions(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test a history file from another format version is replaced with a warning."""
+        path = tmp_path / "history.bin"
+        with ProbeHistory(path, {"raw": 4, "1m": 2, "1h": 2}) as history:
+            history.append(T0, result())
+        with path.open("r+b") as f:
+            f.write(HEADER.pack(MAGIC, VERSION - 1))
+
+        with ProbeHistory(path, {"raw": 4, "1m": 2, "1h": 2}) as history:
+            assert len(history.rings["raw"]) == 0
+            history.append(T0, result())
+            assert len(history.rings["raw"]) == 1
+        assert f"probe history version {VERSION - 1}" in caplog.text
+
+    @pytest.mark.unit
+    def test_summaries_agree_across_resolutions(self, tmp_path: Path) -> None:
+        """Test raw and rolled-up records summarize to the same totals."""
+        with ProbeHistory(tmp_path / "history.bin") as history:
+            for i in range(90):
+                history.append(T0 + i * 40, result(i % 30 != 0, 5.0 + i % 3))
+            raw = summarize(history.records("raw", 0, 2**62), "raw")
+            hourly = summarize(history.records("1h", 0, 2**62), "1h")
+
+        assert raw["probes"] == hourly["probes"] == 90
+        assert raw["failures"] == hourly["failures"] == 3
+        assert hourly["latency_mean_ms"] == pytest.approx(raw["latency_mean_ms"], rel=1e-3)
+        assert raw["latency_max_ms"] == hourly["latency_max_ms"] == 7.0
+        assert summarize([], "1m")["availability"] is None
+
+    @pytest.mark.unit
+    def test_phases(self, tmp_path: Path) -> None:
+        """Test phase times are kept per probe and averaged in rollups and summaries."""
+        with ProbeHistory(tmp_path / "history.bin") as history:
+            for i in range(4):
+                history.append(T0 + i, result(ttfb=float(i + 1)))
+            history.append(T0 + 5, result(healthy=False, latency=None))
+            raw = history.records("raw", 0, 2**62)
+            minutes = history.records("1m", 0, 2**62)
+
+        assert raw[0]["phases_ms"]["ttfb"] == 1.0
+        assert raw[-1]["phases_ms"] == {}
+        assert minutes[0]["phases_ms"]["ttfb"] == pytest.approx(2.5)
+        assert minutes[0]["phases_ms"]["body"] == pytest.approx(0.5)
+        assert summarize(raw, "raw")["phases_ms"]["ttfb"] == pytest.approx(2.5)
+        assert summarize(minutes, "1m")["phases_ms"]["ttfb"] == pytest.approx(2.5)
+
+    @pytest.mark.unit
+    def test_phases_reported_by_some_probes(self, tmp_path: Path) -> None:
+        """Test a phase missing from some probes is averaged over the probes that reported it."""
+        reported = [{"ttfb": 1.0}, {"ttfb": 2.0, "dns": 4.0}, {"ttfb": 3.0, "dns": 8.0}]
+        with ProbeHistory(tmp_path / "history.bin") as history:
+            for i, phases in enumerate(reported):
+                probe = result()
+                probe["checks"]["n8n"]["phases_ms"] = phases
+                history.append(T0 + i, probe)
+            probe = result()
+            probe["checks"]["n8n"]["phases_ms"] = {"ttfb": 1.0, "dns": 2.0}
+            history.append(T0 + 60, probe)
+            raw = history.records("raw", 0, 2**62)
+            minutes = history.records("1m", 0, 2**62)
+
+        assert minutes[0]["phases_ms"]["dns"] == pytest.approx(6.0)
+        assert minutes[0]["phase_samples"] == {"dns": 2, "ttfb": 3}
+        assert summarize(raw, "raw")["phases_ms"]["dns"] == pytest.approx(14 / 3)
+        assert summarize(minutes, "1m")["phases_ms"]["dns"] == pytest.approx(14 / 3)
+
+    @pytest.mark.unit
+    def test_pick_resolution(self) -> None:
+        """Test longer ranges are read from coarser rings."""
+        assert pick_resolution(3_600_000) == "raw"
+        assert pick_resolution(86_400_000) == "1m"
+        assert pick_resolution(30 * 86_400_000) == "1h"
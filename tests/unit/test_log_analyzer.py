@@ -0,0 +1,199 @@
+"""Unit tests for the n8n log analyzer."""
+
+import itertools
+import json
+import mmap
+from pathlib import Path
+
+import pytest
+
+from src.log_analyzer import (
+    NO_WORKFLOW,
+    LogAnalyzer,
+    analyze_file,
+    follow,
+    parse_line,
+    split_ranges,
+)
+
+
+def json_line(level: str, message: str, seconds: float, **metadata: str) -> str:
+    """Build a JSON-format n8n log line at ``seconds`` past midnight."""
+    timestamp = f"2026-01-01T00:{int(seconds) // 60:02d}:{seconds % 60:06.3f}Z"
+    return json.dumps(
+        {"level": level, "message": message, "metadata": metadata, "timestamp": timestamp}
+    )
+
+
+def execution_lines(execution_id: str, workflow_id: str, start: float, duration: float) -> list:
+    """Build start and finish lines for one successful execution."""
+    ids = {"workflowId": workflow_id, "executionId": execution_id}
+    return [
+        json_line("debug", "Workflow execution started", start, **ids),
+        json_line("debug", "Workflow execution finished successfully", start + duration, **ids),
+    ]
+
+
+@pytest.fixture
+def n8n_log(tmp_path: Path) -> Path:
+    """Provide a log file with 40 executions across two workflows, every 10th failing."""
+    lines = []
+    for i in range(40):
+        ids = {"workflowId": "wf-a" if i % 2 else "wf-b", "executionId": str(i)}
+        lines.append(json_line("debug", "Workflow execution started", i, **ids))
+        lines.append(json_line("info", "Pruning old executions", i))
+        if i % 10 == 0:
+            lines.append(
+                json_line("error", "Workflow execution finished with error", i + 0.5, **ids)
+            )
+        else:
+            lines.append(
+                json_line("debug", "Workflow execution finished successfully", i + 0.25, **ids)
+            )
+    path = tmp_path / "n8n.log"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestParseLine:
+    """Test log line parsing."""
+
+    @pytest.mark.unit
+    def test_json_line(self) -> None:
+        """Test JSON lines yield level, message, timestamp and IDs."""
+        line = json_line("info", "Workflow execution started", 1.5, workflowId="7", executionId="9")
+        event = parse_line(line.encode())
+        assert event is not None
+        assert (event.level, event.workflow_id, event.execution_id) == ("info", "7", "9")
+        assert event.timestamp is not None
+
+    @pytest.mark.unit
+    def test_text_line(self) -> None:
+        """Test text lines with trailing metadata are parsed."""
+        line = (
+            b"2026-01-01T00:00:01.000Z | WARNING | Workflow execution started "
+            b'{"workflowId": 3, "executionId": 4}'
+        )
+        event = parse_line(line)
+        assert event is not None
+        assert (event.level, event.workflow_id, event.execution_id) == ("warn", "3", "4")
+        assert event.message == "Workflow execution started"
+
+    @pytest.mark.unit
+    def test_lines_without_workflow_keep_only_level(self) -> None:
+        """Test lines not about a workflow are classified by level only."""
+        event = parse_line(b'{"level":"error","message":"Redis unavailable"}')
+        assert event is not None
+        assert (event.level, event.workflow_id, event.message) == ("error", None, "")
+        assert parse_line(b"2026-01-01T00:00:00Z | info | n8n ready on port 5678").level == "info"
+        assert parse_line(b"Editor is now accessible via") is None
+        assert parse_line(b'{"level": "info", "workflowId": ') is None
+
+
+class TestLogAnalyzer:
+    """Test per-workflow aggregation."""
+
+    @pytest.mark.unit
+    def test_aggregates_per_workflow(self, n8n_log: Path) -> None:
+        """Test counts, failures, errors and durations per workflow."""
+        report = analyze_file(str(n8n_log), workers=1).report()
+        rows = {row["workflow_id"]: row for row in report["workflows"]}
+
+        assert report["lines"] == 120
+        assert report["levels"] == {"debug": 76, "info": 40, "error": 4}
+        assert rows["wf-b"]["finished"] == 20
+        assert rows["wf-b"]["failed"] == 4
+        assert rows["wf-b"]["errors"] == 4
+        assert rows["wf-a"]["failure_rate"] == 0.0
+        assert rows["wf-a"]["p50_ms"] == pytest.approx(250, rel=0.02)
+        assert report["slowest"][0]["duration_ms"] == pytest.approx(500, rel=0.02)
+        assert report["in_flight"] == report["unmatched"] == 0
+
+    @pytest.mark.unit
+    def test_errors_without_workflow(self) -> None:
+        """Test errors and warnings not tied to a workflow are still counted."""
+        analyzer = LogAnalyzer()
+        analyzer.feed(b'{"level":"warn","message":"Slow query"}')
+        analyzer.feed(b"not a log line")
+
+        assert analyzer.workflows[NO_WORKFLOW].warnings == 1
+        assert analyzer.unparsed == 1
+
+    @pytest.mark.unit
+    def test_pending_executions_are_bounded(self) -> None:
+        """Test the oldest unfinished executions are dropped beyond max_pending."""
+        analyzer = LogAnalyzer(max_pending=2)
+        for i in range(5):
+            analyzer.feed(execution_lines(str(i), "wf", i, 1)[0].encode())
+
+        assert list(analyzer.pending) == ["3", "4"]
+        assert analyzer.report()["unmatched"] == 3
+
+    @pytest.mark.unit
+    def test_merge_pairs_executions_across_chunks(self) -> None:
+        """Test an execution started in one chunk and finished in the next is timed."""
+        start, finish = execution_lines("1", "wf", 0, 2)
+        first, second = LogAnalyzer(), LogAnalyzer()
+        first.feed(start.encode())
+        second.feed(finish.encode())
+
+        first.merge(second)
+        assert first.workflows["wf"].durations.total == 1
+        assert first.report()["slowest"][0]["duration_ms"] == pytest.approx(2000, rel=0.02)
+        assert first.report()["unmatched"] == 0
+
+    @pytest.mark.unit
+    def test_split_ranges_on_line_boundaries(self, n8n_log: Path) -> None:
+        """Test chunks cover the file exactly and start on line boundaries."""
+        with n8n_log.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = split_ranges(mm, 7)
+            assert ranges[0][0] == 0
+            assert ranges[-1][1] == len(mm)
+            for (_, end), (start, _) in itertools.pairwise(ranges):
+                assert end == start
+                assert mm[start - 1 : start] == b"\n"
+
+    @pytest.mark.unit
+    def test_parallel_matches_sequential(self, n8n_log: Path) -> None:
+        """Test splitting a file across processes gives the same report."""
+        sequential = analyze_file(str(n8n_log), workers=1).report()
+        parallel = analyze_file(str(n8n_log), workers=3, chunk_bytes=1024).report()
+        assert parallel == sequential
+
+    @pytest.mark.unit
+    def test_merge_files_in_order(self, tmp_path: Path) -> None:
+        """Test an execution spanning a rotated file and the current one is paired."""
+        start, finish = execution_lines("1", "wf", 0, 3)
+        (tmp_path / "n8n.log.1").write_text(start + "\n")
+        (tmp_path / "n8n.log").write_text(finish + "\n")
+        (tmp_path / "empty.log").write_text("")
+
+        analyzer = LogAnalyzer()
+        for name in ("n8n.log.1", "empty.log", "n8n.log"):
+            analyzer.merge(analyze_file(str(tmp_path / name)))
+        assert analyzer.workflows["wf"].durations.total == 1
+
+
+class TestFollow:
+    """Test following a live log file."""
+
+    @pytest.mark.unit
+    def test_follow_reads_complete_lines_and_handles_truncation(self, tmp_path: Path) -> None:
+        """Test appended lines are read once complete and truncation restarts from zero."""
+        path = tmp_path / "n8n.log"
+        start, finish = execution_lines("1", "wf", 0, 1)
+        path.write_text(start + "\n" + finish[:20])
+
+        analyzer = LogAnalyzer()
+        polls = follow(str(path), analyzer, sleep=lambda _seconds: None)
+        assert next(polls) == 1
+        assert next(polls) == 0
+
+        with path.open("a") as f:
+            f.write(finish[20:] + "\n")
+        assert next(polls) == 1
+        assert analyzer.workflows["wf"].durations.total == 1
+
+        path.write_text('{"level":"error"}\n')
+        assert next(polls) == 1
+        assert analyzer.levels["error"] == 1
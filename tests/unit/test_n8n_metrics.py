@@ -0,0 +1,177 @@
+"""Unit tests for the n8n /metrics scraper."""
+
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.n8n_metrics import (
+    MetricsScraper,
+    Scrape,
+    assess,
+    counter_rates,
+    parse_sample,
+    read_metrics,
+    summarize,
+)
+from src.stand_in import StandInServer
+
+PAGE = """\
+# HELP n8n_nodejs_eventloop_lag_seconds Lag of event loop in seconds.
+# TYPE n8n_nodejs_eventloop_lag_seconds gauge
+n8n_nodejs_eventloop_lag_seconds 0.25 1767225600000
+# TYPE n8n_nodejs_heap_size_used_bytes gauge
+n8n_nodejs_heap_size_used_bytes 96
+# TYPE n8n_nodejs_heap_size_total_bytes gauge
+n8n_nodejs_heap_size_total_bytes 100
+# TYPE n8n_nodejs_active_handles gauge
+n8n_nodejs_active_handles 12
+# TYPE n8n_http_request_duration_seconds histogram
+n8n_http_request_duration_seconds_bucket{le="0.1"} 3
+n8n_http_request_duration_seconds_count 3
+# TYPE n8n_workflow_success counter
+n8n_workflow_success_total{workflow_id="1"} 10
+n8n_workflow_success_total{workflow_id="2"} 4
+this is not a metric
+"""
+
+
+async def lines(text: str) -> AsyncIterator[str]:
+    """Yield a page line by line, as a streamed response would."""
+    for line in text.splitlines():
+        yield line
+
+
+def scrape(timestamp: float, **counters: float) -> Scrape:
+    """Build a scrape holding workflow counters keyed by workflow ID."""
+    result = Scrape(timestamp)
+    for workflow, value in counters.items():
+        result.samples[("n8n_workflow_started_total", (("workflow_id", workflow),))] = value
+    result.counters.add("n8n_workflow_started_total")
+    return result
+
+
+class TestParsing:
+    """Test exposition-format parsing."""
+
+    @pytest.mark.unit
+    def test_parse_sample(self) -> None:
+        """Test names, sorted unescaped labels, special values and timestamps."""
+        assert parse_sample("up 1") == ("up", (), 1.0)
+        assert parse_sample('m{b="x",a="say \\"hi\\"\\n"} +Inf 123') == (
+            "m",
+            (("a", 'say "hi"\n'), ("b", "x")),
+            float("inf"),
+        )
+        assert parse_sample('m{a="1",} 2') == ("m", (("a", "1"),), 2.0)
+        with pytest.raises(ValueError, match="Malformed labels"):
+            parse_sample("m{a=1} 2")
+        with pytest.raises(ValueError, match="Malformed metric line"):
+            parse_sample("m")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_read_metrics_keeps_counters_and_runtime_gauges(self) -> None:
+        """Test histograms, other gauges and malformed lines are dropped while streaming."""
+        result = await read_metrics(lines(PAGE), 5.0)
+
+        assert result.gauge("nodejs_eventloop_lag_p99_seconds", "eventloop_lag_seconds") == 0.25
+        assert result.counters == {"n8n_workflow_success_total"}
+        assert len(result.samples) == 5
+        assert result.gauge("nodejs_active_handles") is None
+
+        report = summarize(result, None)
+        assert report["event_loop_lag_ms"] == 250.0
+        assert report["heap_used_bytes"] == 96
+        assert report["heap_total_bytes"] == 100
+        assert report["heap_pressure"] is None
+        assert "rates" not in report
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_heap_pressure_uses_configured_limit(self) -> None:
+        """Test heap use is measured against HEALTH_HEAP_LIMIT_MB, not the committed heap."""
+        page = PAGE.replace("used_bytes 96", f"used_bytes {512 * 1024 * 1024}")
+        result = await read_metrics(lines(page), 5.0)
+
+        with patch("src.config.config.HEALTH_HEAP_LIMIT_MB", 2048):
+            report = summarize(result, None)
+
+        assert report["heap_limit_bytes"] == 2048 * 1024 * 1024
+        assert report["heap_pressure"] == 0.25
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_heap_limit_from_available_heap_spaces(self) -> None:
+        """Test the heap limit is read from /metrics when HEALTH_HEAP_LIMIT_MB is unset."""
+        page = PAGE + (
+            "# TYPE n8n_nodejs_heap_space_size_available_bytes gauge\n"
+            'n8n_nodejs_heap_space_size_available_bytes{space="new"} 100\n'
+            'n8n_nodejs_heap_space_size_available_bytes{space="old"} 204\n'
+        )
+        result = await read_metrics(lines(page), 5.0)
+
+        with patch("src.config.config.HEALTH_HEAP_LIMIT_MB", None):
+            report = summarize(result, None)
+        assert report["heap_limit_bytes"] == 400
+        assert report["heap_pressure"] == 0.24
+        assert assess(report, max_heap=0.2) == ["heap 24% used > 20%"]
+
+        with patch("src.config.config.HEALTH_HEAP_LIMIT_MB", 1):
+            assert summarize(result, None)["heap_limit_bytes"] == 1024 * 1024
+
+
+class TestRates:
+    """Test rates between scrapes and health assessment."""
+
+    @pytest.mark.unit
+    def test_counter_rates(self) -> None:
+        """Test increases, restarts and new series between two scrapes."""
+        rates = counter_rates(scrape(0.0, a=10, b=50), scrape(10.0, a=30, b=5, c=2))
+        report = summarize(scrape(10.0), rates)
+
+        assert report["workflow_rates"] == {
+            "n8n_workflow_started_total:a": 2.0,
+            "n8n_workflow_started_total:b": 0.5,
+            "n8n_workflow_started_total:c": 0.2,
+        }
+        assert report["rates"] == {"n8n_workflow_started_total": pytest.approx(2.7)}
+        assert counter_rates(scrape(1.0, a=1), scrape(1.0, a=2)) == {}
+
+    @pytest.mark.unit
+    def test_assess(self) -> None:
+        """Test event loop lag and heap pressure limits."""
+        assert assess({"event_loop_lag_ms": 10.0, "heap_pressure": 0.5}, 100, 0.9) == []
+        assert assess({"event_loop_lag_ms": None, "heap_pressure": None}) == []
+        assert assess({"event_loop_lag_ms": 250.0, "heap_pressure": 0.96}, 100, 0.9) == [
+            "event loop lag 250ms > 100ms",
+            "heap 96% used > 90%",
+        ]
+
+
+class TestMetricsScraper:
+    """Test scraping over HTTP."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_scrape_all(self, n8n_stand_in: StandInServer) -> None:
+        """Test concurrent scrapes report rates from the second round and errors per URL."""
+        now = 0.0
+        scraper = MetricsScraper(concurrency=2, clock=lambda: now)
+        urls = [f"{n8n_stand_in.url}/metrics", f"{n8n_stand_in.url}/missing/metrics"]
+
+        async with httpx.AsyncClient() as client:
+            await client.get(f"{n8n_stand_in.url}/webhook/7")
+            first = await scraper.scrape_all(client, urls)
+            for _ in range(4):
+                await client.get(f"{n8n_stand_in.url}/webhook/7")
+            now = 2.0
+            second, missing = await scraper.scrape_all(client, urls)
+
+        assert "rates" not in first[0]
+        assert first[0]["heap_used_bytes"] == 60 * 1024 * 1024
+        assert second["interval_seconds"] == 2.0
+        assert second["workflow_rates"] == {"n8n_workflow_started_total:7": 2.0}
+        assert missing["url"] == urls[1]
+        assert "404" in missing["error"]
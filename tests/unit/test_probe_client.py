@@ -0,0 +1,49 @@
+"""Unit tests for the health sidecar client."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.probe_client import main
+
+
+async def serve(path: Path, reply: bytes) -> asyncio.Server:
+    """Serve ``reply`` to every connection on a Unix socket."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(reply)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_unix_server(handle, str(path))
+
+
+class TestProbeClient:
+    """Test the healthcheck client."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_exit_codes(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test only a healthy reply exits 0, and verbose flags print the reply."""
+        healthy, stale = tmp_path / "healthy.sock", tmp_path / "stale.sock"
+        async with await serve(healthy, b'healthy 12\n{"status": "healthy"}\n'), await serve(
+            stale, b'stale 90000\n{"status": "healthy"}\n'
+        ):
+            ok = await asyncio.to_thread(main, ["--socket", str(healthy), "-v", "--json"])
+            old = await asyncio.to_thread(main, ["--socket", str(stale), "--timeout", "0.5"])
+
+        assert (ok, old) == (0, 1)
+        assert capsys.readouterr().out == 'healthy 12\n{"status": "healthy"}\n'
+
+    @pytest.mark.unit
+    def test_unreachable_and_usage(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a missing socket and unknown arguments fail."""
+        monkeypatch.setenv("HEALTH_SIDECAR_SOCKET", str(tmp_path / "missing.sock"))
+        assert main([]) == 1
+        assert main(["--bogus"]) == 2
+        err = capsys.readouterr().err
+        assert "sidecar unreachable at" in err
+        assert "usage:" in err
@@ -0,0 +1,248 @@
+"""Unit tests for the execution prune engine."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+import pytest
+
+from src.prune import (
+    PostgresPruneBackend,
+    SQLitePruneBackend,
+    load_state,
+    next_batch_size,
+    prune_executions,
+)
+
+# Subset of n8n's SQLite schema touched by pruning.
+SCHEMA = """
+CREATE TABLE execution_entity (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    "workflowId" TEXT,
+    "stoppedAt" DATETIME
+);
+CREATE TABLE execution_data (
+    "executionId" INTEGER PRIMARY KEY,
+    data TEXT,
+    "workflowData" TEXT
+);
+"""
+
+NOW = datetime(2026, 1, 15, tzinfo=UTC)
+
+
+@pytest.fixture
+def n8n_sqlite() -> sqlite3.Connection:
+    """Provide an n8n-like SQLite database with 100 old and 20 recent executions."""
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    for i in range(1, 121):
+        stopped = NOW - timedelta(days=30 if i <= 100 else 1)
+        conn.execute(
+            'INSERT INTO execution_entity (id, "workflowId", "stoppedAt") VALUES (?, ?, ?)',
+            (i, "1", stopped.replace(tzinfo=None).isoformat(" ", "milliseconds")),
+        )
+        conn.execute("INSERT INTO execution_data VALUES (?, ?, ?)", (i, "x" * 90, "y" * 10))
+    conn.execute('INSERT INTO execution_entity (id, "stoppedAt") VALUES (121, NULL)')
+    conn.commit()
+    return conn
+
+
+class FakeClock:
+    """Clock advanced by fake statement latency."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SlowBackend(SQLitePruneBackend):
+    """SQLite backend whose deletes take ``ms_per_row`` on a fake clock."""
+
+    def __init__(self, conn: sqlite3.Connection, clock: FakeClock, ms_per_row: float) -> None:
+        super().__init__(conn)
+        self.clock = clock
+        self.ms_per_row = ms_per_row
+        self.batch_sizes: list[int] = []
+
+    async def delete(self, ids: list[int]) -> int:
+        self.batch_sizes.append(len(ids))
+        self.clock.now += len(ids) * self.ms_per_row / 1000
+        return await super().delete(ids)
+
+
+def count(conn: sqlite3.Connection, table: str) -> int:
+    """Return the number of rows in ``table``."""
+    return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+class TestPrune:
+    """Test the prune engine against a SQLite stand-in."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("latency_ms", "expected"),
+        [(250.0, 100), (50.0, 200), (1000.0, 50), (0.0, 200), (10.0, 200)],
+    )
+    def test_next_batch_size(self, latency_ms: float, expected: int) -> None:
+        """Test batches grow or shrink toward the target, at most 2x per step."""
+        assert next_batch_size(100, latency_ms, 250.0, 10, 1000) == expected
+        assert next_batch_size(100, 5000.0, 250.0, 80, 1000) == 80
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dry_run_estimate(self, n8n_sqlite: sqlite3.Connection) -> None:
+        """Test the estimate counts only executions older than the cutoff."""
+        rows, size = await SQLitePruneBackend(n8n_sqlite).estimate(NOW - timedelta(days=7))
+        assert rows == 100
+        assert size == 100 * 100
+        assert count(n8n_sqlite, "execution_entity") == 121
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prune_adapts_and_throttles(self, n8n_sqlite: sqlite3.Connection) -> None:
+        """Test batches adapt to latency, pauses follow latency and recent rows survive."""
+        clock = FakeClock()
+        backend = SlowBackend(n8n_sqlite, clock, ms_per_row=5.0)
+        pauses: list[float] = []
+
+        async def sleep(seconds: float) -> None:
+            pauses.append(seconds)
+
+        result = await prune_executions(
+            backend,
+            NOW - timedelta(days=7),
+            batch_size=10,
+            min_batch=5,
+            target_ms=200.0,
+            pause_ratio=0.5,
+            sleep=sleep,
+            clock=clock,
+        )
+
+        assert result["complete"] is True
+        assert result["deleted"] == 100
+        assert backend.batch_sizes == [10, 20, 40, 30]
+        assert pauses[:2] == pytest.approx([0.025, 0.05])
+        assert count(n8n_sqlite, "execution_entity") == 21
+        assert count(n8n_sqlite, "execution_data") == 20
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prune_resumes(self, n8n_sqlite: sqlite3.Connection, tmp_path: Path) -> None:
+        """Test an interrupted run resumes from its saved cursor and cutoff."""
+        state_path = tmp_path / "state.json"
+        backend = SQLitePruneBackend(n8n_sqlite)
+        cutoff = NOW - timedelta(days=7)
+
+        async def sleep(seconds: float) -> None:
+            return None
+
+        first = await prune_executions(
+            backend, cutoff, batch_size=30, state_path=state_path, max_batches=1, sleep=sleep
+        )
+        saved = load_state(state_path)
+
+        assert first["complete"] is False
+        assert saved is not None
+        assert saved["last_id"] == 30
+
+        second = await prune_executions(
+            backend, NOW, batch_size=30, state_path=state_path, sleep=sleep
+        )
+
+        assert second["resumed"] is True
+        assert second["complete"] is True
+        assert second["deleted"] == 100
+        assert not state_path.exists()
+        assert count(n8n_sqlite, "execution_entity") == 21
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prune_refuses_other_runs_state(
+        self, n8n_sqlite: sqlite3.Connection, tmp_path: Path
+    ) -> None:
+        """Test saved state for another database or threshold is not resumed."""
+        state_path = tmp_path / "state.json"
+        backend = SQLitePruneBackend(n8n_sqlite)
+        identity = {"database": "sqlite:/a.sqlite", "older_than_hours": 168}
+
+        async def sleep(seconds: float) -> None:
+            return None
+
+        await prune_executions(
+            backend, NOW, state_path=state_path, max_batches=1, identity=identity, sleep=sleep
+        )
+        for other in ({**identity, "database": "postgresdb:db:5432/n8n"}, None):
+            with pytest.raises(ValueError, match="delete it to start over"):
+                await prune_executions(backend, NOW, state_path=state_path, identity=other)
+
+        assert load_state(state_path)["identity"] == identity
+
+
+class FakeTransaction:
+    """Async context manager returned by FakeConnection.transaction()."""
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class FakeConnection:
+    """Minimal asyncpg connection recording executed statements."""
+
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, Any]] = []
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction()
+
+    async def execute(self, query: str, ids: list[int]) -> str:
+        self.statements.append((query, ids))
+        return f"DELETE {len(ids)}"
+
+    async def __aenter__(self) -> "FakeConnection":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class FakePool:
+    """Minimal asyncpg pool stand-in."""
+
+    def __init__(self) -> None:
+        self.conn = FakeConnection()
+
+    def acquire(self) -> FakeConnection:
+        return self.conn
+
+    async def fetchrow(self, query: str, cutoff: datetime) -> dict[str, int]:
+        return {"rows": 7, "bytes": 4096}
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, int]]:
+        return [{"id": 3}, {"id": 4}]
+
+
+class TestPostgresPruneBackend:
+    """Test the PostgreSQL backend."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_postgres_backend(self) -> None:
+        """Test the backend deletes data and executions in one transaction."""
+        pool = FakePool()
+        backend = PostgresPruneBackend(pool)
+
+        assert await backend.estimate(NOW) == (7, 4096)
+        assert await backend.next_batch(0, NOW, 2) == [3, 4]
+        assert await backend.delete([3, 4]) == 2
+        assert [q.split()[2] for q, _ in pool.conn.statements] == [
+            "execution_data",
+            "execution_entity",
+        ]
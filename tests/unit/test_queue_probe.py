@@ -0,0 +1,146 @@
+"""Unit tests for the Redis/Bull queue probe."""
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.health_check import HealthChecker
+from src.queue_probe import QueueProbe
+
+
+class FakePipeline:
+    """Records queued commands and returns canned replies on execute()."""
+
+    def __init__(self, replies: list[Any]) -> None:
+        self.replies = replies
+        self.commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any) -> None:
+            self.commands.append((name, args))
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        return self.replies
+
+
+class FakeRedis:
+    """Minimal redis.asyncio.Redis stand-in."""
+
+    def __init__(self, replies: list[Any], **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self.pipelines: list[FakePipeline] = []
+        self.replies = replies
+        self.aclose = AsyncMock()
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        pipe = FakePipeline(self.replies)
+        self.pipelines.append(pipe)
+        return pipe
+
+
+class TestQueueProbe:
+    """Test queue probe."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_reads_all_lists_in_one_round_trip(self) -> None:
+        """Test counts, oldest job age and throughput from one pipeline per check."""
+        server_time = (1_700_000_030, 0)
+        replies = [12, 3, 4, 1, b"500", b"1700000000000", server_time]
+        clients: list[FakeRedis] = []
+
+        def factory(**kwargs: Any) -> FakeRedis:
+            client = FakeRedis(replies, **kwargs)
+            clients.append(client)
+            return client
+
+        probe = QueueProbe(client_factory=factory)
+        first = await probe.check()
+        # 10s later: 30 more jobs enqueued while the backlog grew by 10.
+        replies[:2] = [22, 3]
+        replies[4:] = [b"530", b"1700000000000", (1_700_000_040, 0)]
+        second = await probe.check()
+        await probe.aclose()
+
+        assert len(clients) == 1
+        assert len(clients[0].pipelines) == 2
+        clients[0].aclose.assert_awaited_once()
+
+        commands = [name for name, _ in clients[0].pipelines[0].commands]
+        assert commands == ["llen", "llen", "zcard", "zcard", "get", "eval", "time"]
+        assert clients[0].pipelines[0].commands[0][1] == ("bull:jobs:wait",)
+        assert clients[0].pipelines[0].commands[4][1] == ("bull:jobs:id",)
+
+        assert first["status"] == "healthy"
+        assert first["waiting"] == 12
+        assert first["active"] == 3
+        assert first["delayed"] == 4
+        assert first["failed"] == 1
+        assert first["oldest_waiting_age_ms"] == 30_000
+        assert first["processed_per_second"] is None
+        assert second["oldest_waiting_age_ms"] == 40_000
+        assert second["processed_per_second"] == 2.0
+
+    @pytest.mark.unit
+    def test_processed_rate_ignores_queue_resets(self) -> None:
+        """Test a job counter that went backwards yields no rate."""
+        probe = QueueProbe(client_factory=lambda **kwargs: None)
+
+        assert probe._processed_per_second(100.0, 50, 5) is None
+        assert probe._processed_per_second(100.0, 60, 5) is None
+        assert probe._processed_per_second(105.0, 3, 0) is None
+        assert probe._processed_per_second(110.0, 13, 0) == 2.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_empty_queue(self) -> None:
+        """Test an empty wait list reports zero lag."""
+        replies = [0, 0, 0, 0, None, None, (1_700_000_000, 0)]
+        probe = QueueProbe(client_factory=lambda **kwargs: FakeRedis(replies))
+
+        result = await probe.check()
+
+        assert result["oldest_waiting_age_ms"] == 0.0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_redis_unreachable(self) -> None:
+        """Test Redis errors are reported as unhealthy."""
+        client = MagicMock()
+        client.pipeline.return_value.execute = AsyncMock(side_effect=ConnectionError("refused"))
+        probe = QueueProbe(client_factory=lambda **kwargs: client)
+
+        result = await probe.check()
+
+        assert result["status"] == "unhealthy"
+        assert result["error"] == "refused"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_checker_skips_queue_outside_queue_mode(self) -> None:
+        """Test the queue check is not applicable in regular mode."""
+        with patch("src.config.config.EXECUTIONS_MODE", "regular"):
+            result = await HealthChecker().check_queue()
+
+        assert result["status"] == "not_applicable"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_full_health_check_includes_queue(self) -> None:
+        """Test an unhealthy queue makes the overall status unhealthy."""
+        checker = HealthChecker()
+        with patch("src.config.config.EXECUTIONS_MODE", "queue"), patch.object(
+            checker, "check_health", return_value={"status": "healthy"}
+        ), patch.object(checker, "check_database", return_value={"status": "healthy"}), patch(
+            "src.health_check.QueueProbe"
+        ) as mock_probe:
+            mock_probe.return_value.check = AsyncMock(return_value={"status": "unhealthy"})
+            mock_probe.return_value.aclose = AsyncMock()
+
+            result = await checker.full_health_check()
+
+        assert result["status"] == "unhealthy"
+        assert result["checks"]["queue"]["status"] == "unhealthy"
@@ -0,0 +1,138 @@
+"""Unit tests for the performance regression suite."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.config import config
+from src.regression import (
+    DEFAULT_CLI,
+    benchmark_names,
+    compare,
+    fleet_fanout,
+    health_throughput,
+    load_baseline,
+    mann_whitney_p,
+    probe_only_env,
+    run_suite,
+    save_baseline,
+    time_cli,
+    time_config_load,
+)
+
+
+class TestStatistics:
+    """Test the significance test and baseline comparison."""
+
+    @pytest.mark.unit
+    def test_mann_whitney_detects_shift(self) -> None:
+        """Test a consistent shift is significant only in its own direction."""
+        baseline = [10.0 + i * 0.1 for i in range(10)]
+        slower = [12.0 + i * 0.1 for i in range(10)]
+
+        assert mann_whitney_p(baseline, slower) < 0.001
+        assert mann_whitney_p(slower, baseline) > 0.99
+        assert 0.3 < mann_whitney_p(baseline, list(baseline)) < 0.7
+
+    @pytest.mark.unit
+    def test_mann_whitney_degenerate_samples(self) -> None:
+        """Test empty or all-tied samples are never significant."""
+        assert mann_whitney_p([], [1.0]) == 1.0
+        assert mann_whitney_p([5.0] * 4, [5.0] * 4) == 1.0
+
+    @pytest.mark.unit
+    def test_compare_statuses(self) -> None:
+        """Test regressions need both significance and a large enough effect."""
+        baseline = {
+            "slow": [10.0 + i * 0.1 for i in range(10)],
+            "nudged": [10.0 + i * 0.1 for i in range(10)],
+            "fast": [10.0 + i * 0.1 for i in range(10)],
+        }
+        current = {
+            "slow": [20.0 + i * 0.1 for i in range(10)],
+            "nudged": [11.0 + i * 0.1 for i in range(10)],
+            "fast": [5.0 + i * 0.1 for i in range(10)],
+            "added": [1.0, 2.0],
+        }
+
+        rows = {row["name"]: row for row in compare(baseline, current)}
+
+        assert rows["slow"]["status"] == "regression"
+        assert rows["slow"]["change"] == pytest.approx(1.0, rel=0.05)
+        assert rows["nudged"]["status"] == "ok"
+        assert rows["fast"]["status"] == "improvement"
+        assert rows["added"]["status"] == "new"
+
+    @pytest.mark.unit
+    def test_baseline_round_trip_keeps_other_entries(self, tmp_path: Path) -> None:
+        """Test updating part of the baseline keeps benchmarks that were not rerun."""
+        path = tmp_path / "benchmarks" / "baseline.json"
+        assert load_baseline(path) == {}
+
+        save_baseline({"a": [1.0, 3.0], "b": [2.0]}, path)
+        save_baseline({"a": [5.0]}, path)
+
+        assert load_baseline(path) == {"a": [5.0], "b": [2.0]}
+        assert json.loads(path.read_text())["benchmarks"]["b"]["median_ms"] == 2.0
+
+
+class TestBenchmarks:
+    """Test the individual benchmarks."""
+
+    @pytest.mark.unit
+    def test_committed_baseline_covers_suite(self) -> None:
+        """Test the committed baseline has samples for every benchmark."""
+        baseline = load_baseline(DEFAULT_CLI.parent / "benchmarks" / "baseline.json")
+        assert set(baseline) == set(benchmark_names())
+        assert all(len(samples) >= 8 for samples in baseline.values())
+
+    @pytest.mark.unit
+    def test_probe_only_env_restores_config(self) -> None:
+        """Test database and queue checks are disabled only inside the context."""
+        with probe_only_env():
+            assert config.DB_TYPE == "sqlite"
+        assert config.DB_TYPE == "postgresdb"
+        assert "EXECUTIONS_MODE" not in os.environ
+
+    @pytest.mark.unit
+    def test_time_cli(self) -> None:
+        """Test CLI cold starts are timed per command."""
+        samples = time_cli({"help": ["--help"], "info": ["info"]}, runs=2)
+        assert set(samples) == {"help", "info"}
+        assert all(len(s) == 2 and min(s) > 0 for s in samples.values())
+
+    @pytest.mark.unit
+    def test_time_config_load(self) -> None:
+        """Test config loads are timed and leave the config readable."""
+        samples = time_config_load(runs=3, loops=5)
+        assert len(samples) == 3
+        assert config.N8N_PORT == 5678
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_throughput(self) -> None:
+        """Test full health checks are timed against a stand-in."""
+        samples = await health_throughput(runs=2, probes=3)
+        assert len(samples) == 2
+        assert all(sample > 0 for sample in samples)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fleet_fanout(self) -> None:
+        """Test fleet rounds are timed for each fan-out size."""
+        samples = await fleet_fanout(runs=2, sizes=(1, 3))
+        assert set(samples) == {1, 3}
+        assert all(len(s) == 2 for s in samples.values())
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_suite_selects_by_prefix(self) -> None:
+        """Test only benchmarks matching a selected prefix run."""
+        with patch("src.regression.time_cli", return_value={"info": [1.0]}) as timed:
+            results = await run_suite(["cli.info", "config."], runs=2)
+
+        assert timed.call_args.args[0] == {"info": ["info"]}
+        assert set(results) == {"cli.info", "config.load"}
@@ -0,0 +1,139 @@
+"""Unit tests for adaptive timeouts and the circuit breaker."""
+
+import pytest
+
+from src.resilience import AdaptiveTimeout, CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdaptiveTimeout:
+    """Test adaptive timeout."""
+
+    @pytest.mark.unit
+    def test_uses_ceiling_until_warmed_up(self) -> None:
+        """Test the ceiling applies until enough latencies are observed."""
+        timeout = AdaptiveTimeout(ceiling=10.0, min_samples=3)
+        timeout.observe(0.1)
+        timeout.observe(0.1)
+        assert timeout.current == 10.0
+        timeout.observe(0.1)
+        assert timeout.current < 10.0
+
+    @pytest.mark.unit
+    def test_tracks_latency_with_floor(self) -> None:
+        """Test steady fast probes shrink the timeout down to the floor."""
+        timeout = AdaptiveTimeout(ceiling=10.0, floor=0.5)
+        for _ in range(20):
+            timeout.observe(0.02)
+        assert timeout.current == 0.5
+
+        for _ in range(20):
+            timeout.observe(1.0)
+        assert 2.0 <= timeout.current <= 10.0
+
+    @pytest.mark.unit
+    def test_percentile_covers_tail_latency(self) -> None:
+        """Test occasional slow probes keep the timeout above the tail."""
+        timeout = AdaptiveTimeout(ceiling=30.0, floor=0.1)
+        for i in range(50):
+            timeout.observe(3.0 if i % 10 == 0 else 0.1)
+        assert timeout.current >= 6.0
+
+    @pytest.mark.unit
+    def test_timeouts_back_off_until_success(self) -> None:
+        """Test each timeout doubles the value, capped at the ceiling, until a success."""
+        timeout = AdaptiveTimeout(ceiling=4.0, floor=0.5)
+        for _ in range(10):
+            timeout.observe(0.01)
+
+        timeout.observe_timeout()
+        assert timeout.current == 1.0
+        timeout.observe_timeout()
+        timeout.observe_timeout()
+        timeout.observe_timeout()
+        assert timeout.current == 4.0
+
+        timeout.observe(0.01)
+        assert timeout.current == 0.5
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker."""
+
+    @pytest.mark.unit
+    def test_opens_after_consecutive_failures(self) -> None:
+        """Test the circuit opens at the threshold and successes reset the count."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow() is True
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is False
+        assert breaker.retry_in == 5.0
+
+    @pytest.mark.unit
+    def test_half_open_allows_one_trial(self) -> None:
+        """Test only one trial runs at a time once the reset timeout passes."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 5.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.retry_in == 0.0
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow() is True
+
+    @pytest.mark.unit
+    def test_released_trial_can_run_again(self) -> None:
+        """Test a cancelled trial gives its slot back without counting as a failure."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 5.0
+        assert breaker.allow() is True
+        breaker.release()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.failures == 1
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+    @pytest.mark.unit
+    def test_failed_trial_reopens_with_backoff(self) -> None:
+        """Test failed trials double the reset timeout up to the maximum."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=5.0, max_reset_timeout=15.0, clock=clock
+        )
+        breaker.record_failure()
+
+        for expected in (10.0, 15.0, 15.0):
+            clock.now += breaker.reset_timeout
+            assert breaker.allow() is True
+            breaker.record_failure()
+            assert breaker.state == CircuitBreaker.OPEN
+            assert breaker.reset_timeout == expected
+
+        clock.now += breaker.reset_timeout
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.reset_timeout == 5.0
@@ -0,0 +1,75 @@
+"""Unit tests for the health sidecar daemon."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.probe_client import query
+from src.sidecar import HealthSidecar
+
+
+class FakeChecker:
+    """HealthChecker stand-in returning scripted statuses, then raising."""
+
+    def __init__(self, *statuses: str) -> None:
+        self.statuses = list(statuses)
+
+    async def full_health_check(self) -> dict[str, Any]:
+        if not self.statuses:
+            raise ConnectionError("probe crashed")
+        return {"status": self.statuses.pop(0), "checks": {"n8n": {"latency_ms": 1.5}}}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestHealthSidecar:
+    """Test the health sidecar."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_reply_tracks_status_and_staleness(self) -> None:
+        """Test replies report starting, the cached status, and stale once too old."""
+        clock = FakeClock()
+        sidecar = HealthSidecar(FakeChecker("healthy"), "unused.sock", interval=5, clock=clock)
+        assert sidecar.reply() == b"starting 0\n{}\n"
+
+        await sidecar.refresh()
+        clock.now += 2
+        status, _, body = sidecar.reply().partition(b"\n")
+        assert status == b"healthy 2000"
+        assert json.loads(body)["checks"]["n8n"]["latency_ms"] == 1.5
+
+        clock.now += 14
+        assert sidecar.reply().startswith(b"stale 16000\n")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_serves_cached_result_over_socket(self, tmp_path: Path) -> None:
+        """Test queries are answered from cache while failing refreshes keep the last result."""
+        socket_path = tmp_path / "health.sock"
+        socket_path.write_text("left over")
+        checker = FakeChecker("healthy", "unhealthy")
+
+        async with HealthSidecar(checker, socket_path, interval=0.01, max_age=60) as sidecar:
+            await asyncio.sleep(0)
+            first = await asyncio.to_thread(query, str(socket_path))
+            while sidecar.refreshes < 2:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.03)
+            second = await asyncio.to_thread(query, str(socket_path))
+
+        assert first.startswith(b"healthy ")
+        assert second.startswith(b"unhealthy ")
+        assert sidecar.queries == 2
+        assert not socket_path.exists()
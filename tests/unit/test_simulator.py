@@ -0,0 +1,136 @@
+"""Unit tests for the capacity simulator."""
+
+import math
+import random
+
+import pytest
+
+from src.executions import ExecutionStore
+from src.simulator import (
+    effective_timeout,
+    fit_lognormal,
+    generate_workload,
+    parse_distribution,
+    parse_profile,
+    simulate,
+    sweep,
+)
+
+
+class TestWorkload:
+    """Test workload parsing and generation."""
+
+    @pytest.mark.unit
+    def test_parse_profile(self) -> None:
+        """Test arrival profiles parse into steps."""
+        assert parse_profile("60:1,30:2.5") == [(60.0, 1.0), (30.0, 2.5)]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("profile", ["", "60", "0:1", "60:-1"])
+    def test_parse_profile_invalid(self, profile: str) -> None:
+        """Test malformed profiles are rejected."""
+        with pytest.raises(ValueError):
+            parse_profile(profile)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("spec", ["fixed:2", "exponential:2", "lognormal:0.5,0.2"])
+    def test_parse_distribution(self, spec: str) -> None:
+        """Test supported distributions produce positive samples."""
+        sampler = parse_distribution(spec)
+        assert sampler(random.Random(0)) > 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("spec", ["fixed", "lognormal:1", "gamma:1,2"])
+    def test_parse_distribution_invalid(self, spec: str) -> None:
+        """Test unknown or underspecified distributions are rejected."""
+        with pytest.raises(ValueError):
+            parse_distribution(spec)
+
+    @pytest.mark.unit
+    def test_generate_workload(self) -> None:
+        """Test arrivals follow the profile rate and are reproducible."""
+        profile = [(1000.0, 2.0), (1000.0, 0.0), (1000.0, 1.0)]
+        arrivals, durations = generate_workload(profile, parse_distribution("fixed:1"), seed=3)
+
+        assert len(arrivals) == len(durations)
+        assert 2700 < len(arrivals) < 3300
+        assert not any(1000 <= t < 2000 for t in arrivals)
+        assert arrivals == sorted(arrivals)
+        assert generate_workload(profile, parse_distribution("fixed:1"), seed=3)[0] == arrivals
+
+    @pytest.mark.unit
+    def test_fit_lognormal_from_history(self) -> None:
+        """Test a distribution is fitted from the execution cache."""
+        store = ExecutionStore(":memory:")
+        store.upsert(
+            {
+                "id": str(i),
+                "workflowId": "1",
+                "startedAt": "2025-12-29T10:00:00.000Z",
+                "stoppedAt": f"2025-12-29T10:00:0{i % 5 + 1}.000Z",
+            }
+            for i in range(1, 51)
+        )
+
+        mu, sigma = fit_lognormal(store.durations())
+
+        assert 0 < mu < math.log(5)
+        assert sigma > 0
+        with pytest.raises(ValueError):
+            fit_lognormal(store.durations(workflow_id="missing"))
+
+
+class TestSimulate:
+    """Test the event simulation."""
+
+    @pytest.mark.unit
+    def test_no_contention(self) -> None:
+        """Test jobs never wait when slots outnumber overlapping jobs."""
+        result = simulate([0.0, 1.0, 2.0], [0.5, 0.5, 0.5], slots=1)
+        assert result["max_wait"] == 0.0
+        assert result["utilization"] == pytest.approx(1.5 / 2.5)
+
+    @pytest.mark.unit
+    def test_queueing_and_timeouts(self) -> None:
+        """Test waits accumulate on a busy slot and long runs are cut off."""
+        result = simulate([0.0, 0.0, 0.0], [2.0, 2.0, 10.0], slots=1, timeout=5.0)
+
+        assert result["jobs"] == 3
+        assert result["max_wait"] == 4.0
+        assert result["mean_wait"] == pytest.approx(2.0)
+        assert result["timeout_rate"] == pytest.approx(1 / 3)
+        assert result["utilization"] == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_empty_workload(self) -> None:
+        """Test an empty workload reports zeros."""
+        result = simulate([], [], slots=4)
+        assert result["jobs"] == 0
+        assert result["utilization"] == 0.0
+
+    @pytest.mark.unit
+    def test_effective_timeout(self) -> None:
+        """Test the timeout is capped by the maximum and can be disabled."""
+        assert effective_timeout(3600, 600) == 600
+        assert effective_timeout(60, 0) == 60
+        assert effective_timeout(-1, 7200) == math.inf
+        assert effective_timeout() == 3600
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_sweep(self, processes: int) -> None:
+        """Test more workers reduce queue wait for the same workload."""
+        arrivals, durations = generate_workload(
+            [(600.0, 15.0)], parse_distribution("exponential:1"), seed=1
+        )
+        results = sweep(arrivals, durations, [1, 2, 4], processes=processes)
+
+        assert [(r["mode"], r["slots"]) for r in results] == [
+            ("regular", 10),
+            ("queue", 10),
+            ("queue", 20),
+            ("queue", 40),
+        ]
+        queue_waits = [r["mean_wait"] for r in results[1:]]
+        assert queue_waits == sorted(queue_waits, reverse=True)
+        assert results[1]["utilization"] > results[3]["utilization"]
@@ -0,0 +1,113 @@
+"""Unit tests for the n8n stand-in server."""
+
+import httpx
+import pytest
+
+from src.executions import ExecutionStore, sync_executions
+from src.health_check import HealthChecker
+from src.stand_in import Behaviour, StandInServer
+
+
+class TestStandInServer:
+    """Test the stand-in server."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_routes(self, n8n_stand_in: StandInServer) -> None:
+        """Test health, webhook and unknown routes over one keep-alive connection."""
+        async with httpx.AsyncClient(base_url=n8n_stand_in.url) as client:
+            health = await client.get("/healthz")
+            webhook = await client.post("/webhook/orders", json={"id": 1})
+            missing = await client.get("/nope")
+
+        assert health.json() == {"status": "ok"}
+        assert webhook.status_code == 200
+        assert missing.status_code == 404
+        assert n8n_stand_in.connections == 1
+        assert n8n_stand_in.requests["/webhook/orders"] == 1
+
+    @pytest.mark.unit
+    def test_behaviour_for_longest_prefix(self) -> None:
+        """Test the most specific route behaviour wins."""
+        slow = Behaviour(latency="fixed:1")
+        failing = Behaviour(error_rate=1.0)
+        server = StandInServer(routes={"/webhook/": slow, "/webhook/fail": failing})
+
+        assert server.behaviour_for("/webhook/fail/now") is failing
+        assert server.behaviour_for("/webhook/ok") is slow
+        assert server.behaviour_for("/healthz") is server.default
+
+    @pytest.mark.unit
+    def test_slow_start_decays(self) -> None:
+        """Test latency is scaled up right after start and back to normal afterwards."""
+        server = StandInServer(
+            default=Behaviour(latency="fixed:0.1"), slow_start=60.0, slow_start_factor=5.0
+        )
+        assert server.latency(server.default) == pytest.approx(0.5, rel=0.01)
+
+        server.started_at -= 60.0
+        assert server.latency(server.default) == pytest.approx(0.1)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_and_drops(self, n8n_stand_in: StandInServer) -> None:
+        """Test scripted errors return 500 and drops abort the connection."""
+        n8n_stand_in.routes["/webhook/error"] = Behaviour(error_rate=1.0)
+        n8n_stand_in.routes["/webhook/drop"] = Behaviour(drop_rate=1.0)
+
+        async with httpx.AsyncClient(base_url=n8n_stand_in.url) as client:
+            error = await client.post("/webhook/error")
+            with pytest.raises(httpx.RemoteProtocolError):
+                await client.post("/webhook/drop")
+
+        assert error.status_code == 500
+        assert n8n_stand_in.errors == 1
+        assert n8n_stand_in.drops == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_executions_api_with_sync(self) -> None:
+        """Test execution history syncs from the paginated executions API."""
+        store = ExecutionStore(":memory:")
+        server = StandInServer(executions=120, api_key="secret")
+
+        async with server, httpx.AsyncClient() as client:
+            denied = await client.get(f"{server.url}/api/v1/executions")
+            result = await sync_executions(store, client, server.url, "secret", page_size=50)
+
+        assert denied.status_code == 401
+        assert result["synced"] == 120
+        assert result["pages"] == 3
+        assert result["watermark"] == "120"
+        assert sum(row["failures"] for row in store.workflow_stats()) == 6
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_breaker_opens_on_dropped_connections(self, n8n_stand_in: StandInServer) -> None:
+        """Test HealthChecker stops probing a stand-in that drops every connection."""
+        n8n_stand_in.default = Behaviour(drop_rate=1.0)
+
+        async with HealthChecker(base_url=n8n_stand_in.url) as checker:
+            results = [await checker.check_health() for _ in range(5)]
+
+        assert n8n_stand_in.requests["/healthz"] == 3
+        assert results[-1]["error"] == "circuit open"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_workflows_api(self) -> None:
+        """Test workflows are listed, created and replaced through the public API."""
+        async with StandInServer(workflows=3) as server, httpx.AsyncClient() as client:
+            url = f"{server.url}/api/v1/workflows"
+            listed = await client.get(url, params={"limit": 2})
+            created = await client.post(url, json={"name": "New", "nodes": []})
+            updated = await client.put(f"{url}/1", json={"name": "Renamed"})
+            missing = await client.put(f"{url}/99", json={"name": "Gone"})
+            invalid = await client.put(f"{url}/1", content=b"{")
+
+        assert [w["id"] for w in listed.json()["data"]] == ["1", "2"]
+        assert listed.json()["nextCursor"] == "2"
+        assert created.json()["id"] == "4"
+        assert updated.json()["name"] == "Renamed"
+        assert server.workflows["1"]["nodes"][0]["name"] == "Webhook"
+        assert (missing.status_code, invalid.status_code) == (404, 400)
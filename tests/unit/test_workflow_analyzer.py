@@ -0,0 +1,168 @@
+"""Unit tests for the workflow analyzer."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.workflow_analyzer import (
+    analyze_bulk,
+    analyze_workflow,
+    build_graph,
+    find_back_edges,
+    find_workflow_files,
+    top_ranked,
+)
+
+
+def node(name: str, node_type: str = "n8n-nodes-base.set", **parameters: Any) -> dict[str, Any]:
+    """Build a workflow node."""
+    return {"name": name, "type": f"n8n-nodes-base.{node_type}", "parameters": parameters}
+
+
+def connect(*edges: tuple[str, str]) -> dict[str, Any]:
+    """Build a connections mapping from (source, target) pairs."""
+    connections: dict[str, Any] = {}
+    for source, target in edges:
+        main = connections.setdefault(source, {"main": [[]]})["main"]
+        main[0].append({"node": target, "type": "main", "index": 0})
+    return connections
+
+
+def workflow(nodes: list[dict[str, Any]], edges: list[tuple[str, str]]) -> dict[str, Any]:
+    """Build a workflow like the sample_workflow fixture."""
+    return {"id": "1", "name": "Test", "nodes": nodes, "connections": connect(*edges)}
+
+
+def patterns(result: dict[str, Any]) -> list[str]:
+    """Return the finding patterns in ``result``."""
+    return [f["pattern"] for f in result["findings"]]
+
+
+class TestWorkflowAnalyzer:
+    """Test workflow analysis."""
+
+    @pytest.mark.unit
+    def test_empty_workflow(self, sample_workflow: dict[str, Any]) -> None:
+        """Test the sample workflow analyzes cleanly."""
+        result = analyze_workflow(sample_workflow)
+        assert result["nodes"] == 0
+        assert result["critical_path"] == []
+        assert result["findings"] == []
+
+    @pytest.mark.unit
+    def test_build_graph_ignores_dangling_connections(self) -> None:
+        """Test connections to unknown nodes are dropped."""
+        nodes, successors = build_graph(workflow([node("A")], [("A", "Missing")]))
+        assert list(nodes) == ["A"]
+        assert successors["A"] == []
+
+    @pytest.mark.unit
+    def test_critical_path_and_parallelism(self) -> None:
+        """Test the weighted critical path follows the expensive branch."""
+        result = analyze_workflow(
+            workflow(
+                [node("Start"), node("Fetch", "httpRequest"), node("Set"), node("End")],
+                [("Start", "Fetch"), ("Start", "Set"), ("Fetch", "End"), ("Set", "End")],
+            )
+        )
+
+        assert result["critical_path"] == ["Start", "Fetch", "End"]
+        assert result["critical_path_cost"] == 7
+        assert result["max_fan_out"] == 2
+        assert result["max_fan_in"] == 2
+        assert result["parallel_branches"] == 1
+        assert result["max_parallel_width"] == 2
+
+    @pytest.mark.unit
+    def test_flags_large_fan_out(self) -> None:
+        """Test a node with many branches is flagged."""
+        targets = [node(f"T{i}") for i in range(6)]
+        result = analyze_workflow(
+            workflow([node("Start"), *targets], [("Start", f"T{i}") for i in range(6)])
+        )
+        assert "large_fan_out" in patterns(result)
+
+    @pytest.mark.unit
+    def test_flags_serial_http_chain(self) -> None:
+        """Test three HTTP requests in series are reported once."""
+        nodes = [node("Start")] + [node(f"H{i}", "httpRequest") for i in range(4)]
+        edges = [("Start", "H0"), ("H0", "H1"), ("H1", "H2"), ("H2", "H3")]
+        result = analyze_workflow(workflow(nodes, edges))
+
+        chains = [f for f in result["findings"] if f["pattern"] == "serial_http_chain"]
+        assert len(chains) == 1
+        assert chains[0]["node"] == "H0"
+        assert "4 HTTP requests" in chains[0]["detail"]
+
+    @pytest.mark.unit
+    def test_loops(self) -> None:
+        """Test loops are flagged unless they go through Split In Batches."""
+        unbatched = analyze_workflow(
+            workflow(
+                [node("A"), node("B", "httpRequest"), node("If", "if")],
+                [("A", "B"), ("B", "If"), ("If", "B")],
+            )
+        )
+        batched = analyze_workflow(
+            workflow(
+                [node("A"), node("Batch", "splitInBatches", batchSize=1), node("B")],
+                [("A", "Batch"), ("Batch", "B"), ("B", "Batch")],
+            )
+        )
+
+        assert unbatched["loops"] == 1
+        assert "unbatched_loop" in patterns(unbatched)
+        assert "unbatched_loop" not in patterns(batched)
+        assert "batch_size_one" in patterns(batched)
+
+    @pytest.mark.unit
+    def test_flags_code_patterns(self) -> None:
+        """Test chained and per-item Code nodes are flagged."""
+        result = analyze_workflow(
+            workflow(
+                [node("C1", "code", mode="runOnceForEachItem"), node("C2", "code")],
+                [("C1", "C2")],
+            )
+        )
+        assert sorted(patterns(result)) == ["per_item_code", "redundant_code"]
+
+    @pytest.mark.unit
+    def test_find_back_edges_self_loop(self) -> None:
+        """Test a self loop is a back edge."""
+        assert find_back_edges({"A": ["A"]}) == {("A", "A")}
+
+
+class TestBulkAnalysis:
+    """Test bulk analysis."""
+
+    @pytest.fixture
+    def workflow_dir(self, tmp_path: Path) -> Path:
+        """Write a directory of exported workflows."""
+        slow = workflow(
+            [node(f"H{i}", "httpRequest") for i in range(3)], [("H0", "H1"), ("H1", "H2")]
+        )
+        for i in range(5):
+            (tmp_path / f"wf{i}.json").write_text(json.dumps(workflow([node("A")], [])))
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / "slow.json").write_text(json.dumps([slow, slow]))
+        (tmp_path / "broken.json").write_text("{not json")
+        (tmp_path / "malformed.json").write_text(json.dumps([1, 2]))
+        return tmp_path
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_analyze_bulk(self, workflow_dir: Path, workers: int) -> None:
+        """Test bulk mode covers every workflow, malformed ones included, in-process and over a pool."""
+        files = find_workflow_files([workflow_dir])
+        results = list(analyze_bulk(files, workers=workers, batch_size=2))
+
+        assert len(files) == 8
+        assert len(results) == 10
+        assert sum("error" in r for r in results) == 3
+        malformed = [r for r in results if r["file"].endswith("malformed.json")]
+        assert all(r["error"].startswith("Malformed workflow") for r in malformed)
+
+        ranked = top_ranked(results, 2)
+        assert [r["file"].endswith("slow.json") for r in ranked] == [True, True]
@@ -0,0 +1,162 @@
+"""Unit tests for workflow export and import."""
+
+from collections.abc import AsyncGenerator
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.stand_in import Behaviour, StandInServer
+from src.workflow_sync import (
+    MANIFEST,
+    content_hash,
+    export_workflows,
+    import_workflows,
+    load_manifest,
+    read_local,
+)
+
+API_KEY = "secret"
+
+
+@pytest.fixture
+async def n8n_workflows() -> AsyncGenerator[StandInServer, None]:
+    """Provide a stand-in server holding 12 workflows."""
+    async with StandInServer(workflows=12, api_key=API_KEY, seed=0) as server:
+        yield server
+
+
+class TestContentHash:
+    """Test workflow content hashing."""
+
+    @pytest.mark.unit
+    def test_ignores_ids_and_timestamps(self) -> None:
+        """Test only synced fields affect the hash, regardless of key order."""
+        workflow = {"id": "1", "name": "A", "nodes": [], "connections": {}, "updatedAt": "x"}
+        moved = {"connections": {}, "nodes": [], "name": "A", "id": "9", "updatedAt": "y"}
+
+        assert content_hash(workflow) == content_hash(moved)
+        assert content_hash(workflow) != content_hash({**workflow, "name": "B"})
+
+
+class TestExport:
+    """Test delta export."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_export_writes_only_changes(
+        self, n8n_workflows: StandInServer, tmp_path: Path
+    ) -> None:
+        """Test a repeat export rewrites only the workflows that changed."""
+        async with httpx.AsyncClient() as client:
+            first = await export_workflows(
+                client, tmp_path, n8n_workflows.url, api_key=API_KEY, page_size=5
+            )
+            unchanged_at = (tmp_path / "1.json").stat().st_mtime_ns
+            n8n_workflows.workflows["3"]["name"] = "Renamed"
+            n8n_workflows.workflows["4"]["updatedAt"] = "2026-06-01T00:00:00.000Z"
+            second = await export_workflows(
+                client, tmp_path, n8n_workflows.url, api_key=API_KEY, page_size=5
+            )
+
+        assert first == {"pages": 3, "total": 12, "written": 12, "unchanged": 0, "removed": []}
+        assert (second["written"], second["unchanged"]) == (1, 11)
+        assert json.loads((tmp_path / "3.json").read_text())["name"] == "Renamed"
+        assert (tmp_path / "1.json").stat().st_mtime_ns == unchanged_at
+        assert load_manifest(tmp_path)["workflows"]["3"]["name"] == "Renamed"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_export_prunes_removed(
+        self, n8n_workflows: StandInServer, tmp_path: Path
+    ) -> None:
+        """Test workflows deleted upstream are reported, and removed only with prune."""
+        async with httpx.AsyncClient() as client:
+            await export_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+            del n8n_workflows.workflows["12"]
+            kept = await export_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+            pruned = await export_workflows(
+                client, tmp_path, n8n_workflows.url, api_key=API_KEY, prune=True
+            )
+
+        assert kept["removed"] == pruned["removed"] == ["12"]
+        assert not (tmp_path / "12.json").exists()
+        assert "12" not in load_manifest(tmp_path)["workflows"]
+        assert len(read_local(tmp_path)) == 11
+        assert (tmp_path / MANIFEST).exists()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_export_requires_api_key(
+        self, n8n_workflows: StandInServer, tmp_path: Path
+    ) -> None:
+        """Test an unauthorized export raises."""
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await export_workflows(client, tmp_path, n8n_workflows.url, api_key="wrong")
+
+
+class TestImport:
+    """Test delta import."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_import_pushes_only_differences(
+        self, n8n_workflows: StandInServer, tmp_path: Path
+    ) -> None:
+        """Test unchanged workflows are skipped, changed updated and new ones created."""
+        async with httpx.AsyncClient() as client:
+            await export_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+            edited = json.loads((tmp_path / "2.json").read_text())
+            edited["nodes"][1]["parameters"] = {"value": 1}
+            (tmp_path / "2.json").write_text(json.dumps(edited))
+            new = {**edited, "id": "staging-7", "name": "New workflow"}
+            (tmp_path / "staging-7.json").write_text(json.dumps(new))
+
+            plan = await import_workflows(
+                client, tmp_path, n8n_workflows.url, api_key=API_KEY, dry_run=True
+            )
+            assert len(n8n_workflows.workflows) == 12
+            result = await import_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+            again = await import_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+
+        assert plan == result
+        assert result == {"total": 13, "created": 1, "updated": 1, "unchanged": 11, "failed": []}
+        assert n8n_workflows.workflows["2"]["nodes"][1]["parameters"] == {"value": 1}
+        assert n8n_workflows.workflows["13"]["name"] == "New workflow"
+        assert again["unchanged"] == 13
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_import_matches_by_name(
+        self, n8n_workflows: StandInServer, tmp_path: Path
+    ) -> None:
+        """Test workflows from another environment update same-named ones."""
+        workflow = dict(n8n_workflows.workflows["5"], id="prod-5", settings={"timezone": "UTC"})
+        (tmp_path / "prod-5.json").write_text(json.dumps(workflow))
+
+        async with httpx.AsyncClient() as client:
+            result = await import_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+
+        assert (result["created"], result["updated"]) == (0, 1)
+        assert n8n_workflows.workflows["5"]["settings"] == {"timezone": "UTC"}
+        assert len(n8n_workflows.workflows) == 12
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_import_records_failures(
+        self, n8n_workflows: StandInServer, tmp_path: Path
+    ) -> None:
+        """Test a rejected push is recorded as failed, not updated, without stopping the others."""
+        for workflow_id in ("3", "4"):
+            workflow = dict(n8n_workflows.workflows[workflow_id], nodes=[])
+            (tmp_path / f"{workflow_id}.json").write_text(json.dumps(workflow))
+        n8n_workflows.routes["/api/v1/workflows/3"] = Behaviour(error_rate=1.0)
+
+        async with httpx.AsyncClient() as client:
+            result = await import_workflows(client, tmp_path, n8n_workflows.url, api_key=API_KEY)
+
+        assert result["updated"] == 1
+        assert [failure["name"] for failure in result["failed"]] == ["Workflow 3"]
+        assert n8n_workflows.workflows["4"]["nodes"] == []